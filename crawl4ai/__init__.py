@@ -48,8 +48,18 @@ from .async_dispatcher import (
     MemoryAdaptiveDispatcher,
     SemaphoreDispatcher,
     RateLimiter,
+    ConcurrencyController,
+    DistributedDispatcher,
     BaseDispatcher,
 )
+from .frontier import (
+    FrontierEntry,
+    FrontierStore,
+    SQLiteFrontierStore,
+    LeaseFrontier,
+    LocalLeaseFrontier,
+    RedisLeaseFrontier,
+)
 from .docker_client import Crawl4aiDockerClient
 from .hub import CrawlerHub
 from .browser_profiler import BrowserProfiler
@@ -72,9 +82,13 @@ from .deep_crawling import (
     BestFirstCrawlingStrategy,
     DFSDeepCrawlStrategy,
     DeepCrawlDecorator,
+    VisitedSet,
+    HashedVisitedSet,
+    BloomVisitedSet,
 )
 # NEW: Import AsyncUrlSeeder
 from .async_url_seeder import AsyncUrlSeeder
+from .http_client import SharedHTTPClient
 # Adaptive Crawler
 from .adaptive_crawler import (
     AdaptiveCrawler,
@@ -119,6 +133,7 @@ __all__ = [
     "VirtualScrollConfig",
     # NEW: Add AsyncUrlSeeder
     "AsyncUrlSeeder",
+    "SharedHTTPClient",
     # Adaptive Crawler
     "AdaptiveCrawler",
     "AdaptiveConfig", 
@@ -129,6 +144,9 @@ __all__ = [
     "BFSDeepCrawlStrategy",
     "BestFirstCrawlingStrategy",
     "DFSDeepCrawlStrategy",
+    "VisitedSet",
+    "HashedVisitedSet",
+    "BloomVisitedSet",
     "FilterChain",
     "URLPatternFilter",
     "ContentTypeFilter",
@@ -174,6 +192,14 @@ __all__ = [
     "MemoryAdaptiveDispatcher",
     "SemaphoreDispatcher",
     "RateLimiter",
+    "ConcurrencyController",
+    "DistributedDispatcher",
+    "FrontierEntry",
+    "FrontierStore",
+    "SQLiteFrontierStore",
+    "LeaseFrontier",
+    "LocalLeaseFrontier",
+    "RedisLeaseFrontier",
     "CrawlerMonitor",
     "LinkPreview",
     "DisplayMode",
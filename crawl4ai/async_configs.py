@@ -28,7 +28,7 @@ from .proxy_strategy import ProxyRotationStrategy
 
 from typing import Union, List, Callable
 import inspect
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional
 from enum import Enum
 
 # Type alias for URL matching
@@ -412,6 +412,12 @@ class BrowserConfig:
                            Default: [].
         enable_stealth (bool): If True, applies playwright-stealth to bypass basic bot detection.
                               Cannot be used with use_undetected browser mode. Default: False.
+        post_processing_executor (str or None): Where the crawler runs scraping, markdown generation and
+                                                extraction: "inline" (on the event loop), "thread" or "process"
+                                                (a crawler-scoped worker pool). None behaves like "inline".
+                                                Can be overridden per run by CrawlerRunConfig. Default: None.
+        post_processing_workers (int or None): Size of the post-processing worker pool. If None, the
+                                               concurrent.futures default is used. Default: None.
     """
 
     def __init__(
@@ -453,6 +459,8 @@ class BrowserConfig:
         debugging_port: int = 9222,
         host: str = "localhost",
         enable_stealth: bool = False,
+        post_processing_executor: str = None,
+        post_processing_workers: int = None,
     ):
         
         self.browser_type = browser_type
@@ -508,6 +516,8 @@ class BrowserConfig:
         self.debugging_port = debugging_port
         self.host = host
         self.enable_stealth = enable_stealth
+        self.post_processing_executor = post_processing_executor
+        self.post_processing_workers = post_processing_workers
 
         fa_user_agenr_generator = ValidUAGenerator()
         if self.user_agent_mode == "random":
@@ -583,6 +593,8 @@ class BrowserConfig:
             debugging_port=kwargs.get("debugging_port", 9222),
             host=kwargs.get("host", "localhost"),
             enable_stealth=kwargs.get("enable_stealth", False),
+            post_processing_executor=kwargs.get("post_processing_executor"),
+            post_processing_workers=kwargs.get("post_processing_workers"),
         )
 
     def to_dict(self):
@@ -618,6 +630,8 @@ class BrowserConfig:
             "debugging_port": self.debugging_port,
             "host": self.host,
             "enable_stealth": self.enable_stealth,
+            "post_processing_executor": self.post_processing_executor,
+            "post_processing_workers": self.post_processing_workers,
         }
 
                 
@@ -790,7 +804,19 @@ class LinkPreviewConfig:
 
 
 class HTTPCrawlerConfig:
-    """HTTP-specific crawler configuration"""
+    """
+    HTTP-specific crawler configuration
+
+    Attributes:
+        max_body_bytes (int or None): Largest response body to download. Larger
+                                      responses are abandoned as soon as that is known.
+                                      Default: None (no limit).
+        allowed_content_types (list of str or None): Media types to download, e.g.
+                                      ["text/html", "application/xhtml+xml"]. A type ending
+                                      in "/" matches a whole family, e.g. "text/". Other
+                                      responses are abandoned before their body is read.
+                                      Default: None (any type).
+    """
 
     method: str = "GET"
     headers: Optional[Dict[str, str]] = None
@@ -798,6 +824,8 @@ class HTTPCrawlerConfig:
     json: Optional[Dict[str, Any]] = None
     follow_redirects: bool = True
     verify_ssl: bool = True
+    max_body_bytes: Optional[int] = None
+    allowed_content_types: Optional[List[str]] = None
 
     def __init__(
         self,
@@ -807,6 +835,8 @@ class HTTPCrawlerConfig:
         json: Optional[Dict[str, Any]] = None,
         follow_redirects: bool = True,
         verify_ssl: bool = True,
+        max_body_bytes: Optional[int] = None,
+        allowed_content_types: Optional[List[str]] = None,
     ):
         self.method = method
         self.headers = headers
@@ -814,6 +844,8 @@ class HTTPCrawlerConfig:
         self.json = json
         self.follow_redirects = follow_redirects
         self.verify_ssl = verify_ssl
+        self.max_body_bytes = max_body_bytes
+        self.allowed_content_types = allowed_content_types
 
     @staticmethod
     def from_kwargs(kwargs: dict) -> "HTTPCrawlerConfig":
@@ -824,6 +856,8 @@ class HTTPCrawlerConfig:
             json=kwargs.get("json"),
             follow_redirects=kwargs.get("follow_redirects", True),
             verify_ssl=kwargs.get("verify_ssl", True),
+            max_body_bytes=kwargs.get("max_body_bytes"),
+            allowed_content_types=kwargs.get("allowed_content_types"),
         )
 
     def to_dict(self):
@@ -834,6 +868,8 @@ class HTTPCrawlerConfig:
             "json": self.json,
             "follow_redirects": self.follow_redirects,
             "verify_ssl": self.verify_ssl,
+            "max_body_bytes": self.max_body_bytes,
+            "allowed_content_types": self.allowed_content_types,
         }
 
     def clone(self, **kwargs):
@@ -911,6 +947,9 @@ class CrawlerRunConfig():
                            Default: "lxml".
         scraping_strategy (ContentScrapingStrategy): Scraping strategy to use.
                            Default: LXMLWebScrapingStrategy.
+        post_processing_executor (str or None): Where to run scraping, markdown generation and extraction for
+                                                this run: "inline", "thread" or "process". If None, the
+                                                BrowserConfig setting is used. Default: None.
         proxy_config (ProxyConfig or dict or None): Detailed proxy configuration, e.g. {"server": "...", "username": "..."}.
                                      If None, no additional proxy config. Default: None.
 
@@ -939,6 +978,19 @@ class CrawlerRunConfig():
                               Default: False.
         no_cache_write (bool): Legacy parameter, if True acts like CacheMode.READ_ONLY.
                                Default: False.
+        cache_max_age (float or None): Maximum age in seconds of a cached result to use when
+                                       reading from the cache. Older entries are re-crawled,
+                                       or revalidated with CacheMode.REVALIDATE.
+                                       Default: None (any age).
+        cache_ttl (float or None): Seconds after which a result written to the cache expires.
+                                   Expired entries are kept, and revalidated by
+                                   CacheMode.REVALIDATE, until the cache limits or
+                                   AsyncDatabaseManager.aevict() evict them.
+                                   Default: None (never expires).
+        cache_fields (list of str or None): CrawlResult fields to load from a cache hit, e.g.
+                                            ["markdown"]. Other cached fields are left empty,
+                                            so large ones like html and screenshot are not read.
+                                            Default: None (all fields).
         shared_data (dict or None): Shared data to be passed between hooks.
                                      Default: None.
 
@@ -1037,6 +1089,10 @@ class CrawlerRunConfig():
                         Default: True.
         log_console (bool): If True, log console messages from the page.
                             Default: False.
+        capture_resource_usage (bool): If True, measure the page's JS heap, DOM size and renderer CPU
+                                       time through the Chrome DevTools Protocol (Chromium only) and
+                                       report them in CrawlResult.resource_usage and DispatchResult.
+                                       Default: False.
 
         # HTTP Crwler Strategy Parameters
         method (str): HTTP method to use for the request, when using AsyncHTTPCrwalerStrategy.
@@ -1072,6 +1128,23 @@ class CrawlerRunConfig():
         'no_cache_read' : 'Instead, use cache_mode=CacheMode.WRITE_ONLY',
         'no_cache_write' : 'Instead, use cache_mode=CacheMode.READ_ONLY',
     }
+    # Parameters __init__ converts, validates or derives other attributes from.
+    _CLONE_REBUILD_PARAMS = frozenset({
+        'extraction_strategy', 'chunking_strategy', 'scraping_strategy',
+        'target_elements', 'excluded_tags', 'excluded_selector', 'keep_attrs',
+        'proxy_config', 'table_extraction', 'table_score_threshold',
+        'exclude_social_media_domains', 'exclude_domains',
+        'link_preview_config', 'virtual_scroll_config',
+        'js_code', 'c4a_script', 'experimental',
+    })
+    # Parameters that change how BrowserManager sets up a browser context, and
+    # so go into the context signature. The signature cached on the config is
+    # dropped when one of them is set.
+    _CONTEXT_SIGNATURE_FIELDS = frozenset({
+        'proxy_config', 'locale', 'timezone_id', 'geolocation',
+        'override_navigator', 'simulate_user', 'magic',
+        'user_agent', 'user_agent_mode',
+    })
 
     def __init__(
         self,
@@ -1091,6 +1164,7 @@ class CrawlerRunConfig():
         prettiify: bool = False,
         parser_type: str = "lxml",
         scraping_strategy: ContentScrapingStrategy = None,
+        post_processing_executor: str = None,
         proxy_config: Union[ProxyConfig, dict, None] = None,
         proxy_rotation_strategy: Optional[ProxyRotationStrategy] = None,
         # Browser Location and Identity Parameters
@@ -1106,6 +1180,9 @@ class CrawlerRunConfig():
         disable_cache: bool = False,
         no_cache_read: bool = False,
         no_cache_write: bool = False,
+        cache_max_age: Optional[float] = None,
+        cache_ttl: Optional[float] = None,
+        cache_fields: Optional[List[str]] = None,
         shared_data: dict = None,
         # Page Navigation and Timing Parameters
         wait_until: str = "domcontentloaded",
@@ -1157,6 +1234,7 @@ class CrawlerRunConfig():
         # Network and Console Capturing Parameters
         capture_network_requests: bool = False,
         capture_console_messages: bool = False,
+        capture_resource_usage: bool = False,
         # Connection Parameters
         method: str = "GET",
         stream: bool = False,
@@ -1196,6 +1274,7 @@ class CrawlerRunConfig():
         self.prettiify = prettiify
         self.parser_type = parser_type
         self.scraping_strategy = scraping_strategy or LXMLWebScrapingStrategy()
+        self.post_processing_executor = post_processing_executor
         self.proxy_config = proxy_config
         if isinstance(proxy_config, dict):
             self.proxy_config = ProxyConfig.from_dict(proxy_config)
@@ -1219,6 +1298,9 @@ class CrawlerRunConfig():
         self.disable_cache = disable_cache
         self.no_cache_read = no_cache_read
         self.no_cache_write = no_cache_write
+        self.cache_max_age = cache_max_age
+        self.cache_ttl = cache_ttl
+        self.cache_fields = cache_fields
         self.shared_data = shared_data
 
         # Page Navigation and Timing Parameters
@@ -1283,6 +1365,7 @@ class CrawlerRunConfig():
         # Network and Console Capturing Parameters
         self.capture_network_requests = capture_network_requests
         self.capture_console_messages = capture_console_messages
+        self.capture_resource_usage = capture_resource_usage
 
         # Connection Parameters
         self.stream = stream
@@ -1453,15 +1536,24 @@ class CrawlerRunConfig():
 
     def __setattr__(self, name, value):
         """Handle attribute setting."""
-        # TODO: Planning to set properties dynamically based on the __init__ signature
-        sig = inspect.signature(self.__init__)
-        all_params = sig.parameters  # Dictionary of parameter names and their details
-
-        if name in self._UNWANTED_PROPS and value is not all_params[name].default:
+        # Only deprecated properties need the __init__ signature, and it is
+        # looked up once rather than on every assignment.
+        if name in self._UNWANTED_PROPS and value is not CrawlerRunConfig._init_params()[name].default:
             raise AttributeError(f"Setting '{name}' is deprecated. {self._UNWANTED_PROPS[name]}")
+        if name in self._CONTEXT_SIGNATURE_FIELDS:
+            self.__dict__.pop("_context_signature", None)
         
         super().__setattr__(name, value)
 
+    @classmethod
+    def _init_params(cls) -> Mapping[str, inspect.Parameter]:
+        """Return the parameters of `cls.__init__`, computed once per class."""
+        params = cls.__dict__.get("_init_params_cache")
+        if params is None:
+            params = inspect.signature(cls.__init__).parameters
+            cls._init_params_cache = params
+        return params
+
     @staticmethod
     def from_kwargs(kwargs: dict) -> "CrawlerRunConfig":
         return CrawlerRunConfig(
@@ -1481,6 +1573,7 @@ class CrawlerRunConfig():
             prettiify=kwargs.get("prettiify", False),
             parser_type=kwargs.get("parser_type", "lxml"),
             scraping_strategy=kwargs.get("scraping_strategy"),
+            post_processing_executor=kwargs.get("post_processing_executor"),
             proxy_config=kwargs.get("proxy_config"),
             proxy_rotation_strategy=kwargs.get("proxy_rotation_strategy"),
             # Browser Location and Identity Parameters
@@ -1496,6 +1589,9 @@ class CrawlerRunConfig():
             disable_cache=kwargs.get("disable_cache", False),
             no_cache_read=kwargs.get("no_cache_read", False),
             no_cache_write=kwargs.get("no_cache_write", False),
+            cache_max_age=kwargs.get("cache_max_age"),
+            cache_ttl=kwargs.get("cache_ttl"),
+            cache_fields=kwargs.get("cache_fields"),
             shared_data=kwargs.get("shared_data", None),
             # Page Navigation and Timing Parameters
             wait_until=kwargs.get("wait_until", "domcontentloaded"),
@@ -1555,6 +1651,7 @@ class CrawlerRunConfig():
             # Network and Console Capturing Parameters
             capture_network_requests=kwargs.get("capture_network_requests", False),
             capture_console_messages=kwargs.get("capture_console_messages", False),
+            capture_resource_usage=kwargs.get("capture_resource_usage", False),
             # Connection Parameters
             method=kwargs.get("method", "GET"),
             stream=kwargs.get("stream", False),
@@ -1604,6 +1701,7 @@ class CrawlerRunConfig():
             "prettiify": self.prettiify,
             "parser_type": self.parser_type,
             "scraping_strategy": self.scraping_strategy,
+            "post_processing_executor": self.post_processing_executor,
             "proxy_config": self.proxy_config,
             "proxy_rotation_strategy": self.proxy_rotation_strategy,
             "locale": self.locale,
@@ -1616,6 +1714,9 @@ class CrawlerRunConfig():
             "disable_cache": self.disable_cache,
             "no_cache_read": self.no_cache_read,
             "no_cache_write": self.no_cache_write,
+            "cache_max_age": self.cache_max_age,
+            "cache_ttl": self.cache_ttl,
+            "cache_fields": self.cache_fields,
             "shared_data": self.shared_data,
             "wait_until": self.wait_until,
             "page_timeout": self.page_timeout,
@@ -1660,6 +1761,7 @@ class CrawlerRunConfig():
             "log_console": self.log_console,
             "capture_network_requests": self.capture_network_requests,
             "capture_console_messages": self.capture_console_messages,
+            "capture_resource_usage": self.capture_resource_usage,
             "method": self.method,
             "stream": self.stream,
             "check_robots_txt": self.check_robots_txt,
@@ -1695,10 +1797,26 @@ class CrawlerRunConfig():
                 verbose=True
             )
             ```
+
+        Note:
+            The copy is shallow: attributes are copied from `__dict__` without
+            running `__init__` again, so strategies and other objects are shared
+            with the original, as they were with the previous `to_dict()` based
+            copy. Updating a parameter that `__init__` converts or validates
+            (see `_CLONE_REBUILD_PARAMS`), or an unknown one, rebuilds the
+            configuration through `from_kwargs` instead.
         """
-        config_dict = self.to_dict()
-        config_dict.update(kwargs)
-        return CrawlerRunConfig.from_kwargs(config_dict)
+        params = CrawlerRunConfig._init_params()
+        if any(name not in params or name in self._CLONE_REBUILD_PARAMS for name in kwargs):
+            config_dict = self.to_dict()
+            config_dict.update(kwargs)
+            return CrawlerRunConfig.from_kwargs(config_dict)
+
+        config = self.__class__.__new__(self.__class__)
+        config.__dict__.update(self.__dict__)
+        for name, value in kwargs.items():
+            setattr(config, name, value)
+        return config
 
 class LLMConfig:
     def __init__(
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import asyncio
 import base64
+import re
 import time
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
 from typing import Callable, Dict, Any, List, Union
 from typing import Optional, AsyncGenerator, Final
 import os
@@ -14,7 +16,7 @@ from PIL import Image, ImageDraw, ImageFont
 import hashlib
 import uuid
 from .js_snippet import load_js_script
-from .models import AsyncCrawlResponse
+from .models import AsyncCrawlResponse, PageResourceUsage
 from .config import SCREENSHOT_HEIGHT_TRESHOLD
 from .async_configs import BrowserConfig, CrawlerRunConfig, HTTPCrawlerConfig
 from .async_logger import AsyncLogger
@@ -22,10 +24,11 @@ from .ssl_certificate import SSLCertificate
 from .user_agent_generator import ValidUAGenerator
 from .browser_manager import BrowserManager
 from .browser_adapter import BrowserAdapter, PlaywrightAdapter, UndetectedAdapter
+from .utils import sniff_encoding
+from .http_client import SharedHTTPClient
 
 import aiofiles
 import aiohttp
-import chardet
 from aiohttp.client import ClientTimeout
 from urllib.parse import urlparse
 from types import MappingProxyType
@@ -71,6 +74,9 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
 
     """
 
+    # Seconds between JS heap readings while capture_resource_usage is on
+    RESOURCE_SAMPLE_INTERVAL = 0.25
+
     def __init__(
         self, browser_config: BrowserConfig = None, logger: AsyncLogger = None, browser_adapter: BrowserAdapter = None, **kwargs
     ):
@@ -95,6 +101,10 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
         # Initialize session management
         self._downloaded_files = []
 
+        # Held while a crawl overrides the browser's user agent and opens its
+        # page, so concurrent crawls cannot swap the user agent in between
+        self._user_agent_lock = asyncio.Lock()
+
         # Initialize hooks system
         self.hooks = {
             "on_browser_created": None,
@@ -450,7 +460,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
         screenshot_data = None
 
         if url.startswith(("http://", "https://", "view-source:")):
-            return await self._crawl_web(url, config)
+            return await self._crawl_web(url, config, kwargs.get("conditional_headers"))
 
         elif url.startswith("file://"):
             # initialize empty lists for console messages
@@ -502,7 +512,7 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
             )
 
     async def _crawl_web(
-        self, url: str, config: CrawlerRunConfig
+        self, url: str, config: CrawlerRunConfig, conditional_headers: Optional[Dict[str, str]] = None
     ) -> AsyncCrawlResponse:
         """
         Internal method to crawl web URLs with the specified configuration.
@@ -511,6 +521,9 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
         Args:
             url (str): The web URL to crawl
             config (CrawlerRunConfig): Configuration object controlling the crawl behavior
+            conditional_headers (dict, optional): If-None-Match / If-Modified-Since headers
+                for the navigation request. A 304 answer returns an empty response with
+                status_code 304 without rendering the page.
 
         Returns:
             AsyncCrawlResponse: The response containing HTML, headers, status code, and optional data
@@ -530,15 +543,20 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
 
         # Handle user agent with magic mode
         user_agent_to_override = config.user_agent
-        if user_agent_to_override:
-            self.browser_config.user_agent = user_agent_to_override
-        elif config.magic or config.user_agent_mode == "random":
-            self.browser_config.user_agent = ValidUAGenerator().generate(
-                **(config.user_agent_generator_config or {})
-            )
+        if user_agent_to_override or config.magic or config.user_agent_mode == "random":
+            async with self._user_agent_lock:
+                if user_agent_to_override:
+                    self.browser_config.user_agent = user_agent_to_override
+                else:
+                    self.browser_config.user_agent = ValidUAGenerator().generate(
+                        **(config.user_agent_generator_config or {})
+                    )
 
-        # Get page for session
-        page, context = await self.browser_manager.get_page(crawlerRunConfig=config)
+                # Get page for session
+                page, context = await self.browser_manager.get_page(crawlerRunConfig=config)
+        else:
+            # Get page for session
+            page, context = await self.browser_manager.get_page(crawlerRunConfig=config)
 
         # await page.goto(URL)
 
@@ -554,6 +572,17 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
         # Call hook after page creation
         await self.execute_hook("on_page_context_created", page, context=context, config=config)
 
+        # Per-page resource accounting through CDP
+        resource_session = None
+        resource_baseline = {}
+        resource_sampler = None
+        if config.capture_resource_usage:
+            resource_session, resource_baseline = await self._start_resource_usage(page)
+            if resource_session:
+                resource_sampler = asyncio.create_task(
+                    self._sample_heap_peak(resource_session, resource_baseline)
+                )
+
         # Network Request Capturing
         if config.capture_network_requests:
             async def handle_request_capture(request):
@@ -678,10 +707,24 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                             }
                         )
 
+                    revalidation = None
+                    if conditional_headers:
+                        revalidation = await self._revalidate_navigation(page, conditional_headers)
+
                     response = await page.goto(
                         url, wait_until=config.wait_until, timeout=config.page_timeout
                     )
                     redirected_url = page.url
+
+                    if revalidation is not None:
+                        await page.unroute("**/*", revalidation["handler"])
+                        if "headers" in revalidation:
+                            return AsyncCrawlResponse(
+                                html="",
+                                response_headers=revalidation["headers"],
+                                status_code=304,
+                                redirected_url=url,
+                            )
                 except Error as e:
                     # Allow navigation to be aborted when downloading files
                     # This is expected behavior for downloads in some browser engines
@@ -1023,6 +1066,14 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                 final_messages = await self.adapter.retrieve_console_messages(page)
                 captured_console.extend(final_messages)
 
+            resource_usage = None
+            if resource_session:
+                resource_sampler.cancel()
+                resource_usage = await self._collect_resource_usage(
+                    resource_session, resource_baseline
+                )
+                resource_session = None
+
             # Return complete response
             return AsyncCrawlResponse(
                 html=html,
@@ -1041,12 +1092,19 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                 # Include captured data if enabled
                 network_requests=captured_requests if config.capture_network_requests else None,
                 console_messages=captured_console if config.capture_console_messages else None,
+                resource_usage=resource_usage,
             )
 
         except Exception as e:
             raise e
 
         finally:
+            if resource_sampler:
+                resource_sampler.cancel()
+            if resource_session:
+                with contextlib.suppress(Exception):
+                    await resource_session.detach()
+
             # If no session_id is given we should close the page
             all_contexts = page.context.browser.contexts
             total_pages = sum(len(context.pages) for context in all_contexts)                
@@ -1072,6 +1130,48 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                 # Close the page
                 await page.close()
 
+    async def _revalidate_navigation(self, page: Page, conditional_headers: Dict[str, str]) -> Dict[str, Any]:
+        """
+        Sends the next navigation request of the page with conditional headers.
+
+        The request is intercepted and fetched with the headers added. Any answer
+        but 304 is passed to the browser as it is. A 304 is answered with an empty
+        page, and its headers are stored under "headers" in the returned dict,
+        which also holds the route "handler" to unroute after navigating.
+
+        Args:
+            page (Page): The page about to navigate
+            conditional_headers (Dict[str, str]): If-None-Match / If-Modified-Since headers
+
+        Returns:
+            Dict[str, Any]: The revalidation state
+        """
+        revalidation: Dict[str, Any] = {}
+
+        async def handler(route):
+            request = route.request
+            if (
+                "sent" in revalidation
+                or not request.is_navigation_request()
+                or request.frame != page.main_frame
+            ):
+                await route.fallback()
+                return
+            revalidation["sent"] = True
+            # Redirects are left to the browser, so that page.url stays accurate
+            response = await route.fetch(
+                headers={**request.headers, **conditional_headers}, max_redirects=0
+            )
+            if response.status == 304:
+                revalidation["headers"] = response.headers
+                await route.fulfill(status=200, body="", content_type="text/html")
+            else:
+                await route.fulfill(response=response)
+
+        revalidation["handler"] = handler
+        await page.route("**/*", handler)
+        return revalidation
+
     # async def _handle_full_page_scan(self, page: Page, scroll_delay: float = 0.1):
     async def _handle_full_page_scan(self, page: Page, scroll_delay: float = 0.1, max_scroll_steps: Optional[int] = None):
         """
@@ -1482,6 +1582,91 @@ class AsyncPlaywrightCrawlerStrategy(AsyncCrawlerStrategy):
                 )
             return None
 
+    async def _start_resource_usage(self, page: Page):
+        """
+        Start measuring the resources a page uses through a CDP session.
+
+        Args:
+            page (Page): The Playwright page object
+
+        Returns:
+            tuple: The CDP session and the baseline metrics, or (None, {}) when the
+            browser does not support CDP
+        """
+        try:
+            session = await page.context.new_cdp_session(page)
+            await session.send("Performance.enable")
+            return session, await self._get_performance_metrics(session)
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(
+                    message="Resource usage capture unavailable: {error}",
+                    tag="RESOURCES",
+                    params={"error": str(e)},
+                )
+            return None, {}
+
+    @staticmethod
+    async def _get_performance_metrics(session) -> Dict[str, float]:
+        response = await session.send("Performance.getMetrics")
+        return {metric["name"]: metric["value"] for metric in response.get("metrics", [])}
+
+    async def _sample_heap_peak(self, session, baseline: Dict[str, float]):
+        """
+        Read the page's metrics every RESOURCE_SAMPLE_INTERVAL seconds until
+        cancelled, keeping the largest JS heap seen in baseline["JSHeapPeakSize"].
+
+        Args:
+            session: The CDP session returned by _start_resource_usage
+            baseline (Dict[str, float]): Metrics read when the session started
+        """
+        baseline["JSHeapPeakSize"] = baseline.get("JSHeapUsedSize", 0)
+        while True:
+            await asyncio.sleep(self.RESOURCE_SAMPLE_INTERVAL)
+            try:
+                metrics = await self._get_performance_metrics(session)
+            except Exception:
+                return  # The page or session is gone; the final reading still counts
+            baseline["JSHeapPeakSize"] = max(
+                baseline["JSHeapPeakSize"], metrics.get("JSHeapUsedSize", 0)
+            )
+
+    async def _collect_resource_usage(
+        self, session, baseline: Dict[str, float]
+    ) -> Optional[PageResourceUsage]:
+        """
+        Read the page's final metrics and close the CDP session.
+
+        Args:
+            session: The CDP session returned by _start_resource_usage
+            baseline (Dict[str, float]): Metrics read when the session started,
+                with the peak heap kept by _sample_heap_peak
+
+        Returns:
+            Optional[PageResourceUsage]: JS heap, DOM size and the main-thread task
+            time spent since the baseline, or None if the metrics could not be read
+        """
+        try:
+            metrics = await self._get_performance_metrics(session)
+            await session.detach()
+        except Exception as e:
+            if self.logger:
+                self.logger.warning(
+                    message="Failed to read resource usage: {error}",
+                    tag="RESOURCES",
+                    params={"error": str(e)},
+                )
+            return None
+        return PageResourceUsage(
+            js_heap_used_mb=metrics.get("JSHeapUsedSize", 0) / (1024 * 1024),
+            js_heap_total_mb=metrics.get("JSHeapTotalSize", 0) / (1024 * 1024),
+            js_heap_peak_mb=max(
+                baseline.get("JSHeapPeakSize", 0), metrics.get("JSHeapUsedSize", 0)
+            ) / (1024 * 1024),
+            cpu_time=max(0.0, metrics.get("TaskDuration", 0) - baseline.get("TaskDuration", 0)),
+            dom_nodes=int(metrics.get("Nodes", 0)),
+        )
+
     async def _capture_console_messages(
         self, page: Page, file_path: str
     ) -> List[Dict[str, Union[str, float]]]:
@@ -2150,12 +2335,26 @@ class HTTPStatusError(HTTPCrawlerError):
         super().__init__(f"HTTP {status_code}: {message}")
 
 
+class ResponseTooLargeError(HTTPCrawlerError):
+    """Raised when a response body exceeds max_body_bytes"""
+    pass
+
+
+class UnsupportedContentTypeError(HTTPCrawlerError):
+    """Raised when a response's content type is not in allowed_content_types"""
+    pass
+
+
 class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
     """
     Fast, lightweight HTTP-only crawler strategy optimized for memory efficiency.
+
+    Given an `http_client`, requests go through that shared pool and the
+    strategy's own `max_connections` / `dns_cache_ttl` are not used. An
+    AsyncWebCrawler hands its pool to a strategy that has none.
     """
     
-    __slots__ = ('logger', 'max_connections', 'dns_cache_ttl', 'chunk_size', '_session', 'hooks', 'browser_config')
+    __slots__ = ('logger', 'max_connections', 'dns_cache_ttl', 'chunk_size', '_session', 'hooks', 'browser_config', 'http_client')
 
     DEFAULT_TIMEOUT: Final[int] = 30
     DEFAULT_CHUNK_SIZE: Final[int] = 64 * 1024  
@@ -2178,7 +2377,8 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
         logger: Optional[AsyncLogger] = None,
         max_connections: int = DEFAULT_MAX_CONNECTIONS,
         dns_cache_ttl: int = DEFAULT_DNS_CACHE_TTL,
-        chunk_size: int = DEFAULT_CHUNK_SIZE
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        http_client: Optional[SharedHTTPClient] = None,
     ):
         """Initialize the HTTP crawler with config"""
         self.browser_config = browser_config or HTTPCrawlerConfig()
@@ -2186,6 +2386,7 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
         self.max_connections = max_connections
         self.dns_cache_ttl = dns_cache_ttl
         self.chunk_size = chunk_size
+        self.http_client = http_client
         self._session: Optional[aiohttp.ClientSession] = None
         
         self.hooks = {
@@ -2209,7 +2410,10 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
     @contextlib.asynccontextmanager
     async def _session_context(self):
         try:
-            if not self._session:
+            if self.http_client is not None:
+                # Always the pool's current session, which it reopens after a close
+                self._session = self.http_client.session
+            elif not self._session:
                 await self.start()
             yield self._session
         finally:
@@ -2233,7 +2437,9 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
         return hook_func(*args, **kwargs)
 
     async def start(self) -> None:
-        if not self._session:
+        if self.http_client is not None:
+            self._session = self.http_client.session
+        elif not self._session:
             connector = aiohttp.TCPConnector(
                 limit=self.max_connections,
                 ttl_dns_cache=self.dns_cache_ttl,
@@ -2247,7 +2453,10 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
             )
 
     async def close(self) -> None:
-        if self._session and not self._session.closed:
+        if self.http_client is not None:
+            # The shared pool outlives the strategy; its owner closes it
+            self._session = None
+        elif self._session and not self._session.closed:
             try:
                 await asyncio.wait_for(self._session.close(), timeout=5.0)
             except asyncio.TimeoutError:
@@ -2286,10 +2495,42 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
         )
 
 
+    def _check_content_type(self, url: str, content_type: str) -> None:
+        """Raise UnsupportedContentTypeError unless allowed_content_types admits the type"""
+        allowed = self.browser_config.allowed_content_types
+        if not allowed:
+            return
+        content_type = (content_type or "").lower()
+        for allowed_type in allowed:
+            allowed_type = allowed_type.lower()
+            if content_type == allowed_type or (
+                allowed_type.endswith("/") and content_type.startswith(allowed_type)
+            ):
+                return
+        raise UnsupportedContentTypeError(f"Content type {content_type or 'unknown'} not allowed for {url}")
+
+    async def _read_body(self, url: str, response: aiohttp.ClientResponse) -> bytearray:
+        """
+        Read the body in chunk_size pieces, giving up once it is larger than
+        max_body_bytes. A Content-Length over the limit fails before any read.
+        """
+        limit = self.browser_config.max_body_bytes
+        if limit is not None and response.content_length is not None and response.content_length > limit:
+            raise ResponseTooLargeError(
+                f"Response of {response.content_length} bytes exceeds max_body_bytes={limit} for {url}"
+            )
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            body += chunk
+            if limit is not None and len(body) > limit:
+                raise ResponseTooLargeError(f"Response exceeds max_body_bytes={limit} for {url}")
+        return body
+
     async def _handle_http(
         self, 
         url: str, 
-        config: CrawlerRunConfig
+        config: CrawlerRunConfig,
+        conditional_headers: Optional[Dict[str, str]] = None,
     ) -> AsyncCrawlResponse:
         async with self._session_context() as session:
             timeout = ClientTimeout(
@@ -2301,6 +2542,8 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
             headers = dict(self._BASE_HEADERS)
             if self.browser_config.headers:
                 headers.update(self.browser_config.headers)
+            if conditional_headers:
+                headers.update(conditional_headers)
 
             request_kwargs = {
                 'timeout': timeout,
@@ -2319,20 +2562,28 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
 
             try:
                 async with session.request(self.browser_config.method, url, **request_kwargs) as response:
-                    content = memoryview(await response.read())
-                    
+                    if conditional_headers and response.status == 304:
+                        result = AsyncCrawlResponse(
+                            html="",
+                            response_headers=dict(response.headers),
+                            status_code=304,
+                            redirected_url=str(response.url)
+                        )
+                        await self.hooks['after_request'](result)
+                        return result
+
                     if not (200 <= response.status < 300):
                         raise HTTPStatusError(
                             response.status,
                             f"Unexpected status code for {url}"
                         )
-                    
-                    encoding = response.charset
-                    if not encoding:
-                        encoding = chardet.detect(content.tobytes())['encoding'] or 'utf-8'                    
-                    
+
+                    self._check_content_type(url, response.content_type)
+                    content = await self._read_body(url, response)
+                    encoding = sniff_encoding(content, response.charset)
+
                     result = AsyncCrawlResponse(
-                        html=content.tobytes().decode(encoding, errors='replace'),
+                        html=content.decode(encoding, errors='replace'),
                         response_headers=dict(response.headers),
                         status_code=response.status,
                         redirected_url=str(response.url)
@@ -2341,6 +2592,10 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
                     await self.hooks['after_request'](result)
                     return result
 
+            except HTTPCrawlerError as e:
+                await self.hooks['on_error'](e)
+                raise
+
             except aiohttp.ServerTimeoutError as e:
                 await self.hooks['on_error'](e)
                 raise ConnectionTimeoutError(f"Request timed out: {str(e)}")
@@ -2381,7 +2636,7 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
             elif scheme == 'raw':
                 return await self._handle_raw(parsed.path)
             else:  # http or https
-                return await self._handle_http(url, config)
+                return await self._handle_http(url, config, kwargs.get("conditional_headers"))
                 
         except Exception as e:
             if self.logger:
@@ -2391,3 +2646,245 @@ class AsyncHTTPCrawlerStrategy(AsyncCrawlerStrategy):
                     params={"error": str(e), "url": url}
                 )
             raise
+
+
+####################################################################################################
+# Hybrid Crawler Strategy
+####################################################################################################
+
+@dataclass
+class DomainRouteStats:
+    """How pages of one domain were fetched by AsyncHybridCrawlerStrategy"""
+    http: int = 0  # served over plain HTTP
+    escalated: int = 0  # fetched over HTTP, then rendered in the browser
+    browser: int = 0  # sent straight to the browser
+    reasons: Dict[str, int] = field(default_factory=dict)
+    # Pages routed by the domain's learned preference, HTTP probes included
+    routed_by_domain: int = 0
+
+    @property
+    def escalation_rate(self) -> float:
+        attempts = self.http + self.escalated
+        return self.escalated / attempts if attempts else 0.0
+
+
+class AsyncHybridCrawlerStrategy(AsyncCrawlerStrategy):
+    """
+    Crawler strategy that fetches pages over plain HTTP and renders them in a
+    browser only when they need it.
+
+    A page goes to the browser when the run config asks for something only a
+    browser can do (js_code, wait_for, screenshots, sessions...), or when the
+    HTTP response looks like it needs JavaScript: almost no visible text, an
+    empty single-page-app mount point, a "please enable JavaScript" noscript
+    message on a page without much text, or a 403/503 status.
+
+    Decisions are counted per domain. Once a domain has been escalated on at
+    least `learn_after` pages at a rate of `escalation_threshold` or more, its
+    pages go straight to the browser, with one HTTP probe every
+    `reprobe_interval` pages in case that changed. The browser itself is only
+    started when the first page needs it.
+
+    Attributes:
+        http_strategy (AsyncHTTPCrawlerStrategy): Strategy for plain HTTP fetches.
+        browser_strategy (AsyncPlaywrightCrawlerStrategy): Strategy for rendered fetches.
+    """
+
+    # Run config options that only have an effect in a browser
+    BROWSER_ONLY_OPTIONS: Final = (
+        "js_code", "wait_for", "js_only", "session_id", "screenshot", "pdf",
+        "capture_mhtml", "scan_full_page", "virtual_scroll_config", "simulate_user",
+        "override_navigator", "magic", "process_iframes", "remove_overlay_elements",
+        "adjust_viewport_to_content", "capture_network_requests",
+        "capture_console_messages", "capture_resource_usage", "fetch_ssl_certificate",
+    )
+    # Statuses that are often a JavaScript challenge rather than a real error
+    ESCALATE_STATUS_CODES: Final = frozenset({403, 503})
+
+    _HIDDEN_RE = re.compile(r"<(script|style|noscript|template|svg)\b[^>]*>.*?</\1\s*>", re.I | re.S)
+    _TAG_RE = re.compile(r"<[^>]*>")
+    _SPA_ROOT_RE = re.compile(
+        r"""<(div|main|section)\b[^>]*\bid\s*=\s*["'](?:root|app|__next|__nuxt|svelte)["'][^>]*>\s*</\1\s*>"""
+        r"""|<app-root\b[^>]*>\s*</app-root\s*>""",
+        re.I,
+    )
+    _NOSCRIPT_RE = re.compile(r"<noscript\b[^>]*>(.*?)</noscript\s*>", re.I | re.S)
+    _JS_REQUIRED_RE = re.compile(
+        r"(?:enable|turn on|activate)\s+javascript|javascript\s+is\s+(?:disabled|required|not enabled)"
+        r"|requires?\s+javascript",
+        re.I,
+    )
+
+    def __init__(
+        self,
+        browser_config: Optional[BrowserConfig] = None,
+        http_config: Optional[HTTPCrawlerConfig] = None,
+        logger: Optional[AsyncLogger] = None,
+        min_text_length: int = 200,
+        learn_after: int = 10,
+        escalation_threshold: float = 0.6,
+        reprobe_interval: int = 50,
+        http_strategy: Optional[AsyncCrawlerStrategy] = None,
+        browser_strategy: Optional[AsyncCrawlerStrategy] = None,
+    ):
+        """
+        Args:
+            browser_config (BrowserConfig, optional): Settings for the browser strategy.
+            http_config (HTTPCrawlerConfig, optional): Settings for HTTP fetches. By
+                default they send the browser's user agent.
+            logger (AsyncLogger, optional): Logger for both strategies.
+            min_text_length (int): Pages with less visible text are rendered in the browser.
+            learn_after (int): Pages of a domain to see before its escalation rate is used.
+            escalation_threshold (float): Escalation rate that sends a domain to the browser.
+            reprobe_interval (int): How often a browser-bound domain is tried over HTTP again.
+            http_strategy, browser_strategy (AsyncCrawlerStrategy, optional): Replace the
+                default AsyncHTTPCrawlerStrategy / AsyncPlaywrightCrawlerStrategy.
+        """
+        self.browser_config = browser_config or BrowserConfig()
+        self.logger = logger
+        if http_config is None:
+            http_config = HTTPCrawlerConfig(headers={"User-Agent": self.browser_config.user_agent})
+        self.http_strategy = http_strategy or AsyncHTTPCrawlerStrategy(browser_config=http_config)
+        self.browser_strategy = browser_strategy or AsyncPlaywrightCrawlerStrategy(
+            browser_config=self.browser_config, logger=logger
+        )
+        self.min_text_length = min_text_length
+        self.learn_after = learn_after
+        self.escalation_threshold = escalation_threshold
+        self.reprobe_interval = reprobe_interval
+        self._domains: Dict[str, DomainRouteStats] = {}
+        self._browser_started = False
+        self._browser_lock = asyncio.Lock()
+
+    async def __aenter__(self):
+        await self.http_strategy.__aenter__()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.http_strategy.__aexit__(exc_type, exc_val, exc_tb)
+        if self._browser_started:
+            self._browser_started = False
+            await self.browser_strategy.__aexit__(exc_type, exc_val, exc_tb)
+
+    @property
+    def http_client(self) -> Optional[SharedHTTPClient]:
+        """The shared HTTP pool of the HTTP strategy, if it takes one"""
+        return getattr(self.http_strategy, "http_client", None)
+
+    @http_client.setter
+    def http_client(self, http_client: Optional[SharedHTTPClient]):
+        if hasattr(self.http_strategy, "http_client"):
+            self.http_strategy.http_client = http_client
+
+    def set_hook(self, hook_type: str, hook: Callable):
+        """Set a hook on the HTTP strategy if it has that hook type, else on the browser strategy"""
+        if hook_type in getattr(self.http_strategy, "hooks", {}):
+            self.http_strategy.set_hook(hook_type, hook)
+        else:
+            self.browser_strategy.set_hook(hook_type, hook)
+
+    def update_user_agent(self, user_agent: str):
+        """Use the user agent for both HTTP and browser fetches"""
+        if hasattr(self.browser_strategy, "update_user_agent"):
+            self.browser_strategy.update_user_agent(user_agent)
+        http_config = getattr(self.http_strategy, "browser_config", None)
+        if isinstance(http_config, HTTPCrawlerConfig):
+            self.http_strategy.browser_config = http_config.clone(
+                headers={**(http_config.headers or {}), "User-Agent": user_agent}
+            )
+
+    def escalation_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-domain routing counts: pages served over HTTP, escalated to the
+        browser, or sent there directly, the escalation rate, whether the
+        domain now goes straight to the browser, and the escalation reasons.
+        """
+        return {
+            domain: {
+                "http": stats.http,
+                "escalated": stats.escalated,
+                "browser": stats.browser,
+                "escalation_rate": stats.escalation_rate,
+                "prefers_browser": self._prefers_browser(stats),
+                "reasons": dict(stats.reasons),
+            }
+            for domain, stats in self._domains.items()
+        }
+
+    def _prefers_browser(self, stats: DomainRouteStats) -> bool:
+        return (
+            stats.http + stats.escalated >= self.learn_after
+            and stats.escalation_rate >= self.escalation_threshold
+        )
+
+    def _required_browser_reason(self, config: CrawlerRunConfig) -> Optional[str]:
+        for option in self.BROWSER_ONLY_OPTIONS:
+            if getattr(config, option, None):
+                return option
+        return None
+
+    def _page_reason(self, html: str) -> Optional[str]:
+        """Why a page fetched over HTTP should be rendered instead, if it should"""
+        if self._SPA_ROOT_RE.search(html):
+            return "spa root"
+        text_length = len("".join(self._TAG_RE.sub(" ", self._HIDDEN_RE.sub(" ", html)).split()))
+        if text_length < self.min_text_length:
+            return "little text"
+        # Sites often ask for JavaScript for comments or widgets only, so the
+        # message counts on pages without much text of their own
+        if text_length < self.min_text_length * 10 and any(
+            self._JS_REQUIRED_RE.search(block) for block in self._NOSCRIPT_RE.findall(html)
+        ):
+            return "noscript"
+        return None
+
+    async def _crawl_browser(self, url: str, config: CrawlerRunConfig, **kwargs) -> AsyncCrawlResponse:
+        if not self._browser_started:
+            async with self._browser_lock:
+                if not self._browser_started:
+                    await self.browser_strategy.__aenter__()
+                    self._browser_started = True
+        return await self.browser_strategy.crawl(url, config=config, **kwargs)
+
+    async def crawl(
+        self, url: str, config: Optional[CrawlerRunConfig] = None, **kwargs
+    ) -> AsyncCrawlResponse:
+        config = config or CrawlerRunConfig.from_kwargs(kwargs)
+        reason = self._required_browser_reason(config)
+        if not url.startswith(("http://", "https://")):
+            if reason:
+                return await self._crawl_browser(url, config, **kwargs)
+            return await self.http_strategy.crawl(url, config=config, **kwargs)
+
+        domain = urlparse(url).netloc.lower()
+        stats = self._domains.setdefault(domain, DomainRouteStats())
+        if reason is None and self._prefers_browser(stats):
+            stats.routed_by_domain += 1
+            if stats.routed_by_domain % self.reprobe_interval:
+                reason = "domain"
+        if reason:
+            stats.browser += 1
+            return await self._crawl_browser(url, config, **kwargs)
+
+        try:
+            response = await self.http_strategy.crawl(url, config=config, **kwargs)
+            # A 304 has no body to judge; the cached page is reused
+            reason = None if response.status_code == 304 else self._page_reason(response.html)
+        except HTTPStatusError as e:
+            if e.status_code not in self.ESCALATE_STATUS_CODES:
+                raise
+            reason = f"status {e.status_code}"
+
+        if reason is None:
+            stats.http += 1
+            return response
+
+        stats.escalated += 1
+        stats.reasons[reason] = stats.reasons.get(reason, 0) + 1
+        if self.logger:
+            self.logger.debug(
+                message="Rendering {url} in the browser: {reason}",
+                tag="HYBRID",
+                params={"url": url, "reason": reason},
+            )
+        return await self._crawl_browser(url, config, **kwargs)
@@ -1,10 +1,14 @@
 import os
+import base64
+import binascii
+import gzip
 from pathlib import Path
 import aiosqlite
 import asyncio
-from typing import Optional, Dict
+from typing import Optional, Dict, Iterable, List, Tuple
 from contextlib import asynccontextmanager
 import json  
+import time
 from .models import CrawlResult, MarkdownGenerationResult, StringCompatibleMarkdown
 import aiofiles
 from .async_logger import AsyncLogger
@@ -19,18 +23,163 @@ base_directory = DB_PATH = os.path.join(
 os.makedirs(DB_PATH, exist_ok=True)
 DB_PATH = os.path.join(base_directory, "crawl4ai.db")
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Legacy content directories, one file per content hash
+LEGACY_CONTENT_TYPES = ("html", "cleaned", "markdown", "extracted", "screenshots")
+
+# CrawlResult fields stored as content hashes, and their legacy content directory
+CONTENT_TYPES = {
+    "html": "html",
+    "cleaned_html": "cleaned",
+    "markdown": "markdown",
+    "extracted_content": "extracted",
+    "screenshot": "screenshots",
+}
+
+# CrawlResult fields a cache entry holds, in crawled_data column order
+CACHED_FIELDS = (
+    "html",
+    "cleaned_html",
+    "markdown",
+    "extracted_content",
+    "media",
+    "links",
+    "metadata",
+    "screenshot",
+    "response_headers",
+    "downloaded_files",
+)
+
+
+def pack_content(content: str, binary: bool = False) -> Tuple[str, int, bytes]:
+    """
+    Encode content for the content store.
+
+    Text is compressed with zstd when `zstandard` is installed and gzip
+    otherwise. With `binary=True`, base64 content (screenshots) is stored as
+    its raw bytes, uncompressed since image formats already are.
+
+    Returns:
+        Tuple[str, int, bytes]: The codec, whether the data is decoded base64, and the data.
+    """
+    if binary:
+        try:
+            data = base64.b64decode(content, validate=True)
+            if base64.b64encode(data).decode("ascii") == content:
+                return "none", 1, data
+        except (binascii.Error, ValueError):
+            pass
+    data = content.encode("utf-8")
+    if zstandard is not None:
+        return "zstd", 0, zstandard.ZstdCompressor(level=3).compress(data)
+    return "gzip", 0, gzip.compress(data, compresslevel=6)
+
+
+def unpack_content(codec: str, is_binary: int, data: bytes) -> str:
+    """Decode content written by `pack_content`"""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd compressed cache content")
+        data = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == "gzip":
+        data = gzip.decompress(data)
+    if is_binary:
+        return base64.b64encode(data).decode("ascii")
+    return data.decode("utf-8")
+
 
 class AsyncDatabaseManager:
-    def __init__(self, pool_size: int = 10, max_retries: int = 3):
+    """
+    Async access to the crawl cache.
+
+    Each cached URL is a row in `crawled_data` that refers to its html,
+    cleaned html, markdown, extracted content and screenshot by content hash.
+    The content itself lives compressed in the `content_blobs` table of the
+    same database, so identical content is stored once and no file is created
+    per page. SQLite reads the database through a memory map of up to
+    `mmap_size` bytes. Content files left in the per-type directories by older
+    versions are moved into the store on initialization and stay readable
+    until then.
+
+    Cache writes are write-behind: `acache_url` queues the result and returns.
+    Queued results are written together, their content compressed in one
+    worker thread and their rows in one transaction with `executemany`, when
+    `write_batch_size` results are pending, `write_flush_interval` seconds
+    after the first one was queued, or when `aflush_writes` is called.
+    `AsyncWebCrawler.close()` flushes, and so does any read that needs a
+    queued result or one that is being written. Once `max_pending_writes`
+    results are queued, `acache_url` waits for the queue to drain
+    (back-pressure). A batch that fails to write goes back on the queue,
+    behind any newer result for the same URL, and is retried by the next flush.
+
+    Every entry records when it was fetched, last read and, when written with
+    a TTL, when it expires; expired entries are not returned as cache hits, but
+    are kept so that CacheMode.REVALIDATE can send their validators. Read times
+    of cache hits are queued like writes and saved by the next flush. Each flush
+    also evicts the least recently used entries, expired or not, until at most
+    `max_entries` entries and `max_cache_bytes` bytes of stored content remain;
+    `aevict` deletes expired entries as well. The entry count and total size are kept in
+    `cache_stats` by triggers, so checking the limits does not scan the table.
+    Content blobs are reference-counted by triggers on `crawled_data`, and
+    `agc` deletes unreferenced blobs in small batches in the background.
+
+    Limits and write-behind settings of the shared `async_db_manager` can be
+    changed with `configure()`, or through AsyncWebCrawler's
+    `cache_max_entries` and `cache_max_bytes`.
+
+    Args:
+        pool_size (int): Maximum number of concurrent database connections.
+        max_retries (int): Attempts per database operation.
+        mmap_size (int): Bytes of the database file SQLite may memory-map. 0 disables mmap.
+        write_batch_size (int): Pending results that trigger a flush. 1 writes every result immediately.
+        write_flush_interval (float): Seconds a queued result may wait before it is flushed.
+        max_pending_writes (int): Pending results at which `acache_url` waits for the flush.
+        max_entries (int, optional): Maximum number of cached URLs. None means no limit.
+        max_cache_bytes (int, optional): Maximum stored content size in bytes, counted per
+            entry as the compressed size of its content. None means no limit.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = 10,
+        max_retries: int = 3,
+        mmap_size: int = 256 * 1024 * 1024,
+        write_batch_size: int = 100,
+        write_flush_interval: float = 1.0,
+        max_pending_writes: int = 1000,
+        max_entries: Optional[int] = None,
+        max_cache_bytes: Optional[int] = None,
+    ):
         self.db_path = DB_PATH
         self.content_paths = ensure_content_dirs(os.path.dirname(DB_PATH))
         self.pool_size = pool_size
         self.max_retries = max_retries
+        self.mmap_size = mmap_size
         self.connection_pool: Dict[int, aiosqlite.Connection] = {}
         self.pool_lock = asyncio.Lock()
         self.init_lock = asyncio.Lock()
         self.connection_semaphore = asyncio.Semaphore(pool_size)
         self._initialized = False
+        self.write_batch_size = max(1, write_batch_size)
+        self.write_flush_interval = write_flush_interval
+        self.max_pending_writes = max(self.write_batch_size, max_pending_writes)
+        # url -> (row, {content hash: (content, binary)}) waiting for the next flush
+        self._pending_writes: Dict[str, Tuple[tuple, Dict[str, Tuple[str, bool]]]] = {}
+        # The batch the running flush is writing, until its transaction commits
+        self._flushing_writes: Dict[str, Tuple[tuple, Dict[str, Tuple[str, bool]]]] = {}
+        # url -> time of the last cache hit, saved as accessed_at by the next flush
+        self._pending_touches: Dict[str, float] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.max_entries = max_entries
+        self.max_cache_bytes = max_cache_bytes
+        self._gc_task: Optional[asyncio.Task] = None
         self.version_manager = VersionManager()
         self.logger = AsyncLogger(
             log_file=os.path.join(base_directory, ".crawl4ai", "crawler_db.log"),
@@ -38,6 +187,36 @@ class AsyncDatabaseManager:
             tag_width=10,
         )
 
+    _SETTINGS = (
+        "write_batch_size",
+        "write_flush_interval",
+        "max_pending_writes",
+        "max_entries",
+        "max_cache_bytes",
+    )
+
+    def configure(self, **settings):
+        """
+        Change write-behind and eviction settings.
+
+        Takes the keyword arguments of the constructor listed in `_SETTINGS`,
+        and is the way to change them on the shared `async_db_manager`. New
+        limits apply from the next flush.
+
+        Example:
+            async_db_manager.configure(max_entries=50_000, max_cache_bytes=2 * 1024**3)
+
+        Raises:
+            TypeError: If a setting is not one of `_SETTINGS`.
+        """
+        unknown = set(settings) - set(self._SETTINGS)
+        if unknown:
+            raise TypeError(f"Unknown cache settings: {sorted(unknown)}")
+        for name, value in settings.items():
+            setattr(self, name, value)
+        self.write_batch_size = max(1, self.write_batch_size)
+        self.max_pending_writes = max(self.write_batch_size, self.max_pending_writes)
+
     async def initialize(self):
         """Initialize the database and connection pool"""
         try:
@@ -78,6 +257,14 @@ class AsyncDatabaseManager:
                     "Database initialization completed successfully", tag="COMPLETE"
                 )
 
+            if await asyncio.to_thread(self._has_legacy_content):
+                migrated = await self.amigrate_content_files()
+                self.logger.success(
+                    message="Moved {count} content files into the content store",
+                    tag="COMPLETE",
+                    params={"count": migrated},
+                )
+
         except Exception as e:
             self.logger.error(
                 message="Database initialization error: {error}",
@@ -92,10 +279,20 @@ class AsyncDatabaseManager:
 
     async def cleanup(self):
         """Cleanup connections when shutting down"""
-        async with self.pool_lock:
-            for conn in self.connection_pool.values():
-                await conn.close()
-            self.connection_pool.clear()
+        try:
+            await self.aflush_writes()
+            if self._gc_task is not None and not self._gc_task.done():
+                if self._gc_task.get_loop() is asyncio.get_running_loop():
+                    await self._gc_task
+        finally:
+            async with self.pool_lock:
+                for conn in self.connection_pool.values():
+                    await conn.close()
+                self.connection_pool.clear()
+
+    def _has_queued_write(self, url: str) -> bool:
+        """True if a result for `url` is queued or being written by a flush"""
+        return url in self._pending_writes or url in self._flushing_writes
 
     @asynccontextmanager
     async def get_connection(self):
@@ -132,6 +329,7 @@ class AsyncDatabaseManager:
                         conn = await aiosqlite.connect(self.db_path, timeout=30.0)
                         await conn.execute("PRAGMA journal_mode = WAL")
                         await conn.execute("PRAGMA busy_timeout = 5000")
+                        await conn.execute(f"PRAGMA mmap_size = {int(self.mmap_size)}")
 
                         # Verify database structure
                         async with conn.execute(
@@ -152,6 +350,10 @@ class AsyncDatabaseManager:
                                 "screenshot",
                                 "response_headers",
                                 "downloaded_files",
+                                "fetched_at",
+                                "expires_at",
+                                "accessed_at",
+                                "content_size",
                             }
                             missing_columns = expected_columns - set(column_names)
                             if missing_columns:
@@ -241,11 +443,28 @@ class AsyncDatabaseManager:
                     metadata TEXT DEFAULT "{}",
                     screenshot TEXT DEFAULT "",
                     response_headers TEXT DEFAULT "{}",
-                    downloaded_files TEXT DEFAULT "{}"  -- New column added
+                    downloaded_files TEXT DEFAULT "{}",  -- New column added
+                    fetched_at REAL,
+                    expires_at REAL,
+                    accessed_at REAL,
+                    content_size INTEGER DEFAULT 0
+                )
+            """
+            )
+            await db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS content_blobs (
+                    hash TEXT PRIMARY KEY,
+                    codec TEXT NOT NULL,
+                    is_binary INTEGER NOT NULL DEFAULT 0,
+                    size INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    refcount INTEGER NOT NULL DEFAULT 0
                 )
             """
             )
             await db.commit()
+        await self.update_db_schema()
 
     async def update_db_schema(self):
         """Update database schema if needed"""
@@ -262,19 +481,127 @@ class AsyncDatabaseManager:
                 "screenshot",
                 "response_headers",
                 "downloaded_files",
+                "fetched_at",
+                "expires_at",
+                "accessed_at",
+                "content_size",
             ]
 
             for column in new_columns:
                 if column not in column_names:
                     await self.aalter_db_add_column(column, db)
+
+            cursor = await db.execute("PRAGMA table_info(content_blobs)")
+            blob_columns = [column[1] for column in await cursor.fetchall()]
+            recount = "refcount" not in blob_columns
+            if recount:
+                await db.execute(
+                    "ALTER TABLE content_blobs ADD COLUMN refcount INTEGER NOT NULL DEFAULT 0"
+                )
+
+            cursor = await db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cache_stats'"
+            )
+            restat = await cursor.fetchone() is None
+
+            await db.executescript(
+                """
+                CREATE INDEX IF NOT EXISTS idx_crawled_data_accessed_at ON crawled_data (accessed_at);
+                CREATE INDEX IF NOT EXISTS idx_crawled_data_expires_at
+                    ON crawled_data (expires_at) WHERE expires_at IS NOT NULL;
+                CREATE INDEX IF NOT EXISTS idx_content_blobs_orphans
+                    ON content_blobs (refcount) WHERE refcount <= 0;
+
+                CREATE TRIGGER IF NOT EXISTS crawled_data_refs_insert AFTER INSERT ON crawled_data
+                BEGIN
+                    UPDATE content_blobs SET refcount = refcount + 1 WHERE hash IN (
+                        NEW.html, NEW.cleaned_html, NEW.markdown, NEW.extracted_content, NEW.screenshot
+                    );
+                END;
+                CREATE TRIGGER IF NOT EXISTS crawled_data_refs_delete AFTER DELETE ON crawled_data
+                BEGIN
+                    UPDATE content_blobs SET refcount = refcount - 1 WHERE hash IN (
+                        OLD.html, OLD.cleaned_html, OLD.markdown, OLD.extracted_content, OLD.screenshot
+                    );
+                END;
+                CREATE TRIGGER IF NOT EXISTS crawled_data_refs_update
+                AFTER UPDATE OF html, cleaned_html, markdown, extracted_content, screenshot ON crawled_data
+                BEGIN
+                    UPDATE content_blobs SET refcount = refcount - 1 WHERE hash IN (
+                        OLD.html, OLD.cleaned_html, OLD.markdown, OLD.extracted_content, OLD.screenshot
+                    );
+                    UPDATE content_blobs SET refcount = refcount + 1 WHERE hash IN (
+                        NEW.html, NEW.cleaned_html, NEW.markdown, NEW.extracted_content, NEW.screenshot
+                    );
+                END;
+
+                CREATE TABLE IF NOT EXISTS cache_stats (
+                    id INTEGER PRIMARY KEY CHECK (id = 0),
+                    entries INTEGER NOT NULL DEFAULT 0,
+                    content_bytes INTEGER NOT NULL DEFAULT 0
+                );
+                CREATE TRIGGER IF NOT EXISTS crawled_data_stats_insert AFTER INSERT ON crawled_data
+                BEGIN
+                    UPDATE cache_stats SET entries = entries + 1,
+                        content_bytes = content_bytes + COALESCE(NEW.content_size, 0);
+                END;
+                CREATE TRIGGER IF NOT EXISTS crawled_data_stats_delete AFTER DELETE ON crawled_data
+                BEGIN
+                    UPDATE cache_stats SET entries = entries - 1,
+                        content_bytes = content_bytes - COALESCE(OLD.content_size, 0);
+                END;
+                CREATE TRIGGER IF NOT EXISTS crawled_data_stats_update
+                AFTER UPDATE OF content_size ON crawled_data
+                BEGIN
+                    UPDATE cache_stats SET content_bytes = content_bytes
+                        + COALESCE(NEW.content_size, 0) - COALESCE(OLD.content_size, 0);
+                END;
+            """
+            )
+            if recount:
+                await self._recount_references(db)
+            if restat:
+                # Count the existing entries once; the triggers keep the totals from here on
+                await db.execute(
+                    "INSERT OR REPLACE INTO cache_stats (id, entries, content_bytes) "
+                    "SELECT 0, COUNT(*), COALESCE(SUM(content_size), 0) FROM crawled_data"
+                )
             await db.commit()
 
+    @staticmethod
+    async def _recount_references(db):
+        """Recompute every blob's reference count from crawled_data in one pass"""
+        await db.executescript(
+            """
+            DROP TABLE IF EXISTS temp.content_refs;
+            CREATE TEMP TABLE content_refs AS
+                SELECT hash, COUNT(*) AS refs FROM (
+                    SELECT url, html AS hash FROM crawled_data
+                    UNION SELECT url, cleaned_html FROM crawled_data
+                    UNION SELECT url, markdown FROM crawled_data
+                    UNION SELECT url, extracted_content FROM crawled_data
+                    UNION SELECT url, screenshot FROM crawled_data
+                ) GROUP BY hash;
+            CREATE INDEX temp.idx_content_refs ON content_refs (hash);
+            UPDATE content_blobs SET refcount = COALESCE(
+                (SELECT refs FROM temp.content_refs WHERE content_refs.hash = content_blobs.hash), 0
+            );
+            DROP TABLE temp.content_refs;
+        """
+        )
+
     async def aalter_db_add_column(self, new_column: str, db):
         """Add new column to the database"""
         if new_column == "response_headers":
             await db.execute(
                 f'ALTER TABLE crawled_data ADD COLUMN {new_column} TEXT DEFAULT "{{}}"'
             )
+        elif new_column in ("fetched_at", "expires_at", "accessed_at"):
+            await db.execute(f"ALTER TABLE crawled_data ADD COLUMN {new_column} REAL")
+        elif new_column == "content_size":
+            await db.execute(
+                f"ALTER TABLE crawled_data ADD COLUMN {new_column} INTEGER DEFAULT 0"
+            )
         else:
             await db.execute(
                 f'ALTER TABLE crawled_data ADD COLUMN {new_column} TEXT DEFAULT ""'
@@ -285,73 +612,76 @@ class AsyncDatabaseManager:
             params={"column": new_column},
         )
 
-    async def aget_cached_url(self, url: str) -> Optional[CrawlResult]:
-        """Retrieve cached URL data as CrawlResult"""
+    async def aget_cached_url(
+        self,
+        url: str,
+        max_age: Optional[float] = None,
+        fields: Optional[Iterable[str]] = None,
+        include_expired: bool = False,
+    ) -> Optional[CrawlResult]:
+        """
+        Retrieve cached URL data as CrawlResult.
+
+        Args:
+            url (str): The URL to look up.
+            max_age (float, optional): Ignore entries fetched more than this many seconds ago.
+            fields (Iterable[str], optional): CrawlResult fields to load, e.g. ["markdown"].
+                Only their content is read and decoded; the other cached fields are left
+                empty. `url` and `success` are always set. None loads every field.
+            include_expired (bool): Also return entries past their TTL that have not been
+                evicted yet, e.g. to revalidate them with the server.
+
+        Returns:
+            Optional[CrawlResult]: The cached result, or None if there is no fresh entry.
+        """
+        if fields is None:
+            fields = CACHED_FIELDS
+        else:
+            fields = set(fields)
+            unknown = fields - set(CACHED_FIELDS) - {"url", "success"}
+            if unknown:
+                raise ValueError(f"Fields are not cached: {sorted(unknown)}")
+        columns = ["url", "success"] + [field for field in CACHED_FIELDS if field in fields]
 
         async def _get(db):
-            async with db.execute(
-                "SELECT * FROM crawled_data WHERE url = ?", (url,)
-            ) as cursor:
+            now = time.time()
+            query = f"SELECT {', '.join(columns)} FROM crawled_data WHERE url = ?"
+            params = [url]
+            if not include_expired:
+                query += " AND (expires_at IS NULL OR expires_at > ?)"
+                params.append(now)
+            if max_age is not None:
+                query += " AND fetched_at >= ?"
+                params.append(now - max_age)
+            async with db.execute(query, params) as cursor:
                 row = await cursor.fetchone()
-                if not row:
-                    return None
-
-                # Get column names
-                columns = [description[0] for description in cursor.description]
-                # Create dict from row data
-                row_dict = dict(zip(columns, row))
-
-                # Load content from files using stored hashes
-                content_fields = {
-                    "html": row_dict["html"],
-                    "cleaned_html": row_dict["cleaned_html"],
-                    "markdown": row_dict["markdown"],
-                    "extracted_content": row_dict["extracted_content"],
-                    "screenshot": row_dict["screenshot"],
-                    "screenshots": row_dict["screenshot"],
-                }
-
-                for field, hash_value in content_fields.items():
-                    if hash_value:
-                        content = await self._load_content(
-                            hash_value,
-                            field.split("_")[0],  # Get content type from field name
-                        )
-                        row_dict[field] = content or ""
-                    else:
-                        row_dict[field] = ""
-
-                # Parse JSON fields
-                json_fields = [
-                    "media",
-                    "links",
-                    "metadata",
-                    "response_headers",
-                    "markdown",
-                ]
-                for field in json_fields:
+            if not row:
+                return None
+            row_dict = dict(zip(columns, row))
+
+            # Load requested content by hash, each distinct hash once
+            hashes = {
+                field: row_dict[field]
+                for field in CONTENT_TYPES
+                if field in row_dict and row_dict[field]
+            }
+            contents = await self._load_contents(db, hashes)
+            for field in CONTENT_TYPES:
+                if field in row_dict:
+                    row_dict[field] = contents.get(row_dict[field]) or ""
+
+            # Parse JSON fields
+            for field in ("media", "links", "metadata", "response_headers"):
+                if field in row_dict:
                     try:
                         row_dict[field] = (
                             json.loads(row_dict[field]) if row_dict[field] else {}
                         )
                     except json.JSONDecodeError:
-                        # Very UGLY, never mention it to me please
-                        if field == "markdown" and isinstance(row_dict[field], str):
-                            row_dict[field] = MarkdownGenerationResult(
-                                raw_markdown=row_dict[field] or "",
-                                markdown_with_citations="",
-                                references_markdown="",
-                                fit_markdown="",
-                                fit_html="",
-                            )
-                        else:
-                            row_dict[field] = {}
-
-                if isinstance(row_dict["markdown"], Dict):
-                    if row_dict["markdown"].get("raw_markdown"):
-                        row_dict["markdown"] = row_dict["markdown"]["raw_markdown"]
+                        row_dict[field] = {}
 
-                # Parse downloaded_files
+            # Parse downloaded_files
+            if "downloaded_files" in row_dict:
                 try:
                     row_dict["downloaded_files"] = (
                         json.loads(row_dict["downloaded_files"])
@@ -360,15 +690,23 @@ class AsyncDatabaseManager:
                     )
                 except json.JSONDecodeError:
                     row_dict["downloaded_files"] = []
+                if not isinstance(row_dict["downloaded_files"], list):
+                    row_dict["downloaded_files"] = []
+
+            if "markdown" in row_dict:
+                row_dict["markdown"] = self._parse_markdown(row_dict["markdown"])
 
-                # Remove any fields not in CrawlResult model
-                valid_fields = CrawlResult.__annotations__.keys()
-                filtered_dict = {k: v for k, v in row_dict.items() if k in valid_fields}
-                filtered_dict["markdown"] = row_dict["markdown"]
-                return CrawlResult(**filtered_dict)
+            row_dict.setdefault("html", "")
+            return CrawlResult(**row_dict)
 
         try:
-            return await self.execute_with_retry(_get)
+            if self._has_queued_write(url):
+                # Waits for a running flush to commit, then writes the rest
+                await self.aflush_writes()
+            result = await self.execute_with_retry(_get)
+            if result is not None:
+                self._touch(url)
+            return result
         except Exception as e:
             self.logger.error(
                 message="Error retrieving cached URL: {error}",
@@ -378,9 +716,96 @@ class AsyncDatabaseManager:
             )
             return None
 
-    async def acache_url(self, result: CrawlResult):
-        """Cache CrawlResult data"""
-        # Store content files and get hashes
+    @staticmethod
+    def _parse_markdown(content: str) -> Optional[MarkdownGenerationResult]:
+        """Markdown is cached as MarkdownGenerationResult JSON, or as plain text by older versions"""
+        if not content:
+            return None
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            data = None
+        if isinstance(data, dict) and "raw_markdown" in data:
+            data.setdefault("markdown_with_citations", "")
+            data.setdefault("references_markdown", "")
+            return MarkdownGenerationResult(**data)
+        return MarkdownGenerationResult(
+            raw_markdown=content,
+            markdown_with_citations="",
+            references_markdown="",
+            fit_markdown="",
+            fit_html="",
+        )
+
+    async def arefresh_cached_url(
+        self,
+        url: str,
+        response_headers: Optional[Dict[str, str]] = None,
+        ttl: Optional[float] = None,
+    ) -> bool:
+        """
+        Mark a cached entry as fetched now, after the server confirmed it is unchanged.
+
+        Headers sent with the 304 response replace the cached ones of the same
+        name, as they may carry a new ETag or expiry. The content is left as is.
+
+        Args:
+            url (str): The URL of the entry.
+            response_headers (dict, optional): Headers of the 304 response.
+            ttl (float, optional): Seconds until the entry expires. None means it never does.
+
+        Returns:
+            bool: True if the entry was found and updated.
+        """
+        async def _refresh(db):
+            async with db.execute(
+                "SELECT response_headers FROM crawled_data WHERE url = ?", (url,)
+            ) as cursor:
+                row = await cursor.fetchone()
+            if not row:
+                return False
+            try:
+                headers = json.loads(row[0]) if row[0] else {}
+            except json.JSONDecodeError:
+                headers = {}
+            if response_headers:
+                updated = {name.lower() for name in response_headers}
+                headers = {k: v for k, v in headers.items() if k.lower() not in updated}
+                headers.update(response_headers)
+            now = time.time()
+            await db.execute(
+                "UPDATE crawled_data SET response_headers = ?, fetched_at = ?, "
+                "expires_at = ?, accessed_at = ? WHERE url = ?",
+                (json.dumps(headers), now, now + ttl if ttl is not None else None, now, url),
+            )
+            return True
+
+        try:
+            if self._has_queued_write(url):
+                await self.aflush_writes()
+            return await self.execute_with_retry(_refresh)
+        except Exception as e:
+            self.logger.error(
+                message="Error refreshing cached URL: {error}",
+                tag="ERROR",
+                force_verbose=True,
+                params={"error": str(e)},
+            )
+            return False
+
+    async def acache_url(self, result: CrawlResult, ttl: Optional[float] = None):
+        """
+        Queue a CrawlResult for caching.
+
+        The result is serialized right away, so later changes to it are not
+        cached, and written by the next flush. Waits for the flush when
+        `max_pending_writes` results are already queued.
+
+        Args:
+            result (CrawlResult): The result to cache.
+            ttl (float, optional): Seconds until the entry expires. None means it never does.
+        """
+        # Content to store in files, keyed by content type
         content_map = {
             "html": (result.html, "html"),
             "cleaned_html": (result.cleaned_html or "", "cleaned"),
@@ -391,8 +816,9 @@ class AsyncDatabaseManager:
 
         try:
             if isinstance(result.markdown, StringCompatibleMarkdown):
+                # Keep every markdown variant, not just the raw markdown string
                 content_map["markdown"] = (
-                    result.markdown,
+                    result.markdown._markdown_result.model_dump_json(),
                     "markdown",
                 )
             elif isinstance(result.markdown, MarkdownGenerationResult):
@@ -421,19 +847,124 @@ class AsyncDatabaseManager:
                 "markdown",
             )
 
+        fetched_at = time.time()
         content_hashes = {}
+        contents = {}
         for field, (content, content_type) in content_map.items():
-            content_hashes[field] = await self._store_content(content, content_type)
+            content_hash = generate_content_hash(content) if content else ""
+            content_hashes[field] = content_hash
+            if content_hash:
+                contents[content_hash] = (content, content_type == "screenshots")
 
-        async def _cache(db):
-            await db.execute(
+        row = (
+            result.url,
+            content_hashes["html"],
+            content_hashes["cleaned_html"],
+            content_hashes["markdown"],
+            content_hashes["extracted_content"],
+            result.success,
+            json.dumps(result.media),
+            json.dumps(result.links),
+            json.dumps(result.metadata or {}),
+            content_hashes["screenshot"],
+            json.dumps(result.response_headers or {}),
+            json.dumps(result.downloaded_files or []),
+            fetched_at,
+            fetched_at + ttl if ttl is not None else None,
+            fetched_at,  # accessed_at
+        )
+
+        # A newer result for the same URL replaces the queued one
+        self._pending_writes.pop(result.url, None)
+        self._pending_writes[result.url] = (row, contents)
+
+        if len(self._pending_writes) >= self.max_pending_writes:
+            try:
+                await self.aflush_writes()
+            except Exception:
+                # Logged by aflush_writes; the batch stays queued for the next flush
+                pass
+        elif len(self._pending_writes) >= self.write_batch_size:
+            self._schedule_flush()
+        else:
+            self._schedule_flush_timer()
+
+    def _touch(self, url: str):
+        """Queue the read time of a cache hit for the next flush, for LRU eviction"""
+        self._pending_touches[url] = time.time()
+        if len(self._pending_touches) >= self.write_batch_size:
+            self._schedule_flush()
+        else:
+            self._schedule_flush_timer()
+
+    def _schedule_flush_timer(self):
+        """Flush `write_flush_interval` seconds from now, unless a flush is already timed"""
+        loop = asyncio.get_running_loop()
+        if self._flush_timer is None or self._flush_loop is not loop:
+            # No timer yet, or it belongs to an event loop that is gone
+            self._flush_loop = loop
+            self._flush_timer = loop.call_later(self.write_flush_interval, self._schedule_flush)
+
+    def _schedule_flush(self):
+        """Start a background flush unless one is already running"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        loop = asyncio.get_running_loop()
+        if (
+            self._flush_task is None
+            or self._flush_task.done()
+            or self._flush_task.get_loop() is not loop
+        ):
+            self._flush_task = loop.create_task(self.aflush_writes())
+            self._flush_task.add_done_callback(self._flush_done)
+
+    @staticmethod
+    def _flush_done(task: asyncio.Task):
+        """Retrieve the error of a background flush, which aflush_writes already logged"""
+        if not task.cancelled():
+            task.exception()
+
+    async def aflush_writes(self):
+        """
+        Write all queued results and their content in one transaction.
+
+        Raises:
+            Exception: If a batch could not be written. Its results are queued
+                again, unless a newer result for the same URL was queued meanwhile.
+        """
+        async with self._flush_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+
+            evicted = 0
+            try:
+                while self._pending_writes or self._pending_touches:
+                    evicted += await self._write_batch()
+            finally:
+                if evicted:
+                    self._schedule_gc()
+
+    async def _write_batch(self) -> int:
+        """Write the queued results and read times as one batch. Called by aflush_writes under `_flush_lock`."""
+        async def _cache(db, blobs, rows):
+            await db.executemany(
+                """
+                INSERT OR IGNORE INTO content_blobs (hash, codec, is_binary, size, data)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                blobs,
+            )
+            await db.executemany(
                 """
                 INSERT INTO crawled_data (
                     url, html, cleaned_html, markdown,
                     extracted_content, success, media, links, metadata,
-                    screenshot, response_headers, downloaded_files
+                    screenshot, response_headers, downloaded_files,
+                    fetched_at, expires_at, accessed_at, content_size
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(url) DO UPDATE SET
                     html = excluded.html,
                     cleaned_html = excluded.cleaned_html,
@@ -445,43 +976,316 @@ class AsyncDatabaseManager:
                     metadata = excluded.metadata,
                     screenshot = excluded.screenshot,
                     response_headers = excluded.response_headers,
-                    downloaded_files = excluded.downloaded_files
+                    downloaded_files = excluded.downloaded_files,
+                    fetched_at = excluded.fetched_at,
+                    expires_at = excluded.expires_at,
+                    accessed_at = excluded.accessed_at,
+                    content_size = excluded.content_size
+            """,
+                rows,
+            )
+            await db.executemany(
+                "UPDATE crawled_data SET accessed_at = ? WHERE url = ?",
+                [(accessed_at, url) for url, accessed_at in touches.items()],
+            )
+            # Expired entries stay until the limits evict them, for revalidation
+            return await self._evict(db, self.max_entries, self.max_cache_bytes, purge_expired=False)
+
+        # Readers of a URL in the batch wait on the flush lock until it commits
+        self._flushing_writes, self._pending_writes = self._pending_writes, {}
+        touches, self._pending_touches = self._pending_touches, {}
+        batch = list(self._flushing_writes.values())
+        try:
+            contents = {}
+            for _, row_contents in batch:
+                contents.update(row_contents)
+            blobs = await asyncio.to_thread(self._pack_blobs, contents)
+            blob_sizes = {blob[0]: len(blob[4]) for blob in blobs}
+            rows = [
+                row + (sum(blob_sizes[h] for h in row_contents),)
+                for row, row_contents in batch
+            ]
+            return await self.execute_with_retry(_cache, blobs, rows)
+        except Exception as e:
+            self.logger.error(
+                message="Error caching {count} URLs: {error}",
+                tag="ERROR",
+                force_verbose=True,
+                params={"count": len(batch), "error": str(e)},
+            )
+            # Requeue the batch; a result or read queued meanwhile is newer and wins
+            for url, entry in self._flushing_writes.items():
+                self._pending_writes.setdefault(url, entry)
+            for url, accessed_at in touches.items():
+                self._pending_touches.setdefault(url, accessed_at)
+            raise
+        finally:
+            self._flushing_writes = {}
+
+    async def aevict(
+        self,
+        max_entries: Optional[int] = None,
+        max_cache_bytes: Optional[int] = None,
+    ) -> int:
+        """
+        Delete expired entries, then least recently used ones until the cache fits its limits.
+
+        Content of deleted entries stays in the store until `agc` runs.
+
+        Args:
+            max_entries (int, optional): Entry limit. Defaults to `self.max_entries`.
+            max_cache_bytes (int, optional): Content size limit. Defaults to `self.max_cache_bytes`.
+
+        Returns:
+            int: Number of entries deleted.
+        """
+        max_entries = self.max_entries if max_entries is None else max_entries
+        max_cache_bytes = self.max_cache_bytes if max_cache_bytes is None else max_cache_bytes
+
+        try:
+            return await self.execute_with_retry(self._evict, max_entries, max_cache_bytes)
+        except Exception as e:
+            self.logger.error(
+                message="Error evicting cache entries: {error}",
+                tag="ERROR",
+                force_verbose=True,
+                params={"error": str(e)},
+            )
+            return 0
+
+    @staticmethod
+    async def _evict(
+        db,
+        max_entries: Optional[int],
+        max_cache_bytes: Optional[int],
+        purge_expired: bool = True,
+    ) -> int:
+        """Eviction for `aevict` and every flush, run inside the caller's transaction"""
+        evicted = 0
+        if purge_expired:
+            cursor = await db.execute(
+                "DELETE FROM crawled_data WHERE expires_at <= ?", (time.time(),)
+            )
+            evicted = cursor.rowcount
+        if max_entries is None and max_cache_bytes is None:
+            return evicted
+
+        # Totals kept by the cache_stats triggers, current as of the deletes above
+        async with db.execute("SELECT entries, content_bytes FROM cache_stats") as cursor:
+            entries, content_bytes = await cursor.fetchone() or (0, 0)
+
+        if max_entries is not None:
+            excess = entries - max_entries
+            if excess > 0:
+                cursor = await db.execute(
+                    """
+                    DELETE FROM crawled_data WHERE url IN (
+                        SELECT url FROM crawled_data ORDER BY accessed_at LIMIT ?
+                    )
+                """,
+                    (excess,),
+                )
+                evicted += cursor.rowcount
+
+        if max_cache_bytes is not None:
+            if max_entries is not None and excess > 0:
+                async with db.execute("SELECT content_bytes FROM cache_stats") as cursor:
+                    (content_bytes,) = await cursor.fetchone()
+            excess = content_bytes - max_cache_bytes
+            if excess > 0:
+                urls = []
+                async with db.execute(
+                    "SELECT url, content_size FROM crawled_data ORDER BY accessed_at"
+                ) as cursor:
+                    async for url, size in cursor:
+                        urls.append((url,))
+                        excess -= size or 0
+                        if excess <= 0:
+                            break
+                await db.executemany("DELETE FROM crawled_data WHERE url = ?", urls)
+                evicted += len(urls)
+
+        return evicted
+
+    def _schedule_gc(self):
+        """Start a background garbage collection unless one is already running"""
+        loop = asyncio.get_running_loop()
+        if self._gc_task is None or self._gc_task.done() or self._gc_task.get_loop() is not loop:
+            self._gc_task = loop.create_task(self.agc())
+
+    async def agc(self, batch_size: int = 500) -> int:
+        """
+        Delete content blobs no cached entry refers to.
+
+        Blobs are deleted `batch_size` at a time, each batch in its own short
+        transaction, so crawls can read and write the cache in between.
+
+        Returns:
+            int: Number of blobs deleted.
+        """
+
+        async def _collect(db):
+            cursor = await db.execute(
+                """
+                DELETE FROM content_blobs WHERE rowid IN (
+                    SELECT rowid FROM content_blobs WHERE refcount <= 0 LIMIT ?
+                )
             """,
-                (
-                    result.url,
-                    content_hashes["html"],
-                    content_hashes["cleaned_html"],
-                    content_hashes["markdown"],
-                    content_hashes["extracted_content"],
-                    result.success,
-                    json.dumps(result.media),
-                    json.dumps(result.links),
-                    json.dumps(result.metadata or {}),
-                    content_hashes["screenshot"],
-                    json.dumps(result.response_headers or {}),
-                    json.dumps(result.downloaded_files or []),
-                ),
+                (batch_size,),
             )
+            return cursor.rowcount
 
+        deleted = 0
         try:
-            await self.execute_with_retry(_cache)
+            while True:
+                count = await self.execute_with_retry(_collect)
+                deleted += count
+                if count < batch_size:
+                    return deleted
+                await asyncio.sleep(0)
         except Exception as e:
             self.logger.error(
-                message="Error caching URL: {error}",
+                message="Error collecting unused cache content: {error}",
                 tag="ERROR",
                 force_verbose=True,
                 params={"error": str(e)},
             )
+            return deleted
+
+    @staticmethod
+    def _pack_blobs(contents: Dict[str, Tuple[str, bool]]) -> List[tuple]:
+        """Compress content into content_blobs rows (runs in a worker thread)"""
+        blobs = []
+        for content_hash, (content, binary) in contents.items():
+            codec, is_binary, data = pack_content(content, binary)
+            blobs.append((content_hash, codec, is_binary, len(content), data))
+        return blobs
+
+    def _has_legacy_content(self) -> bool:
+        """Check whether any legacy content directory still holds files"""
+        for content_type in LEGACY_CONTENT_TYPES:
+            directory = self.content_paths.get(content_type)
+            if directory and os.path.isdir(directory):
+                with os.scandir(directory) as entries:
+                    if any(entry.is_file() for entry in entries):
+                        return True
+        return False
+
+    async def amigrate_content_files(self, batch_size: int = 500) -> int:
+        """
+        Move content files from the legacy per-type directories into the content store.
+
+        Files are read and compressed in a worker thread, inserted `batch_size`
+        at a time together with their reference counts and deleted once their
+        batch is committed, so an interrupted migration resumes where it stopped
+        and never leaves a moved blob for `agc` to collect. Files that cannot be
+        read are left in place.
+
+        Returns:
+            int: Number of files moved.
+        """
+
+        migrated = 0
+        # Own connection: this also runs from initialize(), before the pool is ready
+        async with aiosqlite.connect(self.db_path, timeout=30.0) as db:
+            await db.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS migrated_refs (hash TEXT PRIMARY KEY, refs INTEGER NOT NULL)"
+            )
+            for content_type in LEGACY_CONTENT_TYPES:
+                directory = self.content_paths.get(content_type)
+                if not directory or not os.path.isdir(directory):
+                    continue
+                entries = os.scandir(directory)
+                try:
+                    while True:
+                        blobs, paths = await asyncio.to_thread(
+                            self._read_legacy_batch,
+                            entries,
+                            content_type == "screenshots",
+                            batch_size,
+                        )
+                        if not paths:
+                            break
+                        await db.executemany(
+                            """
+                            INSERT OR IGNORE INTO content_blobs (hash, codec, is_binary, size, data)
+                            VALUES (?, ?, ?, ?, ?)
+                        """,
+                            blobs,
+                        )
+                        # The moved blobs are referenced by rows written before they
+                        # existed, so count those rows before the files go away
+                        await db.execute("DELETE FROM temp.migrated_refs")
+                        await db.executemany(
+                            "INSERT OR IGNORE INTO temp.migrated_refs (hash, refs) VALUES (?, 0)",
+                            [(blob[0],) for blob in blobs],
+                        )
+                        # One scan of crawled_data per batch, not one per blob
+                        await db.execute(
+                            """
+                            INSERT OR REPLACE INTO temp.migrated_refs (hash, refs)
+                            SELECT m.hash, COUNT(*) FROM crawled_data c
+                            JOIN temp.migrated_refs m ON m.hash IN (
+                                c.html, c.cleaned_html, c.markdown, c.extracted_content, c.screenshot
+                            )
+                            GROUP BY m.hash
+                        """
+                        )
+                        await db.execute(
+                            """
+                            UPDATE content_blobs SET refcount = (
+                                SELECT refs FROM temp.migrated_refs m WHERE m.hash = content_blobs.hash
+                            ) WHERE hash IN (SELECT hash FROM temp.migrated_refs)
+                        """
+                        )
+                        await db.commit()
+                        await asyncio.to_thread(self._remove_files, paths)
+                        migrated += len(blobs)
+                finally:
+                    entries.close()
+        return migrated
+
+    def _read_legacy_batch(self, entries, binary: bool, batch_size: int):
+        """Read and compress the next batch of legacy content files (runs in a worker thread)"""
+        blobs, paths = [], []
+        for entry in entries:
+            if not entry.is_file():
+                continue
+            try:
+                with open(entry.path, "r", encoding="utf-8") as f:
+                    content = f.read()
+            except (OSError, UnicodeDecodeError) as e:
+                self.logger.warning(
+                    message="Skipping unreadable content file {path}: {error}",
+                    tag="INIT",
+                    params={"path": entry.path, "error": str(e)},
+                )
+                continue
+            # Files are named by the hash their rows refer to
+            codec, is_binary, data = pack_content(content, binary)
+            blobs.append((entry.name, codec, is_binary, len(content), data))
+            paths.append(entry.path)
+            if len(paths) >= batch_size:
+                break
+        return blobs, paths
+
+    @staticmethod
+    def _remove_files(paths: List[str]):
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
 
     async def aget_total_count(self) -> int:
         """Get total number of cached URLs"""
-
         async def _count(db):
             async with db.execute("SELECT COUNT(*) FROM crawled_data") as cursor:
                 result = await cursor.fetchone()
                 return result[0] if result else 0
 
         try:
+            await self.aflush_writes()
             return await self.execute_with_retry(_count)
         except Exception as e:
             self.logger.error(
@@ -494,9 +1298,12 @@ class AsyncDatabaseManager:
 
     async def aclear_db(self):
         """Clear all data from the database"""
+        self._pending_writes.clear()
+        self._pending_touches.clear()
 
         async def _clear(db):
             await db.execute("DELETE FROM crawled_data")
+            await db.execute("DELETE FROM content_blobs")
 
         try:
             await self.execute_with_retry(_clear)
@@ -509,10 +1316,14 @@ class AsyncDatabaseManager:
             )
 
     async def aflush_db(self):
-        """Drop the entire table"""
+        """Drop the cache tables"""
+        self._pending_writes.clear()
+        self._pending_touches.clear()
 
         async def _flush(db):
             await db.execute("DROP TABLE IF EXISTS crawled_data")
+            await db.execute("DROP TABLE IF EXISTS content_blobs")
+            await db.execute("DROP TABLE IF EXISTS cache_stats")
 
         try:
             await self.execute_with_retry(_flush)
@@ -524,40 +1335,57 @@ class AsyncDatabaseManager:
                 params={"error": str(e)},
             )
 
-    async def _store_content(self, content: str, content_type: str) -> str:
-        """Store content in filesystem and return hash"""
-        if not content:
-            return ""
+    async def _load_contents(self, db, hashes: Dict[str, str]) -> Dict[str, str]:
+        """
+        Load content by hash from the content store, or from legacy content files.
 
-        content_hash = generate_content_hash(content)
-        file_path = os.path.join(self.content_paths[content_type], content_hash)
+        Args:
+            hashes (Dict[str, str]): Content hash per CrawlResult field.
 
-        # Only write if file doesn't exist
-        if not os.path.exists(file_path):
-            async with aiofiles.open(file_path, "w", encoding="utf-8") as f:
-                await f.write(content)
+        Returns:
+            Dict[str, str]: Content per hash. Content that cannot be loaded is missing.
+        """
+        unique = set(hashes.values())
+        if not unique:
+            return {}
 
-        return content_hash
+        placeholders = ", ".join("?" * len(unique))
+        async with db.execute(
+            f"SELECT hash, codec, is_binary, data FROM content_blobs WHERE hash IN ({placeholders})",
+            tuple(unique),
+        ) as cursor:
+            blobs = await cursor.fetchall()
 
-    async def _load_content(
-        self, content_hash: str, content_type: str
-    ) -> Optional[str]:
-        """Load content from filesystem by hash"""
-        if not content_hash:
-            return None
+        contents = {}
+        stored = {blob[0] for blob in blobs}
+        for content_hash, codec, is_binary, data in blobs:
+            try:
+                contents[content_hash] = unpack_content(codec, is_binary, data)
+            except Exception as e:
+                self.logger.error(
+                    message="Failed to decode content {hash}: {error}",
+                    tag="ERROR",
+                    force_verbose=True,
+                    params={"hash": content_hash, "error": str(e)},
+                )
 
-        file_path = os.path.join(self.content_paths[content_type], content_hash)
-        try:
-            async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
-                return await f.read()
-        except:
-            self.logger.error(
-                message="Failed to load content: {file_path}",
-                tag="ERROR",
-                force_verbose=True,
-                params={"file_path": file_path},
+        for field, content_hash in hashes.items():
+            if content_hash in contents or content_hash in stored:
+                continue
+            file_path = os.path.join(
+                self.content_paths[CONTENT_TYPES[field]], content_hash
             )
-            return None
+            try:
+                async with aiofiles.open(file_path, "r", encoding="utf-8") as f:
+                    contents[content_hash] = await f.read()
+            except:
+                self.logger.error(
+                    message="Failed to load content: {file_path}",
+                    tag="ERROR",
+                    force_verbose=True,
+                    params={"file_path": file_path},
+                )
+        return contents
 
 
 # Create a singleton instance
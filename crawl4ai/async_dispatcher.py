@@ -1,4 +1,4 @@
-from typing import Dict, Optional, List, Tuple, Union
+from typing import AsyncIterable, AsyncIterator, Callable, Dict, Iterable, Optional, List, Tuple, Union
 from .async_configs import CrawlerRunConfig
 from .models import (
     CrawlResult,
@@ -8,14 +8,19 @@ from .models import (
 )
 
 from .components.crawler_monitor import CrawlerMonitor
+from .frontier import LeaseFrontier
 
 from .types import AsyncWebCrawler
 
+from collections import deque
 from collections.abc import AsyncGenerator
 
+import os
 import time
 import psutil
 import asyncio
+import heapq
+import socket
 import uuid
 
 from urllib.parse import urlparse
@@ -32,35 +37,83 @@ class RateLimiter:
         max_delay: float = 60.0,
         max_retries: int = 3,
         rate_limit_codes: List[int] = None,
+        max_concurrent_per_domain: Optional[int] = None,
+        respect_crawl_delay: bool = False,
     ):
         self.base_delay = base_delay
         self.max_delay = max_delay
         self.max_retries = max_retries
         self.rate_limit_codes = rate_limit_codes or [429, 503]
+        self.max_concurrent_per_domain = max_concurrent_per_domain
+        self.respect_crawl_delay = respect_crawl_delay
         self.domains: Dict[str, DomainState] = {}
+        # Set, and replaced by the next waiter, when a request is released
+        self._released: Optional[asyncio.Event] = None
 
     def get_domain(self, url: str) -> str:
         return urlparse(url).netloc
 
-    async def wait_if_needed(self, url: str) -> None:
-        domain = self.get_domain(url)
+    def _get_state(self, domain: str) -> DomainState:
         state = self.domains.get(domain)
-
         if not state:
-            self.domains[domain] = DomainState()
-            state = self.domains[domain]
+            state = self.domains[domain] = DomainState()
+        return state
 
-        now = time.time()
-        if state.last_request_time:
-            wait_time = max(0, state.current_delay - (now - state.last_request_time))
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
+    def ready_in(self, domain: str, now: Optional[float] = None) -> float:
+        """
+        Seconds until `domain` may take another request: 0 when it is ready now,
+        and infinity while it is at `max_concurrent_per_domain`.
+        """
+        state = self.domains.get(domain)
+        if not state:
+            return 0.0
+        if self.max_concurrent_per_domain and state.in_flight >= self.max_concurrent_per_domain:
+            return float("inf")
+        if not state.last_request_time:
+            return 0.0
+        delay = max(state.current_delay, state.crawl_delay)
+        return max(0.0, delay - ((now or time.time()) - state.last_request_time))
 
+    def acquire(self, url: str) -> None:
+        """Record the start of a request to the domain of `url` without waiting"""
+        state = self._get_state(self.get_domain(url))
         # Random delay within base range if no current delay
         if state.current_delay == 0:
             state.current_delay = random.uniform(*self.base_delay)
-
         state.last_request_time = time.time()
+        state.in_flight += 1
+
+    def release(self, url: str) -> None:
+        """Record the end of a request started with `acquire` or `wait_if_needed`"""
+        state = self._get_state(self.get_domain(url))
+        state.in_flight = max(0, state.in_flight - 1)
+        released, self._released = self._released, None
+        if released is not None:
+            released.set()
+
+    def set_crawl_delay(self, domain: str, crawl_delay: Optional[float]) -> None:
+        """Apply a robots.txt Crawl-delay (in seconds) to `domain`"""
+        self._get_state(domain).crawl_delay = min(crawl_delay or 0.0, self.max_delay)
+
+    async def wait_if_needed(self, url: str) -> None:
+        """
+        Wait until the domain of `url` is ready and record the request.
+
+        Every call must be paired with a `release` once the request is done.
+        """
+        domain = self.get_domain(url)
+        while True:
+            wait_time = self.ready_in(domain)
+            if wait_time == 0:
+                break
+            if wait_time == float("inf"):
+                # Wake up on the next release and check again
+                if self._released is None:
+                    self._released = asyncio.Event()
+                await self._released.wait()
+            else:
+                await asyncio.sleep(wait_time)
+        self.acquire(url)
 
     def update_delay(self, url: str, status_code: int) -> bool:
         domain = self.get_domain(url)
@@ -86,6 +139,269 @@ class RateLimiter:
 
 
 
+class ConcurrencyController:
+    """
+    Additive-increase / multiplicative-decrease (AIMD) controller for the number
+    of concurrent crawls.
+
+    After every round of `limit` completed crawls the limit grows by
+    `increase_step`, as long as the p95 latency of the last `window` crawls
+    stays under `latency_target` and their error rate under `max_error_rate`.
+    Timeouts and rate-limit responses from crawls started after the last
+    decrease, CPU usage above `cpu_threshold_percent` and memory pressure cut
+    the limit by `decrease_factor`. Pressure signals cut it at most once per
+    `decrease_interval` seconds.
+    """
+
+    def __init__(
+        self,
+        initial_permit: int = 4,
+        min_permit: int = 1,
+        max_permit: int = 64,
+        increase_step: int = 1,
+        decrease_factor: float = 0.5,
+        latency_target: float = 30.0,  # p95 crawl time in seconds
+        max_error_rate: float = 0.2,
+        window: int = 100,
+        cpu_threshold_percent: Optional[float] = 95.0,
+        decrease_interval: float = 5.0,
+        rate_limit_codes: List[int] = None,
+        history_size: int = 1000,
+    ):
+        self.min_permit = min_permit
+        self.max_permit = max_permit
+        self.increase_step = increase_step
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.max_error_rate = max_error_rate
+        self.cpu_threshold_percent = cpu_threshold_percent
+        self.decrease_interval = decrease_interval
+        self.rate_limit_codes = rate_limit_codes or [429, 503]
+        self.limit = max(min_permit, min(initial_permit, max_permit))
+        # (time, limit, reason) for every change of the limit
+        self.history: deque = deque([(time.time(), self.limit, "initial")], maxlen=history_size)
+        self._samples: deque = deque(maxlen=window)  # (latency, failed)
+        self._completed_since_change = 0
+        self._last_decrease = 0.0
+
+    def _set_limit(self, limit: int, reason: str) -> bool:
+        limit = max(self.min_permit, min(limit, self.max_permit))
+        self._completed_since_change = 0
+        if limit == self.limit:
+            return False
+        self.limit = limit
+        self.history.append((time.time(), limit, reason))
+        return True
+
+    def decrease(self, reason: str) -> bool:
+        """Cut the limit multiplicatively; returns True if it changed"""
+        self._last_decrease = time.time()
+        self._samples.clear()
+        return self._set_limit(int(self.limit * self.decrease_factor), reason)
+
+    def record(self, task_result: CrawlerTaskResult) -> bool:
+        """Feed a finished crawl to the controller; returns True if the limit changed"""
+        result = task_result.result
+        error = (task_result.error_message or "").lower()
+        congested = None
+        if result.status_code in self.rate_limit_codes:
+            congested = f"HTTP {result.status_code}"
+        elif "timeout" in error or "timed out" in error:
+            congested = "timeout"
+        if congested:
+            # Crawls started before the last cut saw the old limit: one cut per round
+            if task_result.start_time >= self._last_decrease:
+                return self.decrease(congested)
+            return False
+
+        self._samples.append((task_result.end_time - task_result.start_time, not result.success))
+        self._completed_since_change += 1
+        if self._completed_since_change < self.limit or self.limit >= self.max_permit:
+            return False
+        if not self._healthy():
+            self._completed_since_change = 0
+            return False
+        return self._set_limit(self.limit + self.increase_step, "increase")
+
+    def _healthy(self) -> bool:
+        latencies = sorted(latency for latency, _ in self._samples)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        error_rate = sum(failed for _, failed in self._samples) / len(self._samples)
+        return p95 <= self.latency_target and error_rate <= self.max_error_rate
+
+    def observe_pressure(self, memory_pressure: bool, cpu_percent: Optional[float] = None) -> bool:
+        """Cut the limit on memory pressure or CPU saturation; returns True if it changed"""
+        if time.time() - self._last_decrease < self.decrease_interval:
+            return False
+        if memory_pressure:
+            return self.decrease("memory pressure")
+        if (
+            self.cpu_threshold_percent is not None
+            and cpu_percent is not None
+            and cpu_percent >= self.cpu_threshold_percent
+        ):
+            return self.decrease("cpu saturation")
+        return False
+
+
+# URLs to crawl: a list or any (async) iterable of URLs or (url, config) pairs
+UrlSource = Union[
+    Iterable[Union[str, Tuple[str, CrawlerRunConfig]]],
+    AsyncIterable[Union[str, Tuple[str, CrawlerRunConfig]]],
+]
+
+
+async def _iter_url_items(
+    urls: UrlSource, config: Union[CrawlerRunConfig, List[CrawlerRunConfig]]
+) -> AsyncIterator[Tuple[str, Union[CrawlerRunConfig, List[CrawlerRunConfig]]]]:
+    """Yield (url, config) for each item of `urls`, pulling items only as they are needed"""
+
+    def _item(item):
+        if isinstance(item, str):
+            return item, config
+        url, url_config = item
+        return url, url_config if url_config is not None else config
+
+    if hasattr(urls, "__aiter__"):
+        async for item in urls:
+            yield _item(item)
+    else:
+        for item in urls:
+            yield _item(item)
+
+
+class _TaskQueue:
+    """
+    Dispatch queue with lazy fairness aging and optional per-domain readiness.
+
+    Tasks are kept in one FIFO per retry count. `pop` hands out the oldest
+    task once it has waited longer than `fairness_timeout`, and otherwise the
+    oldest task with the fewest retries. Requeued tasks get a fresh enqueue
+    time, so every FIFO stays ordered by enqueue time and both choices only
+    look at the FIFO heads: aging is computed when a task is taken instead
+    of re-sorting the whole queue as time passes.
+
+    With `ready_in`, a callable giving the seconds until a domain may take
+    another request, `pop` only hands out tasks whose domain is ready. Tasks
+    of a domain that is not ready are parked in a FIFO per domain, and the
+    domain is scheduled on a heap by the time it becomes ready, or blocked
+    until `notify_domain` when it is at its concurrency cap.
+    """
+
+    def __init__(
+        self,
+        fairness_timeout: float,
+        ready_in: Optional[Callable[[str], float]] = None,
+        domain_of: Callable[[str], str] = lambda url: urlparse(url).netloc,
+    ):
+        self.fairness_timeout = fairness_timeout
+        self.ready_in = ready_in
+        self.domain_of = domain_of
+        self._levels: Dict[int, deque] = {}
+        self._size = 0
+        self._enqueue_time_sum = 0.0
+        self._parked: Dict[str, deque] = {}  # domain -> (enqueue_time, item)
+        self._schedule: List[Tuple[float, str]] = []  # (ready time, domain) heap
+        self._blocked = set()  # Parked domains waiting for notify_domain
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(self, item: tuple, retry_count: int, enqueue_time: float) -> None:
+        level = self._levels.get(retry_count)
+        if level is None:
+            level = self._levels[retry_count] = deque()
+        level.append((enqueue_time, item))
+        self._size += 1
+        self._enqueue_time_sum += enqueue_time
+
+    def pop(self, now: float) -> Optional[Tuple[tuple, float]]:
+        """
+        Remove and return the next task and its enqueue time, or None when the
+        queue holds tasks but none of their domains is ready.
+        """
+        if not self._size:
+            raise IndexError("pop from an empty queue")
+        if self.ready_in is None:
+            return self._take(self._pop_level(now))
+
+        # Parked domains that became ready go first: their tasks were due earlier
+        while self._schedule and self._schedule[0][0] <= now:
+            _, domain = heapq.heappop(self._schedule)
+            if self._park_if_waiting(domain, now):
+                continue
+            parked = self._parked[domain]
+            entry = parked.popleft()
+            if parked:
+                heapq.heappush(self._schedule, (now, domain))
+            else:
+                del self._parked[domain]
+            return self._take(entry)
+
+        while self._levels:
+            entry = self._pop_level(now)
+            domain = self.domain_of(entry[1][0])
+            if domain in self._parked:
+                self._parked[domain].append(entry)
+            elif self.ready_in(domain) > 0:
+                self._parked[domain] = deque([entry])
+                self._park_if_waiting(domain, now)
+            else:
+                return self._take(entry)
+        return None
+
+    def _pop_level(self, now: float) -> Tuple[float, tuple]:
+        oldest_level = min(self._levels, key=lambda retries: self._levels[retries][0][0])
+        if now - self._levels[oldest_level][0][0] > self.fairness_timeout:
+            retry_count = oldest_level
+        else:
+            retry_count = min(self._levels)
+        level = self._levels[retry_count]
+        entry = level.popleft()
+        if not level:
+            del self._levels[retry_count]
+        return entry
+
+    def _take(self, entry: Tuple[float, tuple]) -> Tuple[tuple, float]:
+        enqueue_time, item = entry
+        self._size -= 1
+        self._enqueue_time_sum -= enqueue_time
+        return item, enqueue_time
+
+    def _park_if_waiting(self, domain: str, now: float) -> bool:
+        """Schedule or block a parked domain that is not ready; False if it is ready"""
+        wait_time = self.ready_in(domain)
+        if wait_time <= 0:
+            return False
+        if wait_time == float("inf"):
+            self._blocked.add(domain)
+        else:
+            heapq.heappush(self._schedule, (now + wait_time, domain))
+        return True
+
+    def notify_domain(self, domain: str) -> bool:
+        """Re-check a blocked domain, e.g. after a request finished; True if it was blocked"""
+        if domain not in self._blocked:
+            return False
+        self._blocked.discard(domain)
+        heapq.heappush(self._schedule, (0.0, domain))
+        return True
+
+    def next_ready_time(self) -> Optional[float]:
+        """When the earliest waiting domain becomes ready, if any is scheduled"""
+        return self._schedule[0][0] if self._schedule else None
+
+    def stats(self, now: float) -> Tuple[int, float, float]:
+        """Return the queue length, the longest wait and the average wait"""
+        if not self._size:
+            return 0, 0.0, 0.0
+        oldest = min(
+            [level[0][0] for level in self._levels.values()]
+            + [parked[0][0] for parked in self._parked.values()]
+        )
+        return self._size, now - oldest, now - self._enqueue_time_sum / self._size
+
+
 class BaseDispatcher(ABC):
     def __init__(
         self,
@@ -124,6 +440,19 @@ class BaseDispatcher(ABC):
         # No match found - return None to indicate URL should be skipped
         return None
 
+    @staticmethod
+    def _measure_crawl(result: CrawlResult, start_memory: float) -> Tuple[float, float, float]:
+        """
+        Return (memory_usage, peak_memory, cpu_time) of a crawl: the page's final and
+        peak JS heap in use and its renderer CPU time when the browser reported them, and otherwise the
+        RSS growth of this process, which also counts every concurrent crawl.
+        """
+        usage = result.resource_usage
+        if usage:
+            return usage.js_heap_used_mb, usage.js_heap_peak_mb, usage.cpu_time
+        memory_usage = psutil.Process().memory_info().rss / (1024 * 1024) - start_memory
+        return memory_usage, memory_usage, 0.0
+
     @abstractmethod
     async def crawl_url(
         self,
@@ -137,7 +466,7 @@ class BaseDispatcher(ABC):
     @abstractmethod
     async def run_urls(
         self,
-        urls: List[str],
+        urls: UrlSource,
         crawler: AsyncWebCrawler,  # noqa: F821
         config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
         monitor: Optional[CrawlerMonitor] = None,
@@ -157,8 +486,16 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
         memory_wait_timeout: Optional[float] = 600.0,
         rate_limiter: Optional[RateLimiter] = None,
         monitor: Optional[CrawlerMonitor] = None,
+        prefetch_limit: int = 1000,  # URLs taken from the input and not finished yet
+        concurrency_controller: Optional[ConcurrencyController] = None,  # Replaces max_session_permit
+        page_memory_limit_mb: Optional[float] = None,  # JS heap above which a domain is memory-hungry
     ):
         super().__init__(rate_limiter, monitor)
+        self.prefetch_limit = prefetch_limit
+        self.concurrency_controller = concurrency_controller
+        self.page_memory_limit_mb = page_memory_limit_mb
+        # Domain -> largest page JS heap (MB) seen above page_memory_limit_mb
+        self.memory_hungry_domains: Dict[str, float] = {}
         self.memory_threshold_percent = memory_threshold_percent
         self.critical_threshold_percent = critical_threshold_percent
         self.recovery_threshold_percent = recovery_threshold_percent
@@ -167,10 +504,24 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
         self.fairness_timeout = fairness_timeout
         self.memory_wait_timeout = memory_wait_timeout
         self.result_queue = asyncio.Queue()
-        self.task_queue = asyncio.PriorityQueue()  # Priority queue for better management
+        # Queued (url, task_id, retry_count, config) tasks; with a rate limiter or a
+        # page memory limit only tasks whose domain is ready are handed out
+        if rate_limiter:
+            self.task_queue = _TaskQueue(
+                fairness_timeout, ready_in=self._domain_ready_in, domain_of=rate_limiter.get_domain
+            )
+        elif page_memory_limit_mb is not None:
+            self.task_queue = _TaskQueue(fairness_timeout, ready_in=self._domain_ready_in)
+        else:
+            self.task_queue = _TaskQueue(fairness_timeout)
+        self._crawl_delay_lookups: Dict[str, asyncio.Task] = {}
         self.memory_pressure_mode = False  # Flag to indicate when we're in memory pressure mode
         self.current_memory_percent = 0.0  # Track current memory usage
         self._high_memory_start_time: Optional[float] = None
+        # When memory-hungry domains started waiting for memory to recover
+        self._memory_hold_start: Optional[float] = None
+        # Set when the memory pressure mode changes or tasks arrive in an empty queue
+        self._wakeup = asyncio.Event()
         
     async def _memory_monitor_task(self):
         """Background task to continuously monitor memory usage and update state"""
@@ -182,6 +533,7 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                 if not self.memory_pressure_mode:
                     self.memory_pressure_mode = True
                     self._high_memory_start_time = time.time()
+                    self._wakeup.set()
                     if self.monitor:
                         self.monitor.update_memory_status("PRESSURE")
                 else:
@@ -201,29 +553,58 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
             elif self.memory_pressure_mode and self.current_memory_percent <= self.recovery_threshold_percent:
                 self.memory_pressure_mode = False
                 self._high_memory_start_time = None
+                self._wakeup.set()
                 if self.monitor:
                     self.monitor.update_memory_status("NORMAL")
             elif self.current_memory_percent < self.memory_threshold_percent:
                 self._high_memory_start_time = None
+
+            # Memory-hungry domains wait for memory to drop below the recovery
+            # threshold, or for memory_wait_timeout
+            recovered = self.current_memory_percent < self.recovery_threshold_percent
+            if recovered or self._memory_hold_expired():
+                if recovered:
+                    self._memory_hold_start = None
+                released = [self.task_queue.notify_domain(domain) for domain in self.memory_hungry_domains]
+                if any(released):
+                    self._wakeup.set()
             
             # In critical mode, we might need to take more drastic action
             if self.current_memory_percent >= self.critical_threshold_percent:
                 if self.monitor:
                     self.monitor.update_memory_status("CRITICAL")
                 # We could implement additional memory-saving measures here
-                
+
+            if self.concurrency_controller and self.concurrency_controller.observe_pressure(
+                self.memory_pressure_mode, psutil.cpu_percent(interval=None)
+            ):
+                self._report_concurrency()
+                self._wakeup.set()
+
+            self._update_queue_statistics()
             await asyncio.sleep(self.check_interval)
-    
-    def _get_priority_score(self, wait_time: float, retry_count: int) -> float:
-        """Calculate priority score (lower is higher priority)
-        - URLs waiting longer than fairness_timeout get higher priority
-        - More retry attempts decreases priority
-        """
-        if wait_time > self.fairness_timeout:
-            # High priority for long-waiting URLs
-            return -wait_time
-        # Standard priority based on retries
-        return retry_count
+
+    @property
+    def session_permit(self) -> int:
+        """Current number of concurrent crawls allowed"""
+        if self.concurrency_controller:
+            return self.concurrency_controller.limit
+        return self.max_session_permit
+
+    def _report_concurrency(self):
+        if self.monitor:
+            _, limit, reason = self.concurrency_controller.history[-1]
+            self.monitor.update_concurrency(limit, reason)
+
+    def _update_queue_statistics(self):
+        """Report queue length and wait times to the monitor"""
+        if self.monitor:
+            total_queued, highest_wait_time, avg_wait_time = self.task_queue.stats(time.time())
+            self.monitor.update_queue_statistics(
+                total_queued=total_queued,
+                highest_wait_time=highest_wait_time,
+                avg_wait_time=avg_wait_time,
+            )
     
     async def crawl_url(
         self,
@@ -234,7 +615,7 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
     ) -> CrawlerTaskResult:
         start_time = time.time()
         error_message = ""
-        memory_usage = peak_memory = 0.0
+        memory_usage = peak_memory = cpu_time = 0.0
         
         # Select appropriate config for this URL
         selected_config = self.select_config(url, config)
@@ -282,15 +663,12 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
                 
             self.concurrent_sessions += 1
             
-            if self.rate_limiter:
-                await self.rate_limiter.wait_if_needed(url)
-                
             # Check if we're in critical memory state
             if self.current_memory_percent >= self.critical_threshold_percent:
-                # Requeue this task with increased priority and retry count
-                enqueue_time = time.time()
-                priority = self._get_priority_score(enqueue_time - start_time, retry_count + 1)
-                await self.task_queue.put((priority, (url, task_id, retry_count + 1, enqueue_time)))
+                # Requeue this task with an increased retry count
+                self.task_queue.push(
+                    (url, task_id, retry_count + 1, config), retry_count + 1, time.time()
+                )
                 
                 # Update monitoring
                 if self.monitor:
@@ -320,8 +698,9 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
             result = await self.crawler.arun(url, config=selected_config, session_id=task_id)
             
             # Measure memory usage
-            end_memory = process.memory_info().rss / (1024 * 1024)
-            memory_usage = peak_memory = end_memory - start_memory
+            memory_usage, peak_memory, cpu_time = self._measure_crawl(result, start_memory)
+            if result.resource_usage:
+                self._record_page_memory(url, peak_memory)
             
             # Handle rate limiting
             if self.rate_limiter and result.status_code:
@@ -365,6 +744,7 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
             result=result,
             memory_usage=memory_usage,
             peak_memory=peak_memory,
+            cpu_time=cpu_time,
             start_time=start_time,
             end_time=end_time,
             error_message=error_message,
@@ -373,251 +753,217 @@ class MemoryAdaptiveDispatcher(BaseDispatcher):
         
     async def run_urls(
         self,
-        urls: List[str],
+        urls: UrlSource,
         crawler: AsyncWebCrawler,
         config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
     ) -> List[CrawlerTaskResult]:
-        self.crawler = crawler
-        
-        # Start the memory monitor task
-        memory_monitor = asyncio.create_task(self._memory_monitor_task())
-        
-        if self.monitor:
-            self.monitor.start()
-            
         results = []
-
         try:
-            # Initialize task queue
-            for url in urls:
-                task_id = str(uuid.uuid4())
-                if self.monitor:
-                    self.monitor.add_task(task_id, url)
-                # Add to queue with initial priority 0, retry count 0, and current time
-                await self.task_queue.put((0, (url, task_id, 0, time.time())))
+            async for result in self._dispatch(urls, crawler, config):
+                results.append(result)
+        except Exception as e:
+            if self.monitor:
+                self.monitor.update_memory_status(f"QUEUE_ERROR: {str(e)}")
+        return results
 
-            active_tasks = []
+    async def run_urls_stream(
+        self,
+        urls: UrlSource,
+        crawler: AsyncWebCrawler,
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> AsyncGenerator[CrawlerTaskResult, None]:
+        async for result in self._dispatch(urls, crawler, config):
+            yield result
 
-            # Process until both queues are empty
-            while not self.task_queue.empty() or active_tasks:
-                if memory_monitor.done():
-                    exc = memory_monitor.exception()
-                    if exc:
-                        for t in active_tasks:
-                            t.cancel()
-                        raise exc
+    def _domain_ready_in(self, domain: str) -> float:
+        """
+        Seconds until `domain` may take another request: infinite while its
+        Crawl-delay is unknown. Memory-hungry domains also wait while memory is
+        not below the recovery threshold, for at most memory_wait_timeout.
+        """
+        if (
+            domain in self.memory_hungry_domains
+            and self.current_memory_percent >= self.recovery_threshold_percent
+        ):
+            if self._memory_hold_start is None:
+                self._memory_hold_start = time.time()
+            if not self._memory_hold_expired():
+                return float("inf")
+        lookup = self._crawl_delay_lookups.get(domain)
+        if lookup is not None and not lookup.done():
+            return float("inf")
+        return self.rate_limiter.ready_in(domain) if self.rate_limiter else 0.0
 
-                # If memory pressure is low, greedily fill all available slots
-                if not self.memory_pressure_mode:
-                    slots = self.max_session_permit - len(active_tasks)
-                    while slots > 0:
-                        try:
-                            # Use get_nowait() to immediately get tasks without blocking
-                            priority, (url, task_id, retry_count, enqueue_time) = self.task_queue.get_nowait()
-                            
-                            # Create and start the task
-                            task = asyncio.create_task(
-                                self.crawl_url(url, config, task_id, retry_count)
-                            )
-                            active_tasks.append(task)
-                            
-                            # Update waiting time in monitor
-                            if self.monitor:
-                                wait_time = time.time() - enqueue_time
-                                self.monitor.update_task(
-                                    task_id, 
-                                    wait_time=wait_time,
-                                    status=CrawlStatus.IN_PROGRESS
-                                )
-                            
-                            slots -= 1
-                            
-                        except asyncio.QueueEmpty:
-                            # No more tasks in queue, exit the loop
-                            break
-                        
-                # Wait for completion even if queue is starved
-                if active_tasks:
-                    done, pending = await asyncio.wait(
-                        active_tasks, timeout=0.1, return_when=asyncio.FIRST_COMPLETED
-                    )
-                    
-                    # Process completed tasks
-                    for completed_task in done:
-                        result = await completed_task
-                        results.append(result)
-                        
-                    # Update active tasks list
-                    active_tasks = list(pending)
-                else:
-                    # If no active tasks but still waiting, sleep briefly
-                    await asyncio.sleep(self.check_interval / 2)
-                    
-                # Update priorities for waiting tasks if needed
-                await self._update_queue_priorities()
+    def _memory_hold_expired(self) -> bool:
+        """True once memory-hungry domains have waited memory_wait_timeout seconds"""
+        return (
+            self.memory_wait_timeout is not None
+            and self._memory_hold_start is not None
+            and time.time() - self._memory_hold_start >= self.memory_wait_timeout
+        )
 
-        except Exception as e:
-            if self.monitor:
-                self.monitor.update_memory_status(f"QUEUE_ERROR: {str(e)}")                
-        
-        finally:
-            # Clean up
-            memory_monitor.cancel()
-            if self.monitor:
-                self.monitor.stop()
-            return results
-                
-    async def _update_queue_priorities(self):
-        """Periodically update priorities of items in the queue to prevent starvation"""
-        # Skip if queue is empty
-        if self.task_queue.empty():
+    def _record_page_memory(self, url: str, page_memory: float):
+        """Flag the domain of `url` as memory-hungry if the page exceeded page_memory_limit_mb"""
+        if self.page_memory_limit_mb is None or page_memory <= self.page_memory_limit_mb:
             return
-            
-        # Use a drain-and-refill approach to update all priorities
-        temp_items = []
-        
-        # Drain the queue (with a safety timeout to prevent blocking)
+        domain = self.task_queue.domain_of(url)
+        self.memory_hungry_domains[domain] = max(page_memory, self.memory_hungry_domains.get(domain, 0.0))
+
+    async def _load_crawl_delay(self, url: str, domain: str):
+        """Apply the robots.txt Crawl-delay of a newly seen domain and release its queued tasks"""
         try:
-            drain_start = time.time()
-            while not self.task_queue.empty() and time.time() - drain_start < 5.0:  # 5 second safety timeout
-                try:
-                    # Get item from queue with timeout
-                    priority, (url, task_id, retry_count, enqueue_time) = await asyncio.wait_for(
-                        self.task_queue.get(), timeout=0.1
+            user_agent = getattr(getattr(self.crawler, "browser_config", None), "user_agent", None)
+            crawl_delay = await self.crawler.robots_parser.crawl_delay(url, user_agent or "*")
+            self.rate_limiter.set_crawl_delay(domain, crawl_delay)
+        except Exception:
+            pass  # Fall back to the rate limiter's own delays
+        finally:
+            self.task_queue.notify_domain(domain)
+            self._wakeup.set()
+
+    async def _feed_queue(
+        self,
+        urls: UrlSource,
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+        capacity: asyncio.Semaphore,
+    ):
+        """Move URLs from the input into the task queue while fewer than `prefetch_limit` are unfinished"""
+        async for url, url_config in _iter_url_items(urls, config):
+            await capacity.acquire()
+            task_id = str(uuid.uuid4())
+            if self.monitor:
+                self.monitor.add_task(task_id, url)
+            if (
+                self.rate_limiter
+                and self.rate_limiter.respect_crawl_delay
+                and getattr(self.crawler, "robots_parser", None)
+            ):
+                domain = self.rate_limiter.get_domain(url)
+                if domain not in self._crawl_delay_lookups:
+                    self._crawl_delay_lookups[domain] = asyncio.create_task(
+                        self._load_crawl_delay(url, domain)
                     )
-                    
-                    # Calculate new priority based on current wait time
-                    current_time = time.time()
-                    wait_time = current_time - enqueue_time
-                    new_priority = self._get_priority_score(wait_time, retry_count)
-                    
-                    # Store with updated priority
-                    temp_items.append((new_priority, (url, task_id, retry_count, enqueue_time)))
-                    
-                    # Update monitoring stats for this task
-                    if self.monitor and task_id in self.monitor.stats:
-                        self.monitor.update_task(task_id, wait_time=wait_time)
-                        
-                except asyncio.TimeoutError:
-                    # Queue might be empty or very slow
-                    break
-        except Exception as e:
-            # If anything goes wrong, make sure we refill the queue with what we've got
-            self.monitor.update_memory_status(f"QUEUE_ERROR: {str(e)}")
-        
-        # Calculate queue statistics
-        if temp_items and self.monitor:
-            total_queued = len(temp_items)
-            wait_times = [item[1][3] for item in temp_items]
-            highest_wait_time = time.time() - min(wait_times) if wait_times else 0
-            avg_wait_time = sum(time.time() - t for t in wait_times) / len(wait_times) if wait_times else 0
-            
-            # Update queue statistics in monitor
-            self.monitor.update_queue_statistics(
-                total_queued=total_queued,
-                highest_wait_time=highest_wait_time,
-                avg_wait_time=avg_wait_time
-            )
-        
-        # Sort by priority (lowest number = highest priority)
-        temp_items.sort(key=lambda x: x[0])
-        
-        # Refill the queue with updated priorities
-        for item in temp_items:
-            await self.task_queue.put(item)
-                
-    async def run_urls_stream(
+            # A non-empty queue means every slot is busy (or memory is under
+            # pressure), so the scheduler only needs waking for the first task
+            if not self.task_queue:
+                self._wakeup.set()
+            self.task_queue.push((url, task_id, 0, url_config), 0, time.time())
+
+    async def _dispatch(
         self,
-        urls: List[str],
+        urls: UrlSource,
         crawler: AsyncWebCrawler,
         config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
     ) -> AsyncGenerator[CrawlerTaskResult, None]:
+        """
+        Crawl `urls` and yield each result as it completes.
+
+        URLs are pulled from `urls` as they are needed, so at most
+        `prefetch_limit` of them are queued or crawling at any time. The
+        scheduler only wakes up when a crawl finishes, when URLs arrive in an
+        empty queue, when the memory pressure mode changes, when the memory
+        monitor fails or when a rate-limited domain becomes ready, and then
+        fills every free slot from the task queue. With a rate limiter, slots
+        only go to URLs whose domain is ready, so no slot waits on a domain.
+        Results of tasks requeued under critical memory pressure are not
+        yielded; the requeued task yields its own result later.
+        """
         self.crawler = crawler
-        
-        # Start the memory monitor task
+        self._wakeup = asyncio.Event()
+        max_permit = (
+            self.concurrency_controller.max_permit
+            if self.concurrency_controller
+            else self.max_session_permit
+        )
+        capacity = asyncio.Semaphore(max(self.prefetch_limit, max_permit))
+
+        # Start the memory monitor and the queue feeder, and let both take a first step
         memory_monitor = asyncio.create_task(self._memory_monitor_task())
-        
+        feeder = asyncio.create_task(self._feed_queue(urls, config, capacity))
+        await asyncio.sleep(0)
+        wakeup = None
+
         if self.monitor:
             self.monitor.start()
-            
+            if self.concurrency_controller:
+                self._report_concurrency()
+
+        active_tasks = set()
         try:
-            # Initialize task queue
-            for url in urls:
-                task_id = str(uuid.uuid4())
-                if self.monitor:
-                    self.monitor.add_task(task_id, url)
-                # Add to queue with initial priority 0, retry count 0, and current time
-                await self.task_queue.put((0, (url, task_id, 0, time.time())))
-                
-            active_tasks = []
-            completed_count = 0
-            total_urls = len(urls)
-
-            while completed_count < total_urls:
-                if memory_monitor.done():
-                    exc = memory_monitor.exception()
-                    if exc:
-                        for t in active_tasks:
-                            t.cancel()
-                        raise exc
+            while not feeder.done() or self.task_queue or active_tasks:
                 # If memory pressure is low, greedily fill all available slots
                 if not self.memory_pressure_mode:
-                    slots = self.max_session_permit - len(active_tasks)
-                    while slots > 0:
-                        try:
-                            # Use get_nowait() to immediately get tasks without blocking
-                            priority, (url, task_id, retry_count, enqueue_time) = self.task_queue.get_nowait()
-                            
-                            # Create and start the task
-                            task = asyncio.create_task(
-                                self.crawl_url(url, config, task_id, retry_count)
+                    now = time.time()
+                    while len(active_tasks) < self.session_permit and self.task_queue:
+                        task = self.task_queue.pop(now)
+                        if task is None:
+                            break  # Every queued URL waits for its domain
+                        (url, task_id, retry_count, url_config), enqueue_time = task
+                        if self.rate_limiter:
+                            self.rate_limiter.acquire(url)
+                        active_tasks.add(
+                            asyncio.create_task(
+                                self.crawl_url(url, url_config, task_id, retry_count)
                             )
-                            active_tasks.append(task)
-                            
-                            # Update waiting time in monitor
-                            if self.monitor:
-                                wait_time = time.time() - enqueue_time
-                                self.monitor.update_task(
-                                    task_id, 
-                                    wait_time=wait_time,
-                                    status=CrawlStatus.IN_PROGRESS
-                                )
-                            
-                            slots -= 1
-                            
-                        except asyncio.QueueEmpty:
-                            # No more tasks in queue, exit the loop
-                            break
-                        
-                # Process completed tasks and yield results
-                if active_tasks:
-                    done, pending = await asyncio.wait(
-                        active_tasks, timeout=0.1, return_when=asyncio.FIRST_COMPLETED
-                    )
-                    
-                    for completed_task in done:
-                        result = await completed_task
-                        
-                        # Only count as completed if it wasn't requeued
-                        if "requeued" not in result.error_message:
-                            completed_count += 1
-                            yield result
-                        
-                    # Update active tasks list
-                    active_tasks = list(pending)
-                else:
-                    # If no active tasks but still waiting, sleep briefly
-                    await asyncio.sleep(self.check_interval / 2)
-                
-                # Update priorities for waiting tasks if needed
-                await self._update_queue_priorities()
-                
+                        )
+                        if self.monitor:
+                            self.monitor.update_task(
+                                task_id,
+                                wait_time=now - enqueue_time,
+                                status=CrawlStatus.IN_PROGRESS,
+                            )
+                    self._update_queue_statistics()
+
+                if wakeup is None or wakeup.done():
+                    self._wakeup.clear()
+                    wakeup = asyncio.create_task(self._wakeup.wait())
+
+                waiting = active_tasks | {memory_monitor, wakeup}
+                if not feeder.done():
+                    waiting.add(feeder)
+                # Wake up when the next rate-limited domain becomes ready
+                timeout = None
+                ready_time = self.task_queue.next_ready_time()
+                if ready_time is not None and len(active_tasks) < self.session_permit:
+                    timeout = max(0.0, ready_time - time.time())
+                done, _ = await asyncio.wait(
+                    waiting, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                # The feeder may have failed before it was ever waited on
+                for task in (memory_monitor, feeder):
+                    if task.done() and task.exception():
+                        raise task.exception()
+
+                for completed_task in done & active_tasks:
+                    active_tasks.discard(completed_task)
+                    result = completed_task.result()
+                    if self.rate_limiter:
+                        self.rate_limiter.release(result.url)
+                        self.task_queue.notify_domain(self.rate_limiter.get_domain(result.url))
+                    # Only count as completed if it wasn't requeued
+                    if (result.result.metadata or {}).get("status") != "requeued":
+                        if self.concurrency_controller and self.concurrency_controller.record(result):
+                            self._report_concurrency()
+                        capacity.release()
+                        yield result
+
+            if feeder.exception():
+                raise feeder.exception()
+
         finally:
             # Clean up
+            for task in active_tasks:
+                task.cancel()
             memory_monitor.cancel()
+            feeder.cancel()
+            for lookup in self._crawl_delay_lookups.values():
+                lookup.cancel()
+            if wakeup is not None:
+                wakeup.cancel()
             if self.monitor:
                 self.monitor.stop()
-                
+
 
 class SemaphoreDispatcher(BaseDispatcher):
     def __init__(
@@ -626,10 +972,12 @@ class SemaphoreDispatcher(BaseDispatcher):
         max_session_permit: int = 20,
         rate_limiter: Optional[RateLimiter] = None,
         monitor: Optional[CrawlerMonitor] = None,
+        prefetch_limit: int = 1000,  # URLs taken from the input and not finished yet
     ):
         super().__init__(rate_limiter, monitor)
         self.semaphore_count = semaphore_count
         self.max_session_permit = max_session_permit
+        self.prefetch_limit = prefetch_limit
 
     async def crawl_url(
         self,
@@ -640,7 +988,7 @@ class SemaphoreDispatcher(BaseDispatcher):
     ) -> CrawlerTaskResult:
         start_time = time.time()
         error_message = ""
-        memory_usage = peak_memory = 0.0
+        memory_usage = peak_memory = cpu_time = 0.0
 
         # Select appropriate config for this URL
         selected_config = self.select_config(url, config)
@@ -672,6 +1020,7 @@ class SemaphoreDispatcher(BaseDispatcher):
                 error_message=error_message
             )
 
+        domain_acquired = False
         try:
             if self.monitor:
                 self.monitor.update_task(
@@ -680,14 +1029,13 @@ class SemaphoreDispatcher(BaseDispatcher):
 
             if self.rate_limiter:
                 await self.rate_limiter.wait_if_needed(url)
+                domain_acquired = True
 
             async with semaphore:
                 process = psutil.Process()
                 start_memory = process.memory_info().rss / (1024 * 1024)
                 result = await self.crawler.arun(url, config=selected_config, session_id=task_id)
-                end_memory = process.memory_info().rss / (1024 * 1024)
-
-                memory_usage = peak_memory = end_memory - start_memory
+                memory_usage, peak_memory, cpu_time = self._measure_crawl(result, start_memory)
 
                 if self.rate_limiter and result.status_code:
                     if not self.rate_limiter.update_delay(url, result.status_code):
@@ -700,6 +1048,7 @@ class SemaphoreDispatcher(BaseDispatcher):
                             result=result,
                             memory_usage=memory_usage,
                             peak_memory=peak_memory,
+                            cpu_time=cpu_time,
                             start_time=start_time,
                             end_time=time.time(),
                             error_message=error_message,
@@ -721,6 +1070,8 @@ class SemaphoreDispatcher(BaseDispatcher):
             )
 
         finally:
+            if domain_acquired:
+                self.rate_limiter.release(url)
             end_time = time.time()
             if self.monitor:
                 self.monitor.update_task(
@@ -737,6 +1088,7 @@ class SemaphoreDispatcher(BaseDispatcher):
             result=result,
             memory_usage=memory_usage,
             peak_memory=peak_memory,
+            cpu_time=cpu_time,
             start_time=start_time,
             end_time=end_time,
             error_message=error_message,
@@ -745,27 +1097,253 @@ class SemaphoreDispatcher(BaseDispatcher):
     async def run_urls(
         self,
         crawler: AsyncWebCrawler,  # noqa: F821
-        urls: List[str],
+        urls: UrlSource,
         config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
     ) -> List[CrawlerTaskResult]:
+        results = {}
+        async for index, result in self._dispatch(urls, crawler, config):
+            results[index] = result
+        # Keep the order of the input
+        return [results[index] for index in range(len(results))]
+
+    async def run_urls_stream(
+        self,
+        urls: UrlSource,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> AsyncGenerator[CrawlerTaskResult, None]:
+        async for _, result in self._dispatch(urls, crawler, config):
+            yield result
+
+    async def _dispatch(
+        self,
+        urls: UrlSource,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> AsyncGenerator[Tuple[int, CrawlerTaskResult], None]:
+        """
+        Crawl `urls` and yield (input index, result) pairs as crawls complete.
+
+        URLs are pulled from `urls` only while fewer than `prefetch_limit`
+        crawls are unfinished, so the input can be an unbounded (async) iterator.
+        """
         self.crawler = crawler
         if self.monitor:
             self.monitor.start()
 
+        semaphore = asyncio.Semaphore(self.semaphore_count)
+        limit = max(self.prefetch_limit, self.semaphore_count)
+        tasks = set()
+        finished = deque()
+        task_done = asyncio.Event()
+
+        def _on_done(task):
+            finished.append(task)
+            task_done.set()
+
+        async def _crawl(index, url, url_config, task_id):
+            return index, await self.crawl_url(url, url_config, task_id, semaphore)
+
         try:
-            semaphore = asyncio.Semaphore(self.semaphore_count)
-            tasks = []
+            index = 0
+            async for url, url_config in _iter_url_items(urls, config):
+                while len(tasks) >= limit and not finished:
+                    task_done.clear()
+                    await task_done.wait()
+                while finished:
+                    task = finished.popleft()
+                    tasks.discard(task)
+                    yield task.result()
 
-            for url in urls:
                 task_id = str(uuid.uuid4())
                 if self.monitor:
                     self.monitor.add_task(task_id, url)
-                task = asyncio.create_task(
-                    self.crawl_url(url, config, task_id, semaphore)
-                )
-                tasks.append(task)
+                task = asyncio.create_task(_crawl(index, url, url_config, task_id))
+                task.add_done_callback(_on_done)
+                tasks.add(task)
+                index += 1
 
-            return await asyncio.gather(*tasks, return_exceptions=True)
+            while tasks:
+                while not finished:
+                    task_done.clear()
+                    await task_done.wait()
+                while finished:
+                    task = finished.popleft()
+                    tasks.discard(task)
+                    yield task.result()
         finally:
+            for task in tasks:
+                task.cancel()
             if self.monitor:
-                self.monitor.stop()
\ No newline at end of file
+                self.monitor.stop()
+
+
+class DistributedDispatcher(SemaphoreDispatcher):
+    """
+    Crawls URLs from a LeaseFrontier shared by several workers, possibly on
+    different machines.
+
+    URLs passed to `run_urls` are added to the shared frontier (URLs already
+    seen by any worker are dropped); every worker then claims batches of URLs
+    under a lease and renews the leases of the crawls it is running. If a
+    worker dies, its leases expire and other workers pick the URLs up again.
+    A worker given URLs registers as a seeder while it adds them. A run ends
+    once a seeder has started, every seeder has finished and every URL in the
+    frontier has been completed, so workers can join with an empty URL list
+    before the seeders do. With `idle_timeout`, a worker also stops after that
+    many seconds without anything to crawl. Per-URL configs are not shared
+    between workers: every URL is crawled with the run config, or the first
+    matching config of a list.
+    """
+
+    def __init__(
+        self,
+        frontier: LeaseFrontier,
+        worker_id: Optional[str] = None,
+        max_session_permit: int = 20,
+        claim_batch_size: int = 10,
+        lease_seconds: float = 60.0,
+        poll_interval: float = 0.5,
+        idle_timeout: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        monitor: Optional[CrawlerMonitor] = None,
+    ):
+        super().__init__(
+            semaphore_count=max_session_permit,
+            max_session_permit=max_session_permit,
+            rate_limiter=rate_limiter,
+            monitor=monitor,
+        )
+        self.frontier = frontier
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self.claim_batch_size = claim_batch_size
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.idle_timeout = idle_timeout
+
+    async def run_urls(
+        self,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        urls: UrlSource,
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> List[CrawlerTaskResult]:
+        return [result async for result in self._dispatch(urls, crawler, config)]
+
+    async def run_urls_stream(
+        self,
+        urls: UrlSource,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> AsyncGenerator[CrawlerTaskResult, None]:
+        async for result in self._dispatch(urls, crawler, config):
+            yield result
+
+    async def _seed(self, urls: UrlSource, config, batch_size: int = 100) -> None:
+        """Add the URLs to the frontier, registered as a seeder once there is one to add"""
+        if urls is None:
+            return
+        batch = []
+        seeding = False
+        try:
+            async for url, _ in _iter_url_items(urls, config):
+                if not seeding:
+                    await self.frontier.begin_seeding()
+                    seeding = True
+                batch.append(url)
+                if len(batch) >= batch_size:
+                    await self.frontier.add(batch)
+                    batch = []
+            if batch:
+                await self.frontier.add(batch)
+        finally:
+            if seeding:
+                await self.frontier.end_seeding()
+
+    async def _keep_leases(self, active: Dict[asyncio.Task, str]) -> None:
+        """Renew the leases of running crawls and requeue leases other workers let expire"""
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            try:
+                if active:
+                    await self.frontier.heartbeat(self.worker_id, list(active.values()), self.lease_seconds)
+                await self.frontier.requeue_expired()
+            except Exception as e:
+                # Try again next round; leases only expire after lease_seconds
+                logger = getattr(self.crawler, "logger", None)
+                if logger:
+                    logger.warning(
+                        message="Failed to renew leases: {error}",
+                        tag="LEASE",
+                        params={"error": str(e)},
+                    )
+
+    async def _idle_wait(self) -> float:
+        next_ready = await self.frontier.next_ready_time()
+        if next_ready is None:
+            return self.poll_interval
+        return min(self.poll_interval, max(next_ready - time.time(), 0.001))
+
+    async def _dispatch(
+        self,
+        urls: UrlSource,
+        crawler: AsyncWebCrawler,  # noqa: F821
+        config: Union[CrawlerRunConfig, List[CrawlerRunConfig]],
+    ) -> AsyncGenerator[CrawlerTaskResult, None]:
+        self.crawler = crawler
+        if self.monitor:
+            self.monitor.start()
+
+        semaphore = asyncio.Semaphore(self.max_session_permit)
+        active: Dict[asyncio.Task, str] = {}
+        feeder = asyncio.create_task(self._seed(urls, config))
+        lease_keeper = asyncio.create_task(self._keep_leases(active))
+
+        idle_since = time.monotonic()
+        try:
+            while True:
+                if feeder.done() and feeder.exception():
+                    raise feeder.exception()
+                if lease_keeper.done():
+                    raise lease_keeper.exception() or RuntimeError("Lease renewal stopped")
+
+                free = self.max_session_permit - len(active)
+                if free > 0:
+                    claimed = await self.frontier.claim(
+                        self.worker_id, min(free, self.claim_batch_size), self.lease_seconds
+                    )
+                    for url in claimed:
+                        task_id = str(uuid.uuid4())
+                        if self.monitor:
+                            self.monitor.add_task(task_id, url)
+                        task = asyncio.create_task(self.crawl_url(url, config, task_id, semaphore))
+                        active[task] = url
+
+                if not active:
+                    if feeder.done() and await self.frontier.is_finished():
+                        break
+                    if self.idle_timeout is not None and time.monotonic() - idle_since >= self.idle_timeout:
+                        break
+                    # Nothing claimable: wait for a domain to become ready, for new
+                    # URLs, or for another worker's expired leases
+                    await self.frontier.requeue_expired()
+                    await asyncio.sleep(await self._idle_wait())
+                    continue
+
+                # With free slots, wake up as well when the next domain becomes claimable
+                timeout = await self._idle_wait() if len(active) < self.max_session_permit else self.poll_interval
+                done, _ = await asyncio.wait(active, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url = active.pop(task)
+                    result = task.result()
+                    await self.frontier.complete(url, result.result.success)
+                    yield result
+                idle_since = time.monotonic()
+        finally:
+            feeder.cancel()
+            lease_keeper.cancel()
+            for task in active:
+                task.cancel()
+            # Let a cancelled feeder unregister as a seeder
+            await asyncio.gather(feeder, lease_keeper, return_exceptions=True)
+            if self.monitor:
+                self.monitor.stop()
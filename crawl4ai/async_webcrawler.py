@@ -3,9 +3,14 @@ import os
 import sys
 import time
 from pathlib import Path
-from typing import Optional, List
+from typing import Optional, List, Dict, Tuple
 import json
 import asyncio
+import copy
+import pickle
+import multiprocessing
+from functools import partial
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor
 
 # from contextlib import nullcontext, asynccontextmanager
 from contextlib import asynccontextmanager
@@ -28,7 +33,7 @@ from .async_crawler_strategy import (
     AsyncPlaywrightCrawlerStrategy,
     AsyncCrawlResponse,
 )
-from .cache_context import CacheMode, CacheContext
+from .cache_context import CacheMode, CacheContext, conditional_headers
 from .markdown_generation_strategy import (
     DefaultMarkdownGenerator,
     MarkdownGenerationStrategy,
@@ -37,8 +42,10 @@ from .deep_crawling import DeepCrawlDecorator
 from .async_logger import AsyncLogger, AsyncLoggerBase
 from .async_configs import BrowserConfig, CrawlerRunConfig, ProxyConfig, SeedingConfig
 from .async_dispatcher import *  # noqa: F403
-from .async_dispatcher import BaseDispatcher, MemoryAdaptiveDispatcher, RateLimiter
+from .async_dispatcher import BaseDispatcher, MemoryAdaptiveDispatcher, RateLimiter, UrlSource
 from .async_url_seeder import AsyncUrlSeeder
+from .http_client import SharedHTTPClient
+from .frontier import FrontierStore, close_frontier, open_frontier, resume_urls
 
 from .utils import (
     sanitize_input_encode,
@@ -50,6 +57,212 @@ from .utils import (
 )
 
 
+def process_html_content(
+    url: str,
+    html: str,
+    extracted_content: str,
+    config: CrawlerRunConfig,
+    screenshot_data: str,
+    pdf_data: str,
+    logger: Optional[AsyncLoggerBase] = None,
+    **kwargs,
+) -> Tuple[CrawlResult, Dict[str, float]]:
+    """
+    Run the CPU-bound part of the pipeline: scraping, fit_html preprocessing,
+    markdown generation and structured extraction.
+
+    This function is self-contained so it can run inline, in a worker thread or
+    in a worker process. It only touches its arguments, and both its inputs and
+    its return value are picklable as long as the configured strategies are.
+
+    Args:
+        url: The URL being processed
+        html: Raw HTML content
+        extracted_content: Previously extracted content (if any)
+        config: Configuration object controlling processing behavior
+        screenshot_data: Screenshot data (if any)
+        pdf_data: PDF data (if any)
+        logger: Optional logger for warnings, None inside worker processes
+        **kwargs: Additional parameters forwarded to the scraping strategy
+
+    Returns:
+        Tuple[CrawlResult, Dict[str, float]]: The processed result and the time spent
+        in the "scrape" and "extract" stages, so the caller can log them.
+    """
+    timings = {}
+    cleaned_html = ""
+    try:
+        t1 = time.perf_counter()
+
+        scraping_strategy = config.scraping_strategy
+
+        # Process HTML content
+        params = config.__dict__.copy()
+        params.pop("url", None)
+        # add keys from kwargs to params that doesn't exist in params
+        params.update({k: v for k, v in kwargs.items()
+                      if k not in params.keys()})
+        params["keep_source_tree"] = True
+
+        ################################
+        # Scraping Strategy Execution  #
+        ################################
+        result: ScrapingResult = scraping_strategy.scrap(
+            url, html, **params)
+
+        if result is None:
+            raise ValueError(
+                f"Process HTML, Failed to extract content from the website: {url}"
+            )
+
+    except InvalidCSSSelectorError as e:
+        raise ValueError(str(e))
+    except Exception as e:
+        raise ValueError(
+            f"Process HTML, Failed to extract content from the website: {url}, error: {str(e)}"
+        )
+
+    # Extract results - handle both dict and ScrapingResult
+    if isinstance(result, dict):
+        cleaned_html = sanitize_input_encode(
+            result.get("cleaned_html", ""))
+        media = result.get("media", {})
+        tables = media.pop("tables", []) if isinstance(media, dict) else []
+        links = result.get("links", {})
+        metadata = result.get("metadata", {})
+        source_tree = result.get("source_tree")
+    else:
+        cleaned_html = sanitize_input_encode(result.cleaned_html)
+        # media = result.media.model_dump()
+        # tables = media.pop("tables", [])
+        # links = result.links.model_dump()
+        media = result.media.model_dump() if hasattr(result.media, 'model_dump') else result.media
+        tables = media.pop("tables", []) if isinstance(media, dict) else []
+        links = result.links.model_dump() if hasattr(result.links, 'model_dump') else result.links
+        metadata = result.metadata
+        source_tree = getattr(result, "source_tree", None)
+
+    # Reuse the scraper's parse when it kept one, other strategies fall back to parsing html
+    fit_html = preprocess_html_for_schema(html_content=html, text_threshold= 500, max_size= 300_000, tree=source_tree)
+
+    ################################
+    # Generate Markdown            #
+    ################################
+    markdown_generator: Optional[MarkdownGenerationStrategy] = (
+        config.markdown_generator or DefaultMarkdownGenerator()
+    )
+
+    # --- SELECT HTML SOURCE BASED ON CONTENT_SOURCE ---
+    # Get the desired source from the generator config, default to 'cleaned_html'
+    selected_html_source = getattr(markdown_generator, 'content_source', 'cleaned_html')
+
+    # Define the source selection logic using dict dispatch
+    html_source_selector = {
+        "raw_html": lambda: html,  # The original raw HTML
+        "cleaned_html": lambda: cleaned_html,  # The HTML after scraping strategy
+        "fit_html": lambda: fit_html,  # The HTML after preprocessing for schema
+    }
+
+    markdown_input_html = cleaned_html  # Default to cleaned_html
+
+    try:
+        # Get the appropriate lambda function, default to returning cleaned_html if key not found
+        source_lambda = html_source_selector.get(selected_html_source, lambda: cleaned_html)
+        # Execute the lambda to get the selected HTML
+        markdown_input_html = source_lambda()
+
+    except Exception as e:
+        # Handle potential errors, especially from preprocess_html_for_schema
+        if logger:
+            logger.warning(
+                f"Error getting/processing '{selected_html_source}' for markdown source: {e}. Falling back to cleaned_html.",
+                tag="MARKDOWN_SRC"
+            )
+        # Ensure markdown_input_html is still the default cleaned_html in case of error
+        markdown_input_html = cleaned_html
+    # --- END: HTML SOURCE SELECTION ---
+
+    # Uncomment if by default we want to use PruningContentFilter
+    # if not config.content_filter and not markdown_generator.content_filter:
+    #     markdown_generator.content_filter = PruningContentFilter()
+
+    markdown_result: MarkdownGenerationResult = (
+        markdown_generator.generate_markdown(
+            input_html=markdown_input_html,
+            base_url=params.get("redirected_url", url)
+            # html2text_options=kwargs.get('html2text', {})
+        )
+    )
+
+    timings["scrape"] = int((time.perf_counter() - t1) * 1000) / 1000
+
+    ################################
+    # Structured Content Extraction           #
+    ################################
+    if (
+        not bool(extracted_content)
+        and config.extraction_strategy
+        and not isinstance(config.extraction_strategy, NoExtractionStrategy)
+    ):
+        t1 = time.perf_counter()
+        # Choose content based on input_format
+        content_format = config.extraction_strategy.input_format
+        if content_format == "fit_markdown" and not markdown_result.fit_markdown:
+            # Reported by the caller, which holds the logger in every executor mode
+            timings["fit_markdown_fallback"] = time.perf_counter() - t1
+            content_format = "markdown"
+
+        content = {
+            "markdown": markdown_result.raw_markdown,
+            "html": html,
+            "fit_html": fit_html,
+            "cleaned_html": cleaned_html,
+            "fit_markdown": markdown_result.fit_markdown,
+        }.get(content_format, markdown_result.raw_markdown)
+
+        # Use IdentityChunking for HTML input, otherwise use provided chunking strategy
+        chunking = (
+            IdentityChunking()
+            if content_format in ["html", "cleaned_html", "fit_html"]
+            else config.chunking_strategy
+        )
+        sections = chunking.chunk(content)
+        extracted_content = config.extraction_strategy.run(url, sections)
+        extracted_content = json.dumps(
+            extracted_content, indent=4, default=str, ensure_ascii=False
+        )
+        timings["extract"] = time.perf_counter() - t1
+
+    # Apply HTML formatting if requested
+    if config.prettiify:
+        cleaned_html = fast_format_html(cleaned_html)
+
+    # Return complete crawl result
+    crawl_result = CrawlResult(
+        url=url,
+        html=html,
+        fit_html=fit_html,
+        cleaned_html=cleaned_html,
+        markdown=markdown_result,
+        media=media,
+        tables=tables,                       # NEW
+        links=links,
+        metadata=metadata,
+        screenshot=screenshot_data,
+        pdf=pdf_data,
+        extracted_content=extracted_content,
+        success=True,
+        error_message="",
+    )
+    return crawl_result, timings
+
+
+def _process_pickled_html_content(payload: bytes) -> Tuple[CrawlResult, Dict[str, float]]:
+    """Worker process entry point: unpickle the arguments and run process_html_content"""
+    args, kwargs = pickle.loads(payload)
+    return process_html_content(*args, **kwargs)
+
+
 class AsyncWebCrawler:
     """
     Asynchronous web crawler with flexible caching capabilities.
@@ -115,6 +328,9 @@ class AsyncWebCrawler:
             os.getenv("CRAWL4_AI_BASE_DIRECTORY", Path.home())),
         thread_safe: bool = False,
         logger: AsyncLoggerBase = None,
+        http_client: SharedHTTPClient = None,
+        cache_max_entries: Optional[int] = None,
+        cache_max_bytes: Optional[int] = None,
         **kwargs,
     ):
         """
@@ -124,7 +340,14 @@ class AsyncWebCrawler:
             crawler_strategy: Strategy for crawling web pages. Default AsyncPlaywrightCrawlerStrategy
             config: Configuration object for browser settings. Default BrowserConfig()
             base_directory: Base directory for storing cache
-            thread_safe: Whether to use thread-safe operations
+            thread_safe: Whether to serialize concurrent `arun` calls that share a `session_id`
+            http_client: Connection pool for robots.txt, URL seeding, link previews, PDF
+                downloads and HTTP strategies. Default a pool owned by this crawler
+            cache_max_entries: Maximum number of cached URLs. The cache is shared by
+                all crawlers in the process, so this sets the limit for all of them.
+                None leaves the current limit (none by default) unchanged
+            cache_max_bytes: Maximum stored size of cached content, in bytes. Shared
+                like `cache_max_entries`
             **kwargs: Additional arguments for backwards compatibility
         """
         # Handle browser configuration
@@ -148,16 +371,37 @@ class AsyncWebCrawler:
             **params,  # Pass remaining kwargs for backwards compatibility
         )
 
-        # Thread safety setup
-        self._lock = asyncio.Lock() if thread_safe else None
+        # Thread safety setup. Pages crawl concurrently; only calls that drive
+        # the same browser session wait for each other.
+        self._thread_safe = thread_safe
+        self._session_locks: Dict[str, list] = {}
+
+        # Executors for CPU-heavy post-processing, created lazily per mode
+        self._post_processing_executors: Dict[str, Executor] = {}
 
         # Initialize directories
         self.crawl4ai_folder = os.path.join(base_directory, ".crawl4ai")
         os.makedirs(self.crawl4ai_folder, exist_ok=True)
         os.makedirs(f"{self.crawl4ai_folder}/cache", exist_ok=True)
 
+        # Eviction limits of the process-wide cache
+        cache_limits = {
+            name: value
+            for name, value in (("max_entries", cache_max_entries), ("max_cache_bytes", cache_max_bytes))
+            if value is not None
+        }
+        if cache_limits:
+            async_db_manager.configure(**cache_limits)
+
+        # One connection pool for everything fetched outside the browser
+        self._owns_http_client = http_client is None
+        self.http_client = http_client or SharedHTTPClient(
+            headers={"User-Agent": self.browser_config.user_agent}
+        )
+        self._lent_http_client = False
+
         # Initialize robots parser
-        self.robots_parser = RobotsParser()
+        self.robots_parser = RobotsParser(http_client=self.http_client)
 
         self.ready = False
 
@@ -174,6 +418,10 @@ class AsyncWebCrawler:
         Returns:
             AsyncWebCrawler: The initialized crawler instance
         """
+        await self.http_client.start()
+        if getattr(self.crawler_strategy, "http_client", False) is None:
+            self.crawler_strategy.http_client = self.http_client
+            self._lent_http_client = True
         await self.crawler_strategy.__aenter__()
         self.logger.info(f"Crawl4AI {crawl4ai_version}", tag="INIT")
         self.ready = True
@@ -187,8 +435,27 @@ class AsyncWebCrawler:
         This method will:
         1. Clean up browser resources
         2. Close any open pages and contexts
+        3. Shut down post-processing worker pools
+        4. Write any cache entries still queued in the database manager
+        5. Close the HTTP connection pool if the crawler created it
         """
         await self.crawler_strategy.__aexit__(None, None, None)
+        if self._lent_http_client:
+            self.crawler_strategy.http_client = None
+            self._lent_http_client = False
+
+        executors = list(self._post_processing_executors.values())
+        self._post_processing_executors.clear()
+        for executor in executors:
+            await asyncio.to_thread(executor.shutdown)
+
+        try:
+            await async_db_manager.aflush_writes()
+        finally:
+            # The seeder borrows a client of the pool, which is gone after this
+            self.url_seeder = None
+            if self._owns_http_client:
+                await self.http_client.close()
 
     async def __aenter__(self):
         return await self.start()
@@ -201,6 +468,32 @@ class AsyncWebCrawler:
         """异步空上下文管理器"""
         yield
 
+    @asynccontextmanager
+    async def _session_lock(self, session_id: Optional[str]):
+        """
+        Hold the lock of a browser session while a thread-safe crawler uses it.
+
+        A session is a single page, so two `arun` calls sharing a `session_id`
+        cannot drive it at the same time. Calls without a session, or on a
+        crawler created with `thread_safe=False`, do not wait. Locks are
+        dropped once no call is using or waiting for the session.
+        """
+        if not self._thread_safe or not session_id:
+            yield
+            return
+
+        entry = self._session_locks.get(session_id)
+        if entry is None:
+            entry = self._session_locks[session_id] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._session_locks[session_id]
+
     async def arun(
         self,
         url: str,
@@ -244,8 +537,12 @@ class AsyncWebCrawler:
             raise ValueError(
                 "Invalid URL, make sure the URL is a non-empty string")
 
-        async with self._lock or self.nullcontext():
+        async with self._session_lock(config.session_id):
             try:
+                # Work on a private copy: concurrent calls often share one config,
+                # and the cache mode default, proxy rotation and the crawler
+                # strategy all write to it.
+                config = copy.copy(config)
                 self.logger.verbose = config.verbose
 
                 # Default to ENABLED if no cache mode specified
@@ -258,14 +555,47 @@ class AsyncWebCrawler:
                 # Initialize processing variables
                 async_response: AsyncCrawlResponse = None
                 cached_result: CrawlResult = None
+                # Cached result to serve if the server answers 304 Not Modified
+                stale_result: CrawlResult = None
                 screenshot_data = None
                 pdf_data = None
                 extracted_content = None
                 start_time = time.perf_counter()
 
+                # Fields to load on a cache hit. Without html, a hit is not
+                # judged by whether it has html.
+                cache_fields = None
+                if config.cache_fields is not None:
+                    cache_fields = set(config.cache_fields)
+                    if config.screenshot:
+                        cache_fields.add("screenshot")
+                needs_cached_html = cache_fields is None or "html" in cache_fields
+
                 # Try to get cached result if appropriate
-                if cache_context.should_read():
-                    cached_result = await async_db_manager.aget_cached_url(url)
+                if cache_context.should_revalidate():
+                    # Entries younger than cache_max_age are served as they are,
+                    # any other entry only once the server confirms it is unchanged
+                    if config.cache_max_age is not None:
+                        cached_result = await async_db_manager.aget_cached_url(
+                            url, max_age=config.cache_max_age, fields=cache_fields
+                        )
+                    if not cached_result:
+                        stale_result = await async_db_manager.aget_cached_url(
+                            url,
+                            # The cached validators go into the conditional request
+                            fields=cache_fields | {"response_headers"} if cache_fields is not None else None,
+                            # An entry past cache_ttl can still be confirmed unchanged
+                            include_expired=True,
+                        )
+                        if stale_result and (
+                            (config.screenshot and not stale_result.screenshot)
+                            or (config.pdf and not stale_result.pdf)
+                        ):
+                            stale_result = None
+                elif cache_context.should_read():
+                    cached_result = await async_db_manager.aget_cached_url(
+                        url, max_age=config.cache_max_age, fields=cache_fields
+                    )
 
                 if cached_result:
                     html = sanitize_input_encode(cached_result.html)
@@ -289,7 +619,7 @@ class AsyncWebCrawler:
 
                     self.logger.url_status(
                         url=cache_context.display_url,
-                        success=bool(html),
+                        success=bool(html) or not needs_cached_html,
                         timing=time.perf_counter() - start_time,
                         tag="FETCH",
                     )
@@ -304,10 +634,9 @@ class AsyncWebCrawler:
                             params={"proxy": next_proxy.server}
                         )
                         config.proxy_config = next_proxy
-                        # config = config.clone(proxy_config=next_proxy)
 
                 # Fetch fresh content if needed
-                if not cached_result or not html:
+                if not cached_result or (not html and needs_cached_html):
                     t1 = time.perf_counter()
 
                     if config.user_agent:
@@ -333,11 +662,33 @@ class AsyncWebCrawler:
                     ##############################
                     # Call CrawlerStrategy.crawl #
                     ##############################
+                    validators = conditional_headers(
+                        stale_result.response_headers if stale_result else None
+                    )
                     async_response = await self.crawler_strategy.crawl(
                         url,
                         config=config,  # Pass the entire config object
+                        **({"conditional_headers": validators} if validators else {}),
                     )
 
+                    if validators and async_response.status_code == 304:
+                        # Unchanged since it was cached: serve the cached result
+                        # without processing the page again
+                        await async_db_manager.arefresh_cached_url(
+                            url, async_response.response_headers, ttl=config.cache_ttl
+                        )
+                        self.logger.url_status(
+                            url=cache_context.display_url,
+                            success=True,
+                            timing=time.perf_counter() - start_time,
+                            tag="COMPLETE",
+                        )
+                        stale_result.success = True
+                        stale_result.status_code = 304
+                        stale_result.session_id = getattr(config, "session_id", None)
+                        stale_result.redirected_url = stale_result.redirected_url or url
+                        return CrawlResultContainer(stale_result)
+
                     html = sanitize_input_encode(async_response.html)
                     screenshot_data = async_response.screenshot
                     pdf_data = async_response.pdf_data
@@ -379,6 +730,7 @@ class AsyncWebCrawler:
                     # Add captured network and console data if available
                     crawl_result.network_requests = async_response.network_requests
                     crawl_result.console_messages = async_response.console_messages
+                    crawl_result.resource_usage = async_response.resource_usage
 
                     crawl_result.success = bool(html)
                     crawl_result.session_id = getattr(
@@ -393,7 +745,9 @@ class AsyncWebCrawler:
 
                     # Update cache if appropriate
                     if cache_context.should_write() and not bool(cached_result):
-                        await async_db_manager.acache_url(crawl_result)
+                        await async_db_manager.acache_url(
+                            crawl_result, ttl=config.cache_ttl
+                        )
 
                     return CrawlResultContainer(crawl_result)
 
@@ -404,7 +758,7 @@ class AsyncWebCrawler:
                         timing=time.perf_counter() - start_time,
                         tag="COMPLETE"
                     )
-                    cached_result.success = bool(html)
+                    cached_result.success = bool(html) or not needs_cached_html
                     cached_result.session_id = getattr(
                         config, "session_id", None)
                     cached_result.redirected_url = cached_result.redirected_url or url
@@ -446,6 +800,11 @@ class AsyncWebCrawler:
         """
         Process HTML content using the provided configuration.
 
+        The CPU-heavy stages run through `process_html_content`, either inline on
+        the event loop or on the post-processing executor selected by
+        `config.post_processing_executor` (falling back to
+        `browser_config.post_processing_executor`).
+
         Args:
             url: The URL being processed
             html: Raw HTML content
@@ -459,204 +818,115 @@ class AsyncWebCrawler:
         Returns:
             CrawlResult: Processed result containing extracted and formatted content
         """
-        cleaned_html = ""
-        try:
-            _url = url if not kwargs.get("is_raw_html", False) else "Raw HTML"
-            t1 = time.perf_counter()
+        _url = url if not kwargs.get("is_raw_html", False) else "Raw HTML"
+        # Lets scraping strategies download PDFs and link previews through the pool
+        kwargs.setdefault("http_client", self.http_client)
+
+        mode = (
+            config.post_processing_executor
+            or self.browser_config.post_processing_executor
+            or "inline"
+        )
+        if mode not in ("inline", "thread", "process"):
+            raise ValueError(
+                f"Invalid post_processing_executor '{mode}', expected 'inline', 'thread' or 'process'"
+            )
 
+        if mode == "process":
+            # Worker processes get a copy of the config without our logger,
+            # which holds locks and file handles that cannot be pickled.
+            worker_config = copy.copy(config)
+            worker_config.scraping_strategy = copy.copy(config.scraping_strategy)
+            worker_config.scraping_strategy.logger = None
+            try:
+                # Pickle once here: an unpicklable config fails fast on this
+                # thread, and the executor only has to copy the bytes.
+                payload = pickle.dumps(
+                    ((url, html, extracted_content, worker_config, screenshot_data, pdf_data), kwargs),
+                    protocol=pickle.HIGHEST_PROTOCOL,
+                )
+            except Exception as e:
+                self.logger.warning(
+                    message="Config for {url} cannot be sent to a worker process ({error}), using a thread instead",
+                    tag="SCRAPE",
+                    params={"url": _url, "error": str(e)},
+                )
+                mode = "thread"
+            else:
+                executor = self._get_post_processing_executor(mode)
+                result, timings = await asyncio.get_running_loop().run_in_executor(
+                    executor, _process_pickled_html_content, payload
+                )
+
+        if mode != "process":
             # Get scraping strategy and ensure it has a logger
             scraping_strategy = config.scraping_strategy
             if not scraping_strategy.logger:
                 scraping_strategy.logger = self.logger
 
-            # Process HTML content
-            params = config.__dict__.copy()
-            params.pop("url", None)
-            # add keys from kwargs to params that doesn't exist in params
-            params.update({k: v for k, v in kwargs.items()
-                          if k not in params.keys()})
-
-            ################################
-            # Scraping Strategy Execution  #
-            ################################
-            result: ScrapingResult = scraping_strategy.scrap(
-                url, html, **params)
-
-            if result is None:
-                raise ValueError(
-                    f"Process HTML, Failed to extract content from the website: {url}"
-                )
-
-        except InvalidCSSSelectorError as e:
-            raise ValueError(str(e))
-        except Exception as e:
-            raise ValueError(
-                f"Process HTML, Failed to extract content from the website: {url}, error: {str(e)}"
+            func = partial(
+                process_html_content,
+                url, html, extracted_content, config, screenshot_data, pdf_data,
+                logger=self.logger,
+                **kwargs,
             )
-
-        # Extract results - handle both dict and ScrapingResult
-        if isinstance(result, dict):
-            cleaned_html = sanitize_input_encode(
-                result.get("cleaned_html", ""))
-            media = result.get("media", {})
-            tables = media.pop("tables", []) if isinstance(media, dict) else []
-            links = result.get("links", {})
-            metadata = result.get("metadata", {})
-        else:
-            cleaned_html = sanitize_input_encode(result.cleaned_html)
-            # media = result.media.model_dump()
-            # tables = media.pop("tables", [])
-            # links = result.links.model_dump()
-            media = result.media.model_dump() if hasattr(result.media, 'model_dump') else result.media
-            tables = media.pop("tables", []) if isinstance(media, dict) else []
-            links = result.links.model_dump() if hasattr(result.links, 'model_dump') else result.links
-            metadata = result.metadata
-
-        fit_html = preprocess_html_for_schema(html_content=html, text_threshold= 500, max_size= 300_000)
-
-        ################################
-        # Generate Markdown            #
-        ################################
-        markdown_generator: Optional[MarkdownGenerationStrategy] = (
-            config.markdown_generator or DefaultMarkdownGenerator()
-        )
-
-        # --- SELECT HTML SOURCE BASED ON CONTENT_SOURCE ---
-        # Get the desired source from the generator config, default to 'cleaned_html'
-        selected_html_source = getattr(markdown_generator, 'content_source', 'cleaned_html')
-
-        # Define the source selection logic using dict dispatch
-        html_source_selector = {
-            "raw_html": lambda: html,  # The original raw HTML
-            "cleaned_html": lambda: cleaned_html,  # The HTML after scraping strategy
-            "fit_html": lambda: fit_html,  # The HTML after preprocessing for schema
-        }
-
-        markdown_input_html = cleaned_html  # Default to cleaned_html
-
-        try:
-            # Get the appropriate lambda function, default to returning cleaned_html if key not found
-            source_lambda = html_source_selector.get(selected_html_source, lambda: cleaned_html)
-            # Execute the lambda to get the selected HTML
-            markdown_input_html = source_lambda()
-
-            # Log which source is being used (optional, but helpful for debugging)
-            # if self.logger and verbose:
-            #     actual_source_used = selected_html_source if selected_html_source in html_source_selector else 'cleaned_html (default)'
-            #     self.logger.debug(f"Using '{actual_source_used}' as source for Markdown generation for {url}", tag="MARKDOWN_SRC")
-
-        except Exception as e:
-            # Handle potential errors, especially from preprocess_html_for_schema
-            if self.logger:
-                self.logger.warning(
-                    f"Error getting/processing '{selected_html_source}' for markdown source: {e}. Falling back to cleaned_html.",
-                    tag="MARKDOWN_SRC"
+            if mode == "thread":
+                executor = self._get_post_processing_executor(mode)
+                result, timings = await asyncio.get_running_loop().run_in_executor(
+                    executor, func
                 )
-            # Ensure markdown_input_html is still the default cleaned_html in case of error
-            markdown_input_html = cleaned_html
-        # --- END: HTML SOURCE SELECTION ---
-
-        # Uncomment if by default we want to use PruningContentFilter
-        # if not config.content_filter and not markdown_generator.content_filter:
-        #     markdown_generator.content_filter = PruningContentFilter()
-
-        markdown_result: MarkdownGenerationResult = (
-            markdown_generator.generate_markdown(
-                input_html=markdown_input_html,
-                base_url=params.get("redirected_url", url)
-                # html2text_options=kwargs.get('html2text', {})
-            )
-        )
+            else:
+                result, timings = func()
 
         # Log processing completion
         self.logger.url_status(
             url=_url,
             success=True,
-            timing=int((time.perf_counter() - t1) * 1000) / 1000,
+            timing=timings["scrape"],
             tag="SCRAPE"
         )
-        # self.logger.info(
-        #     message="{url:.50}... | Time: {timing}s",
-        #     tag="SCRAPE",
-        #     params={"url": _url, "timing": int((time.perf_counter() - t1) * 1000) / 1000},
-        # )
-
-        ################################
-        # Structured Content Extraction           #
-        ################################
-        if (
-            not bool(extracted_content)
-            and config.extraction_strategy
-            and not isinstance(config.extraction_strategy, NoExtractionStrategy)
-        ):
-            t1 = time.perf_counter()
-            # Choose content based on input_format
-            content_format = config.extraction_strategy.input_format
-            if content_format == "fit_markdown" and not markdown_result.fit_markdown:
-
-                self.logger.url_status(
-                        url=_url,
-                        success=bool(html),
-                        timing=time.perf_counter() - t1,
-                        tag="EXTRACT",
-                    )
-                content_format = "markdown"
-
-            content = {
-                "markdown": markdown_result.raw_markdown,
-                "html": html,
-                "fit_html": fit_html,
-                "cleaned_html": cleaned_html,
-                "fit_markdown": markdown_result.fit_markdown,
-            }.get(content_format, markdown_result.raw_markdown)
-
-            # Use IdentityChunking for HTML input, otherwise use provided chunking strategy
-            chunking = (
-                IdentityChunking()
-                if content_format in ["html", "cleaned_html", "fit_html"]
-                else config.chunking_strategy
-            )
-            sections = chunking.chunk(content)
-            extracted_content = config.extraction_strategy.run(url, sections)
-            extracted_content = json.dumps(
-                extracted_content, indent=4, default=str, ensure_ascii=False
+        if "fit_markdown_fallback" in timings:
+            self.logger.url_status(
+                url=_url,
+                success=bool(html),
+                timing=timings["fit_markdown_fallback"],
+                tag="EXTRACT",
             )
-
-            # Log extraction completion
+        if "extract" in timings:
             self.logger.url_status(
                         url=_url,
                         success=bool(html),
-                        timing=time.perf_counter() - t1,
+                        timing=timings["extract"],
                         tag="EXTRACT",
                     )
 
-        # Apply HTML formatting if requested
-        if config.prettiify:
-            cleaned_html = fast_format_html(cleaned_html)
-
-        # Return complete crawl result
-        return CrawlResult(
-            url=url,
-            html=html,
-            fit_html=fit_html,
-            cleaned_html=cleaned_html,
-            markdown=markdown_result,
-            media=media,
-            tables=tables,                       # NEW
-            links=links,
-            metadata=metadata,
-            screenshot=screenshot_data,
-            pdf=pdf_data,
-            extracted_content=extracted_content,
-            success=True,
-            error_message="",
-        )
+        return result
+
+    def _get_post_processing_executor(self, mode: str) -> Executor:
+        """Return the crawler-scoped executor for `mode`, creating it on first use."""
+        executor = self._post_processing_executors.get(mode)
+        if executor is None:
+            workers = self.browser_config.post_processing_workers
+            if mode == "process":
+                # "spawn" avoids forking a process that runs Playwright threads
+                executor = ProcessPoolExecutor(
+                    max_workers=workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            else:
+                executor = ThreadPoolExecutor(
+                    max_workers=workers,
+                    thread_name_prefix="crawl4ai-postprocess",
+                )
+            self._post_processing_executors[mode] = executor
+        return executor
 
     async def arun_many(
         self,
-        urls: List[str],
+        urls: UrlSource,
         config: Optional[Union[CrawlerRunConfig, List[CrawlerRunConfig]]] = None,
         dispatcher: Optional[BaseDispatcher] = None,
+        resume_from: Optional[Union[str, FrontierStore]] = None,
         # Legacy parameters maintained for backwards compatibility
         # word_count_threshold=MIN_WORD_THRESHOLD,
         # extraction_strategy: ExtractionStrategy = None,
@@ -675,11 +945,19 @@ class AsyncWebCrawler:
         Runs the crawler for multiple URLs concurrently using a configurable dispatcher strategy.
 
         Args:
-        urls: List of URLs to crawl
+        urls: URLs to crawl. Can be a list, or any iterable or async iterable, of:
+            - URL strings
+            - (url, config) pairs, crawling that URL with its own config
+              (a None config falls back to `config`)
+            Iterators are consumed lazily, only as the dispatcher has room for more work.
         config: Configuration object(s) controlling crawl behavior. Can be:
             - Single CrawlerRunConfig: Used for all URLs
             - List[CrawlerRunConfig]: Configs with url_matcher for URL-specific settings
         dispatcher: The dispatcher strategy instance to use. Defaults to MemoryAdaptiveDispatcher
+        resume_from: Path of a SQLite frontier file, or a FrontierStore, recording the progress
+            of this run. If it holds an earlier run, the URLs that run did not finish are crawled
+            first and URLs it already crawled are skipped. Resumed URLs use `config`, and
+            results are returned in the order they finish.
         [other parameters maintained for backwards compatibility]
 
         Returns:
@@ -702,6 +980,16 @@ class AsyncWebCrawler:
             config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS, stream=True),
         ):
             print(f"Processed {result.url}: {len(result.markdown)} chars")
+
+        # Streaming URLs from an async generator, with per-URL configs
+        async def frontier():
+            async for url in discover_urls():
+                yield url, CrawlerRunConfig(screenshot=url.endswith("/"))
+
+        async for result in await crawler.arun_many(
+            urls=frontier(), config=CrawlerRunConfig(stream=True)
+        ):
+            print(f"Processed {result.url}")
         """
         config = config or CrawlerRunConfig()
         # if config is None:
@@ -738,6 +1026,8 @@ class AsyncWebCrawler:
                         start_time=task_result.start_time,
                         end_time=task_result.end_time,
                         error_message=task_result.error_message,
+                        cpu_time=task_result.cpu_time,
+                        resource_usage=task_result.result.resource_usage,
                     ),
                 )
                 or task_result.result
@@ -749,18 +1039,44 @@ class AsyncWebCrawler:
         else:
             stream = config.stream
 
+        frontier = None
+        if resume_from is not None:
+            frontier = open_frontier(resume_from)
+            await frontier.open()
+            urls = resume_urls(frontier, urls)
+
+        async def finish(task_result):
+            if frontier:
+                await frontier.mark_done(task_result.url, task_result.result.success)
+            return transform_result(task_result)
+
         if stream:
 
             async def result_transformer():
-                async for task_result in dispatcher.run_urls_stream(
-                    crawler=self, urls=urls, config=config
-                ):
-                    yield transform_result(task_result)
+                try:
+                    async for task_result in dispatcher.run_urls_stream(
+                        crawler=self, urls=urls, config=config
+                    ):
+                        yield await finish(task_result)
+                finally:
+                    if frontier:
+                        await close_frontier(frontier, resume_from)
 
             return result_transformer()
         else:
-            _results = await dispatcher.run_urls(crawler=self, urls=urls, config=config)
-            return [transform_result(res) for res in _results]
+            if frontier is None:
+                _results = await dispatcher.run_urls(crawler=self, urls=urls, config=config)
+                return [transform_result(res) for res in _results]
+            # Record each result as it finishes so an interrupted run keeps its progress
+            try:
+                return [
+                    await finish(res)
+                    async for res in dispatcher.run_urls_stream(
+                        crawler=self, urls=urls, config=config
+                    )
+                ]
+            finally:
+                await close_frontier(frontier, resume_from)
 
     async def aseed_urls(
         self,
@@ -810,7 +1126,8 @@ class AsyncWebCrawler:
             # Pass the crawler's logger for consistent logging
             self.url_seeder = AsyncUrlSeeder(
                 base_directory=self.crawl4ai_folder,
-                logger=self.logger
+                logger=self.logger,
+                client=self.http_client.httpx_client,
             )                    
 
         # Merge config object with direct kwargs, giving kwargs precedence
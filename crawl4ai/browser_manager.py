@@ -10,6 +10,7 @@ import signal
 import subprocess
 import shlex
 from playwright.async_api import BrowserContext
+import copy
 import hashlib
 from .js_snippet import load_js_script
 from .config import DOWNLOAD_PAGE_TIMEOUT
@@ -40,6 +41,14 @@ BROWSER_DISABLE_OPTIONS = [
     "--use-mock-keychain",
 ]
 
+# Context signature fields that hold objects which can be changed in place
+_MUTABLE_SIGNATURE_FIELDS = ("proxy_config", "geolocation")
+
+
+def _signature_snapshot(value):
+    """Copy a mutable context signature field so later in-place changes show up"""
+    return value.to_dict() if hasattr(value, "to_dict") else copy.deepcopy(value)
+
 
 class ManagedBrowser:
     """
@@ -969,38 +978,38 @@ class BrowserManager:
 
     def _make_config_signature(self, crawlerRunConfig: CrawlerRunConfig) -> str:
         """
-        Converts the crawlerRunConfig into a dict, excludes ephemeral fields,
-        then returns a hash of the sorted JSON. This yields a stable signature
-        that identifies configurations requiring a unique browser context.
+        Returns a hash identifying configurations that require a unique browser context.
+
+        Only the fields that change how a context is created and set up
+        (`CrawlerRunConfig._CONTEXT_SIGNATURE_FIELDS`: proxy, locale, timezone,
+        geolocation, user agent and navigator overrides) go into the signature. Proxy and
+        geolocation settings are compared by value. The signature is cached on
+        the config and dropped when one of those fields is set; proxy and
+        geolocation objects can also change in place, so their values are
+        compared with the cached ones on every call.
         """
+        mutable = tuple(
+            _signature_snapshot(getattr(crawlerRunConfig, key, None))
+            for key in _MUTABLE_SIGNATURE_FIELDS
+        )
+        cached = crawlerRunConfig.__dict__.get("_context_signature")
+        if cached is not None and cached[0] == mutable:
+            return cached[1]
+
         import json
 
-        config_dict = crawlerRunConfig.__dict__.copy()
-        # Exclude items that do not affect browser-level setup.
-        # Expand or adjust as needed, e.g. chunking_strategy is purely for data extraction, not for browser config.
-        ephemeral_keys = [
-            "session_id",
-            "js_code",
-            "scraping_strategy",
-            "extraction_strategy",
-            "chunking_strategy",
-            "cache_mode",
-            "content_filter",
-            "semaphore_count",
-            "url"
-        ]
-        
-        # Do NOT exclude locale, timezone_id, or geolocation as these DO affect browser context
-        # and should cause a new context to be created if they change
-        
-        for key in ephemeral_keys:
-            if key in config_dict:
-                del config_dict[key]
+        config_dict = dict(zip(_MUTABLE_SIGNATURE_FIELDS, mutable))
+        for key in crawlerRunConfig._CONTEXT_SIGNATURE_FIELDS.difference(_MUTABLE_SIGNATURE_FIELDS):
+            value = getattr(crawlerRunConfig, key, None)
+            if hasattr(value, "to_dict"):
+                value = value.to_dict()
+            config_dict[key] = value
         # Convert to canonical JSON string
         signature_json = json.dumps(config_dict, sort_keys=True, default=str)
 
         # Hash the JSON so we get a compact, unique string
         signature_hash = hashlib.sha256(signature_json.encode("utf-8")).hexdigest()
+        crawlerRunConfig._context_signature = (mutable, signature_hash)
         return signature_hash
 
     async def _apply_stealth_to_page(self, page):
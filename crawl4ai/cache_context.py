@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import Dict, Optional
 
 
 class CacheMode(Enum):
@@ -11,6 +12,8 @@ class CacheMode(Enum):
     - READ_ONLY: Only read from cache, don't write
     - WRITE_ONLY: Only write to cache, don't read
     - BYPASS: Bypass cache for this operation
+    - REVALIDATE: Read and write, but check cached pages with the server first
+      (If-None-Match / If-Modified-Since) and reuse them on 304 Not Modified
     """
 
     ENABLED = "enabled"
@@ -18,6 +21,7 @@ class CacheMode(Enum):
     READ_ONLY = "read_only"
     WRITE_ONLY = "write_only"
     BYPASS = "bypass"
+    REVALIDATE = "revalidate"
 
 
 class CacheContext:
@@ -62,14 +66,14 @@ class CacheContext:
 
         How it works:
         1. If always_bypass is True or is_cacheable is False, return False.
-        2. If cache_mode is ENABLED or READ_ONLY, return True.
+        2. If cache_mode is ENABLED, READ_ONLY or REVALIDATE, return True.
 
         Returns:
             bool: True if cache should be read, False otherwise.
         """
         if self.always_bypass or not self.is_cacheable:
             return False
-        return self.cache_mode in [CacheMode.ENABLED, CacheMode.READ_ONLY]
+        return self.cache_mode in [CacheMode.ENABLED, CacheMode.READ_ONLY, CacheMode.REVALIDATE]
 
     def should_write(self) -> bool:
         """
@@ -77,14 +81,25 @@ class CacheContext:
 
         How it works:
         1. If always_bypass is True or is_cacheable is False, return False.
-        2. If cache_mode is ENABLED or WRITE_ONLY, return True.
+        2. If cache_mode is ENABLED, WRITE_ONLY or REVALIDATE, return True.
 
         Returns:
             bool: True if cache should be written, False otherwise.
         """
         if self.always_bypass or not self.is_cacheable:
             return False
-        return self.cache_mode in [CacheMode.ENABLED, CacheMode.WRITE_ONLY]
+        return self.cache_mode in [CacheMode.ENABLED, CacheMode.WRITE_ONLY, CacheMode.REVALIDATE]
+
+    def should_revalidate(self) -> bool:
+        """
+        Determines if a cached web page must be confirmed with the server before use.
+
+        Returns:
+            bool: True if cache_mode is REVALIDATE and the URL is a web URL.
+        """
+        if self.always_bypass or not self.is_web_url:
+            return False
+        return self.cache_mode == CacheMode.REVALIDATE
 
     @property
     def display_url(self) -> str:
@@ -115,3 +130,19 @@ def _legacy_to_cache_mode(
     if no_cache_write:
         return CacheMode.READ_ONLY
     return CacheMode.ENABLED
+
+
+def conditional_headers(response_headers: Optional[Dict[str, str]]) -> Dict[str, str]:
+    """
+    Builds the conditional request headers that revalidate a cached response.
+
+    ETag becomes If-None-Match and Last-Modified becomes If-Modified-Since.
+    Returns an empty dict when the response carried neither validator.
+    """
+    headers = {name.lower(): value for name, value in (response_headers or {}).items()}
+    conditional = {}
+    if headers.get("etag"):
+        conditional["If-None-Match"] = headers["etag"]
+    if headers.get("last-modified"):
+        conditional["If-Modified-Since"] = headers["last-modified"]
+    return conditional
@@ -137,6 +137,8 @@ class TerminalUI:
         status_text.append(f"Web Crawler Dashboard | Runtime: {runtime} | Memory: {memory_percent:.1f}% {memory_icon}\n")
         status_text.append(f"Status: {memory_status} | URLs: {summary['urls_completed']}/{summary['urls_total']} | ")
         status_text.append(f"Peak Mem: {summary['peak_memory_percent']:.1f}% at {self.monitor._format_time(summary['peak_memory_time'])}")
+        if summary["concurrency_limit"] is not None:
+            status_text.append(f" | Permits: {summary['concurrency_limit']}")
         
         return Panel(status_text, title="Crawler Status", border_style="blue")
     
@@ -396,6 +398,10 @@ class CrawlerMonitor:
         
         # Requeue tracking
         self.requeued_count = 0
+
+        # Concurrency limit set by an adaptive controller (None when fixed)
+        self.concurrency_limit = None
+        self.concurrency_history = []  # (timestamp, limit, reason)
         
         # Thread-safety
         self._lock = threading.RLock()
@@ -572,6 +578,18 @@ class CrawlerMonitor:
         with self._lock:
             self.memory_status = status
     
+    def update_concurrency(self, limit: int, reason: str):
+        """
+        Record a change of the concurrency limit.
+        
+        Args:
+            limit: The new number of concurrent crawls allowed
+            reason: Why the limit changed (e.g. "increase", "timeout", "memory pressure")
+        """
+        with self._lock:
+            self.concurrency_limit = limit
+            self.concurrency_history.append((time.time(), limit, reason))
+
     def update_queue_statistics(
         self,
         total_queued: int,
@@ -639,6 +657,21 @@ class CrawlerMonitor:
         with self._lock:
             return self.queue_stats.copy()
     
+    def get_concurrency_stats(self) -> Dict:
+        """
+        Get the concurrency limit and its history.
+        
+        Returns:
+            Dictionary with:
+            - current_limit: Concurrent crawls currently allowed (None if not adaptive)
+            - history: List of (timestamp, limit, reason) changes
+        """
+        with self._lock:
+            return {
+                "current_limit": self.concurrency_limit,
+                "history": list(self.concurrency_history),
+            }
+
     def get_summary(self) -> Dict:
         """
         Get a summary of all crawler statistics.
@@ -656,6 +689,7 @@ class CrawlerMonitor:
             - avg_task_duration: Average task processing time
             - estimated_completion_time: Projected finish time
             - requeue_rate: Percentage of tasks requeued
+            - concurrency_limit: Current adaptive concurrency limit, if any
         """
         with self._lock:
             # Calculate runtime
@@ -702,7 +736,8 @@ class CrawlerMonitor:
                 "avg_task_duration": avg_task_duration,
                 "estimated_completion_time": estimated_completion_time,
                 "requeue_rate": requeue_rate,
-                "requeued_count": self.requeued_count
+                "requeued_count": self.requeued_count,
+                "concurrency_limit": self.concurrency_limit
             }
     
     def render(self):
@@ -2,9 +2,12 @@ import inspect
 import re
 import time
 from bs4 import BeautifulSoup, Tag
+from bs4.builder import HTMLTreeBuilder
 from typing import List, Tuple, Dict, Optional
 from rank_bm25 import BM25Okapi
 from collections import deque
+from lxml import etree
+from lxml import html as lhtml
 from bs4 import NavigableString, Comment
 
 from .utils import (
@@ -627,20 +630,202 @@ class PruningContentFilter(RelevantContentFilter):
         """
         Implements content filtering using pruning algorithm with dynamic threshold.
 
-        Note:
-        This method implements the filtering logic for the PruningContentFilter class.
-        It takes HTML content as input and returns a list of filtered text chunks.
+        The page is pruned in a single bottom-up pass over its lxml tree. Every
+        node is scored on the metrics of its subtree (text length, markup
+        length, link text length and word count). All of them are sums over the
+        children, so they are computed once per node in a post-order walk instead
+        of being re-derived by serializing every subtree again, which made the
+        BeautifulSoup implementation quadratic in the nesting depth. Lengths and
+        the returned blocks follow BeautifulSoup's serialization rules, so the
+        output is identical to `_filter_content_soup`.
+
+        Content the fast path cannot reproduce exactly (ruby text, templates,
+        scripts or styles that are not excluded, meta tags, processing
+        instructions, boolean attributes such as `disabled` whose written form
+        is ambiguous in the tree, and documents nested deep enough for libxml2
+        to truncate them), and subclasses that override the BeautifulSoup hooks,
+        go through `_filter_content_soup` instead.
 
         Args:
             html (str): HTML content to be filtered.
             min_word_threshold (int): Minimum word threshold for filtering (optional).
 
         Returns:
-            List[str]: List of filtered text chunks.
+            List[str]: List of filtered HTML chunks.
         """
         if not html or not isinstance(html, str):
             return []
 
+        if self._overrides_soup_hooks():
+            return self._filter_content_soup(html)
+
+        body = self._find_body(html)
+        if body is not None:
+            try:
+                return self._filter_tree(body)
+            except _SoupOnlyContent:
+                pass
+        return self._filter_content_soup(html)
+
+    def _overrides_soup_hooks(self) -> bool:
+        """Returns True if a subclass customizes the BeautifulSoup pruning hooks."""
+        cls = type(self)
+        return any(
+            getattr(cls, name) is not getattr(PruningContentFilter, name)
+            for name in _PRUNING_SOUP_HOOKS
+        )
+
+    def _find_body(self, html: str):
+        """Returns the <body> element of `html`, wrapping the fragment in one if needed."""
+        for source in (html, f"<body>{html}</body>"):
+            try:
+                root = lhtml.document_fromstring(source)
+            except (etree.ParserError, etree.XMLSyntaxError, ValueError):
+                return None
+            body = next(root.iter("body"), None)
+            if body is not None:
+                return body
+        return None
+
+    def _filter_tree(self, body) -> List[str]:
+        """
+        Prunes the tree under `body` and returns its remaining top-level blocks.
+
+        Raises:
+            _SoupOnlyContent: If the tree holds content only the BeautifulSoup path handles.
+        """
+        removed = set()
+        self._measure(body, removed, depth=sum(1 for _ in body.iterancestors()))
+        if body in removed:
+            return []
+
+        content_blocks = []
+        for element in body:
+            if not isinstance(element.tag, str) or element in removed:
+                continue
+            out = []
+            if self._serialize(element, removed, out):
+                content_blocks.append("".join(out))
+        return content_blocks
+
+    def _measure(self, node, removed, preserve=False, depth=0) -> Tuple[int, int, int, Optional[str]]:
+        """
+        Computes the metrics of `node` from those of its children and decides whether it is pruned.
+
+        Excluded tags and pruned nodes are added to `removed`. Comments and
+        excluded tags are skipped, but the text around them stays split into
+        separate strings, as it does after BeautifulSoup extracts them.
+        Whitespace-only strings are collapsed like BeautifulSoup does outside
+        of <pre> and <textarea> (`preserve`). `depth` is the number of
+        ancestors of `node`.
+
+        Returns:
+            Tuple[int, int, int, Optional[str]]: Stripped text length, number of
+            spaces in the stripped text, serialized length of the node and the
+            node's `.string` in BeautifulSoup terms.
+        """
+        tag = node.tag
+        if tag in _SOUP_ONLY_TAGS:
+            raise _SoupOnlyContent(tag)
+        if depth >= _MAX_TREE_DEPTH:
+            # libxml2 drops anything nested deeper when it builds a tree
+            raise _SoupOnlyContent(tag)
+
+        text_len = spaces = tag_len = link_text_len = contents = 0
+        string = None
+
+        preserve = preserve or tag in _PRESERVE_WHITESPACE_TAGS
+        text = _collapse_whitespace(node.text, preserve)
+        if text:
+            stripped = text.strip()
+            text_len += len(stripped)
+            spaces += stripped.count(" ")
+            tag_len += _escaped_len(text)
+            contents += 1
+            string = text
+
+        for child in node:
+            child_tag = child.tag
+            if not isinstance(child_tag, str):
+                if child_tag is not etree.Comment:
+                    raise _SoupOnlyContent(child_tag)
+            elif child_tag in self.excluded_tags:
+                removed.add(child)
+            else:
+                child_text_len, child_spaces, child_len, string = self._measure(
+                    child, removed, preserve, depth + 1
+                )
+                text_len += child_text_len
+                spaces += child_spaces
+                tag_len += child_len
+                contents += 1
+                if child_tag == "a" and string:
+                    link_text_len += len(string.strip())
+
+            tail = _collapse_whitespace(child.tail, preserve)
+            if tail:
+                stripped = tail.strip()
+                text_len += len(stripped)
+                spaces += stripped.count(" ")
+                tag_len += _escaped_len(tail)
+                contents += 1
+                string = tail
+
+        metrics = {
+            "node": node,
+            "tag_name": tag,
+            "text_len": text_len,
+            "tag_len": tag_len,
+            "link_text_len": link_text_len,
+            "word_count": spaces + 1,
+        }
+        score = self._compute_composite_score(metrics, text_len, tag_len, link_text_len)
+        if self._should_remove(tag, score, text_len, tag_len, link_text_len):
+            removed.add(node)
+
+        start_len = len(_start_tag(node, tag))
+        if contents == 0 and tag in _VOID_ELEMENTS:
+            node_len = start_len + 2
+        else:
+            node_len = start_len + 1 + tag_len + len(tag) + 3
+        return text_len, spaces, node_len, string if contents == 1 else None
+
+    def _serialize(self, node, removed, out: List[str], preserve=False) -> bool:
+        """
+        Appends the pruned markup of `node` to `out` the way BeautifulSoup's `str()` renders it.
+
+        Returns:
+            bool: True if the pruned node still contains non-whitespace text.
+        """
+        tag = node.tag
+        if tag in _VOID_ELEMENTS and not _has_contents(node, removed):
+            out.append(_start_tag(node, tag) + "/>")
+            return False
+
+        out.append(_start_tag(node, tag) + ">")
+        preserve = preserve or tag in _PRESERVE_WHITESPACE_TAGS
+        has_text = False
+        text = _collapse_whitespace(node.text, preserve)
+        if text:
+            out.append(_escape_text(text))
+            has_text = not text.isspace()
+        for child in node:
+            if isinstance(child.tag, str) and child not in removed:
+                has_text = self._serialize(child, removed, out, preserve) or has_text
+            tail = _collapse_whitespace(child.tail, preserve)
+            if tail:
+                out.append(_escape_text(tail))
+                has_text = has_text or not tail.isspace()
+        out.append("</" + tag + ">")
+        return has_text
+
+    def _filter_content_soup(self, html: str) -> List[str]:
+        """
+        Reference implementation of `filter_content` on a BeautifulSoup tree.
+
+        Used for content the lxml fast path cannot reproduce exactly and by
+        subclasses that override the BeautifulSoup hooks.
+        """
         soup = BeautifulSoup(html, "lxml")
         if not soup.body:
             soup = BeautifulSoup(f"<body>{html}</body>", "lxml")
@@ -702,36 +887,41 @@ class PruningContentFilter(RelevantContentFilter):
 
         score = self._compute_composite_score(metrics, text_len, tag_len, link_text_len)
 
-        if self.threshold_type == "fixed":
-            should_remove = score < self.threshold
-        else:  # dynamic
-            tag_importance = self.tag_importance.get(node.name, 0.7)
-            text_ratio = text_len / tag_len if tag_len > 0 else 0
-            link_ratio = link_text_len / text_len if text_len > 0 else 1
-
-            threshold = self.threshold  # base threshold
-            if tag_importance > 1:
-                threshold *= 0.8
-            if text_ratio > 0.4:
-                threshold *= 0.9
-            if link_ratio > 0.6:
-                threshold *= 1.2
-
-            should_remove = score < threshold
-
-        if should_remove:
+        if self._should_remove(node.name, score, text_len, tag_len, link_text_len):
             node.decompose()
         else:
             children = [child for child in node.children if hasattr(child, "name")]
             for child in children:
                 self._prune_tree(child)
 
+    def _should_remove(self, tag_name, score, text_len, tag_len, link_text_len) -> bool:
+        """Compares the score of a node against the fixed or dynamic threshold"""
+        if self.threshold_type == "fixed":
+            return score < self.threshold
+
+        # dynamic
+        tag_importance = self.tag_importance.get(tag_name, 0.7)
+        text_ratio = text_len / tag_len if tag_len > 0 else 0
+        link_ratio = link_text_len / text_len if text_len > 0 else 1
+
+        threshold = self.threshold  # base threshold
+        if tag_importance > 1:
+            threshold *= 0.8
+        if text_ratio > 0.4:
+            threshold *= 0.9
+        if link_ratio > 0.6:
+            threshold *= 1.2
+
+        return score < threshold
+
     def _compute_composite_score(self, metrics, text_len, tag_len, link_text_len):
         """Computes the composite score"""
         if self.min_word_threshold:
-            # Get raw text from metrics node - avoid extra processing
-            text = metrics["node"].get_text(strip=True)
-            word_count = text.count(" ") + 1
+            word_count = metrics.get("word_count")
+            if word_count is None:
+                # Get raw text from metrics node - avoid extra processing
+                text = metrics["node"].get_text(strip=True)
+                word_count = text.count(" ") + 1
             if word_count < self.min_word_threshold:
                 return -1.0  # Guaranteed removal
         score = 0.0
@@ -764,19 +954,108 @@ class PruningContentFilter(RelevantContentFilter):
         return score / total_weight if total_weight > 0 else 0
 
     def _compute_class_id_weight(self, node):
-        """Computes the class ID weight"""
+        """Computes the class ID weight of a BeautifulSoup tag or an lxml element"""
+        attrs = node.attrs if isinstance(node, Tag) else node.attrib
         class_id_score = 0
-        if "class" in node.attrs:
-            classes = " ".join(node["class"])
+        if "class" in attrs:
+            classes = attrs["class"]
+            if isinstance(classes, str):
+                classes = _NON_WHITESPACE.findall(classes)
+            classes = " ".join(classes)
             if self.negative_patterns.match(classes):
                 class_id_score -= 0.5
-        if "id" in node.attrs:
-            element_id = node["id"]
+        if "id" in attrs:
+            element_id = attrs["id"]
             if self.negative_patterns.match(element_id):
                 class_id_score -= 0.5
         return class_id_score
 
 
+class _SoupOnlyContent(Exception):
+    """Raised by the lxml pruning pass for content only the BeautifulSoup path reproduces."""
+
+
+# Hooks of the BeautifulSoup implementation. Subclasses overriding any of them
+# keep getting BeautifulSoup objects.
+_PRUNING_SOUP_HOOKS = (
+    "_remove_comments",
+    "_remove_unwanted_tags",
+    "_prune_tree",
+    "_compute_composite_score",
+    "_compute_class_id_weight",
+)
+
+# BeautifulSoup keeps the text of these tags out of get_text() (or rewrites
+# their attributes on output), so their lengths cannot be derived from lxml.
+_SOUP_ONLY_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_STRING_CONTAINERS) | {"meta"}
+_VOID_ELEMENTS = frozenset(HTMLTreeBuilder.DEFAULT_EMPTY_ELEMENT_TAGS)
+_LIST_ATTRIBUTES = {
+    tag: frozenset(names)
+    for tag, names in HTMLTreeBuilder.DEFAULT_CDATA_LIST_ATTRIBUTES.items()
+}
+# Attributes libxml2 sets to their own name when they are written without a value.
+_BOOLEAN_ATTRIBUTES = frozenset({
+    "checked", "compact", "declare", "defer", "disabled", "ismap", "multiple",
+    "nohref", "noresize", "noshade", "nowrap", "readonly", "selected",
+})
+_MAX_TREE_DEPTH = 256
+_PRESERVE_WHITESPACE_TAGS = frozenset(HTMLTreeBuilder.DEFAULT_PRESERVE_WHITESPACE_TAGS)
+_NON_WHITESPACE = re.compile(r"\S+")
+_ASCII_SPACES = "\x20\x0a\x09\x0c\x0d"
+
+
+def _collapse_whitespace(text: Optional[str], preserve: bool) -> Optional[str]:
+    """Replaces an ASCII-whitespace-only string by a single newline or space, as BeautifulSoup does."""
+    if not text or preserve or text.strip(_ASCII_SPACES):
+        return text
+    return "\n" if "\n" in text else " "
+
+
+def _escape_text(text: str) -> str:
+    """Escapes text and attribute values like BeautifulSoup's "minimal" formatter."""
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+def _escaped_len(text: str) -> int:
+    """Length of `_escape_text(text)` without building the escaped string."""
+    return len(text) + 4 * text.count("&") + 3 * (text.count("<") + text.count(">"))
+
+
+def _start_tag(node, tag: str) -> str:
+    """Renders the opening tag of an lxml element, without the closing bracket, as BeautifulSoup does."""
+    attrib = node.attrib
+    if not attrib:
+        return "<" + tag
+    list_attributes = _LIST_ATTRIBUTES["*"].union(_LIST_ATTRIBUTES.get(tag, ()))
+    parts = ["<", tag]
+    for key, value in sorted(attrib.items()):
+        if value == key and key in _BOOLEAN_ATTRIBUTES:
+            # libxml2 fills in valueless boolean attributes when it builds a
+            # tree, while BeautifulSoup keeps them empty; the source is ambiguous.
+            raise _SoupOnlyContent(key)
+        if key in list_attributes:
+            value = " ".join(_NON_WHITESPACE.findall(value))
+        value = _escape_text(value)
+        if '"' not in value:
+            value = '"' + value + '"'
+        elif "'" not in value:
+            value = "'" + value + "'"
+        else:
+            value = '"' + value.replace('"', "&quot;") + '"'
+        parts.append(" " + key + "=" + value)
+    return "".join(parts)
+
+
+def _has_contents(node, removed) -> bool:
+    """Returns True if the element keeps any child or text after pruning."""
+    if node.text:
+        return True
+    return any(
+        child.tail or (isinstance(child.tag, str) and child not in removed)
+        for child in node
+    )
+
+
 class LLMContentFilter(RelevantContentFilter):
     """Content filtering using LLMs to generate relevant markdown.
 
@@ -182,6 +182,7 @@ class LXMLWebScrapingStrategy(ContentScrapingStrategy):
             media=media,
             links=links,
             metadata=raw_result.get("metadata", {}),
+            source_tree=raw_result.get("source_tree"),
         )
 
     async def ascrap(self, url: str, html: str, **kwargs) -> ScrapingResult:
@@ -606,6 +607,12 @@ class LXMLWebScrapingStrategy(ContentScrapingStrategy):
         success = True
         try:
             doc = lhtml.document_fromstring(html)
+            # An untouched copy lets the caller build fit_html without parsing the page again
+            source_tree = (
+                copy.deepcopy(doc.getroottree()).getroot()
+                if kwargs.get("keep_source_tree", False)
+                else None
+            )
             # Match BeautifulSoup's behavior of using body or full doc
             # body = doc.xpath('//body')[0] if doc.xpath('//body') else doc
             body = doc
@@ -811,22 +818,27 @@ class LXMLWebScrapingStrategy(ContentScrapingStrategy):
                     config = TempCrawlerRunConfig(link_preview_config, kwargs.get("score_links", False))
                     
                     # Extract head content (run async operation in sync context)
-                    async def extract_links():
-                        async with LinkPreview(self.logger) as extractor:
+                    async def extract_links(http_client=None):
+                        async with LinkPreview(self.logger, http_client=http_client) as extractor:
                             return await extractor.extract_link_heads(links_obj, config)
                     
                     # Run the async operation
-                    try:
-                        # Check if we're already in an async context
-                        loop = asyncio.get_running_loop()
-                        # If we're in an async context, we need to run in a thread
-                        import concurrent.futures
-                        with concurrent.futures.ThreadPoolExecutor() as executor:
-                            future = executor.submit(asyncio.run, extract_links())
-                            updated_links = future.result()
-                    except RuntimeError:
-                        # No running loop, we can use asyncio.run directly
-                        updated_links = asyncio.run(extract_links())
+                    http_client = kwargs.get("http_client")
+                    if http_client is not None:
+                        # Borrow the crawler's connection pool
+                        updated_links = http_client.run(extract_links)
+                    else:
+                        try:
+                            # Check if we're already in an async context
+                            loop = asyncio.get_running_loop()
+                            # If we're in an async context, we need to run in a thread
+                            import concurrent.futures
+                            with concurrent.futures.ThreadPoolExecutor() as executor:
+                                future = executor.submit(asyncio.run, extract_links())
+                                updated_links = future.result()
+                        except RuntimeError:
+                            # No running loop, we can use asyncio.run directly
+                            updated_links = asyncio.run(extract_links())
                     
                     # Convert back to dict format
                     links["internal"] = [link.dict() for link in updated_links.internal]
@@ -855,6 +867,7 @@ class LXMLWebScrapingStrategy(ContentScrapingStrategy):
                 "media": media,
                 "links": links,
                 "metadata": meta,
+                "source_tree": source_tree,
             }
 
         except Exception as e:
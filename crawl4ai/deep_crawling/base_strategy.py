@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import AsyncGenerator, Optional, Set, List, Dict
+from typing import Any, AsyncGenerator, Iterable, Optional, Set, List, Dict, Tuple, Union
 from functools import wraps
 from contextvars import ContextVar
 from ..types import AsyncWebCrawler, CrawlerRunConfig, CrawlResult, RunManyReturn
+from ..utils import efficient_normalize_url_for_deep_crawl, normalize_url_for_deep_crawl
+from .visited import VisitedSet
+from ..frontier import FrontierStore
 
 
 class DeepCrawlDecorator:
@@ -42,6 +45,91 @@ class DeepCrawlDecorator:
             return await original_arun(url, config=config, **kwargs)
         return wrapped_arun
 
+class _PendingUrls:
+    """
+    Entries of the URLs handed to one arun_many call, keyed by normalized URL.
+
+    Results are matched to their entry in O(1) by their URL or, for redirected
+    pages, their redirected URL. Matched entries are removed, so what is left
+    once a batch is done are the URLs that returned no result.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]] = ()):
+        self._entries: Dict[str, Tuple[str, Any]] = {}
+        for url, entry in entries:
+            self.add(url, entry)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return efficient_normalize_url_for_deep_crawl(url, url)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, url: str, entry: Any) -> None:
+        self._entries[self._key(url)] = (url, entry)
+
+    def pop(self, result: CrawlResult) -> Optional[Tuple[str, Any]]:
+        """Remove and return (queued url, entry) for a result, or None if it matches no URL"""
+        for url in (result.url, result.redirected_url):
+            if url:
+                match = self._entries.pop(self._key(url), None)
+                if match:
+                    return match
+        return None
+
+    def urls(self) -> List[str]:
+        """Queued URLs that have not been matched to a result"""
+        return [url for url, _ in self._entries.values()]
+
+
+class _ResumedVisited:
+    """
+    Visited set of a crawl with a frontier store. URLs recorded in the store
+    count as seen through store.is_known, so they are not copied into
+    `visited`; `unfinished` URLs are recorded but still to be crawled, and only
+    count as seen once added.
+    """
+
+    def __init__(
+        self,
+        visited: Union[Set[str], VisitedSet],
+        store: FrontierStore,
+        unfinished: Iterable[str] = (),
+    ):
+        self._visited = visited
+        self._store = store
+        self._unfinished = set(unfinished)
+
+    def add(self, url: str) -> None:
+        self._unfinished.discard(url)
+        self._visited.add(url)
+
+    def update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add(url)
+
+    def add_unfinished(self, url: str) -> None:
+        """Record a URL queued in the store but not crawled yet"""
+        self._unfinished.add(url)
+
+    def __contains__(self, url: str) -> bool:
+        if url in self._visited:
+            return True
+        return url not in self._unfinished and self._store.is_known(url)
+
+
+def _page_url(result: CrawlResult, visited: Set[str]) -> str:
+    """
+    The URL a result's page was served from, which its relative links resolve
+    against. A redirect target is added to visited so it is not crawled again.
+    """
+    page_url = result.redirected_url or result.url
+    if page_url != result.url:
+        visited.add(normalize_url_for_deep_crawl(page_url, page_url))
+    return page_url
+
+
 class DeepCrawlStrategy(ABC):
     """
     Abstract base class for deep crawling strategies.
@@ -53,6 +141,15 @@ class DeepCrawlStrategy(ABC):
       - _process_links: Extract and process links from a CrawlResult.
     """
 
+    # Template for the set of seen URLs; each crawl gets an empty copy of it
+    visited_set: Optional[VisitedSet] = None
+
+    def _new_visited(self) -> Union[Set[str], VisitedSet]:
+        """An empty visited set for a new crawl: a copy of visited_set, or a plain set"""
+        if self.visited_set is None:
+            return set()
+        return self.visited_set.empty_copy()
+
     @abstractmethod
     async def _arun_batch(
         self,
@@ -2,13 +2,16 @@
 import asyncio
 import logging
 from datetime import datetime
-from typing import AsyncGenerator, Optional, Set, Dict, List, Tuple
+from typing import AsyncGenerator, Optional, Set, Dict, List, Tuple, Union
 from urllib.parse import urlparse
 
+from ..frontier import DONE, FrontierEntry, FrontierStore, close_frontier, open_frontier
 from ..models import TraversalStats
 from .filters import FilterChain
 from .scorers import URLScorer
 from . import DeepCrawlStrategy
+from .base_strategy import _PendingUrls, _ResumedVisited, _page_url
+from .visited import VisitedSet
 
 from ..types import AsyncWebCrawler, CrawlerRunConfig, CrawlResult, RunManyReturn
 from ..utils import normalize_url_for_deep_crawl
@@ -41,12 +44,18 @@ class BestFirstCrawlingStrategy(DeepCrawlStrategy):
         include_external: bool = False,
         max_pages: int = infinity,
         logger: Optional[logging.Logger] = None,
+        resume_from: Optional[Union[str, FrontierStore]] = None,
+        visited_set: Optional[VisitedSet] = None,
     ):
         self.max_depth = max_depth
         self.filter_chain = filter_chain
         self.url_scorer = url_scorer
         self.include_external = include_external
         self.max_pages = max_pages
+        # Frontier file or store the crawl is persisted to and resumed from
+        self.resume_from = resume_from
+        # Set of seen URLs to use instead of a plain set, e.g. to save memory
+        self.visited_set = visited_set
         # self.logger = logger or logging.getLogger(__name__)
         # Ensure logger is always a Logger instance, not a dict from serialization
         if isinstance(logger, logging.Logger):
@@ -127,6 +136,32 @@ class BestFirstCrawlingStrategy(DeepCrawlStrategy):
             depths[url] = new_depth
             next_links.append((url, source_url))
 
+    async def _restore_frontier(self, start_url: str, queue: asyncio.PriorityQueue):
+        """
+        Opens the resume_from frontier and fills the queue with the URLs it has
+        not finished. Returns (store, visited, depths). Without resume_from, or
+        with an empty store, the queue holds just start_url.
+        """
+        initial_score = self.url_scorer.score(start_url) if self.url_scorer else 0
+        if self.resume_from is None:
+            await queue.put((-initial_score, 0, start_url, None))
+            return None, self._new_visited(), {start_url: 0}
+
+        store = open_frontier(self.resume_from)
+        await store.open()
+        if not await store.count():
+            await store.add([FrontierEntry(start_url, score=initial_score)])
+            await queue.put((-initial_score, 0, start_url, None))
+            return store, _ResumedVisited(self._new_visited(), store, [start_url]), {start_url: 0}
+
+        self._pages_crawled = await store.count(DONE)
+        unfinished = await store.unfinished()
+        # Unfinished URLs are not seen yet so that they are crawled when dequeued
+        visited = _ResumedVisited(self._new_visited(), store, (entry.url for entry in unfinished))
+        for entry in unfinished:
+            await queue.put((-entry.score, entry.depth, entry.url, entry.parent_url))
+        return store, visited, {}
+
     async def _arun_best_first(
         self,
         start_url: str,
@@ -140,77 +175,98 @@ class BestFirstCrawlingStrategy(DeepCrawlStrategy):
         are treated as higher priority. URLs are processed in batches for efficiency.
         """
         queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
-        # Push the initial URL with score 0 and depth 0.
-        initial_score = self.url_scorer.score(start_url) if self.url_scorer else 0
-        await queue.put((-initial_score, 0, start_url, None))
-        visited: Set[str] = set()
-        depths: Dict[str, int] = {start_url: 0}
+        store, visited, depths = await self._restore_frontier(start_url, queue)
 
-        while not queue.empty() and not self._cancel_event.is_set():
-            # Stop if we've reached the max pages limit
-            if self._pages_crawled >= self.max_pages:
-                self.logger.info(f"Max pages limit ({self.max_pages}) reached, stopping crawl")
-                break
-                
-            # Calculate how many more URLs we can process in this batch
-            remaining = self.max_pages - self._pages_crawled
-            batch_size = min(BATCH_SIZE, remaining)
-            if batch_size <= 0:
-                # No more pages to crawl
-                self.logger.info(f"Max pages limit ({self.max_pages}) reached, stopping crawl")
-                break
-                
-            batch: List[Tuple[float, int, str, Optional[str]]] = []
-            # Retrieve up to BATCH_SIZE items from the priority queue.
-            for _ in range(BATCH_SIZE):
-                if queue.empty():
+        try:
+            while not queue.empty() and not self._cancel_event.is_set():
+                # Stop if we've reached the max pages limit
+                if self._pages_crawled >= self.max_pages:
+                    self.logger.info(f"Max pages limit ({self.max_pages}) reached, stopping crawl")
                     break
-                item = await queue.get()
-                score, depth, url, parent_url = item
-                if url in visited:
-                    continue
-                visited.add(url)
-                batch.append(item)
 
-            if not batch:
-                continue
+                # Calculate how many more URLs we can process in this batch
+                remaining = self.max_pages - self._pages_crawled
+                batch_size = min(BATCH_SIZE, remaining)
+                if batch_size <= 0:
+                    # No more pages to crawl
+                    self.logger.info(f"Max pages limit ({self.max_pages}) reached, stopping crawl")
+                    break
+
+                batch: List[Tuple[float, int, str, Optional[str]]] = []
+                # Retrieve up to BATCH_SIZE items from the priority queue.
+                for _ in range(BATCH_SIZE):
+                    if queue.empty():
+                        break
+                    item = await queue.get()
+                    score, depth, url, parent_url = item
+                    if url in visited:
+                        continue
+                    visited.add(url)
+                    batch.append(item)
 
-            # Process the current batch of URLs.
-            urls = [item[2] for item in batch]
-            batch_config = config.clone(deep_crawl_strategy=None, stream=True)
-            stream_gen = await crawler.arun_many(urls=urls, config=batch_config)
-            async for result in stream_gen:
-                result_url = result.url
-                # Find the corresponding tuple from the batch.
-                corresponding = next((item for item in batch if item[2] == result_url), None)
-                if not corresponding:
+                if not batch:
                     continue
-                score, depth, url, parent_url = corresponding
-                result.metadata = result.metadata or {}
-                result.metadata["depth"] = depth
-                result.metadata["parent_url"] = parent_url
-                result.metadata["score"] = -score
-                
-                # Count only successful crawls toward max_pages limit
-                if result.success:
-                    self._pages_crawled += 1
-                    # Check if we've reached the limit during batch processing
-                    if self._pages_crawled >= self.max_pages:
-                        self.logger.info(f"Max pages limit ({self.max_pages}) reached during batch, stopping crawl")
-                        break  # Exit the generator
-                
-                yield result
-                
-                # Only discover links from successful crawls
-                if result.success:
-                    # Discover new links from this result
-                    new_links: List[Tuple[str, Optional[str]]] = []
-                    await self.link_discovery(result, result_url, depth, visited, new_links, depths)
-                    
-                    for new_url, new_parent in new_links:
-                        new_depth = depths.get(new_url, depth + 1)
-                        new_score = self.url_scorer.score(new_url) if self.url_scorer else 0
-                        await queue.put((-new_score, new_depth, new_url, new_parent))
+
+                # Process the current batch of URLs.
+                urls = [item[2] for item in batch]
+                pending = _PendingUrls((item[2], item) for item in batch)
+                if store:
+                    await store.mark_in_flight(urls)
+                batch_config = config.clone(deep_crawl_strategy=None, stream=True)
+                stream_gen = await crawler.arun_many(urls=urls, config=batch_config)
+                async for result in stream_gen:
+                    result_url = result.url
+                    # Find the corresponding tuple from the batch, following redirects.
+                    match = pending.pop(result)
+                    if not match:
+                        self.logger.warning(f"Result for {result_url} matches no queued URL, skipping")
+                        continue
+                    score, depth, url, parent_url = match[1]
+                    result.metadata = result.metadata or {}
+                    result.metadata["depth"] = depth
+                    result.metadata["parent_url"] = parent_url
+                    result.metadata["score"] = -score
+
+                    # Count only successful crawls toward max_pages limit
+                    if result.success:
+                        self._pages_crawled += 1
+                        # Check if we've reached the limit during batch processing
+                        if self._pages_crawled >= self.max_pages:
+                            self.logger.info(f"Max pages limit ({self.max_pages}) reached during batch, stopping crawl")
+                            if store:
+                                await store.mark_done(url, result.success)
+                            break  # Exit the generator
+
+                    yield result
+
+                    # Only discover links from successful crawls
+                    if result.success:
+                        # Discover new links from this result
+                        new_links: List[Tuple[str, Optional[str]]] = []
+                        await self.link_discovery(
+                            result, _page_url(result, visited), depth, visited, new_links, depths
+                        )
+
+                        new_entries = []
+                        for new_url, new_parent in new_links:
+                            new_depth = depths.pop(new_url, depth + 1)
+                            new_score = self.url_scorer.score(new_url) if self.url_scorer else 0
+                            await queue.put((-new_score, new_depth, new_url, new_parent))
+                            new_entries.append(FrontierEntry(new_url, new_depth, new_parent, new_score))
+                            if store:
+                                visited.add_unfinished(new_url)
+                        if store:
+                            await store.add(new_entries)
+                    if store:
+                        await store.mark_done(url, result.success)
+                else:
+                    # The batch is complete; URLs that returned no result are done as well
+                    if store:
+                        for url in pending.urls():
+                            await store.mark_done(url)
+        finally:
+            if store:
+                await close_frontier(store, self.resume_from)
 
         # End of crawl.
 
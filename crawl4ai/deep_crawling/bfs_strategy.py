@@ -1,14 +1,20 @@
 # bfs_deep_crawl_strategy.py
 import asyncio
+import heapq
+import itertools
 import logging
 from datetime import datetime
-from typing import AsyncGenerator, Optional, Set, Dict, List, Tuple
+from collections import defaultdict
+from typing import AsyncGenerator, Optional, Set, Dict, List, Tuple, Union
 from urllib.parse import urlparse
 
+from ..frontier import DONE, FrontierEntry, FrontierStore, close_frontier, open_frontier
 from ..models import TraversalStats
 from .filters import FilterChain
 from .scorers import URLScorer
 from . import DeepCrawlStrategy  
+from .base_strategy import _PendingUrls, _ResumedVisited, _page_url
+from .visited import VisitedSet
 from ..types import AsyncWebCrawler, CrawlerRunConfig, CrawlResult
 from ..utils import normalize_url_for_deep_crawl, efficient_normalize_url_for_deep_crawl
 from math import inf as infinity
@@ -21,6 +27,11 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
       - arun: Main entry point; splits execution into batch or stream modes.
       - link_discovery: Extracts, filters, and (if needed) scores the outgoing URLs.
       - can_process_url: Validates URL format and applies the filter chain.
+
+    With pipelined=True, levels are not crawled one arun_many call at a time:
+    a single arun_many call is fed from a depth-ordered queue, so the links of
+    a finished page are crawled as soon as a session is free instead of after
+    the slowest page of its level.
     """
     def __init__(
         self,
@@ -31,6 +42,9 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
         score_threshold: float = -infinity,
         max_pages: int = infinity,
         logger: Optional[logging.Logger] = None,
+        resume_from: Optional[Union[str, FrontierStore]] = None,
+        pipelined: bool = False,
+        visited_set: Optional[VisitedSet] = None,
     ):
         self.max_depth = max_depth
         self.filter_chain = filter_chain
@@ -38,6 +52,12 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
         self.include_external = include_external
         self.score_threshold = score_threshold
         self.max_pages = max_pages
+        # Frontier file or store the crawl is persisted to and resumed from
+        self.resume_from = resume_from
+        # Crawl discovered links without waiting for the rest of their level
+        self.pipelined = pipelined
+        # Set of seen URLs to use instead of a plain set, e.g. to save memory
+        self.visited_set = visited_set
         # self.logger = logger or logging.getLogger(__name__)
         # Ensure logger is always a Logger instance, not a dict from serialization
         if isinstance(logger, logging.Logger):
@@ -145,6 +165,32 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
             next_level.append((url, source_url))
             depths[url] = next_depth
 
+    async def _restore_frontier(self, start_url: str):
+        """
+        Opens the resume_from frontier and rebuilds the crawl state from it.
+        Returns (store, visited, current_level, depths, later_levels), where
+        later_levels maps depth to the URLs already discovered for that level.
+        Without resume_from, or with an empty store, the crawl starts at start_url.
+        """
+        fresh = (self._new_visited(), [(start_url, None)], {start_url: 0}, {})
+        if self.resume_from is None:
+            return (None, *fresh)
+        store = open_frontier(self.resume_from)
+        await store.open()
+        if not await store.count():
+            await store.add([FrontierEntry(start_url)])
+            return (store, *fresh)
+
+        self._pages_crawled = await store.count(DONE)
+        levels: Dict[int, List[Tuple[str, Optional[str]]]] = defaultdict(list)
+        depths: Dict[str, int] = {}
+        for entry in await store.unfinished():
+            levels[entry.depth].append((entry.url, entry.parent_url))
+            depths[entry.url] = entry.depth
+        current_level = levels.pop(min(levels)) if levels else []
+        visited = _ResumedVisited(self._new_visited(), store)
+        return store, visited, current_level, depths, dict(levels)
+
     async def _arun_batch(
         self,
         start_url: str,
@@ -155,48 +201,79 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
         Batch (non-streaming) mode:
         Processes one BFS level at a time, then yields all the results.
         """
-        visited: Set[str] = set()
+        if self.pipelined:
+            return [result async for result in self._arun_pipelined(start_url, crawler, config)]
+
         # current_level holds tuples: (url, parent_url)
-        current_level: List[Tuple[str, Optional[str]]] = [(start_url, None)]
-        depths: Dict[str, int] = {start_url: 0}
+        store, visited, current_level, depths, later_levels = await self._restore_frontier(start_url)
 
         results: List[CrawlResult] = []
 
-        while current_level and not self._cancel_event.is_set():
-            # Check if we've already reached max_pages before starting a new level
-            if self._pages_crawled >= self.max_pages:
-                self.logger.info(f"Max pages limit ({self.max_pages}) reached, stopping crawl")
-                break
-            
-            next_level: List[Tuple[str, Optional[str]]] = []
-            urls = [url for url, _ in current_level]
+        try:
+            while current_level and not self._cancel_event.is_set():
+                # Check if we've already reached max_pages before starting a new level
+                if self._pages_crawled >= self.max_pages:
+                    self.logger.info(f"Max pages limit ({self.max_pages}) reached, stopping crawl")
+                    break
 
-            # Clone the config to disable deep crawling recursion and enforce batch mode.
-            batch_config = config.clone(deep_crawl_strategy=None, stream=False)
-            batch_results = await crawler.arun_many(urls=urls, config=batch_config)
-            
-            # Update pages crawled counter - count only successful crawls
-            successful_results = [r for r in batch_results if r.success]
-            self._pages_crawled += len(successful_results)
-            
-            for result in batch_results:
-                url = result.url
-                depth = depths.get(url, 0)
-                result.metadata = result.metadata or {}
-                result.metadata["depth"] = depth
-                parent_url = next((parent for (u, parent) in current_level if u == url), None)
-                result.metadata["parent_url"] = parent_url
-                results.append(result)
-                
-                # Only discover links from successful crawls
-                if result.success:
-                    # Link discovery will handle the max pages limit internally
-                    await self.link_discovery(result, url, depth, visited, next_level, depths)
+                next_level: List[Tuple[str, Optional[str]]] = (
+                    later_levels.pop(min(later_levels)) if later_levels else []
+                )
+                urls = [url for url, _ in current_level]
+                pending = _PendingUrls(current_level)
+                if store:
+                    await store.mark_in_flight(urls)
+
+                # Clone the config to disable deep crawling recursion and enforce batch mode.
+                batch_config = config.clone(deep_crawl_strategy=None, stream=False)
+                batch_results = await crawler.arun_many(urls=urls, config=batch_config)
+
+                # Update pages crawled counter - count only successful crawls
+                successful_results = [r for r in batch_results if r.success]
+                self._pages_crawled += len(successful_results)
 
-            current_level = next_level
+                for result in batch_results:
+                    url = result.url
+                    # Match the result to its queued URL, following redirects
+                    queued_url, parent_url = pending.pop(result) or (url, None)
+                    depth = depths.pop(queued_url, 0)
+                    result.metadata = result.metadata or {}
+                    result.metadata["depth"] = depth
+                    result.metadata["parent_url"] = parent_url
+                    results.append(result)
+
+                    # Only discover links from successful crawls
+                    if result.success:
+                        # Link discovery will handle the max pages limit internally
+                        discovered = len(next_level)
+                        await self.link_discovery(
+                            result, _page_url(result, visited), depth, visited, next_level, depths
+                        )
+                        if store:
+                            await self._persist_links(store, next_level[discovered:], depths)
+                    if store:
+                        await store.mark_done(queued_url, result.success)
+
+                if store:
+                    # URLs that returned no result are done as well
+                    for url in pending.urls():
+                        await store.mark_done(url)
+                current_level = next_level
+        finally:
+            if store:
+                await close_frontier(store, self.resume_from)
 
         return results
 
+    async def _persist_links(
+        self,
+        store: FrontierStore,
+        links: List[Tuple[str, Optional[str]]],
+        depths: Dict[str, int],
+    ) -> None:
+        """Records newly discovered (url, parent_url) pairs as pending in the frontier."""
+        await store.add(FrontierEntry(url, depths[url], parent) for url, parent in links)
+
     async def _arun_stream(
         self,
         start_url: str,
@@ -207,50 +284,160 @@ class BFSDeepCrawlStrategy(DeepCrawlStrategy):
         Streaming mode:
         Processes one BFS level at a time and yields results immediately as they arrive.
         """
-        visited: Set[str] = set()
-        current_level: List[Tuple[str, Optional[str]]] = [(start_url, None)]
-        depths: Dict[str, int] = {start_url: 0}
+        if self.pipelined:
+            async for result in self._arun_pipelined(start_url, crawler, config):
+                yield result
+            return
 
-        while current_level and not self._cancel_event.is_set():
-            next_level: List[Tuple[str, Optional[str]]] = []
-            urls = [url for url, _ in current_level]
-            visited.update(urls)
+        store, visited, current_level, depths, later_levels = await self._restore_frontier(start_url)
 
-            stream_config = config.clone(deep_crawl_strategy=None, stream=True)
-            stream_gen = await crawler.arun_many(urls=urls, config=stream_config)
-            
-            # Keep track of processed results for this batch
-            results_count = 0
+        try:
+            while current_level and not self._cancel_event.is_set():
+                next_level: List[Tuple[str, Optional[str]]] = (
+                    later_levels.pop(min(later_levels)) if later_levels else []
+                )
+                urls = [url for url, _ in current_level]
+                pending = _PendingUrls(current_level)
+                visited.update(urls)
+                if store:
+                    await store.mark_in_flight(urls)
+
+                stream_config = config.clone(deep_crawl_strategy=None, stream=True)
+                stream_gen = await crawler.arun_many(urls=urls, config=stream_config)
+
+                # Keep track of processed results for this batch
+                results_count = 0
+                level_complete = True
+                async for result in stream_gen:
+                    url = result.url
+                    # Match the result to its queued URL, following redirects
+                    queued_url, parent_url = pending.pop(result) or (url, None)
+                    depth = depths.pop(queued_url, 0)
+                    result.metadata = result.metadata or {}
+                    result.metadata["depth"] = depth
+                    result.metadata["parent_url"] = parent_url
+
+                    # Count only successful crawls
+                    if result.success:
+                        self._pages_crawled += 1
+                        # Check if we've reached the limit during batch processing
+                        if self._pages_crawled >= self.max_pages:
+                            self.logger.info(f"Max pages limit ({self.max_pages}) reached during batch, stopping crawl")
+                            if store:
+                                await store.mark_done(queued_url, result.success)
+                            level_complete = False
+                            break  # Exit the generator
+
+                    results_count += 1
+                    yield result
+
+                    # Only discover links from successful crawls
+                    if result.success:
+                        # Link discovery will handle the max pages limit internally
+                        discovered = len(next_level)
+                        await self.link_discovery(
+                            result, _page_url(result, visited), depth, visited, next_level, depths
+                        )
+                        if store:
+                            await self._persist_links(store, next_level[discovered:], depths)
+                    if store:
+                        await store.mark_done(queued_url, result.success)
+
+                # If we didn't get results back (e.g. due to errors), avoid getting stuck in an infinite loop
+                # by considering these URLs as visited but not counting them toward the max_pages limit
+                if results_count == 0 and urls:
+                    self.logger.warning(f"No results returned for {len(urls)} URLs, marking as visited")
+
+                if store and level_complete:
+                    # URLs that returned no result are done as well
+                    for url in pending.urls():
+                        await store.mark_done(url)
+                current_level = next_level
+        finally:
+            if store:
+                await close_frontier(store, self.resume_from)
+
+    async def _arun_pipelined(
+        self,
+        start_url: str,
+        crawler: AsyncWebCrawler,
+        config: CrawlerRunConfig,
+    ) -> AsyncGenerator[CrawlResult, None]:
+        """
+        Pipelined mode:
+        Feeds one arun_many call from a queue ordered by depth, adding each page's
+        links as soon as it finishes. Shallower URLs are always handed out first,
+        so the traversal stays breadth-first apart from the URLs the dispatcher
+        has already taken. No more URLs are handed out than max_pages allows.
+        """
+        store, visited, current_level, depths, later_levels = await self._restore_frontier(start_url)
+
+        # Queue items: (depth, sequence, url, parent_url)
+        queue: List[Tuple[int, int, str, Optional[str]]] = []
+        sequence = itertools.count()
+
+        def push(url: str, parent_url: Optional[str]) -> None:
+            heapq.heappush(queue, (depths.get(url, 0), next(sequence), url, parent_url))
+
+        for url, parent_url in current_level:
+            push(url, parent_url)
+        for level in later_levels.values():
+            for url, parent_url in level:
+                push(url, parent_url)
+
+        pending = _PendingUrls()
+        in_flight = 0
+        changed = asyncio.Event()
+
+        async def urls():
+            nonlocal in_flight
+            while not self._cancel_event.is_set() and self._pages_crawled < self.max_pages:
+                if queue and self._pages_crawled + in_flight < self.max_pages:
+                    _, _, url, parent_url = heapq.heappop(queue)
+                    pending.add(url, parent_url)
+                    visited.add(url)
+                    in_flight += 1
+                    if store:
+                        await store.mark_in_flight([url])
+                    yield url
+                elif in_flight:
+                    # Wait for a result to bring new links or free up max_pages capacity
+                    changed.clear()
+                    await changed.wait()
+                else:
+                    return
+
+        stream_config = config.clone(deep_crawl_strategy=None, stream=True)
+        try:
+            stream_gen = await crawler.arun_many(urls=urls(), config=stream_config)
             async for result in stream_gen:
                 url = result.url
-                depth = depths.get(url, 0)
+                queued_url, parent_url = pending.pop(result) or (url, None)
+                depth = depths.pop(queued_url, 0)
                 result.metadata = result.metadata or {}
                 result.metadata["depth"] = depth
-                parent_url = next((parent for (u, parent) in current_level if u == url), None)
                 result.metadata["parent_url"] = parent_url
-                
-                # Count only successful crawls
                 if result.success:
                     self._pages_crawled += 1
-                    # Check if we've reached the limit during batch processing
-                    if self._pages_crawled >= self.max_pages:
-                        self.logger.info(f"Max pages limit ({self.max_pages}) reached during batch, stopping crawl")
-                        break  # Exit the generator
-                
-                results_count += 1
+
                 yield result
-                
-                # Only discover links from successful crawls
+
                 if result.success:
-                    # Link discovery will handle the max pages limit internally
-                    await self.link_discovery(result, url, depth, visited, next_level, depths)
-            
-            # If we didn't get results back (e.g. due to errors), avoid getting stuck in an infinite loop
-            # by considering these URLs as visited but not counting them toward the max_pages limit
-            if results_count == 0 and urls:
-                self.logger.warning(f"No results returned for {len(urls)} URLs, marking as visited")
-                
-            current_level = next_level
+                    next_level: List[Tuple[str, Optional[str]]] = []
+                    await self.link_discovery(
+                        result, _page_url(result, visited), depth, visited, next_level, depths
+                    )
+                    for link_url, link_parent in next_level:
+                        push(link_url, link_parent)
+                    if store:
+                        await self._persist_links(store, next_level, depths)
+                if store:
+                    await store.mark_done(queued_url, result.success)
+                in_flight -= 1
+                changed.set()
+        finally:
+            if store:
+                await close_frontier(store, self.resume_from)
 
     async def shutdown(self) -> None:
         """
@@ -1,5 +1,5 @@
 # dfs_deep_crawl_strategy.py
-from typing import AsyncGenerator, Optional, Set, Dict, List, Tuple
+from typing import AsyncGenerator, Optional, Dict, List, Tuple
 
 from ..models import CrawlResult
 from .bfs_strategy import BFSDeepCrawlStrategy  # noqa
@@ -11,7 +11,15 @@ class DFSDeepCrawlStrategy(BFSDeepCrawlStrategy):
 
     Inherits URL validation and link discovery from BFSDeepCrawlStrategy.
     Overrides _arun_batch and _arun_stream to use a stack (LIFO) for DFS traversal.
+    Frontier persistence (resume_from) and pipelined crawling are BFS-only.
     """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.resume_from is not None:
+            raise ValueError("DFSDeepCrawlStrategy does not support resume_from")
+        if self.pipelined:
+            raise ValueError("DFSDeepCrawlStrategy does not support pipelined crawling")
+
     async def _arun_batch(
         self,
         start_url: str,
@@ -22,7 +30,7 @@ class DFSDeepCrawlStrategy(BFSDeepCrawlStrategy):
         Batch (non-streaming) DFS mode.
         Uses a stack to traverse URLs in DFS order, aggregating CrawlResults into a list.
         """
-        visited: Set[str] = set()
+        visited = self._new_visited()
         # Stack items: (url, parent_url, depth)
         stack: List[Tuple[str, Optional[str], int]] = [(start_url, None, 0)]
         depths: Dict[str, int] = {start_url: 0}
@@ -30,7 +38,9 @@ class DFSDeepCrawlStrategy(BFSDeepCrawlStrategy):
 
         while stack and not self._cancel_event.is_set():
             url, parent, depth = stack.pop()
-            if url in visited or depth > self.max_depth:
+            # link_discovery marks links as visited when it returns them,
+            # so popped URLs are new and only need the depth check
+            if depth > self.max_depth:
                 continue
             visited.add(url)
 
@@ -60,7 +70,7 @@ class DFSDeepCrawlStrategy(BFSDeepCrawlStrategy):
                     
                     # Push new links in reverse order so the first discovered is processed next.
                     for new_url, new_parent in reversed(new_links):
-                        new_depth = depths.get(new_url, depth + 1)
+                        new_depth = depths.pop(new_url, depth + 1)
                         stack.append((new_url, new_parent, new_depth))
         return results
 
@@ -74,13 +84,15 @@ class DFSDeepCrawlStrategy(BFSDeepCrawlStrategy):
         Streaming DFS mode.
         Uses a stack to traverse URLs in DFS order and yields CrawlResults as they become available.
         """
-        visited: Set[str] = set()
+        visited = self._new_visited()
         stack: List[Tuple[str, Optional[str], int]] = [(start_url, None, 0)]
         depths: Dict[str, int] = {start_url: 0}
 
         while stack and not self._cancel_event.is_set():
             url, parent, depth = stack.pop()
-            if url in visited or depth > self.max_depth:
+            # link_discovery marks links as visited when it returns them,
+            # so popped URLs are new and only need the depth check
+            if depth > self.max_depth:
                 continue
             visited.add(url)
 
@@ -106,5 +118,5 @@ class DFSDeepCrawlStrategy(BFSDeepCrawlStrategy):
                     new_links: List[Tuple[str, Optional[str]]] = []
                     await self.link_discovery(result, url, depth, visited, new_links, depths)
                     for new_url, new_parent in reversed(new_links):
-                        new_depth = depths.get(new_url, depth + 1)
+                        new_depth = depths.pop(new_url, depth + 1)
                         stack.append((new_url, new_parent, new_depth))
@@ -0,0 +1,214 @@
+"""
+Visited-URL sets for deep crawls.
+
+Deep crawl strategies only add URLs to their visited set and test membership,
+so the set can trade exactness for memory. A plain `set` keeps every
+normalized URL string (well over 100 bytes per URL); the sets here keep a
+64-bit hash per URL, or a few bits per URL in a Bloom filter.
+"""
+import math
+import os
+import sqlite3
+import tempfile
+import weakref
+from abc import ABC, abstractmethod
+from array import array
+from contextlib import suppress
+from typing import Iterable, Optional, Set
+
+import xxhash
+
+_MASK_64 = (1 << 64) - 1
+
+
+class VisitedSet(ABC):
+    """Set of URLs a deep crawl has seen; only supports adding and membership tests."""
+
+    @abstractmethod
+    def add(self, url: str) -> None:
+        """Record a URL as seen"""
+
+    @abstractmethod
+    def __contains__(self, url: str) -> bool:
+        """Whether a URL was seen"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Number of distinct URLs added"""
+
+    @abstractmethod
+    def empty_copy(self) -> "VisitedSet":
+        """A new, empty set with the same settings, for the next crawl"""
+
+    def update(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self.add(url)
+
+
+class HashedVisitedSet(VisitedSet):
+    """
+    Exact-in-practice visited set of 64-bit URL hashes.
+
+    Hashes are kept in an open-addressing table backed by an `array`, about
+    12-24 bytes per URL. Two URLs with the same 64-bit hash count as one; the
+    chance of any such collision among 10 million URLs is about 3 in a million.
+    """
+
+    def __init__(self, initial_capacity: int = 1024):
+        self.initial_capacity = initial_capacity
+        size = 1 << max(4, (initial_capacity * 2 - 1).bit_length())
+        self._table = array("Q", [0]) * size
+        self._mask = size - 1
+        self._count = 0
+
+    @staticmethod
+    def _hash(url: str) -> int:
+        # 0 marks an empty slot
+        return xxhash.xxh3_64_intdigest(url) or 1
+
+    def _slot(self, key: int) -> int:
+        table, mask = self._table, self._mask
+        index = key & mask
+        while True:
+            value = table[index]
+            if value == 0 or value == key:
+                return index
+            index = (index + 1) & mask
+
+    def add(self, url: str) -> None:
+        key = self._hash(url)
+        index = self._slot(key)
+        if self._table[index]:
+            return
+        self._table[index] = key
+        self._count += 1
+        # Keep the load factor below 0.7 so that probe chains stay short
+        if self._count * 10 > len(self._table) * 7:
+            self._grow()
+
+    def _grow(self) -> None:
+        old = self._table
+        self._table = array("Q", [0]) * (len(old) * 2)
+        self._mask = len(self._table) - 1
+        for key in old:
+            if key:
+                self._table[self._slot(key)] = key
+
+    def __contains__(self, url: str) -> bool:
+        return self._table[self._slot(self._hash(url))] != 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def empty_copy(self) -> "HashedVisitedSet":
+        return HashedVisitedSet(self.initial_capacity)
+
+
+def _drop_scratch_db(db: sqlite3.Connection, path: str) -> None:
+    db.close()
+    with suppress(OSError):
+        os.remove(path)
+
+
+class BloomVisitedSet(VisitedSet):
+    """
+    Visited set in a Bloom filter, optionally backed by an exact set on disk.
+
+    The filter is sized for `capacity` URLs at `error_rate` false positives
+    (about 1.8 bytes per URL at 0.1%). Without `exact_path`, a false positive
+    means a URL is treated as seen and never crawled. With `exact_path`, URLs
+    are also written to a SQLite file next to that path, and URLs the filter
+    reports as seen are confirmed against it, so membership is exact and only
+    those lookups touch the disk. Every set, including each empty_copy, gets
+    its own scratch file, created on the first write and removed when the set
+    is closed or garbage collected.
+    """
+
+    def __init__(
+        self,
+        capacity: int = 10_000_000,
+        error_rate: float = 0.001,
+        exact_path: Optional[str] = None,
+        write_batch_size: int = 1000,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.exact_path = exact_path
+        self.write_batch_size = write_batch_size
+        self._size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._bits = bytearray((self._size + 7) // 8)
+        self._count = 0
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_path: Optional[str] = None
+        self._drop_db: Optional[weakref.finalize] = None
+        self._unwritten: Set[str] = set()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Create this set's scratch file next to exact_path and open it"""
+        if self._db is None:
+            directory, name = os.path.split(os.path.abspath(self.exact_path))
+            stem, ext = os.path.splitext(name)
+            fd, self._db_path = tempfile.mkstemp(prefix=f"{stem}-", suffix=ext or ".db", dir=directory)
+            os.close(fd)
+            self._db = sqlite3.connect(self._db_path)
+            self._db.execute("PRAGMA journal_mode=OFF")
+            self._db.execute("PRAGMA synchronous=OFF")
+            self._db.execute("CREATE TABLE seen (url TEXT PRIMARY KEY) WITHOUT ROWID")
+            self._drop_db = weakref.finalize(self, _drop_scratch_db, self._db, self._db_path)
+        return self._db
+
+    def _positions(self, url: str):
+        # Double hashing: k positions from the two halves of one 128-bit hash
+        digest = xxhash.xxh3_128_intdigest(url)
+        h1, h2 = digest & _MASK_64, (digest >> 64) | 1
+        return [(h1 + i * h2) % self._size for i in range(self._hashes)]
+
+    def _in_filter(self, positions) -> bool:
+        bits = self._bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in positions)
+
+    def _on_disk(self, url: str) -> bool:
+        if url in self._unwritten:
+            return True
+        if self._db is None:
+            return False
+        return self._db.execute("SELECT 1 FROM seen WHERE url = ?", (url,)).fetchone() is not None
+
+    def add(self, url: str) -> None:
+        positions = self._positions(url)
+        if self._in_filter(positions) and (self.exact_path is None or self._on_disk(url)):
+            return
+        for p in positions:
+            self._bits[p >> 3] |= 1 << (p & 7)
+        self._count += 1
+        if self.exact_path is not None:
+            self._unwritten.add(url)
+            if len(self._unwritten) >= self.write_batch_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        db = self._connect()
+        db.executemany("INSERT OR IGNORE INTO seen (url) VALUES (?)", ((u,) for u in self._unwritten))
+        db.commit()
+        self._unwritten.clear()
+
+    def __contains__(self, url: str) -> bool:
+        if not self._in_filter(self._positions(url)):
+            return False
+        return self.exact_path is None or self._on_disk(url)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        """Close and remove the scratch file, if any; the set is empty afterwards"""
+        if self._drop_db is not None:
+            self._drop_db()
+        self._db = self._db_path = self._drop_db = None
+        self._bits = bytearray(len(self._bits))
+        self._count = 0
+        self._unwritten.clear()
+
+    def empty_copy(self) -> "BloomVisitedSet":
+        return BloomVisitedSet(self.capacity, self.error_rate, self.exact_path, self.write_batch_size)
@@ -0,0 +1,637 @@
+"""
+Durable crawl frontier.
+
+A frontier store records every URL a run has seen and whether it is pending,
+in flight or done, so that `arun_many` and the deep crawl strategies can be
+resumed with `resume_from=` after a restart without re-crawling finished URLs.
+
+A lease frontier is a URL queue shared by the workers of a distributed crawl,
+used by DistributedDispatcher.
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Deque, Dict, Iterable, List, Optional, Set, Tuple, Union
+from urllib.parse import urlparse
+
+import aiosqlite
+
+# URL states
+PENDING = 0
+IN_FLIGHT = 1
+DONE = 2
+FAILED = 3
+
+
+@dataclass
+class FrontierEntry:
+    url: str
+    depth: int = 0
+    parent_url: Optional[str] = None
+    score: float = 0.0
+
+
+class FrontierStore(ABC):
+    """
+    Persistent record of a crawl's URLs and their state.
+
+    Writes may be buffered; everything written before `flush` (or `close`)
+    survives a restart. URLs that were in flight when a run stopped are
+    pending again when it resumes.
+    """
+
+    @abstractmethod
+    async def open(self) -> None:
+        """Open the store, creating it if needed"""
+
+    @abstractmethod
+    async def close(self) -> None:
+        """Flush pending writes and release the store"""
+
+    @abstractmethod
+    async def add(self, entries: Iterable[FrontierEntry]) -> List[FrontierEntry]:
+        """Record new pending URLs; returns the entries whose URL was not known yet"""
+
+    @abstractmethod
+    async def mark_in_flight(self, urls: Iterable[str]) -> None:
+        """Record that crawls of these URLs have started"""
+
+    @abstractmethod
+    async def mark_done(self, url: str, success: bool = True) -> None:
+        """Record that a URL was crawled, successfully or not"""
+
+    @abstractmethod
+    async def unfinished(self) -> List[FrontierEntry]:
+        """Pending and in-flight URLs, in the order they were added"""
+
+    @abstractmethod
+    def is_known(self, url: str) -> bool:
+        """Whether the URL was ever added, whatever its state"""
+
+    @abstractmethod
+    async def count(self, *states: int) -> int:
+        """Number of URLs in any of the given states (all URLs if none given)"""
+
+    async def flush(self) -> None:
+        """Write buffered changes"""
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+
+class SQLiteFrontierStore(FrontierStore):
+    """
+    Frontier store in a local SQLite database.
+
+    State changes are buffered and written in one transaction once
+    `batch_size` of them are queued or `flush_interval` seconds have passed,
+    so at most that much progress is crawled again after a crash. The set of
+    known URLs is kept in memory for duplicate checks.
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 1.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._db: Optional[aiosqlite.Connection] = None
+        self._known: Set[str] = set()
+        self._next_seq = 0
+        self._inserts: List[Tuple] = []
+        self._states: Dict[str, int] = {}
+        self._last_flush = time.monotonic()
+
+    async def open(self) -> None:
+        if self._db is not None:
+            return
+        self._db = await aiosqlite.connect(self.path)
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
+        await self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS frontier (
+                url TEXT PRIMARY KEY,
+                depth INTEGER NOT NULL DEFAULT 0,
+                parent_url TEXT,
+                score REAL NOT NULL DEFAULT 0,
+                state INTEGER NOT NULL DEFAULT 0,
+                seq INTEGER NOT NULL
+            )
+            """
+        )
+        await self._db.execute("CREATE INDEX IF NOT EXISTS idx_frontier_state ON frontier(state, seq)")
+        # Crawls that were running when the last run stopped start over
+        await self._db.execute("UPDATE frontier SET state = ? WHERE state = ?", (PENDING, IN_FLIGHT))
+        await self._db.commit()
+
+        async with self._db.execute("SELECT url FROM frontier") as cursor:
+            self._known = {url async for (url,) in cursor}
+        async with self._db.execute("SELECT COALESCE(MAX(seq), -1) + 1 FROM frontier") as cursor:
+            (self._next_seq,) = await cursor.fetchone()
+
+    async def close(self) -> None:
+        if self._db is None:
+            return
+        await self.flush()
+        await self._db.close()
+        self._db = None
+
+    async def add(self, entries: Iterable[FrontierEntry]) -> List[FrontierEntry]:
+        added = []
+        for entry in entries:
+            if entry.url in self._known:
+                continue
+            self._known.add(entry.url)
+            self._inserts.append(
+                (entry.url, entry.depth, entry.parent_url, entry.score, PENDING, self._next_seq)
+            )
+            self._next_seq += 1
+            added.append(entry)
+        await self._maybe_flush()
+        return added
+
+    async def mark_in_flight(self, urls: Iterable[str]) -> None:
+        for url in urls:
+            self._states[url] = IN_FLIGHT
+        await self._maybe_flush()
+
+    async def mark_done(self, url: str, success: bool = True) -> None:
+        self._states[url] = DONE if success else FAILED
+        await self._maybe_flush()
+
+    async def unfinished(self) -> List[FrontierEntry]:
+        await self.flush()
+        async with self._db.execute(
+            "SELECT url, depth, parent_url, score FROM frontier WHERE state IN (?, ?) ORDER BY seq",
+            (PENDING, IN_FLIGHT),
+        ) as cursor:
+            return [FrontierEntry(*row) async for row in cursor]
+
+    def is_known(self, url: str) -> bool:
+        return url in self._known
+
+    async def count(self, *states: int) -> int:
+        await self.flush()
+        if states:
+            query = f"SELECT COUNT(*) FROM frontier WHERE state IN ({','.join('?' * len(states))})"
+        else:
+            query = "SELECT COUNT(*) FROM frontier"
+        async with self._db.execute(query, states) as cursor:
+            return (await cursor.fetchone())[0]
+
+    async def _maybe_flush(self) -> None:
+        if (
+            len(self._inserts) + len(self._states) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        self._last_flush = time.monotonic()
+        if not (self._inserts or self._states):
+            return
+        inserts, self._inserts = self._inserts, []
+        states, self._states = self._states, {}
+        # Inserts go first so that state changes of URLs added in the same batch apply
+        await self._db.executemany(
+            "INSERT OR IGNORE INTO frontier (url, depth, parent_url, score, state, seq) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            inserts,
+        )
+        await self._db.executemany(
+            "UPDATE frontier SET state = ? WHERE url = ?",
+            [(state, url) for url, state in states.items()],
+        )
+        await self._db.commit()
+
+
+def open_frontier(resume_from: Union[str, FrontierStore]) -> FrontierStore:
+    """Return the store for a `resume_from=` value: a store, or the path of a SQLite frontier"""
+    if isinstance(resume_from, FrontierStore):
+        return resume_from
+    return SQLiteFrontierStore(resume_from)
+
+
+async def close_frontier(store: FrontierStore, resume_from: Union[str, FrontierStore]) -> None:
+    """Close a store opened by `open_frontier`; stores passed in by the caller are only flushed"""
+    if store is resume_from:
+        await store.flush()
+    else:
+        await store.close()
+
+
+async def resume_urls(store: FrontierStore, urls) -> AsyncIterator:
+    """
+    Yield the URLs of a resumed `arun_many` run: first the URLs the store has
+    not finished, then the items of `urls` (URLs or (url, config) pairs) the
+    store has never seen. Every yielded URL is recorded as in flight.
+    """
+    for entry in await store.unfinished():
+        await store.mark_in_flight([entry.url])
+        yield entry.url
+
+    async def _items():
+        if urls is None:
+            return
+        if hasattr(urls, "__aiter__"):
+            async for item in urls:
+                yield item
+        else:
+            for item in urls:
+                yield item
+
+    async for item in _items():
+        url = item if isinstance(item, str) else item[0]
+        if await store.add([FrontierEntry(url)]):
+            await store.mark_in_flight([url])
+            yield item
+
+
+class LeaseFrontier(ABC):
+    """
+    URL queue shared by the workers of a distributed crawl.
+
+    Workers claim URLs in batches under a lease, renew the lease while they
+    crawl, and complete each URL when its crawl ends. Leases that are not
+    renewed in time expire and their URLs go back to the queue. URLs are
+    deduplicated across all workers, and a domain is handed out at most once
+    per `politeness_delay` seconds.
+
+    Workers that add URLs do so inside `seeding()`. The crawl is finished once
+    seeding has started, every seeder has finished and every URL is complete,
+    so workers that join before the seeders do wait for them.
+    """
+
+    @abstractmethod
+    async def add(self, urls: Iterable[str]) -> int:
+        """Queue URLs never seen before; returns how many were new"""
+
+    @abstractmethod
+    async def claim(self, worker_id: str, count: int, lease_seconds: float) -> List[str]:
+        """Lease up to `count` URLs from domains that are ready to be crawled"""
+
+    @abstractmethod
+    async def heartbeat(self, worker_id: str, urls: Iterable[str], lease_seconds: float) -> int:
+        """Extend this worker's leases; returns how many it still held"""
+
+    @abstractmethod
+    async def complete(self, url: str, success: bool = True) -> bool:
+        """Mark a URL finished; returns False if it was already finished"""
+
+    @abstractmethod
+    async def requeue_expired(self) -> int:
+        """Return URLs with expired leases to the queue; returns how many"""
+
+    @abstractmethod
+    async def stats(self) -> Dict[str, int]:
+        """Counts of pending, leased, done and failed URLs"""
+
+    @abstractmethod
+    async def next_ready_time(self) -> Optional[float]:
+        """When the next queued domain can be claimed, or None if nothing is queued"""
+
+    @abstractmethod
+    async def begin_seeding(self) -> None:
+        """Register a worker that is adding URLs"""
+
+    @abstractmethod
+    async def end_seeding(self) -> None:
+        """Unregister a worker registered with begin_seeding"""
+
+    @abstractmethod
+    async def seeding_finished(self) -> bool:
+        """Whether a worker has seeded the frontier and none is seeding now"""
+
+    @asynccontextmanager
+    async def seeding(self):
+        """Add URLs as a seeder: other workers do not finish before the block exits"""
+        await self.begin_seeding()
+        try:
+            yield self
+        finally:
+            await self.end_seeding()
+
+    async def is_finished(self) -> bool:
+        """Whether seeding is finished and every URL added has been completed"""
+        if not await self.seeding_finished():
+            return False
+        stats = await self.stats()
+        return stats["pending"] == 0 and stats["leased"] == 0
+
+
+def _domain(url: str) -> str:
+    return urlparse(url).netloc
+
+
+class LocalLeaseFrontier(LeaseFrontier):
+    """
+    In-process lease frontier, for tests and for several dispatchers sharing
+    one event loop. Use RedisLeaseFrontier across processes or machines.
+    """
+
+    def __init__(self, politeness_delay: float = 0.0):
+        self.politeness_delay = politeness_delay
+        self._seen: Set[str] = set()
+        self._queues: Dict[str, Deque[str]] = {}
+        self._next_claim: Dict[str, float] = {}
+        self._leases: Dict[str, Tuple[str, float]] = {}  # url -> (worker_id, expiry)
+        self._done = 0
+        self._failed = 0
+        self._seeders = 0
+        self._seeded = False
+
+    async def begin_seeding(self) -> None:
+        self._seeders += 1
+        self._seeded = True
+
+    async def end_seeding(self) -> None:
+        self._seeders -= 1
+
+    async def seeding_finished(self) -> bool:
+        return self._seeded and self._seeders <= 0
+
+    async def add(self, urls: Iterable[str]) -> int:
+        added = 0
+        for url in urls:
+            if url in self._seen:
+                continue
+            self._seen.add(url)
+            self._queues.setdefault(_domain(url), deque()).append(url)
+            added += 1
+        return added
+
+    async def claim(self, worker_id: str, count: int, lease_seconds: float) -> List[str]:
+        now = time.time()
+        ready = deque(
+            domain for domain in self._queues if self._next_claim.get(domain, 0) <= now
+        )
+        claimed = []
+        while ready and len(claimed) < count:
+            domain = ready.popleft()
+            queue = self._queues[domain]
+            url = queue.popleft()
+            self._leases[url] = (worker_id, now + lease_seconds)
+            claimed.append(url)
+            if not queue:
+                del self._queues[domain]
+            if self.politeness_delay > 0:
+                self._next_claim[domain] = now + self.politeness_delay
+            elif queue:
+                ready.append(domain)
+        return claimed
+
+    async def heartbeat(self, worker_id: str, urls: Iterable[str], lease_seconds: float) -> int:
+        expiry = time.time() + lease_seconds
+        renewed = 0
+        for url in urls:
+            lease = self._leases.get(url)
+            if lease and lease[0] == worker_id:
+                self._leases[url] = (worker_id, expiry)
+                renewed += 1
+        return renewed
+
+    async def complete(self, url: str, success: bool = True) -> bool:
+        if self._leases.pop(url, None) is None:
+            queue = self._queues.get(_domain(url))
+            if not queue or url not in queue:
+                return False
+            queue.remove(url)
+            if not queue:
+                del self._queues[_domain(url)]
+        if success:
+            self._done += 1
+        else:
+            self._failed += 1
+        return True
+
+    async def requeue_expired(self) -> int:
+        now = time.time()
+        expired = [url for url, (_, expiry) in self._leases.items() if expiry <= now]
+        for url in expired:
+            del self._leases[url]
+            self._queues.setdefault(_domain(url), deque()).appendleft(url)
+        return len(expired)
+
+    async def stats(self) -> Dict[str, int]:
+        return {
+            "pending": sum(len(queue) for queue in self._queues.values()),
+            "leased": len(self._leases),
+            "done": self._done,
+            "failed": self._failed,
+        }
+
+    async def next_ready_time(self) -> Optional[float]:
+        if not self._queues:
+            return None
+        return min(self._next_claim.get(domain, 0) for domain in self._queues)
+
+
+# Redis scripts. Pending and leased URLs map to their domain in `domain_of`;
+# `domains` scores each domain with a non-empty queue by when it may be claimed
+# next, and `next_claim` remembers that time while a domain's queue is empty.
+# `seeders` counts the workers adding URLs and `seeded` is set by the first.
+_ADD_SCRIPT = """
+local added = 0
+for i = 2, #ARGV, 2 do
+    local url, domain = ARGV[i], ARGV[i + 1]
+    if redis.call('SADD', KEYS[1], url) == 1 then
+        redis.call('RPUSH', ARGV[1] .. 'queue:' .. domain, url)
+        redis.call('HSET', KEYS[4], url, domain)
+        if not redis.call('ZSCORE', KEYS[2], domain) then
+            redis.call('ZADD', KEYS[2], tonumber(redis.call('HGET', KEYS[3], domain) or 0), domain)
+        end
+        added = added + 1
+    end
+end
+return added
+"""
+
+_CLAIM_SCRIPT = """
+local count, now = tonumber(ARGV[3]), tonumber(ARGV[4])
+local expiry, delay = now + tonumber(ARGV[5]), tonumber(ARGV[6])
+local claimed = {}
+local domains = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, count)
+while #claimed < count and #domains > 0 do
+    local ready = {}
+    for _, domain in ipairs(domains) do
+        if #claimed >= count then break end
+        local queue = ARGV[1] .. 'queue:' .. domain
+        local url = redis.call('LPOP', queue)
+        if url then
+            redis.call('ZADD', KEYS[3], expiry, url)
+            redis.call('HSET', KEYS[4], url, ARGV[2])
+            claimed[#claimed + 1] = url
+        end
+        if redis.call('LLEN', queue) == 0 then
+            redis.call('ZREM', KEYS[1], domain)
+            if delay > 0 then
+                redis.call('HSET', KEYS[2], domain, now + delay)
+            end
+        elseif delay > 0 then
+            redis.call('ZADD', KEYS[1], now + delay, domain)
+        else
+            ready[#ready + 1] = domain
+        end
+    end
+    domains = ready
+end
+return claimed
+"""
+
+_HEARTBEAT_SCRIPT = """
+local renewed = 0
+for i = 3, #ARGV do
+    if redis.call('HGET', KEYS[2], ARGV[i]) == ARGV[1] then
+        redis.call('ZADD', KEYS[1], 'XX', ARGV[2], ARGV[i])
+        renewed = renewed + 1
+    end
+end
+return renewed
+"""
+
+_COMPLETE_SCRIPT = """
+local domain = redis.call('HGET', KEYS[3], ARGV[2])
+if not domain then
+    return 0
+end
+redis.call('HDEL', KEYS[3], ARGV[2])
+redis.call('HDEL', KEYS[2], ARGV[2])
+if redis.call('ZREM', KEYS[1], ARGV[2]) == 0 then
+    local queue = ARGV[1] .. 'queue:' .. domain
+    redis.call('LREM', queue, 1, ARGV[2])
+    if redis.call('LLEN', queue) == 0 then
+        redis.call('ZREM', KEYS[5], domain)
+    end
+end
+redis.call('INCR', KEYS[4])
+return 1
+"""
+
+_REQUEUE_SCRIPT = """
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[2])
+for _, url in ipairs(expired) do
+    local domain = redis.call('HGET', KEYS[3], url)
+    redis.call('ZREM', KEYS[1], url)
+    redis.call('HDEL', KEYS[2], url)
+    redis.call('LPUSH', ARGV[1] .. 'queue:' .. domain, url)
+    if not redis.call('ZSCORE', KEYS[4], domain) then
+        redis.call('ZADD', KEYS[4], tonumber(redis.call('HGET', KEYS[5], domain) or 0), domain)
+    end
+end
+return #expired
+"""
+
+
+class RedisLeaseFrontier(LeaseFrontier):
+    """
+    Lease frontier in Redis, shared by every worker that uses the same `prefix`.
+
+    Each operation is one Lua script, so claims, renewals and completions are
+    atomic across workers. Lease expiry and politeness use the workers' clocks,
+    which should be kept in sync. Per-domain queues use keys built inside the
+    scripts, so the frontier needs a single Redis instance rather than a cluster.
+
+    Args:
+        redis: A `redis.asyncio.Redis` client.
+        prefix: Key prefix naming the crawl.
+        politeness_delay: Minimum seconds between claims of the same domain.
+    """
+
+    def __init__(self, redis, prefix: str = "crawl4ai:frontier", politeness_delay: float = 0.0):
+        self.redis = redis
+        self.prefix = prefix.rstrip(":") + ":"
+        self.politeness_delay = politeness_delay
+        self._add = redis.register_script(_ADD_SCRIPT)
+        self._claim = redis.register_script(_CLAIM_SCRIPT)
+        self._heartbeat = redis.register_script(_HEARTBEAT_SCRIPT)
+        self._complete = redis.register_script(_COMPLETE_SCRIPT)
+        self._requeue = redis.register_script(_REQUEUE_SCRIPT)
+
+    @classmethod
+    def from_url(cls, url: str = "redis://localhost:6379/0", **kwargs) -> "RedisLeaseFrontier":
+        try:
+            from redis import asyncio as aioredis
+        except ImportError:
+            raise ImportError("redis is required for RedisLeaseFrontier. Install with 'pip install redis'")
+        return cls(aioredis.from_url(url), **kwargs)
+
+    def _key(self, name: str) -> str:
+        return self.prefix + name
+
+    async def add(self, urls: Iterable[str]) -> int:
+        args = [self.prefix]
+        for url in urls:
+            args += [url, _domain(url)]
+        if len(args) == 1:
+            return 0
+        keys = [self._key("seen"), self._key("domains"), self._key("next_claim"), self._key("domain_of")]
+        return await self._add(keys=keys, args=args)
+
+    async def claim(self, worker_id: str, count: int, lease_seconds: float) -> List[str]:
+        keys = [self._key("domains"), self._key("next_claim"), self._key("leases"), self._key("owner")]
+        args = [self.prefix, worker_id, count, time.time(), lease_seconds, self.politeness_delay]
+        claimed = await self._claim(keys=keys, args=args)
+        return [url.decode() if isinstance(url, bytes) else url for url in claimed]
+
+    async def heartbeat(self, worker_id: str, urls: Iterable[str], lease_seconds: float) -> int:
+        urls = list(urls)
+        if not urls:
+            return 0
+        keys = [self._key("leases"), self._key("owner")]
+        return await self._heartbeat(keys=keys, args=[worker_id, time.time() + lease_seconds, *urls])
+
+    async def complete(self, url: str, success: bool = True) -> bool:
+        keys = [
+            self._key("leases"),
+            self._key("owner"),
+            self._key("domain_of"),
+            self._key("done" if success else "failed"),
+            self._key("domains"),
+        ]
+        return bool(await self._complete(keys=keys, args=[self.prefix, url]))
+
+    async def requeue_expired(self) -> int:
+        keys = [
+            self._key("leases"),
+            self._key("owner"),
+            self._key("domain_of"),
+            self._key("domains"),
+            self._key("next_claim"),
+        ]
+        return await self._requeue(keys=keys, args=[self.prefix, time.time()])
+
+    async def begin_seeding(self) -> None:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(self._key("seeders"))
+            pipe.set(self._key("seeded"), 1)
+            await pipe.execute()
+
+    async def end_seeding(self) -> None:
+        await self.redis.decr(self._key("seeders"))
+
+    async def seeding_finished(self) -> bool:
+        seeded, seeders = await self.redis.mget(self._key("seeded"), self._key("seeders"))
+        return seeded is not None and int(seeders or 0) <= 0
+
+    async def stats(self) -> Dict[str, int]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hlen(self._key("domain_of"))
+            pipe.zcard(self._key("leases"))
+            pipe.get(self._key("done"))
+            pipe.get(self._key("failed"))
+            unfinished, leased, done, failed = await pipe.execute()
+        return {
+            "pending": unfinished - leased,
+            "leased": leased,
+            "done": int(done or 0),
+            "failed": int(failed or 0),
+        }
+
+    async def next_ready_time(self) -> Optional[float]:
+        first = await self.redis.zrange(self._key("domains"), 0, 0, withscores=True)
+        return first[0][1] if first else None
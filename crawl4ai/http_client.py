@@ -0,0 +1,238 @@
+"""
+A crawler-scoped pool of HTTP connections.
+
+Robots.txt fetches, URL seeding, link previews, PDF downloads and the HTTP
+crawler strategy all talk to the same hosts. Sharing one pool lets them reuse
+keep-alive connections and cached DNS lookups instead of paying for a new
+socket and TLS handshake per subsystem, and caps how many sockets the crawler
+keeps open to a single host.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+import aiohttp
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body stream that frees its per-host slot once it is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, release: Callable[[], None]):
+        self._stream = stream
+        self._release = release
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._release is not None:
+                self._release()
+                self._release = None
+
+
+class _PerHostLimitTransport(httpx.AsyncHTTPTransport):
+    """
+    httpx only limits connections per client. This transport also caps the
+    requests in flight to one host; a slot is held until the body is closed.
+    """
+
+    def __init__(self, max_per_host: int, **kwargs):
+        super().__init__(**kwargs)
+        self._max_per_host = max_per_host
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self._max_per_host:
+            return await super().handle_async_request(request)
+        host = request.url.host
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+        await semaphore.acquire()
+        try:
+            response = await super().handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        response.stream = _ReleasingStream(response.stream, semaphore.release)
+        return response
+
+
+class SharedHTTPClient:
+    """
+    One pool of keep-alive HTTP connections shared by everything a crawler fetches
+    outside the browser.
+
+    Two clients sit behind the same limits. `session` is an aiohttp session with a
+    DNS cache, used by the HTTP crawler strategy, robots.txt checks and PDF
+    downloads. `httpx_client` is an httpx client, used by AsyncUrlSeeder, that
+    speaks HTTP/2 when `http2` is set and the `h2` package is installed. Both are
+    created on first use and bound to the event loop that created them.
+
+    Sync code running in a worker thread, like scraping strategies, can borrow the
+    pool with `run()`.
+
+    Usage:
+        async with SharedHTTPClient(max_connections_per_host=4) as pool:
+            async with pool.session.get("https://example.com") as response:
+                html = await response.text()
+
+        async with AsyncWebCrawler(http_client=pool) as crawler:
+            ...
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_connections_per_host: int = 10,
+        dns_cache_ttl: int = 300,
+        keepalive_timeout: float = 30,
+        timeout: float = 20,
+        http2: bool = True,
+        headers: Optional[Dict[str, str]] = None,
+    ):
+        """
+        Args:
+            max_connections (int): Open connections across all hosts. 0 means no limit.
+            max_connections_per_host (int): Open connections to one host. 0 means no limit.
+            dns_cache_ttl (int): Seconds to cache DNS lookups (aiohttp session only).
+            keepalive_timeout (float): Seconds an idle connection is kept open.
+            timeout (float): Default total timeout of a request, in seconds.
+            http2 (bool): Let the httpx client negotiate HTTP/2 when `h2` is installed.
+            headers (dict, optional): Headers sent with every request, e.g. a User-Agent.
+        """
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.http2 = http2
+        self.headers = dict(headers or {})
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._httpx_client: Optional[httpx.AsyncClient] = None
+
+    def _settings(self) -> Dict[str, Any]:
+        return {
+            "max_connections": self.max_connections,
+            "max_connections_per_host": self.max_connections_per_host,
+            "dns_cache_ttl": self.dns_cache_ttl,
+            "keepalive_timeout": self.keepalive_timeout,
+            "timeout": self.timeout,
+            "http2": self.http2,
+            "headers": self.headers,
+        }
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Connections cannot cross a process boundary; a copy starts with an empty pool
+        return self._settings()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__(**state)
+
+    async def __aenter__(self) -> "SharedHTTPClient":
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self.loop is not loop:
+            # Clients of a previous loop cannot be used, or closed, from this one
+            self.loop = loop
+            self._session = None
+            self._httpx_client = None
+
+    async def start(self) -> None:
+        """Bind the pool to the running event loop. Clients are still created lazily."""
+        self._bind_loop()
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The pooled aiohttp session. Must be used from inside the event loop."""
+        self._bind_loop()
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+        return self._session
+
+    @property
+    def httpx_client(self) -> httpx.AsyncClient:
+        """The pooled httpx client. Must be used from inside the event loop."""
+        self._bind_loop()
+        if self._httpx_client is None or self._httpx_client.is_closed:
+            limits = httpx.Limits(
+                max_connections=self.max_connections or None,
+                max_keepalive_connections=self.max_connections or None,
+                keepalive_expiry=self.keepalive_timeout,
+            )
+            transport = _PerHostLimitTransport(
+                self.max_connections_per_host,
+                http2=self.http2 and HAS_H2,
+                limits=limits,
+            )
+            self._httpx_client = httpx.AsyncClient(
+                transport=transport,
+                headers=self.headers,
+                timeout=self.timeout,
+            )
+        return self._httpx_client
+
+    async def close(self) -> None:
+        """Close all pooled connections. Using the pool again opens new ones."""
+        session, self._session = self._session, None
+        client, self._httpx_client = self._httpx_client, None
+        if session is not None and not session.closed:
+            await session.close()
+        if client is not None and not client.is_closed:
+            await client.aclose()
+
+    def run(self, func: Callable[["SharedHTTPClient"], Awaitable[Any]]) -> Any:
+        """
+        Run `func(pool)` from synchronous code and return its result.
+
+        From a worker thread, the coroutine runs on the pool's event loop and
+        reuses its connections. Where that loop cannot be reached (on the loop's
+        own thread, or in a worker process) it runs on a private event loop with
+        a temporary pool of the same settings.
+        """
+        loop = self.loop
+        if loop is not None and loop.is_running() and not loop.is_closed():
+            try:
+                on_loop_thread = asyncio.get_running_loop() is loop
+            except RuntimeError:
+                on_loop_thread = False
+            if not on_loop_thread:
+                return asyncio.run_coroutine_threadsafe(func(self), loop).result()
+
+        async def run_private():
+            async with SharedHTTPClient(**self._settings()) as pool:
+                return await func(pool)
+
+        # asyncio.run refuses to start inside a running loop, so use a thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, run_private()).result()
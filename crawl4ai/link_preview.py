@@ -10,6 +10,7 @@ import fnmatch
 from typing import Dict, List, Optional, Any
 from .async_logger import AsyncLogger
 from .async_url_seeder import AsyncUrlSeeder
+from .http_client import SharedHTTPClient
 from .async_configs import SeedingConfig, CrawlerRunConfig
 from .models import Links, Link
 from .utils import calculate_total_score
@@ -27,14 +28,16 @@ class LinkPreview:
     - Memory-safe processing for large link sets
     """
     
-    def __init__(self, logger: Optional[AsyncLogger] = None):
+    def __init__(self, logger: Optional[AsyncLogger] = None, http_client: Optional[SharedHTTPClient] = None):
         """
         Initialize the LinkPreview.
         
         Args:
             logger: Optional logger instance for recording events
+            http_client: Optional shared connection pool for the head requests
         """
         self.logger = logger
+        self.http_client = http_client
         self.seeder: Optional[AsyncUrlSeeder] = None
         self._owns_seeder = False
     
@@ -50,7 +53,8 @@ class LinkPreview:
     async def start(self):
         """Initialize the URLSeeder instance."""
         if not self.seeder:
-            self.seeder = AsyncUrlSeeder(logger=self.logger)
+            client = self.http_client.httpx_client if self.http_client else None
+            self.seeder = AsyncUrlSeeder(logger=self.logger, client=client)
             await self.seeder.__aenter__()
             self._owns_seeder = True
     
@@ -17,6 +17,8 @@ class DomainState:
     last_request_time: float = 0
     current_delay: float = 0
     fail_count: int = 0
+    in_flight: int = 0
+    crawl_delay: float = 0
 
 
 @dataclass
@@ -31,6 +33,7 @@ class CrawlerTaskResult:
     error_message: str = ""
     retry_count: int = 0
     wait_time: float = 0.0
+    cpu_time: float = 0.0
     
     @property
     def success(self) -> bool:
@@ -108,6 +111,14 @@ class TraversalStats:
     total_depth_reached: int = 0
     current_depth: int = 0
 
+class PageResourceUsage(BaseModel):
+    """Resources used by one page, measured through the Chrome DevTools Protocol"""
+    js_heap_used_mb: float = 0.0
+    js_heap_total_mb: float = 0.0
+    js_heap_peak_mb: float = 0.0  # Largest JS heap in use sampled while the page was open
+    cpu_time: float = 0.0  # Seconds the renderer's main thread spent on the page's tasks
+    dom_nodes: int = 0
+
 class DispatchResult(BaseModel):
     task_id: str
     memory_usage: float
@@ -115,6 +126,8 @@ class DispatchResult(BaseModel):
     start_time: Union[datetime, float]
     end_time: Union[datetime, float]
     error_message: str = ""
+    cpu_time: float = 0.0
+    resource_usage: Optional[PageResourceUsage] = None
 
 class MarkdownGenerationResult(BaseModel):
     raw_markdown: str
@@ -151,6 +164,7 @@ class CrawlResult(BaseModel):
     redirected_url: Optional[str] = None
     network_requests: Optional[List[Dict[str, Any]]] = None
     console_messages: Optional[List[Dict[str, Any]]] = None
+    resource_usage: Optional[PageResourceUsage] = None
     tables: List[Dict] = Field(default_factory=list)  # NEW – [{headers,rows,caption,summary}]
 
     class Config:
@@ -331,6 +345,7 @@ class AsyncCrawlResponse(BaseModel):
     redirected_url: Optional[str] = None
     network_requests: Optional[List[Dict[str, Any]]] = None
     console_messages: Optional[List[Dict[str, Any]]] = None
+    resource_usage: Optional[PageResourceUsage] = None
 
     class Config:
         arbitrary_types_allowed = True
@@ -385,3 +400,5 @@ class ScrapingResult(BaseModel):
     media: Media = Media()
     links: Links = Links()
     metadata: Dict[str, Any] = {}
+    # Unmodified copy of the parsed page, only kept when the scraper is called with keep_source_tree=True
+    source_tree: Optional[Any] = Field(default=None, exclude=True)
@@ -1,10 +1,14 @@
 from pathlib import Path
 import asyncio
 from dataclasses import asdict
+from functools import partial
+import aiofiles
+import aiohttp
 from crawl4ai.async_logger import AsyncLogger
 from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
 from crawl4ai.models import AsyncCrawlResponse, ScrapingResult 
 from crawl4ai.content_scraping_strategy import ContentScrapingStrategy
+from crawl4ai.http_client import SharedHTTPClient
 from .processor import NaivePDFProcessorStrategy  # Assuming your current PDF code is in pdf_processor.py
 
 class PDFCrawlerStrategy(AsyncCrawlerStrategy):
@@ -37,6 +41,8 @@ class PDFContentScrapingStrategy(ContentScrapingStrategy):
         extract_images (bool): Whether to extract images from PDF.
         image_save_dir (str): Directory to save extracted images.
         logger (AsyncLogger): Logger instance for recording events and errors.
+        http_client (SharedHTTPClient): Connection pool for downloading remote PDFs.
+            An `http_client` passed to `scrap` (the crawler's pool) takes precedence.
         
     Methods:
         scrap(url: str, html: str, **params) -> ScrapingResult:
@@ -58,8 +64,10 @@ class PDFContentScrapingStrategy(ContentScrapingStrategy):
                  extract_images : bool = False,
                  image_save_dir : str = None,
                  batch_size: int = 4,
-                 logger: AsyncLogger = None):
+                 logger: AsyncLogger = None,
+                 http_client: SharedHTTPClient = None):
         self.logger = logger
+        self.http_client = http_client
         self.pdf_processor = NaivePDFProcessorStrategy(
             save_images_locally=save_images_locally,
             extract_images=extract_images,
@@ -81,7 +89,7 @@ class PDFContentScrapingStrategy(ContentScrapingStrategy):
             ScrapingResult: The scraped content.
         """
         # Download if URL or use local path
-        pdf_path = self._get_pdf_path(url)
+        pdf_path = self._get_pdf_path(url, params.get("http_client"))
         try:
             # Process PDF
             # result = self.pdf_processor.process(Path(pdf_path))
@@ -138,44 +146,49 @@ class PDFContentScrapingStrategy(ContentScrapingStrategy):
         return await asyncio.to_thread(self.scrap, url, html, **kwargs)
         
 
-    def _get_pdf_path(self, url: str) -> str:
+    async def _download_pdf(self, url: str, path: str, http_client: SharedHTTPClient) -> None:
+        # Connection timeout: 20s, read timeout: 10 minutes for large PDFs
+        timeout = aiohttp.ClientTimeout(total=None, connect=20, sock_read=60 * 10)
+        async with http_client.session.get(url, timeout=timeout) as response:
+            response.raise_for_status()
+
+            # Get file size if available
+            total_size = response.content_length or 0
+            downloaded = 0
+
+            # Write to temp file
+            async with aiofiles.open(path, 'wb') as f:
+                async for chunk in response.content.iter_chunked(64 * 1024):
+                    await f.write(chunk)
+                    downloaded += len(chunk)
+                    if self.logger and total_size > 0:
+                        progress = (downloaded / total_size) * 100
+                        if progress % 10 < 0.1:  # Log every 10%
+                            self.logger.debug(f"PDF download progress: {progress:.0f}%")
+
+    def _get_pdf_path(self, url: str, http_client: SharedHTTPClient = None) -> str:
         if url.startswith(("http://", "https://")):
             import tempfile
-            import requests
             
             # Create temp file with .pdf extension
             temp_file = tempfile.NamedTemporaryFile(suffix='.pdf', delete=False)
+            temp_file.close()
             self._temp_files.append(temp_file.name)
             
             try:
                 if self.logger:
                     self.logger.info(f"Downloading PDF from {url}...")
                 
-                # Download PDF with streaming and timeout
-                # Connection timeout: 10s, Read timeout: 300s (5 minutes for large PDFs)
-                response = requests.get(url, stream=True, timeout=(20, 60 * 10))
-                response.raise_for_status()
-                
-                # Get file size if available
-                total_size = int(response.headers.get('content-length', 0))
-                downloaded = 0
-                
-                # Write to temp file
-                with open(temp_file.name, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if self.logger and total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            if progress % 10 < 0.1:  # Log every 10%
-                                self.logger.debug(f"PDF download progress: {progress:.0f}%")
+                # Download through the shared pool; without one, run() uses a temporary pool
+                http_client = http_client or self.http_client or SharedHTTPClient()
+                http_client.run(partial(self._download_pdf, url, temp_file.name))
                 
                 if self.logger:
                     self.logger.info(f"PDF downloaded successfully: {temp_file.name}")
                         
                 return temp_file.name
                 
-            except requests.exceptions.Timeout as e:
+            except asyncio.TimeoutError as e:
                 # Clean up temp file if download fails
                 Path(temp_file.name).unlink(missing_ok=True)
                 self._temp_files.remove(temp_file.name)
@@ -29,6 +29,8 @@ import asyncio
 from lxml import etree, html as lhtml
 import sqlite3
 import hashlib
+import codecs
+import chardet
 
 from urllib.robotparser import RobotFileParser
 import aiohttp
@@ -39,12 +41,12 @@ from . import __version__
 from typing import Sequence
 
 from itertools import chain
-from collections import deque
+from collections import OrderedDict, deque
 import psutil
 import numpy as np
 
 from urllib.parse import (
-    urljoin, urlparse, urlunparse,
+    urljoin, urlparse, urlsplit, urlunparse,
     parse_qsl, urlencode, quote, unquote
 )
 import inspect
@@ -249,13 +251,166 @@ class VersionManager:
         return installed is None or installed < current
 
 
+# Characters robots.txt rules and URL paths keep when both are normalized
+# for matching; `*` and `$` stay literal so rule patterns keep their meaning.
+_ROBOTS_SAFE_CHARS = "/*$"
+_ROBOTS_NEEDS_QUOTING = re.compile(r"[^A-Za-z0-9_.~/*$-]")
+
+
+def _normalize_robots_path(path: str) -> str:
+    if not _ROBOTS_NEEDS_QUOTING.search(path):
+        return path
+    return quote(unquote(path), safe=_ROBOTS_SAFE_CHARS)
+
+
+def _robots_rule_pattern(path: str) -> str:
+    """Regex source for a normalized rule path: a prefix match with `*` wildcards and an optional `$` end anchor"""
+    pattern = re.escape(path)
+    anchored = pattern.endswith(r"\$")
+    if anchored:
+        pattern = pattern[:-2]
+    return pattern.replace(r"\*", ".*") + (r"\Z" if anchored else "")
+
+
+class _RobotsGroup:
+    __slots__ = ("agents", "rules", "delay")
+
+    def __init__(self):
+        self.agents: List[str] = []
+        self.rules: List[Tuple[str, bool]] = []
+        self.delay: Optional[float] = None
+
+
+class RobotsRules:
+    """
+    Compiled robots.txt rules of one site.
+
+    Matching follows RFC 9309: the longest matching rule wins and Allow wins a
+    tie, `*` matches any characters and a trailing `$` anchors the end of the
+    path. Groups naming the user agent are merged; the `*` groups apply when
+    none does. Crawl-delay may be fractional.
+
+    Rules are compiled once per user agent, so checking a URL costs a few
+    string comparisons.
+    """
+
+    def __init__(self, text: str):
+        self.sitemaps: List[str] = []
+        self._groups: List[_RobotsGroup] = []
+        # user agent or its token -> (match function, allow flag per regex group, crawl delay)
+        self._by_agent: Dict[str, Tuple[Optional[Callable], List[Optional[bool]], Optional[float]]] = {}
+
+        group = None
+        reading_agents = False
+        for line in text.splitlines():
+            line = line.split("#", 1)[0].strip()
+            key, sep, value = line.partition(":")
+            if not sep:
+                continue
+            key = key.strip().lower()
+            value = value.strip()
+            if key == "user-agent":
+                if group is None or not reading_agents:
+                    group = _RobotsGroup()
+                    self._groups.append(group)
+                reading_agents = True
+                agent = value.split("/")[0].lower()
+                if agent:
+                    group.agents.append(agent)
+            elif key == "sitemap":
+                if value:
+                    self.sitemaps.append(value)
+            else:
+                reading_agents = False
+                if group is None:
+                    continue
+                if key in ("allow", "disallow"):
+                    if value:
+                        group.rules.append((value, key == "allow"))
+                elif key == "crawl-delay":
+                    try:
+                        delay = float(value)
+                    except ValueError:
+                        continue
+                    if 0 <= delay < float("inf"):
+                        group.delay = delay
+
+    @staticmethod
+    def _agent_token(user_agent: str) -> str:
+        return (user_agent or "*").split("/")[0].strip().lower() or "*"
+
+    def _for_agent(self, user_agent: str) -> Tuple[Optional[Callable], List[Optional[bool]], Optional[float]]:
+        compiled = self._by_agent.get(user_agent)
+        if compiled is None:
+            compiled = self._compile_for(self._agent_token(user_agent))
+            if len(self._by_agent) < 256:  # rotating user agents would grow it without bound
+                self._by_agent[user_agent] = compiled
+        return compiled
+
+    def _compile_for(self, token: str) -> Tuple[Optional[Callable], List[Optional[bool]], Optional[float]]:
+        compiled = self._by_agent.get(token)
+        if compiled is None:
+            groups = [g for g in self._groups if any(a != "*" and a in token for a in g.agents)]
+            if not groups:
+                groups = [g for g in self._groups if "*" in g.agents]
+            rules = {(_normalize_robots_path(path), allow) for g in groups for path, allow in g.rules}
+            # Most specific first, Allow before Disallow, so the first match decides.
+            # One alternation of all rules lets the regex engine find it in one call.
+            rules = sorted(rules, key=lambda rule: (-len(rule[0]), not rule[1]))
+            match = None
+            if rules:
+                match = re.compile("|".join(f"({_robots_rule_pattern(path)})" for path, _ in rules), re.S).match
+            delay = next((g.delay for g in groups if g.delay is not None), None)
+            compiled = self._by_agent[token] = (match, [None] + [allow for _, allow in rules], delay)
+        return compiled
+
+    def can_fetch(self, url: str, user_agent: str = "*") -> bool:
+        """Whether `user_agent` may fetch `url` (a URL or a path)"""
+        return self._allowed(urlsplit(url), user_agent)
+
+    def _allowed(self, parts, user_agent: str) -> bool:
+        path = parts.path or "/"
+        if path == "/robots.txt":
+            return True
+        match, allows, _ = self._for_agent(user_agent)
+        if match is None:
+            return True
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        found = match(_normalize_robots_path(path))
+        return True if found is None else allows[found.lastindex]
+
+    def crawl_delay(self, user_agent: str = "*") -> Optional[float]:
+        """The Crawl-delay for `user_agent` in seconds, or None"""
+        return self._for_agent(user_agent)[2]
+
+
 class RobotsParser:
+    """
+    Checks URLs against robots.txt, fetching each site's file once.
+
+    Compiled rules of recently used sites stay in an in-memory LRU, backed by
+    a SQLite cache on disk that is read and written off the event loop.
+    Concurrent first checks for a site share one fetch. A robots.txt that
+    answers 4xx allows everything and is cached like any other; network
+    errors and 5xx also allow everything, but are retried after
+    ERROR_CACHE_TTL seconds.
+    """
+
     # Default 7 days cache TTL
     CACHE_TTL = 7 * 24 * 60 * 60
+    # Seconds before a failed robots.txt fetch is retried
+    ERROR_CACHE_TTL = 5 * 60
 
-    def __init__(self, cache_dir=None, cache_ttl=None):
+    def __init__(self, cache_dir=None, cache_ttl=None, http_client=None, max_cached_sites: int = 10_000):
         self.cache_dir = cache_dir or os.path.join(get_home_folder(), ".crawl4ai", "robots")
         self.cache_ttl = cache_ttl or self.CACHE_TTL
+        # Optional SharedHTTPClient; without one every fetch opens its own session
+        self.http_client = http_client
+        self.max_cached_sites = max_cached_sites
+        # domain -> (rules or None to allow all, expiry time)
+        self._rules: "OrderedDict[str, Tuple[Optional[RobotsRules], float]]" = OrderedDict()
+        self._loading: Dict[str, asyncio.Future] = {}
         os.makedirs(self.cache_dir, exist_ok=True)
         self.db_path = os.path.join(self.cache_dir, "robots_cache.db")
         self._init_db()
@@ -274,41 +429,105 @@ class RobotsParser:
             """)
             conn.execute("CREATE INDEX IF NOT EXISTS idx_domain ON robots_cache(domain)")
 
-    def _get_cached_rules(self, domain: str) -> tuple[str, bool]:
-        """Get cached rules. Returns (rules, is_fresh)"""
+    def _get_cached_rules(self, domain: str) -> Tuple[Optional[str], Optional[int]]:
+        """Get cached rules. Returns (rules, fetch_time), or (None, None) when not cached"""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute(
-                "SELECT rules, fetch_time, hash FROM robots_cache WHERE domain = ?", 
+                "SELECT rules, fetch_time FROM robots_cache WHERE domain = ?",
                 (domain,)
             )
             result = cursor.fetchone()
-            
-            if not result:
-                return None, False
-                
-            rules, fetch_time, _ = result
-            # Check if cache is still fresh based on TTL
-            return rules, (time.time() - fetch_time) < self.cache_ttl
+        return result if result else (None, None)
 
-    def _cache_rules(self, domain: str, content: str):
+    def _cache_rules(self, domain: str, content: str, fetch_time: int):
         """Cache robots.txt content with hash for change detection"""
         hash_val = hashlib.md5(content.encode()).hexdigest()
         with sqlite3.connect(self.db_path) as conn:
-            # Check if content actually changed
-            cursor = conn.execute(
-                "SELECT hash FROM robots_cache WHERE domain = ?", 
-                (domain,)
+            conn.execute(
+                """INSERT OR REPLACE INTO robots_cache
+                   (domain, rules, fetch_time, hash)
+                   VALUES (?, ?, ?, ?)""",
+                (domain, content, fetch_time, hash_val)
             )
-            result = cursor.fetchone()
-            
-            # Only update if hash changed or no previous entry
-            if not result or result[0] != hash_val:
-                conn.execute(
-                    """INSERT OR REPLACE INTO robots_cache 
-                       (domain, rules, fetch_time, hash) 
-                       VALUES (?, ?, ?, ?)""",
-                    (domain, content, int(time.time()), hash_val)
-                )
+
+    @staticmethod
+    async def _fetch_rules(session, robots_url: str, ssl: bool = False) -> Tuple[int, str]:
+        """Download robots.txt, returning the status and the body of a 200"""
+        async with session.get(robots_url, timeout=aiohttp.ClientTimeout(total=2), ssl=ssl) as response:
+            if response.status != 200:
+                return response.status, ""
+            return response.status, await response.text()
+
+    async def _download(self, robots_url: str) -> Optional[str]:
+        """The rules to cache for `robots_url`, "" to allow all, or None if the fetch failed"""
+        try:
+            if self.http_client is not None:
+                # Verify certificates like page fetches do, so both share pooled connections
+                session = self.http_client.session
+                try:
+                    status, rules = await self._fetch_rules(session, robots_url, ssl=True)
+                except aiohttp.ClientSSLError:
+                    status, rules = await self._fetch_rules(session, robots_url)
+            else:
+                async with aiohttp.ClientSession() as session:
+                    status, rules = await self._fetch_rules(session, robots_url)
+        except Exception as _ex:
+            # On any error (timeout, connection failed, etc), allow access
+            return None
+        if status == 200:
+            return rules
+        return "" if 400 <= status < 500 else None
+
+    def _remember(self, domain: str, rules: Optional[RobotsRules], expires: float) -> Optional[RobotsRules]:
+        self._rules[domain] = (rules, expires)
+        self._rules.move_to_end(domain)
+        while len(self._rules) > self.max_cached_sites:
+            self._rules.popitem(last=False)
+        return rules
+
+    async def _load_rules(self, domain: str, scheme: str) -> Optional[RobotsRules]:
+        text, fetch_time = await asyncio.to_thread(self._get_cached_rules, domain)
+        if text is not None and time.time() - fetch_time < self.cache_ttl:
+            return self._remember(domain, RobotsRules(text) if text else None, fetch_time + self.cache_ttl)
+
+        # Ensure we use the same scheme as the input URL
+        fresh = await self._download(f"{scheme}://{domain}/robots.txt")
+        if fresh is None:
+            # Keep using stale rules, if any, until the next attempt
+            stale = RobotsRules(text) if text else None
+            return self._remember(domain, stale, time.time() + self.ERROR_CACHE_TTL)
+
+        fetch_time = int(time.time())
+        await asyncio.to_thread(self._cache_rules, domain, fresh, fetch_time)
+        return self._remember(domain, RobotsRules(fresh) if fresh else None, fetch_time + self.cache_ttl)
+
+    async def get_rules(self, url: str) -> Optional[RobotsRules]:
+        """Return the compiled robots.txt rules for the domain of `url`, or None if there are none"""
+        # Handle empty/invalid URLs
+        try:
+            parsed = urlsplit(url)
+        except ValueError:
+            return None
+        return await self._get_rules(parsed)
+
+    async def _get_rules(self, parsed) -> Optional[RobotsRules]:
+        domain = parsed.netloc
+        if not domain:
+            return None
+
+        # Fast path - compiled rules in memory
+        cached = self._rules.get(domain)
+        if cached is not None and cached[1] > time.time():
+            self._rules.move_to_end(domain)
+            return cached[0]
+
+        # One load per domain; later callers wait for it
+        loading = self._loading.get(domain)
+        if loading is None:
+            loading = asyncio.ensure_future(self._load_rules(domain, parsed.scheme or "http"))
+            self._loading[domain] = loading
+            loading.add_done_callback(lambda _: self._loading.pop(domain, None))
+        return await asyncio.shield(loading)
 
     async def can_fetch(self, url: str, user_agent: str = "*") -> bool:
         """
@@ -321,60 +540,46 @@ class RobotsParser:
         Returns:
             bool: True if allowed, False if disallowed by robots.txt
         """
-        # Handle empty/invalid URLs
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc
-            if not domain:
-                return True
-        except Exception as _ex:
+            parsed = urlsplit(url)
+        except ValueError:
+            return True
+        rules = await self._get_rules(parsed)
+        if rules is None:
             return True
+        return rules._allowed(parsed, user_agent)
 
-        # Fast path - check cache first
-        rules, is_fresh = self._get_cached_rules(domain)
-        
-        # If rules not found or stale, fetch new ones
-        if not is_fresh:
-            try:
-                # Ensure we use the same scheme as the input URL
-                scheme = parsed.scheme or 'http'
-                robots_url = f"{scheme}://{domain}/robots.txt"
-                
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(robots_url, timeout=2, ssl=False) as response:
-                        if response.status == 200:
-                            rules = await response.text()
-                            self._cache_rules(domain, rules)
-                        else:
-                            return True
-            except Exception as _ex:
-                # On any error (timeout, connection failed, etc), allow access
-                return True
+    async def crawl_delay(self, url: str, user_agent: str = "*") -> Optional[float]:
+        """
+        Get the robots.txt Crawl-delay for the domain of a URL.
 
-        if not rules:
-            return True
+        Args:
+            url: Any URL on the domain
+            user_agent: User agent string to check against (default: "*")
 
-        # Create parser for this check
-        parser = RobotFileParser() 
-        parser.parse(rules.splitlines())
-        
-        # If parser can't read rules, allow access
-        if not parser.mtime():
-            return True
-            
-        return parser.can_fetch(user_agent, url)
+        Returns:
+            Optional[float]: The delay in seconds, or None if robots.txt sets none
+        """
+        rules = await self.get_rules(url)
+        if rules is None:
+            return None
+        return rules.crawl_delay(user_agent)
 
     def clear_cache(self):
         """Clear all cached robots.txt entries"""
+        self._rules.clear()
         with sqlite3.connect(self.db_path) as conn:
             conn.execute("DELETE FROM robots_cache")
 
     def clear_expired(self):
         """Remove only expired entries from cache"""
+        now = time.time()
+        for domain in [d for d, (_, expires) in self._rules.items() if expires <= now]:
+            del self._rules[domain]
         with sqlite3.connect(self.db_path) as conn:
-            expire_time = int(time.time()) - self.cache_ttl
+            expire_time = int(now) - self.cache_ttl
             conn.execute("DELETE FROM robots_cache WHERE fetch_time < ?", (expire_time,))
-      
+
 
 class InvalidCSSSelectorError(Exception):
     pass
@@ -2922,7 +3127,84 @@ class HeadPeekr:
         title_match = re.search(r'<title>(.*?)</title>', head_content, re.IGNORECASE | re.DOTALL)
         return title_match.group(1) if title_match else None
 
-def preprocess_html_for_schema(html_content, text_threshold=100, attr_value_threshold=200, max_size=100000):
+# Elements after or inside which libxml2's HTML parser keeps whitespace-only
+# text even with remove_blank_text=True (allowPCData in HTMLparser.c, 2.13)
+_HTML_KEEP_BLANKS_IN = frozenset((
+    "a", "abbr", "acronym", "address", "applet", "b", "bdo", "big",
+    "blockquote", "body", "button", "caption", "center", "cite", "code",
+    "dd", "del", "dfn", "div", "dt", "em", "font", "form", "h1", "h2",
+    "h3", "h4", "h5", "h6", "i", "iframe", "ins", "kbd", "label", "legend",
+    "li", "object", "p", "pre", "q", "s", "samp", "small", "span", "strike",
+    "strong", "td", "th", "tt", "u", "var",
+))
+_HTML_BLANKS = " \t\n\r"
+
+# lxml.html.fromstring only returns the whole document for input that starts like this
+_FULL_HTML_DOCUMENT = re.compile(r"^\s*<(?:html|!doctype)", re.IGNORECASE)
+_HTML_CLOSE_TAG = re.compile(r"</html\s*>", re.IGNORECASE)
+
+
+def _strip_comments_and_blank_text(tree, html_content):
+    """
+    Make a tree parsed by lxml's default HTML parser from html_content look like
+    one parsed with ``etree.HTMLParser(remove_comments=True, remove_blank_text=True)``.
+
+    libxml2 judges each run of character data on its own: a whitespace-only run
+    is dropped at the end of the input, and elsewhere when neither its parent
+    (for leading text) nor its previous sibling (for a tail) allows character
+    data. The same rules are applied here, comment by comment.
+    """
+    public_id = (tree.getroottree().docinfo.public_id or "").lower()
+    strict_body = public_id in ("-//w3c//dtd html 4.01//en", "-//w3c//dtd html 4//en")
+
+    def is_blank(text):
+        return bool(text) and not text.strip(_HTML_BLANKS)
+
+    def keeps_blank(parent, previous):
+        if parent is None or parent.tag in ("html", "head"):
+            return False
+        if parent.tag == "body" and strict_body:
+            return False
+        return previous in _HTML_KEEP_BLANKS_IN
+
+    # A comment ends the run of text before it, so judge that run before merging
+    for comment in list(tree.iter(etree.Comment)):
+        parent = comment.getparent()
+        if parent is None:
+            continue
+        previous = comment.getprevious()
+        if previous is None:
+            before = parent.text
+            if is_blank(before) and not keeps_blank(parent, parent.tag):
+                before = None
+            parent.text = ((before or "") + (comment.tail or "")) or None
+        else:
+            before = previous.tail
+            if is_blank(before) and not keeps_blank(parent, previous.tag):
+                before = None
+            previous.tail = ((before or "") + (comment.tail or "")) or None
+        parent.remove(comment)
+
+    # Whitespace after the last tag ends the input on its own run, unless </html>
+    # closed the document and it never reached the tree
+    stripped = html_content.rstrip(_HTML_BLANKS)
+    trailing = len(html_content) - len(stripped)
+    if trailing and stripped.endswith(">") and not _HTML_CLOSE_TAG.search(html_content):
+        last = tree.xpath("(descendant::text())[last()]")
+        if last and last[0].endswith(html_content[-trailing:]):
+            setattr(last[0].getparent(), "tail" if last[0].is_tail else "text", last[0][:-trailing] or None)
+
+    # normalize-space() trims the same four characters libxml2 treats as blank
+    for text in tree.xpath("descendant::text()[not(normalize-space())]"):
+        owner = text.getparent()
+        if text.is_tail:
+            if not keeps_blank(owner.getparent(), owner.tag):
+                owner.tail = None
+        elif not keeps_blank(owner, owner.tag):
+            owner.text = None
+
+
+def preprocess_html_for_schema(html_content, text_threshold=100, attr_value_threshold=200, max_size=100000, tree=None):
     """
     Preprocess HTML to reduce size while preserving structure for schema generation.
     
@@ -2931,14 +3213,19 @@ def preprocess_html_for_schema(html_content, text_threshold=100, attr_value_thre
         text_threshold (int): Maximum length for text nodes before truncation
         attr_value_threshold (int): Maximum length for attribute values before truncation
         max_size (int): Target maximum size for output HTML
+        tree (lxml.html.HtmlElement, optional): A parsed copy of html_content to work on
+            instead of parsing it again. It is modified in place.
         
     Returns:
         str: Preprocessed HTML content
     """
     try:
-        # Parse HTML with error recovery
-        parser = etree.HTMLParser(remove_comments=True, remove_blank_text=True)
-        tree = lhtml.fromstring(html_content, parser=parser)
+        if tree is None or not _FULL_HTML_DOCUMENT.match(html_content):
+            # Parse HTML with error recovery
+            parser = etree.HTMLParser(remove_comments=True, remove_blank_text=True)
+            tree = lhtml.fromstring(html_content, parser=parser)
+        else:
+            _strip_comments_and_blank_text(tree, html_content)
         
         # 1. Remove HEAD section (keep only BODY)
         head_elements = tree.xpath('//head')
@@ -3579,3 +3866,62 @@ def hooks_to_string(hooks: Dict[str, Callable]) -> Dict[str, str]:
             )
 
     return result
+
+
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+_META_CHARSET_RE = re.compile(
+    rb"""<meta[^>]+?charset\s*=\s*["']?\s*([a-zA-Z0-9_:.+-]+)""", re.IGNORECASE
+)
+
+
+def _known_encoding(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def sniff_encoding(
+    body: bytes,
+    header_charset: Optional[str] = None,
+    meta_scan_bytes: int = 4096,
+    sample_bytes: int = 64 * 1024,
+) -> str:
+    """
+    Pick the text encoding of an HTTP response body.
+
+    Checks, in order: the charset of the Content-Type header, a byte order
+    mark, a <meta charset> / http-equiv declaration in the first
+    `meta_scan_bytes`, and finally chardet run on the first `sample_bytes`
+    only, since detecting over a whole multi-MB page is slow. Defaults to utf-8.
+
+    Args:
+        body (bytes): The response body, or a prefix of it.
+        header_charset (str, optional): Charset from the Content-Type header.
+        meta_scan_bytes (int): How far to look for a meta declaration.
+        sample_bytes (int): How much of the body chardet may look at.
+
+    Returns:
+        str: A codec name that `bytes.decode` accepts.
+    """
+    encoding = _known_encoding(header_charset)
+    if encoding:
+        return encoding
+    for bom, name in _BOMS:
+        if body.startswith(bom):
+            return name
+    match = _META_CHARSET_RE.search(body[:meta_scan_bytes])
+    if match:
+        encoding = _known_encoding(match.group(1).decode("ascii"))
+        if encoding:
+            return encoding
+    detected = chardet.detect(bytes(body[:sample_bytes]))["encoding"]
+    return _known_encoding(detected) or "utf-8"
@@ -6,6 +6,8 @@ sys.path.append(parent_dir)
 
 from crawl4ai.content_filter_strategy import PruningContentFilter
 
+SAMPLE_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_wikipedia.html")
+
 
 @pytest.fixture
 def basic_html():
@@ -165,6 +167,72 @@ class TestPruningContentFilter:
         second_run = filter.filter_content(basic_html)
         assert first_run == second_run, "Output should be consistent"
 
+    @pytest.mark.parametrize(
+        "options",
+        [
+            {},
+            {"threshold_type": "dynamic", "threshold": 0.45},
+            {"min_word_threshold": 5, "threshold": 0.3},
+        ],
+    )
+    def test_matches_soup_implementation(
+        self, options, basic_html, link_heavy_html, mixed_content_html
+    ):
+        """Test the lxml pass returns exactly what the BeautifulSoup implementation returns"""
+        with open(SAMPLE_PAGE, encoding="utf-8") as f:
+            page = f.read()
+        tricky_html = """
+        <div class='  main  content ' id='a"b' title="it's &quot;q&quot;" data-x='<&>'>
+            <!-- comment --><p>Text with &amp; &lt;entities&gt; and&nbsp;spaces <br> here</p>
+            <nav>menu</nav> split <a href="#">one<script>x()</script>two</a>
+            <pre>   </pre>   <img src="a.png" alt=""><input value="x">
+            <ul><li><a href="#">link</a></li><li>plain item text</li></ul>
+        </div>
+        <p>   </p>Loose text<svg><path d="M0"/></svg>
+        """
+        filter = PruningContentFilter(**options)
+        for html in (basic_html, link_heavy_html, mixed_content_html, tricky_html, page):
+            assert filter.filter_content(html) == filter._filter_content_soup(html)
+
+    def test_soup_only_content_falls_back(self):
+        """Test content the lxml pass cannot reproduce still matches BeautifulSoup"""
+        filter = PruningContentFilter(threshold=0.1)
+        for html in (
+            "<div><ruby>漢<rt>kan</rt></ruby> with enough words around it</div>",
+            "<div><template><p>hidden</p></template>visible words here</div>",
+            "<div><select><option selected>One</option></select> pick one option</div>",
+            "<title>No body at all</title>",
+        ):
+            assert filter.filter_content(html) == filter._filter_content_soup(html)
+
+    def test_subclass_hooks_use_soup(self, basic_html):
+        """Test subclasses overriding BeautifulSoup hooks keep receiving BeautifulSoup tags"""
+        seen = []
+
+        class CustomFilter(PruningContentFilter):
+            def _compute_class_id_weight(self, node):
+                seen.append(node.name)
+                return super()._compute_class_id_weight(node)
+
+        contents = CustomFilter().filter_content(basic_html)
+        assert seen and seen[0] == "body"
+        assert contents == PruningContentFilter().filter_content(basic_html)
+
+    def test_deeply_nested_page_matches_soup(self):
+        """Test the lxml pass matches BeautifulSoup on a deeply nested page"""
+        section = "<div class='section'>" + "".join(
+            f"<div><p>Paragraph {i} has enough words to be kept by the filter. "
+            f"<a href='/page/{i}'>Related link {i}</a></p></div>"
+            for i in range(5)
+        ) + "</div>"
+        nested = section
+        for depth in range(10):
+            nested = f"<div id='level-{depth}'>{nested}{section}</div>"
+        html = f"<html><body><article>{nested}</article></body></html>"
+
+        filter = PruningContentFilter()
+        assert filter.filter_content(html) == filter._filter_content_soup(html)
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,132 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import CrawlerRunConfig, MemoryAdaptiveDispatcher, SemaphoreDispatcher
+from crawl4ai.models import CrawlResult
+
+
+class FakeCrawler:
+    """Stands in for AsyncWebCrawler and records the config used for each URL."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.configs = {}
+
+    async def arun(self, url, config=None, session_id=None):
+        self.configs[url] = config
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return CrawlResult(url=url, html="", success=True)
+
+
+class CountingSource:
+    """Async iterator of URLs that tracks how far ahead of the crawl it was read."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.pulled = 0
+        self.finished = 0
+        self.max_outstanding = 0
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self.pulled == self.total:
+            raise StopAsyncIteration
+        self.pulled += 1
+        self.max_outstanding = max(self.max_outstanding, self.pulled - self.finished)
+        return f"https://example.com/{self.pulled}"
+
+
+DISPATCHERS = [
+    lambda **kw: MemoryAdaptiveDispatcher(max_session_permit=4, **kw),
+    lambda **kw: SemaphoreDispatcher(semaphore_count=4, **kw),
+]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_dispatcher", DISPATCHERS)
+async def test_async_generator_input(make_dispatcher):
+    async def urls():
+        for i in range(20):
+            await asyncio.sleep(0)
+            yield f"https://example.com/{i}"
+
+    crawler = FakeCrawler()
+    results = await make_dispatcher().run_urls(
+        urls=urls(), crawler=crawler, config=CrawlerRunConfig()
+    )
+    assert sorted(r.url for r in results) == sorted(f"https://example.com/{i}" for i in range(20))
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_dispatcher", DISPATCHERS)
+async def test_url_config_pairs(make_dispatcher):
+    default = CrawlerRunConfig()
+    screenshot = CrawlerRunConfig(screenshot=True)
+    pairs = iter(
+        [
+            ("https://example.com/a", screenshot),
+            ("https://example.com/b", None),
+            "https://example.com/c",
+        ]
+    )
+
+    crawler = FakeCrawler()
+    results = await make_dispatcher().run_urls(urls=pairs, crawler=crawler, config=default)
+    assert len(results) == 3
+    assert crawler.configs["https://example.com/a"] is screenshot
+    assert crawler.configs["https://example.com/b"] is default
+    assert crawler.configs["https://example.com/c"] is default
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("make_dispatcher", DISPATCHERS)
+async def test_input_is_pulled_up_to_prefetch_limit(make_dispatcher):
+    source = CountingSource(200)
+    dispatcher = make_dispatcher(prefetch_limit=10)
+
+    count = 0
+    async for result in dispatcher.run_urls_stream(
+        urls=source, crawler=FakeCrawler(delay=0.001), config=CrawlerRunConfig()
+    ):
+        source.finished += 1
+        count += 1
+    assert count == 200
+    # One more item than the limit can be read while waiting for a free place
+    assert source.max_outstanding <= 11
+
+
+@pytest.mark.asyncio
+async def test_semaphore_dispatcher_keeps_input_order():
+    urls = [f"https://example.com/{i}" for i in range(30)]
+    dispatcher = SemaphoreDispatcher(semaphore_count=5, prefetch_limit=7)
+    results = await dispatcher.run_urls(
+        crawler=FakeCrawler(delay=0.001), urls=urls, config=CrawlerRunConfig()
+    )
+    assert [r.url for r in results] == urls
+
+
+@pytest.mark.asyncio
+async def test_failing_source_is_reported():
+    async def urls():
+        yield "https://example.com/1"
+        raise RuntimeError("frontier unavailable")
+
+    dispatcher = MemoryAdaptiveDispatcher()
+    with pytest.raises(RuntimeError, match="frontier unavailable"):
+        async for _ in dispatcher.run_urls_stream(
+            urls=urls(), crawler=FakeCrawler(), config=CrawlerRunConfig()
+        ):
+            pass
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
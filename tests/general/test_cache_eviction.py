@@ -0,0 +1,285 @@
+import asyncio
+import os
+import sys
+
+import aiosqlite
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+import crawl4ai.async_webcrawler as async_webcrawler
+from crawl4ai import AsyncWebCrawler, CrawlerRunConfig
+from crawl4ai.async_database import AsyncDatabaseManager, pack_content
+from crawl4ai.models import CrawlResult, MarkdownGenerationResult
+from crawl4ai.utils import ensure_content_dirs, generate_content_hash
+
+
+def make_result(i: int, html: str = None) -> CrawlResult:
+    return CrawlResult(
+        url=f"https://example.com/page{i}",
+        html=html or f"<html><body><p>Page {i}</p></body></html>",
+        success=True,
+        markdown=MarkdownGenerationResult(
+            raw_markdown=f"Page {i}", markdown_with_citations="", references_markdown=""
+        ),
+    )
+
+
+async def make_manager(tmp_path, **kwargs) -> AsyncDatabaseManager:
+    manager = AsyncDatabaseManager(**kwargs)
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_paths = ensure_content_dirs(str(tmp_path))
+    await manager.ainit_db()
+    manager._initialized = True
+    return manager
+
+
+async def query(manager, sql, params=()):
+    async def _query(db):
+        async with db.execute(sql, params) as cursor:
+            return await cursor.fetchall()
+
+    return await manager.execute_with_retry(_query)
+
+
+async def cached_urls(manager):
+    return sorted(url for (url,) in await query(manager, "SELECT url FROM crawled_data"))
+
+
+def test_config_cache_age_options():
+    config = CrawlerRunConfig(cache_max_age=60, cache_ttl=3600)
+    assert config.cache_max_age == 60 and config.cache_ttl == 3600
+    restored = CrawlerRunConfig.from_kwargs(config.to_dict())
+    assert restored.cache_max_age == 60 and restored.cache_ttl == 3600
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_not_returned(tmp_path):
+    manager = await make_manager(tmp_path)
+    await manager.acache_url(make_result(0), ttl=0.1)
+    await manager.acache_url(make_result(1))
+
+    assert await manager.aget_cached_url("https://example.com/page0") is not None
+    await asyncio.sleep(0.2)
+    assert await manager.aget_cached_url("https://example.com/page0") is None
+    assert await manager.aget_cached_url("https://example.com/page1") is not None
+
+    # Flushes keep the expired entry, so it can still be revalidated
+    await manager.acache_url(make_result(2))
+    await manager.aflush_writes()
+    stale = await manager.aget_cached_url("https://example.com/page0", include_expired=True)
+    assert stale.html == make_result(0).html
+
+    # aevict deletes it
+    assert await manager.aevict() == 1
+    assert await cached_urls(manager) == ["https://example.com/page1", "https://example.com/page2"]
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_max_age_on_read(tmp_path):
+    manager = await make_manager(tmp_path)
+    await manager.acache_url(make_result(0))
+    await manager.aflush_writes()
+    await query(manager, "UPDATE crawled_data SET fetched_at = fetched_at - 120")
+
+    assert await manager.aget_cached_url("https://example.com/page0", max_age=60) is None
+    assert await manager.aget_cached_url("https://example.com/page0", max_age=600) is not None
+    assert await manager.aget_cached_url("https://example.com/page0") is not None
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entries_evicted(tmp_path):
+    manager = await make_manager(tmp_path, write_batch_size=1, max_entries=3)
+    for i in range(3):
+        await manager.acache_url(make_result(i))
+        await manager._flush_task
+        await asyncio.sleep(0.01)
+
+    # Reading page0 makes page1 the least recently used entry
+    assert await manager.aget_cached_url("https://example.com/page0") is not None
+    await manager.acache_url(make_result(3))
+    await manager._flush_task
+
+    assert await cached_urls(manager) == [
+        "https://example.com/page0",
+        "https://example.com/page2",
+        "https://example.com/page3",
+    ]
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_cache_hits_touch_entries_in_the_next_flush(tmp_path):
+    manager = await make_manager(tmp_path, write_flush_interval=60)
+    await manager.acache_url(make_result(0))
+    await manager.aflush_writes()
+    (before,) = (await query(manager, "SELECT accessed_at FROM crawled_data"))[0]
+
+    for _ in range(3):
+        assert await manager.aget_cached_url("https://example.com/page0") is not None
+    assert list(manager._pending_touches) == ["https://example.com/page0"]
+    assert await query(manager, "SELECT accessed_at FROM crawled_data") == [(before,)]
+
+    await manager.aflush_writes()
+    (after,) = (await query(manager, "SELECT accessed_at FROM crawled_data"))[0]
+    assert after > before
+    assert manager._pending_touches == {}
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_cache_stats_track_entries_and_size(tmp_path):
+    manager = await make_manager(tmp_path)
+
+    async def check_stats():
+        stats = await query(manager, "SELECT entries, content_bytes FROM cache_stats")
+        actual = await query(
+            manager, "SELECT COUNT(*), COALESCE(SUM(content_size), 0) FROM crawled_data"
+        )
+        assert stats == actual
+        return stats[0]
+
+    for i in range(4):
+        await manager.acache_url(make_result(i))
+    await manager.aflush_writes()
+    entries, _ = await check_stats()
+    assert entries == 4
+
+    # Replacing an entry changes its size but not the count
+    await manager.acache_url(make_result(0, html=os.urandom(1000).hex()))
+    await manager.aflush_writes()
+    assert (await check_stats())[0] == 4
+
+    assert await manager.aevict(max_entries=2) == 2
+    assert (await check_stats())[0] == 2
+    await manager.aclear_db()
+    assert await check_stats() == (0, 0)
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_configure_and_crawler_limits(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path)
+    manager.configure(max_entries=2, write_batch_size=0)
+    assert manager.max_entries == 2 and manager.write_batch_size == 1
+    with pytest.raises(TypeError, match="pool_size"):
+        manager.configure(pool_size=1)
+
+    for i in range(4):
+        await manager.acache_url(make_result(i))
+    await manager.aflush_writes()
+    assert len(await cached_urls(manager)) == 2
+
+    monkeypatch.setattr(async_webcrawler, "async_db_manager", manager)
+    AsyncWebCrawler(base_directory=str(tmp_path), cache_max_bytes=10_000)
+    assert manager.max_cache_bytes == 10_000
+    assert manager.max_entries == 2  # left as it was
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_size_capped_eviction(tmp_path):
+    manager = await make_manager(tmp_path)
+    pages = [make_result(i, html=os.urandom(2000).hex()) for i in range(5)]
+    for page in pages:
+        await manager.acache_url(page)
+    await manager.aflush_writes()
+
+    sizes = await query(manager, "SELECT content_size FROM crawled_data")
+    assert all(size > 2000 for (size,) in sizes)
+    total = sum(size for (size,) in sizes)
+
+    await manager.aevict(max_cache_bytes=total - 1)
+    assert len(await cached_urls(manager)) == 4
+    await manager.aevict(max_cache_bytes=total // 2)
+    (remaining,) = (await query(manager, "SELECT SUM(content_size) FROM crawled_data"))[0]
+    assert remaining <= total // 2
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_blobs_reference_counted_and_collected(tmp_path):
+    manager = await make_manager(tmp_path, write_batch_size=1)
+    shared_html = "<html><body><p>Shared</p></body></html>"
+    html_hash = generate_content_hash(shared_html)
+    await manager.acache_url(make_result(0, html=shared_html))
+    await manager.acache_url(make_result(1, html=shared_html))
+    await manager.aflush_writes()
+
+    async def refcount(content_hash):
+        rows = await query(manager, "SELECT refcount FROM content_blobs WHERE hash = ?", (content_hash,))
+        return rows[0][0] if rows else None
+
+    assert await refcount(html_hash) == 2
+
+    # Re-caching a URL with new content moves its references
+    await manager.acache_url(make_result(1))
+    await manager.aflush_writes()
+    assert await refcount(html_hash) == 1
+    assert await refcount(generate_content_hash(make_result(1).html)) == 1
+
+    assert await manager.agc() == 0
+    await query(manager, "DELETE FROM crawled_data WHERE url = ?", ("https://example.com/page0",))
+    assert await refcount(html_hash) == 0
+
+    # page0's html and markdown are unreferenced now; page1's content is kept
+    assert await manager.agc(batch_size=1) == 2
+    assert await refcount(html_hash) is None
+    assert (await manager.aget_cached_url("https://example.com/page1")).html == make_result(1).html
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_eviction_schedules_gc(tmp_path):
+    manager = await make_manager(tmp_path, write_batch_size=1, max_entries=1)
+    for i in range(3):
+        await manager.acache_url(make_result(i))
+        await manager._flush_task
+        if manager._gc_task:
+            await manager._gc_task
+
+    assert await cached_urls(manager) == ["https://example.com/page2"]
+    (blobs,) = (await query(manager, "SELECT COUNT(*) FROM content_blobs"))[0]
+    assert blobs == 2  # html and markdown of page2
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_schema_upgrade_counts_existing_references(tmp_path):
+    db_path = str(tmp_path / "crawl4ai.db")
+    html = "<p>Old page</p>"
+    html_hash = generate_content_hash(html)
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute(
+            "CREATE TABLE crawled_data (url TEXT PRIMARY KEY, html TEXT, cleaned_html TEXT, "
+            "markdown TEXT, extracted_content TEXT, success BOOLEAN, media TEXT, links TEXT, "
+            "metadata TEXT, screenshot TEXT, response_headers TEXT, downloaded_files TEXT)"
+        )
+        await db.execute(
+            "CREATE TABLE content_blobs (hash TEXT PRIMARY KEY, codec TEXT NOT NULL, "
+            "is_binary INTEGER NOT NULL DEFAULT 0, size INTEGER NOT NULL, data BLOB NOT NULL)"
+        )
+        await db.execute(
+            "INSERT INTO crawled_data VALUES (?, ?, ?, '', '', 1, '{}', '{}', '{}', '', '{}', '[]')",
+            ("https://example.com/old", html_hash, html_hash),
+        )
+        codec, is_binary, data = pack_content(html)
+        await db.execute(
+            "INSERT INTO content_blobs VALUES (?, ?, ?, ?, ?)",
+            (html_hash, codec, is_binary, len(html), data),
+        )
+        await db.commit()
+
+    manager = await make_manager(tmp_path)
+    assert await query(manager, "SELECT refcount FROM content_blobs") == [(1,)]
+    assert await manager.agc() == 0
+    # Entries from before the upgrade have no fetch time, so any max_age skips them
+    assert await manager.aget_cached_url("https://example.com/old", max_age=3600) is None
+    await manager.cleanup()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,153 @@
+import base64
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+import crawl4ai.async_database as async_database
+import crawl4ai.async_webcrawler as async_webcrawler
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.models import AsyncCrawlResponse, CrawlResult, MarkdownGenerationResult
+from crawl4ai.utils import ensure_content_dirs
+
+URL = "https://example.com/article"
+HTML = "<html><body>" + "<p>Some article text.</p>" * 5000 + "</body></html>"
+SCREENSHOT = base64.b64encode(os.urandom(200_000)).decode("ascii")
+
+
+class CountingStrategy(AsyncCrawlerStrategy):
+    """Crawler strategy that serves HTML without a browser and counts the crawls."""
+
+    def __init__(self):
+        self.crawls = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def crawl(self, url, config=None, **kwargs):
+        self.crawls += 1
+        return AsyncCrawlResponse(html=HTML, response_headers={}, status_code=200)
+
+
+async def make_manager(tmp_path) -> AsyncDatabaseManager:
+    manager = AsyncDatabaseManager()
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_paths = ensure_content_dirs(str(tmp_path))
+    await manager.ainit_db()
+    manager._initialized = True
+    await manager.acache_url(
+        CrawlResult(
+            url=URL,
+            html=HTML,
+            success=True,
+            cleaned_html="<p>Some article text.</p>",
+            markdown=MarkdownGenerationResult(
+                raw_markdown="Some article text.",
+                markdown_with_citations="Some article text.",
+                references_markdown="",
+            ),
+            extracted_content='[{"title": "Article"}]',
+            screenshot=SCREENSHOT,
+            links={"internal": [{"href": "https://example.com/"}], "external": []},
+        )
+    )
+    await manager.aflush_writes()
+    return manager
+
+
+def count_unpacks(monkeypatch):
+    decoded = []
+    unpack_content = async_database.unpack_content
+
+    def counting(codec, is_binary, data):
+        content = unpack_content(codec, is_binary, data)
+        decoded.append(content)
+        return content
+
+    monkeypatch.setattr(async_database, "unpack_content", counting)
+    return decoded
+
+
+@pytest.mark.asyncio
+async def test_full_read_decodes_each_blob_once(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path)
+    decoded = count_unpacks(monkeypatch)
+
+    result = await manager.aget_cached_url(URL)
+    assert result.html == HTML
+    assert result.screenshot == SCREENSHOT
+    assert result.markdown.raw_markdown == "Some article text."
+    assert result.extracted_content == '[{"title": "Article"}]'
+    assert result.links["internal"][0]["href"] == "https://example.com/"
+    assert len(decoded) == 5
+    assert decoded.count(SCREENSHOT) == 1
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_projection_loads_only_requested_fields(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path)
+    decoded = count_unpacks(monkeypatch)
+
+    result = await manager.aget_cached_url(URL, fields=["markdown"])
+    assert result.url == URL and result.success
+    assert result.markdown.raw_markdown == "Some article text."
+    assert result.markdown.markdown_with_citations == "Some article text."
+    assert result.html == ""
+    assert result.screenshot is None
+    assert result.links == {}
+    assert len(decoded) == 1  # only the markdown blob
+
+    result = await manager.aget_cached_url(URL, fields=("links", "metadata"))
+    assert result.links["internal"][0]["href"] == "https://example.com/"
+    assert result.markdown is None
+    assert len(decoded) == 1
+
+    with pytest.raises(ValueError, match="pdf"):
+        await manager.aget_cached_url(URL, fields=["markdown", "pdf"])
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_arun_reads_configured_fields(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path)
+    monkeypatch.setattr(async_webcrawler, "async_db_manager", manager)
+    decoded = count_unpacks(monkeypatch)
+    strategy = CountingStrategy()
+
+    config = CrawlerRunConfig(cache_mode=CacheMode.ENABLED, cache_fields=["markdown"])
+    assert CrawlerRunConfig.from_kwargs(config.to_dict()).cache_fields == ["markdown"]
+    async with AsyncWebCrawler(crawler_strategy=strategy, base_directory=str(tmp_path)) as crawler:
+        result = await crawler.arun(URL, config=config)
+    # A hit without html is still a hit
+    assert strategy.crawls == 0
+    assert result.success
+    assert result.markdown.raw_markdown == "Some article text."
+    assert result.html == ""
+    assert len(decoded) == 1
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_markdown_cached_as_json_is_restored(tmp_path):
+    manager = await make_manager(tmp_path)
+    markdown = MarkdownGenerationResult(
+        raw_markdown="Raw", markdown_with_citations="Cited", references_markdown="Refs"
+    )
+    assert manager._parse_markdown(markdown.model_dump_json()) == markdown
+    assert manager._parse_markdown('{"raw_markdown": "Raw"}').raw_markdown == "Raw"
+    assert manager._parse_markdown("42").raw_markdown == "42"
+    assert manager._parse_markdown("") is None
+    await manager.cleanup()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,239 @@
+import asyncio
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncHTTPCrawlerStrategy, AsyncPlaywrightCrawlerStrategy
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.cache_context import conditional_headers
+from crawl4ai.utils import ensure_content_dirs
+
+
+class Site:
+    """Serves pages with an ETag and answers matching If-None-Match with 304."""
+
+    def __init__(self):
+        self.version = 1
+        self.requests = []
+
+    async def handle(self, request):
+        self.requests.append(dict(request.headers))
+        etag = f'"v{self.version}"'
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag, "Cache-Control": "max-age=60"})
+        body = f"<html><body><h1>Version {self.version}</h1><p>Some text for the page.</p></body></html>"
+        return web.Response(text=body, content_type="text/html", headers={"ETag": etag})
+
+
+@pytest_asyncio.fixture
+async def site():
+    site = Site()
+    app = web.Application()
+    app.router.add_get("/{path:.*}", site.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    server = web.TCPSite(runner, "127.0.0.1", 0)
+    await server.start()
+    site.url = f"http://127.0.0.1:{runner.addresses[0][1]}/page"
+    yield site
+    await runner.cleanup()
+
+
+@pytest_asyncio.fixture
+async def manager(tmp_path, monkeypatch):
+    import crawl4ai.async_webcrawler as async_webcrawler
+
+    manager = AsyncDatabaseManager()
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_paths = ensure_content_dirs(str(tmp_path))
+    await manager.ainit_db()
+    manager._initialized = True
+    monkeypatch.setattr(async_webcrawler, "async_db_manager", manager)
+    yield manager
+    await manager.cleanup()
+
+
+def count_processing(crawler, monkeypatch):
+    calls = []
+    aprocess_html = crawler.aprocess_html
+
+    async def counting(*args, **kwargs):
+        calls.append(kwargs["url"])
+        return await aprocess_html(*args, **kwargs)
+
+    monkeypatch.setattr(crawler, "aprocess_html", counting)
+    return calls
+
+
+def test_conditional_headers():
+    assert conditional_headers({"etag": '"abc"', "Last-Modified": "Wed, 21 Oct 2015 07:28:00 GMT"}) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Wed, 21 Oct 2015 07:28:00 GMT",
+    }
+    assert conditional_headers({"Content-Type": "text/html"}) == {}
+    assert conditional_headers(None) == {}
+
+
+@pytest.mark.asyncio
+async def test_unchanged_page_is_served_from_cache(site, manager, tmp_path, monkeypatch):
+    config = CrawlerRunConfig(cache_mode=CacheMode.REVALIDATE)
+    async with AsyncWebCrawler(crawler_strategy=AsyncHTTPCrawlerStrategy(), base_directory=str(tmp_path)) as crawler:
+        processed = count_processing(crawler, monkeypatch)
+        first = await crawler.arun(site.url, config=config)
+        assert first.status_code == 200 and "Version 1" in first.markdown
+        assert "If-None-Match" not in site.requests[0]
+
+        second = await crawler.arun(site.url, config=config)
+        assert site.requests[1]["If-None-Match"] == '"v1"'
+        assert second.success and second.status_code == 304
+        assert second.html == first.html and "Version 1" in second.markdown
+        assert len(processed) == 1  # the 304 was not processed again
+
+        # Headers of the 304 are merged into the cached entry
+        cached = await manager.aget_cached_url(site.url)
+        assert cached.response_headers["Cache-Control"] == "max-age=60"
+
+        site.version = 2
+        third = await crawler.arun(site.url, config=config)
+        assert third.status_code == 200 and "Version 2" in third.markdown
+        assert len(processed) == 2
+        await manager.aflush_writes()
+        assert "Version 2" in (await manager.aget_cached_url(site.url)).html
+
+
+@pytest.mark.asyncio
+async def test_fresh_entries_skip_revalidation(site, manager, tmp_path):
+    async with AsyncWebCrawler(crawler_strategy=AsyncHTTPCrawlerStrategy(), base_directory=str(tmp_path)) as crawler:
+        await crawler.arun(site.url, config=CrawlerRunConfig(cache_mode=CacheMode.ENABLED))
+        result = await crawler.arun(
+            site.url, config=CrawlerRunConfig(cache_mode=CacheMode.REVALIDATE, cache_max_age=60)
+        )
+        assert result.success
+        assert len(site.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_refresh_cached_url_resets_age(site, manager, tmp_path):
+    async with AsyncWebCrawler(crawler_strategy=AsyncHTTPCrawlerStrategy(), base_directory=str(tmp_path)) as crawler:
+        await crawler.arun(site.url, config=CrawlerRunConfig(cache_mode=CacheMode.ENABLED))
+    await manager.aflush_writes()
+
+    async def age(db):
+        await db.execute("UPDATE crawled_data SET fetched_at = fetched_at - 120")
+
+    await manager.execute_with_retry(age)
+    assert await manager.aget_cached_url(site.url, max_age=60) is None
+    assert await manager.arefresh_cached_url(site.url, {"etag": '"v9"'})
+    refreshed = await manager.aget_cached_url(site.url, max_age=60)
+    # The new header replaces the cached one whatever its case
+    assert refreshed.response_headers["etag"] == '"v9"'
+    assert "ETag" not in refreshed.response_headers
+    assert not await manager.arefresh_cached_url("https://example.com/missing")
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_revalidated(site, manager, tmp_path, monkeypatch):
+    config = CrawlerRunConfig(cache_mode=CacheMode.REVALIDATE, cache_ttl=0.2)
+    async with AsyncWebCrawler(crawler_strategy=AsyncHTTPCrawlerStrategy(), base_directory=str(tmp_path)) as crawler:
+        processed = count_processing(crawler, monkeypatch)
+        first = await crawler.arun(site.url, config=config)
+        await manager.aflush_writes()
+        await asyncio.sleep(0.3)
+        assert await manager.aget_cached_url(site.url) is None  # past cache_ttl
+
+        # Writing another URL flushes the cache without dropping the expired entry
+        other = await crawler.arun(site.url.replace("/page", "/other"), config=config)
+        assert other.status_code == 200
+        await manager.aflush_writes()
+
+        second = await crawler.arun(site.url, config=config)
+        assert site.requests[2]["If-None-Match"] == '"v1"'
+        assert second.status_code == 304 and second.html == first.html
+        assert processed.count(site.url) == 1
+        # The 304 renewed the TTL
+        assert (await manager.aget_cached_url(site.url)).html == first.html
+
+
+class FakeRequest:
+    def __init__(self, frame, navigation=True):
+        self.frame = frame
+        self.navigation = navigation
+        self.headers = {"user-agent": "test"}
+
+    def is_navigation_request(self):
+        return self.navigation
+
+
+class FakeResponse:
+    def __init__(self, status, headers=None):
+        self.status = status
+        self.headers = headers or {}
+
+
+class FakeRoute:
+    def __init__(self, request, response):
+        self.request = request
+        self.response = response
+        self.fetched_with = None
+        self.outcome = None
+
+    async def fetch(self, headers=None, max_redirects=None):
+        self.fetched_with = (headers, max_redirects)
+        return self.response
+
+    async def fulfill(self, **kwargs):
+        self.outcome = ("fulfill", kwargs)
+
+    async def fallback(self):
+        self.outcome = ("fallback", None)
+
+
+class FakePage:
+    def __init__(self):
+        self.main_frame = object()
+        self.handler = None
+
+    async def route(self, pattern, handler, times=None):
+        self.handler = handler
+
+
+@pytest.mark.parametrize("status", [304, 200])
+@pytest.mark.asyncio
+async def test_revalidate_navigation_route(status):
+    page = FakePage()
+    strategy = AsyncPlaywrightCrawlerStrategy()
+    revalidation = await strategy._revalidate_navigation(page, {"If-None-Match": '"v1"'})
+    assert page.handler is revalidation["handler"]
+
+    # Subresources and frames are left alone, without using up the revalidation
+    for request in (FakeRequest(page.main_frame, navigation=False), FakeRequest(object())):
+        route = FakeRoute(request, FakeResponse(200))
+        await page.handler(route)
+        assert route.outcome == ("fallback", None) and route.fetched_with is None
+
+    response = FakeResponse(status, {"etag": '"v1"'})
+    route = FakeRoute(FakeRequest(page.main_frame), response)
+    await page.handler(route)
+    assert route.fetched_with == ({"user-agent": "test", "If-None-Match": '"v1"'}, 0)
+    if status == 304:
+        assert revalidation["headers"] == {"etag": '"v1"'}
+        assert route.outcome == ("fulfill", {"status": 200, "body": "", "content_type": "text/html"})
+    else:
+        assert "headers" not in revalidation
+        assert route.outcome == ("fulfill", {"response": response})
+
+    # Only the first navigation is revalidated
+    route = FakeRoute(FakeRequest(page.main_frame), FakeResponse(200))
+    await page.handler(route)
+    assert route.outcome == ("fallback", None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,237 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
+from crawl4ai.async_database import AsyncDatabaseManager
+from crawl4ai.models import AsyncCrawlResponse, CrawlResult, MarkdownGenerationResult
+from crawl4ai.utils import ensure_content_dirs
+
+
+class StaticStrategy(AsyncCrawlerStrategy):
+    """Crawler strategy that returns a fixed page without a browser."""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def crawl(self, url, config=None, **kwargs):
+        return AsyncCrawlResponse(
+            html=f"<html><body><p>Content of {url}</p></body></html>",
+            response_headers={},
+            status_code=200,
+        )
+
+
+def make_result(i: int, html: str = None) -> CrawlResult:
+    return CrawlResult(
+        url=f"https://example.com/page{i}",
+        html=html or f"<html><body><p>Page {i}</p></body></html>",
+        success=True,
+        cleaned_html=f"<p>Page {i}</p>",
+        markdown=MarkdownGenerationResult(
+            raw_markdown=f"Page {i}",
+            markdown_with_citations=f"Page {i}",
+            references_markdown="",
+        ),
+    )
+
+
+async def make_manager(tmp_path, **kwargs) -> AsyncDatabaseManager:
+    manager = AsyncDatabaseManager(**kwargs)
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_paths = ensure_content_dirs(str(tmp_path))
+    await manager.ainit_db()
+    manager._initialized = True
+    return manager
+
+
+def count_executemany(manager, monkeypatch):
+    calls = []
+    execute_with_retry = manager.execute_with_retry
+
+    async def counting(operation, *args):
+        calls.append(operation)
+        return await execute_with_retry(operation, *args)
+
+    monkeypatch.setattr(manager, "execute_with_retry", counting)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_writes_are_batched(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path, write_batch_size=10, write_flush_interval=60)
+    calls = count_executemany(manager, monkeypatch)
+
+    for i in range(10):
+        await manager.acache_url(make_result(i))
+    assert calls == []  # nothing written while acache_url runs
+
+    await manager._flush_task
+    assert len(calls) == 1
+    assert manager._pending_writes == {}
+    assert await manager.aget_total_count() == 10
+
+    cached = await manager.aget_cached_url("https://example.com/page3")
+    assert cached.html == make_result(3).html
+    assert cached.markdown.raw_markdown == "Page 3"
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_flush_after_interval(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path, write_batch_size=100, write_flush_interval=0.05)
+    calls = count_executemany(manager, monkeypatch)
+
+    await manager.acache_url(make_result(0))
+    await manager.acache_url(make_result(1))
+    assert calls == []
+
+    await asyncio.sleep(0.2)
+    assert len(calls) == 1
+    assert manager._pending_writes == {}
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_back_pressure_waits_for_flush(tmp_path, monkeypatch):
+    manager = await make_manager(
+        tmp_path, write_batch_size=5, write_flush_interval=60, max_pending_writes=5
+    )
+    calls = count_executemany(manager, monkeypatch)
+
+    for i in range(4):
+        await manager.acache_url(make_result(i))
+    assert calls == []
+
+    # The fifth result fills the queue, so acache_url writes before returning
+    await manager.acache_url(make_result(4))
+    assert len(calls) == 1
+    assert manager._pending_writes == {}
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_reads_see_queued_writes(tmp_path):
+    manager = await make_manager(tmp_path, write_flush_interval=60)
+
+    await manager.acache_url(make_result(0, html="<p>old</p>"))
+    await manager.acache_url(make_result(0, html="<p>new</p>"))
+    assert len(manager._pending_writes) == 1
+
+    cached = await manager.aget_cached_url("https://example.com/page0")
+    assert cached.html == "<p>new</p>"
+    assert manager._pending_writes == {}
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_reads_wait_for_the_running_flush(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path, write_flush_interval=60)
+    await manager.acache_url(make_result(0))
+
+    started = asyncio.Event()
+    release = asyncio.Event()
+    pack_blobs = manager._pack_blobs
+
+    def slow_pack(contents):
+        manager_loop.call_soon_threadsafe(started.set)
+        asyncio.run_coroutine_threadsafe(release.wait(), manager_loop).result()
+        return pack_blobs(contents)
+
+    manager_loop = asyncio.get_running_loop()
+    monkeypatch.setattr(manager, "_pack_blobs", slow_pack)
+    flush = asyncio.create_task(manager.aflush_writes())
+    await started.wait()
+    # The batch has left the queue but is not committed yet
+    assert manager._pending_writes == {}
+    read = asyncio.create_task(manager.aget_cached_url("https://example.com/page0"))
+    await asyncio.sleep(0.05)
+    assert not read.done()
+
+    release.set()
+    await flush
+    assert (await read).html == make_result(0).html
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_failed_flush_requeues_and_raises(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path, write_flush_interval=60, max_retries=1)
+    # Serialize the newer page1 result up front, to queue it during the flush
+    await manager.acache_url(make_result(1, html="<p>newer</p>"))
+    newer = manager._pending_writes.pop("https://example.com/page1")
+    await manager.acache_url(make_result(0))
+    await manager.acache_url(make_result(1))
+
+    pack_blobs = manager._pack_blobs
+
+    def failing(contents):
+        manager._pending_writes["https://example.com/page1"] = newer
+        raise OSError("disk full")
+
+    monkeypatch.setattr(manager, "_pack_blobs", failing)
+    with pytest.raises(OSError):
+        await manager.aflush_writes()
+    assert set(manager._pending_writes) == {"https://example.com/page0", "https://example.com/page1"}
+    assert manager._pending_writes["https://example.com/page1"] is newer
+    assert manager._flushing_writes == {}
+
+    monkeypatch.setattr(manager, "_pack_blobs", pack_blobs)
+    await manager.aflush_writes()
+    assert (await manager.aget_cached_url("https://example.com/page1")).html == "<p>newer</p>"
+    assert await manager.aget_total_count() == 2
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_background_flush_error_is_retrieved(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path, write_batch_size=1, max_retries=1)
+
+    def failing(contents):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(manager, "_pack_blobs", failing)
+    await manager.acache_url(make_result(0))
+    task = manager._flush_task
+    await asyncio.wait([task])
+    assert isinstance(task.exception(), OSError)
+    # The error was retrieved by the done callback, so asyncio does not report it
+    assert task._log_traceback is False
+    assert "https://example.com/page0" in manager._pending_writes
+
+    monkeypatch.undo()
+    await manager.cleanup()
+    assert await manager.aget_cached_url("https://example.com/page0") is not None
+
+
+@pytest.mark.asyncio
+async def test_crawler_close_flushes_queued_writes(tmp_path, monkeypatch):
+    import crawl4ai.async_webcrawler as async_webcrawler
+
+    manager = await make_manager(tmp_path, write_flush_interval=60)
+    monkeypatch.setattr(async_webcrawler, "async_db_manager", manager)
+
+    config = CrawlerRunConfig(cache_mode=CacheMode.ENABLED)
+    async with AsyncWebCrawler(
+        crawler_strategy=StaticStrategy(), base_directory=str(tmp_path)
+    ) as crawler:
+        for i in range(3):
+            await crawler.arun(f"https://example.com/page{i}", config=config)
+        assert len(manager._pending_writes) == 3
+
+    assert manager._pending_writes == {}
+    assert await manager.aget_total_count() == 3
+    await manager.cleanup()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+import crawl4ai.async_dispatcher as async_dispatcher
+from crawl4ai import (
+    ConcurrencyController,
+    CrawlerMonitor,
+    CrawlerRunConfig,
+    MemoryAdaptiveDispatcher,
+)
+from crawl4ai.models import CrawlerTaskResult, CrawlResult
+
+
+def task_result(latency=1.0, status_code=200, success=True, error="", start_time=None):
+    start_time = time.time() if start_time is None else start_time
+    return CrawlerTaskResult(
+        task_id="task",
+        url="https://example.com/",
+        result=CrawlResult(
+            url="https://example.com/", html="", success=success, status_code=status_code
+        ),
+        memory_usage=0,
+        peak_memory=0,
+        start_time=start_time,
+        end_time=start_time + latency,
+        error_message=error,
+    )
+
+
+def test_additive_increase_once_per_round():
+    controller = ConcurrencyController(initial_permit=2, max_permit=4)
+    assert not controller.record(task_result())
+    assert controller.record(task_result())
+    assert controller.limit == 3
+
+    for _ in range(2):
+        assert not controller.record(task_result())
+    assert controller.record(task_result())
+    assert controller.limit == 4
+
+    # Capped at max_permit
+    for _ in range(8):
+        controller.record(task_result())
+    assert controller.limit == 4
+    assert [limit for _, limit, _ in controller.history] == [2, 3, 4]
+
+
+def test_unhealthy_latency_or_errors_hold_the_limit():
+    slow = ConcurrencyController(initial_permit=2, latency_target=5.0)
+    for _ in range(10):
+        slow.record(task_result(latency=10.0))
+    assert slow.limit == 2
+
+    failing = ConcurrencyController(initial_permit=2, max_error_rate=0.2)
+    for _ in range(10):
+        failing.record(task_result(success=False, error="Page not found"))
+    assert failing.limit == 2
+
+
+def test_multiplicative_decrease_on_congestion():
+    controller = ConcurrencyController(initial_permit=16)
+    before = time.time() - 1
+    assert controller.record(task_result(status_code=429))
+    assert controller.limit == 8
+    # Crawls started before the cut do not cut again
+    assert not controller.record(task_result(status_code=503, start_time=before))
+    assert controller.limit == 8
+
+    assert controller.record(task_result(success=False, error="Timeout 30000ms exceeded"))
+    assert controller.limit == 4
+    assert [reason for _, _, reason in controller.history] == ["initial", "HTTP 429", "timeout"]
+
+
+def test_pressure_decrease_is_rate_limited():
+    controller = ConcurrencyController(initial_permit=16, decrease_interval=60)
+    assert not controller.observe_pressure(False, cpu_percent=50.0)
+    assert controller.observe_pressure(False, cpu_percent=99.0)
+    assert controller.limit == 8
+    assert not controller.observe_pressure(True)
+    assert controller.limit == 8
+
+    controller._last_decrease -= 61
+    assert controller.observe_pressure(True)
+    assert controller.limit == 4
+    assert controller.history[-1][2] == "memory pressure"
+
+
+class RateLimitedCrawler:
+    """Answers 429 while more than `capacity` crawls run at once."""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.active = 0
+
+    async def arun(self, url, config=None, session_id=None):
+        self.active += 1
+        try:
+            await asyncio.sleep(0.005)
+            status_code = 429 if self.active > self.capacity else 200
+        finally:
+            self.active -= 1
+        return CrawlResult(url=url, html="", success=True, status_code=status_code)
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_converges_and_reports_to_monitor(monkeypatch):
+    monkeypatch.setattr(async_dispatcher, "get_true_memory_usage_percent", lambda: 10.0)
+    controller = ConcurrencyController(initial_permit=2, max_permit=32, cpu_threshold_percent=None)
+    monitor = CrawlerMonitor(enable_ui=False)
+    dispatcher = MemoryAdaptiveDispatcher(concurrency_controller=controller, monitor=monitor)
+    urls = [f"https://example.com/{i}" for i in range(600)]
+
+    results = await dispatcher.run_urls(urls, RateLimitedCrawler(capacity=8), CrawlerRunConfig())
+    assert len(results) == 600
+
+    limits = [limit for _, limit, _ in controller.history]
+    assert max(limits) > 8  # probed past the server's capacity...
+    assert any(reason == "HTTP 429" for _, _, reason in controller.history)  # ...and backed off
+    assert controller.limit <= 16
+
+    stats = monitor.get_concurrency_stats()
+    assert stats["current_limit"] == controller.limit
+    assert [limit for _, limit, _ in stats["history"]] == limits
+    assert monitor.get_summary()["concurrency_limit"] == controller.limit
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
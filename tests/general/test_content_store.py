@@ -0,0 +1,194 @@
+import base64
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+import crawl4ai.async_database as async_database
+from crawl4ai.async_database import AsyncDatabaseManager, pack_content, unpack_content
+from crawl4ai.models import CrawlResult, MarkdownGenerationResult
+from crawl4ai.utils import ensure_content_dirs, generate_content_hash
+
+HTML = "<html><body>" + "<p>Repeated paragraph with ünïcode.</p>" * 500 + "</body></html>"
+SCREENSHOT = base64.b64encode(bytes(range(256)) * 40).decode("ascii")
+
+
+async def make_manager(tmp_path, **kwargs) -> AsyncDatabaseManager:
+    manager = AsyncDatabaseManager(**kwargs)
+    manager.db_path = str(tmp_path / "crawl4ai.db")
+    manager.content_paths = ensure_content_dirs(str(tmp_path))
+    await manager.ainit_db()
+    manager._initialized = True
+    return manager
+
+
+def content_files(tmp_path):
+    return [
+        name
+        for _, _, files in os.walk(tmp_path)
+        for name in files
+        if not name.startswith("crawl4ai.db")
+    ]
+
+
+@pytest.mark.parametrize("use_zstd", [True, False])
+def test_pack_round_trip(monkeypatch, use_zstd):
+    if not use_zstd:
+        monkeypatch.setattr(async_database, "zstandard", None)
+    elif async_database.zstandard is None:
+        pytest.skip("zstandard is not installed")
+
+    codec, is_binary, data = pack_content(HTML)
+    assert codec == ("zstd" if use_zstd else "gzip")
+    assert is_binary == 0
+    assert len(data) < len(HTML) / 10
+    assert unpack_content(codec, is_binary, data) == HTML
+
+
+def test_screenshots_stored_as_raw_bytes():
+    codec, is_binary, data = pack_content(SCREENSHOT, binary=True)
+    assert (codec, is_binary) == ("none", 1)
+    assert data == base64.b64decode(SCREENSHOT)
+    assert unpack_content(codec, is_binary, data) == SCREENSHOT
+
+    # Anything that is not canonical base64 is kept as text
+    for text in ("not base64!", SCREENSHOT[:-1], SCREENSHOT + "\n"):
+        codec, is_binary, data = pack_content(text, binary=True)
+        assert is_binary == 0
+        assert unpack_content(codec, is_binary, data) == text
+
+
+@pytest.mark.asyncio
+async def test_cached_content_lives_in_database(tmp_path):
+    manager = await make_manager(tmp_path)
+    result = CrawlResult(
+        url="https://example.com",
+        html=HTML,
+        success=True,
+        cleaned_html=HTML,
+        markdown=MarkdownGenerationResult(
+            raw_markdown="Repeated paragraph", markdown_with_citations="", references_markdown=""
+        ),
+        screenshot=SCREENSHOT,
+    )
+    await manager.acache_url(result)
+    await manager.acache_url(result.model_copy(update={"url": "https://example.com/copy"}))
+    await manager.aflush_writes()
+
+    assert content_files(tmp_path) == []
+
+    async def _blobs(db):
+        async with db.execute("SELECT COUNT(*), SUM(LENGTH(data)) FROM content_blobs") as cursor:
+            return await cursor.fetchone()
+
+    count, stored = await manager.execute_with_retry(_blobs)
+    # html and cleaned_html are identical, and both URLs share all content
+    assert count == 3
+    assert stored < len(HTML) + len(SCREENSHOT)
+
+    cached = await manager.aget_cached_url("https://example.com/copy")
+    assert cached.html == HTML
+    assert cached.cleaned_html == HTML
+    assert cached.screenshot == SCREENSHOT
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_connections_use_mmap(tmp_path):
+    manager = await make_manager(tmp_path, mmap_size=1024 * 1024)
+
+    async def _mmap_size(db):
+        async with db.execute("PRAGMA mmap_size") as cursor:
+            return (await cursor.fetchone())[0]
+
+    assert await manager.execute_with_retry(_mmap_size) == 1024 * 1024
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_legacy_content_files_are_migrated(tmp_path):
+    manager = await make_manager(tmp_path)
+    html_hash = generate_content_hash(HTML)
+    screenshot_hash = generate_content_hash(SCREENSHOT)
+    markdown = "Repeated paragraph"
+    markdown_hash = generate_content_hash(markdown)
+    with open(os.path.join(manager.content_paths["html"], html_hash), "w", encoding="utf-8") as f:
+        f.write(HTML)
+    with open(os.path.join(manager.content_paths["markdown"], markdown_hash), "w") as f:
+        f.write(markdown)
+    with open(os.path.join(manager.content_paths["screenshots"], screenshot_hash), "w") as f:
+        f.write(SCREENSHOT)
+
+    async def _insert(db):
+        await db.execute(
+            "INSERT INTO crawled_data (url, html, cleaned_html, markdown, extracted_content, "
+            "success, screenshot, downloaded_files) VALUES (?, ?, '', ?, '', 1, ?, '[]')",
+            ("https://example.com", html_hash, markdown_hash, screenshot_hash),
+        )
+
+    await manager.execute_with_retry(_insert)
+
+    # Readable from the legacy files before the migration...
+    assert (await manager.aget_cached_url("https://example.com")).html == HTML
+
+    assert manager._has_legacy_content()
+    assert await manager.amigrate_content_files(batch_size=1) == 3
+    assert not manager._has_legacy_content()
+    assert content_files(tmp_path) == []
+
+    # ...and from the content store after it
+    cached = await manager.aget_cached_url("https://example.com")
+    assert cached.html == HTML
+    assert cached.screenshot == SCREENSHOT
+    assert cached.markdown.raw_markdown == "Repeated paragraph"
+    await manager.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_migration_keeps_moved_content(tmp_path, monkeypatch):
+    manager = await make_manager(tmp_path)
+    pages = {f"https://example.com/{i}": f"<html><body>Page {i}</body></html>" for i in range(3)}
+    for url, html in pages.items():
+        html_hash = generate_content_hash(html)
+        with open(os.path.join(manager.content_paths["html"], html_hash), "w", encoding="utf-8") as f:
+            f.write(html)
+
+        async def _insert(db, url=url, html_hash=html_hash):
+            await db.execute(
+                "INSERT INTO crawled_data (url, html, cleaned_html, markdown, extracted_content, "
+                "success, screenshot, downloaded_files) VALUES (?, ?, '', '', '', 1, '', '[]')",
+                (url, html_hash),
+            )
+
+        await manager.execute_with_retry(_insert)
+
+    # Crash right after the first batch's files are deleted
+    remove_files = AsyncDatabaseManager._remove_files
+
+    def _remove_then_crash(paths):
+        remove_files(paths)
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(manager, "_remove_files", _remove_then_crash)
+    with pytest.raises(KeyboardInterrupt):
+        await manager.amigrate_content_files(batch_size=1)
+    assert len(content_files(tmp_path)) == 2
+
+    # The moved blob is already referenced, so collection must leave it alone
+    assert await manager.agc() == 0
+    for url, html in pages.items():
+        assert (await manager.aget_cached_url(url)).html == html
+
+    monkeypatch.undo()
+    assert await manager.amigrate_content_files(batch_size=1) == 2
+    assert await manager.agc() == 0
+    for url, html in pages.items():
+        assert (await manager.aget_cached_url(url)).html == html
+    await manager.cleanup()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
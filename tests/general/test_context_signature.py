@@ -0,0 +1,121 @@
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import BrowserConfig, CacheMode, CrawlerRunConfig, GeolocationConfig
+import crawl4ai.browser_manager as browser_manager
+from crawl4ai.browser_manager import BrowserManager
+
+
+@pytest.fixture
+def manager():
+    return BrowserManager(BrowserConfig(headless=True))
+
+
+def test_signature_is_stable(manager):
+    config = CrawlerRunConfig(locale="de-DE")
+    signature = manager._make_config_signature(config)
+    assert manager._make_config_signature(config) == signature
+    assert manager._make_config_signature(CrawlerRunConfig(locale="de-DE")) == signature
+
+
+def test_signature_ignores_non_context_fields(manager):
+    base = CrawlerRunConfig()
+    other = CrawlerRunConfig(
+        js_code="window.scrollTo(0, 0)",
+        cache_mode=CacheMode.BYPASS,
+        screenshot=True,
+        stream=True,
+        session_id="abc",
+    )
+    assert manager._make_config_signature(base) == manager._make_config_signature(other)
+
+
+def test_signature_compares_proxy_and_geolocation_by_value(manager):
+    first = CrawlerRunConfig(
+        proxy_config="http://127.0.0.1:8080",
+        geolocation=GeolocationConfig(latitude=1.0, longitude=2.0),
+    )
+    second = CrawlerRunConfig(
+        proxy_config="http://127.0.0.1:8080",
+        geolocation=GeolocationConfig(latitude=1.0, longitude=2.0),
+    )
+    third = CrawlerRunConfig(proxy_config="http://127.0.0.1:9090")
+    assert manager._make_config_signature(first) == manager._make_config_signature(second)
+    assert manager._make_config_signature(first) != manager._make_config_signature(third)
+
+
+@pytest.mark.parametrize(
+    "field,value",
+    [
+        ("locale", "fr-FR"),
+        ("timezone_id", "Europe/Paris"),
+        ("proxy_config", "http://127.0.0.1:9090"),
+        ("magic", True),
+        ("user_agent", "TestBot/1.0"),
+        ("user_agent_mode", "random"),
+    ],
+)
+def test_setting_context_field_changes_signature(manager, field, value):
+    config = CrawlerRunConfig()
+    signature = manager._make_config_signature(config)
+
+    setattr(config, field, value)
+    assert manager._make_config_signature(config) != signature
+
+
+def test_in_place_changes_update_signature(manager):
+    config = CrawlerRunConfig(
+        proxy_config="http://127.0.0.1:8080",
+        geolocation=GeolocationConfig(latitude=1.0, longitude=2.0),
+    )
+    signature = manager._make_config_signature(config)
+
+    config.proxy_config.server = "http://127.0.0.1:9090"
+    moved = manager._make_config_signature(config)
+    assert moved != signature
+
+    config.geolocation.latitude = 3.0
+    assert manager._make_config_signature(config) not in (signature, moved)
+
+
+def test_signature_is_cached_until_a_field_changes(manager, monkeypatch):
+    config = CrawlerRunConfig(
+        locale="de-DE", geolocation=GeolocationConfig(latitude=1.0, longitude=2.0)
+    )
+    signature = manager._make_config_signature(config)
+
+    hashes = []
+    real_sha256 = browser_manager.hashlib.sha256
+
+    def counting_sha256(data):
+        hashes.append(data)
+        return real_sha256(data)
+
+    monkeypatch.setattr(browser_manager.hashlib, "sha256", counting_sha256)
+    assert manager._make_config_signature(config) == signature
+    assert hashes == []
+
+    config.locale = "fr-FR"
+    changed = manager._make_config_signature(config)
+    assert len(hashes) == 1
+    assert changed != signature
+    assert changed == manager._make_config_signature(
+        CrawlerRunConfig(locale="fr-FR", geolocation=GeolocationConfig(latitude=1.0, longitude=2.0))
+    )
+
+
+def test_clone_signature_follows_fields(manager):
+    config = CrawlerRunConfig(locale="de-DE")
+    signature = manager._make_config_signature(config)
+
+    assert manager._make_config_signature(config.clone(stream=True)) == signature
+    assert manager._make_config_signature(config.clone(locale="en-US")) != signature
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
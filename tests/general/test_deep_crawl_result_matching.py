@@ -0,0 +1,89 @@
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import BestFirstCrawlingStrategy, BFSDeepCrawlStrategy, CrawlerRunConfig
+from crawl4ai.deep_crawling.base_strategy import _PendingUrls
+from crawl4ai.models import CrawlResult
+
+SITE = {
+    "https://example.com/": ["https://example.com/old-docs", "https://example.com/blog"],
+    "https://example.com/docs/": ["https://example.com/docs/api"],
+    "https://example.com/blog": ["https://example.com/docs/"],
+    "https://example.com/docs/api": [],
+}
+REDIRECTS = {"https://example.com/old-docs": "https://example.com/docs/"}
+
+
+class RedirectingCrawler:
+    """Serves SITE, following REDIRECTS like a browser would."""
+
+    def __init__(self):
+        self.crawled = []
+
+    async def arun(self, url, config=None):
+        self.crawled.append(url)
+        final = REDIRECTS.get(url, url)
+        links = [{"href": href} for href in SITE[final]]
+        return CrawlResult(
+            url=url, redirected_url=final, html="", success=True, links={"internal": links}
+        )
+
+    async def arun_many(self, urls, config=None):
+        results = [await self.arun(url) for url in urls]
+        if not config.stream:
+            return results
+
+        async def stream():
+            for result in results:
+                yield result
+
+        return stream()
+
+
+def test_pending_urls_match_normalized_and_redirected():
+    pending = _PendingUrls(
+        [("https://example.com/a", "parent-a"), ("https://example.com/b", "parent-b")]
+    )
+    result = CrawlResult(url="https://EXAMPLE.com/a/#top", html="", success=True)
+    assert pending.pop(result) == ("https://example.com/a", "parent-a")
+    assert pending.pop(result) is None
+
+    redirected = CrawlResult(
+        url="https://example.com/moved", redirected_url="https://example.com/b", html="", success=True
+    )
+    assert pending.pop(redirected) == ("https://example.com/b", "parent-b")
+    assert len(pending) == 0
+
+
+@pytest.mark.parametrize(
+    "make_strategy",
+    [
+        lambda: BFSDeepCrawlStrategy(max_depth=2),
+        lambda: BestFirstCrawlingStrategy(max_depth=2),
+    ],
+)
+@pytest.mark.parametrize("stream", [False, True])
+@pytest.mark.asyncio
+async def test_redirected_pages(make_strategy, stream):
+    crawler = RedirectingCrawler()
+    results = await make_strategy().arun("https://example.com/", crawler, CrawlerRunConfig(stream=stream))
+    if stream:
+        results = [result async for result in results]
+
+    metadata = {result.url: result.metadata for result in results}
+    assert metadata["https://example.com/old-docs"]["depth"] == 1
+    assert metadata["https://example.com/old-docs"]["parent_url"] == "https://example.com/"
+    # Links are attributed to the page the redirect led to...
+    assert metadata["https://example.com/docs/api"]["depth"] == 2
+    assert metadata["https://example.com/docs/api"]["parent_url"] == "https://example.com/docs/"
+    # ...which is not crawled again when another page links to it
+    assert "https://example.com/docs" not in crawler.crawled
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
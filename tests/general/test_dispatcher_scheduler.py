@@ -0,0 +1,133 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+import crawl4ai.async_dispatcher as async_dispatcher
+from crawl4ai import CrawlerRunConfig, MemoryAdaptiveDispatcher
+from crawl4ai.async_dispatcher import _TaskQueue
+from crawl4ai.models import CrawlResult
+
+
+class FakeCrawler:
+    """Stands in for AsyncWebCrawler: each arun sleeps `delay` seconds."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self.started = []
+
+    async def arun(self, url, config=None, session_id=None):
+        self.started.append(url)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return CrawlResult(url=url, html="", success=True)
+
+
+def test_queue_prefers_fresh_tasks_then_fifo():
+    queue = _TaskQueue(fairness_timeout=60)
+    queue.push(("retried",), 1, 0.0)
+    queue.push(("first",), 0, 1.0)
+    queue.push(("second",), 0, 2.0)
+
+    order = [queue.pop(now=10.0)[0][0] for _ in range(3)]
+    assert order == ["first", "second", "retried"]
+    assert len(queue) == 0
+    with pytest.raises(IndexError):
+        queue.pop(now=10.0)
+
+
+def test_queue_ages_long_waiting_tasks_lazily():
+    queue = _TaskQueue(fairness_timeout=60)
+    queue.push(("old retry",), 2, 0.0)
+    queue.push(("fresh",), 0, 50.0)
+
+    assert queue.pop(now=55.0)[0] == ("fresh",)
+    queue.push(("fresh",), 0, 55.0)
+    # Past the fairness timeout the oldest task wins regardless of retries
+    assert queue.pop(now=61.0)[0] == ("old retry",)
+
+
+def test_queue_statistics():
+    queue = _TaskQueue(fairness_timeout=60)
+    assert queue.stats(now=10.0) == (0, 0.0, 0.0)
+    queue.push(("a",), 0, 2.0)
+    queue.push(("b",), 1, 4.0)
+    assert queue.stats(now=10.0) == (2, 8.0, 7.0)
+    queue.pop(now=10.0)
+    assert queue.stats(now=10.0) == (1, 6.0, 6.0)
+
+
+@pytest.mark.asyncio
+async def test_run_urls_respects_permit_and_returns_all():
+    crawler = FakeCrawler(delay=0.01)
+    dispatcher = MemoryAdaptiveDispatcher(max_session_permit=5)
+    urls = [f"https://example.com/{i}" for i in range(40)]
+
+    results = await dispatcher.run_urls(urls, crawler, CrawlerRunConfig())
+    assert sorted(r.url for r in results) == sorted(urls)
+    assert crawler.max_active == 5
+
+
+@pytest.mark.asyncio
+async def test_scheduler_wakes_only_on_events(monkeypatch):
+    crawler = FakeCrawler(delay=0.2)
+    dispatcher = MemoryAdaptiveDispatcher(max_session_permit=2, check_interval=10)
+    wakeups = []
+    update = dispatcher._update_queue_statistics
+    monkeypatch.setattr(dispatcher, "_update_queue_statistics", lambda: wakeups.append(1) or update())
+
+    urls = [f"https://example.com/{i}" for i in range(4)]
+    results = [r async for r in dispatcher.run_urls_stream(urls, crawler, CrawlerRunConfig())]
+    assert len(results) == 4
+    # One scheduling pass at start and one per completion at most, no 100ms polling
+    assert len(wakeups) <= 1 + len(urls) + 1
+
+
+@pytest.mark.asyncio
+async def test_memory_pressure_change_wakes_scheduler(monkeypatch):
+    readings = iter([92.0, 92.0])
+    monkeypatch.setattr(
+        async_dispatcher, "get_true_memory_usage_percent", lambda: next(readings, 50.0)
+    )
+    crawler = FakeCrawler()
+    dispatcher = MemoryAdaptiveDispatcher(
+        memory_threshold_percent=90, recovery_threshold_percent=85, check_interval=0.05
+    )
+
+    start = time.perf_counter()
+    results = await dispatcher.run_urls(["https://example.com/"], crawler, CrawlerRunConfig())
+    elapsed = time.perf_counter() - start
+
+    assert len(results) == 1
+    # Held back while under pressure, started as soon as memory recovered
+    assert 0.05 <= elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_stream_drains_many_tasks_within_permits():
+    tasks = 2000
+    crawler = FakeCrawler()
+    dispatcher = MemoryAdaptiveDispatcher(max_session_permit=50)
+    urls = [f"https://example.com/{i}" for i in range(tasks)]
+
+    seen = [result.url async for result in dispatcher.run_urls_stream(urls, crawler, CrawlerRunConfig())]
+
+    assert sorted(seen) == sorted(urls)
+    assert crawler.max_active <= 50
+    assert len(dispatcher.task_queue) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
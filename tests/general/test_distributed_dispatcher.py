@@ -0,0 +1,200 @@
+import asyncio
+import os
+import sys
+import time
+from collections import Counter
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import CrawlerRunConfig, DistributedDispatcher, LocalLeaseFrontier
+from crawl4ai.models import CrawlResult
+
+# Every crawler records into the same log, as if the nodes shared the target sites
+CRAWLS = []
+
+
+class FakeCrawler:
+    """Stands in for the AsyncWebCrawler of one node."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.crawled = []
+
+    async def arun(self, url, config=None, session_id=None):
+        self.crawled.append(url)
+        CRAWLS.append((url, time.perf_counter()))
+        await asyncio.sleep(self.delay)
+        return CrawlResult(url=url, html="", success=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_crawls():
+    CRAWLS.clear()
+
+
+async def run_nodes(frontier, crawlers, urls, **kwargs):
+    """Run one dispatcher per crawler; only the first node is given the URLs."""
+    dispatchers = [
+        DistributedDispatcher(frontier, worker_id=f"node-{i}", poll_interval=0.02, **kwargs)
+        for i in range(len(crawlers))
+    ]
+    return await asyncio.gather(
+        *(
+            dispatcher.run_urls(crawler=crawler, urls=urls if i == 0 else [], config=CrawlerRunConfig())
+            for i, (dispatcher, crawler) in enumerate(zip(dispatchers, crawlers))
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_local_frontier_leases():
+    frontier = LocalLeaseFrontier()
+    assert await frontier.add(["https://a.com/1", "https://a.com/2", "https://b.com/1"]) == 3
+    assert await frontier.add(["https://a.com/1"]) == 0
+
+    claimed = await frontier.claim("w1", 2, lease_seconds=0.05)
+    assert sorted(claimed) == ["https://a.com/1", "https://b.com/1"]  # domains take turns
+    assert await frontier.heartbeat("w2", claimed, 10) == 0  # not w2's leases
+
+    await asyncio.sleep(0.06)
+    assert await frontier.requeue_expired() == 2
+    assert (await frontier.stats())["pending"] == 3
+
+    url = (await frontier.claim("w2", 1, lease_seconds=10))[0]
+    assert await frontier.complete(url)
+    assert not await frontier.complete(url)
+    assert await frontier.stats() == {"pending": 2, "leased": 0, "done": 1, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_nodes_share_work_without_duplicates():
+    urls = [f"https://site{i % 30}.com/{i}" for i in range(240)]
+    crawlers = [FakeCrawler(delay=0.01) for _ in range(3)]
+
+    results = await run_nodes(LocalLeaseFrontier(), crawlers, urls + urls[:50], max_session_permit=4)
+
+    crawled = Counter(url for url, _ in CRAWLS)
+    assert set(crawled) == set(urls)
+    assert max(crawled.values()) == 1
+    assert sum(len(r) for r in results) == len(urls)
+    assert all(len(crawler.crawled) > 40 for crawler in crawlers)
+
+
+@pytest.mark.asyncio
+async def test_throughput_scales_with_nodes():
+    urls = [f"https://site{i}.com/" for i in range(120)]
+
+    async def elapsed(nodes):
+        start = time.perf_counter()
+        await run_nodes(
+            LocalLeaseFrontier(), [FakeCrawler(delay=0.05) for _ in range(nodes)], urls, max_session_permit=4
+        )
+        return time.perf_counter() - start
+
+    one, three = await elapsed(1), await elapsed(3)
+    assert three < one / 2
+
+
+@pytest.mark.asyncio
+async def test_politeness_holds_across_nodes():
+    urls = [f"https://polite.com/{i}" for i in range(5)]
+    await run_nodes(LocalLeaseFrontier(politeness_delay=0.1), [FakeCrawler() for _ in range(3)], urls)
+
+    starts = sorted(start for _, start in CRAWLS)
+    assert len(starts) == 5
+    assert all(b - a >= 0.09 for a, b in zip(starts, starts[1:]))
+
+
+@pytest.mark.asyncio
+async def test_expired_leases_are_recrawled():
+    frontier = LocalLeaseFrontier()
+    async with frontier.seeding():
+        await frontier.add([f"https://a{i}.com/" for i in range(4)])
+    # A node claims two URLs and dies without completing them
+    lost = await frontier.claim("dead-node", 2, lease_seconds=0.1)
+
+    crawler = FakeCrawler()
+    await run_nodes(frontier, [crawler], [], lease_seconds=0.1)
+    assert set(lost) <= set(crawler.crawled)
+    assert (await frontier.stats())["done"] == 4
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_long_crawls_leased():
+    urls = [f"https://slow{i}.com/" for i in range(2)]
+    crawlers = [FakeCrawler(delay=0.4), FakeCrawler(delay=0.4)]
+    await run_nodes(LocalLeaseFrontier(), crawlers, urls, lease_seconds=0.15)
+
+    assert len(CRAWLS) == 2  # leases were renewed, so nothing was crawled twice
+
+
+@pytest.mark.asyncio
+async def test_workers_wait_for_a_late_seeder():
+    frontier = LocalLeaseFrontier()
+    urls = [f"https://site{i}.com/" for i in range(20)]
+    helper = FakeCrawler(delay=0.01)
+    helping = asyncio.create_task(
+        DistributedDispatcher(frontier, worker_id="helper", poll_interval=0.02).run_urls(
+            crawler=helper, urls=[], config=CrawlerRunConfig()
+        )
+    )
+    await asyncio.sleep(0.1)
+    assert not helping.done()  # nothing was seeded yet
+
+    seeder = FakeCrawler(delay=0.01)
+    await DistributedDispatcher(frontier, worker_id="seeder", poll_interval=0.02).run_urls(
+        crawler=seeder, urls=urls, config=CrawlerRunConfig()
+    )
+    await asyncio.wait_for(helping, 1)
+    assert sorted(helper.crawled + seeder.crawled) == sorted(urls)
+    assert helper.crawled
+
+
+@pytest.mark.asyncio
+async def test_idle_timeout_stops_a_worker_without_seeders():
+    dispatcher = DistributedDispatcher(LocalLeaseFrontier(), poll_interval=0.02, idle_timeout=0.1)
+    results = await asyncio.wait_for(
+        dispatcher.run_urls(crawler=FakeCrawler(), urls=[], config=CrawlerRunConfig()), 1
+    )
+    assert results == []
+
+
+class FlakyFrontier(LocalLeaseFrontier):
+    """Fails the first lease renewal, as a dropped Redis connection would."""
+
+    def __init__(self):
+        super().__init__()
+        self.heartbeats = 0
+
+    async def heartbeat(self, worker_id, urls, lease_seconds):
+        self.heartbeats += 1
+        if self.heartbeats == 1:
+            raise ConnectionError("connection reset")
+        return await super().heartbeat(worker_id, urls, lease_seconds)
+
+
+class RecordingLogger:
+    def __init__(self):
+        self.warnings = []
+
+    def warning(self, message, tag=None, params=None):
+        self.warnings.append(message.format(**(params or {})))
+
+
+@pytest.mark.asyncio
+async def test_lease_renewal_survives_frontier_errors():
+    frontier = FlakyFrontier()
+    crawler = FakeCrawler(delay=0.3)
+    crawler.logger = RecordingLogger()
+    await run_nodes(frontier, [crawler], ["https://slow.com/"], lease_seconds=0.09)
+
+    assert frontier.heartbeats > 1  # renewal carried on after the failure
+    assert crawler.logger.warnings == ["Failed to renew leases: connection reset"]
+    assert (await frontier.stats())["done"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,177 @@
+import asyncio
+import os
+import sys
+import time
+from collections import defaultdict
+from urllib.parse import urlparse
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import CrawlerRunConfig, MemoryAdaptiveDispatcher, RateLimiter, SemaphoreDispatcher
+from crawl4ai.async_dispatcher import _TaskQueue
+from crawl4ai.models import CrawlResult
+
+
+class FakeCrawler:
+    """Stands in for AsyncWebCrawler and records when and how often each domain is hit."""
+
+    def __init__(self, delay: float = 0.0, robots_parser=None):
+        self.delay = delay
+        self.starts = defaultdict(list)
+        self.active = defaultdict(int)
+        self.max_active = defaultdict(int)
+        self.finished = []
+        if robots_parser:
+            self.robots_parser = robots_parser
+
+    async def arun(self, url, config=None, session_id=None):
+        domain = urlparse(url).netloc
+        self.starts[domain].append(time.perf_counter())
+        self.active[domain] += 1
+        self.max_active[domain] = max(self.max_active[domain], self.active[domain])
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active[domain] -= 1
+        self.finished.append(url)
+        return CrawlResult(url=url, html="", success=True, status_code=200)
+
+
+class FakeRobotsParser:
+    def __init__(self, delays):
+        self.delays = delays
+        self.lookups = []
+
+    async def crawl_delay(self, url, user_agent="*"):
+        self.lookups.append(url)
+        return self.delays.get(urlparse(url).netloc)
+
+
+def test_rate_limiter_readiness():
+    limiter = RateLimiter(base_delay=(1.0, 1.0), max_concurrent_per_domain=2)
+    assert limiter.ready_in("a.com") == 0
+
+    limiter.acquire("https://a.com/1")
+    assert 0.9 < limiter.ready_in("a.com") <= 1.0
+    assert limiter.ready_in("a.com", now=time.time() + 1.5) == 0
+
+    limiter.acquire("https://a.com/2")
+    assert limiter.ready_in("a.com", now=time.time() + 1.5) == float("inf")
+    limiter.release("https://a.com/1")
+    assert limiter.ready_in("a.com", now=time.time() + 1.5) == 0
+
+    # Crawl-delay wins over a shorter current delay
+    limiter.set_crawl_delay("a.com", 5)
+    assert 4.9 < limiter.ready_in("a.com") <= 5.0
+
+
+@pytest.mark.asyncio
+async def test_capped_domain_waiters_wake_on_release():
+    limiter = RateLimiter(base_delay=(0.0, 0.0), max_concurrent_per_domain=1)
+    await limiter.wait_if_needed("https://a.com/0")
+    waiters = [asyncio.create_task(limiter.wait_if_needed(f"https://a.com/{i}")) for i in (1, 2)]
+    await asyncio.sleep(0.01)
+    assert not any(waiter.done() for waiter in waiters)
+
+    limiter.release("https://a.com/0")
+    done, pending = await asyncio.wait(waiters, timeout=1, return_when=asyncio.FIRST_COMPLETED)
+    assert len(done) == 1 and len(pending) == 1
+    # The other waiter goes back to sleep until the next release
+    await asyncio.sleep(0.01)
+    assert not pending.pop().done()
+
+    limiter.release("https://a.com/1")
+    await asyncio.wait_for(asyncio.gather(*waiters), timeout=1)
+    assert limiter.domains["a.com"].in_flight == 1
+
+
+def test_queue_hands_out_ready_domains_only():
+    waits = {"slow.com": 10.0, "fast.com": 0.0}
+    queue = _TaskQueue(fairness_timeout=60, ready_in=lambda domain: waits[domain])
+    queue.push(("https://slow.com/1",), 0, 0.0)
+    queue.push(("https://slow.com/2",), 0, 1.0)
+    queue.push(("https://fast.com/1",), 0, 2.0)
+
+    assert queue.pop(now=5.0)[0] == ("https://fast.com/1",)
+    assert queue.pop(now=5.0) is None
+    assert len(queue) == 2
+    assert queue.next_ready_time() == 15.0
+    # Parked tasks still count towards the queue statistics
+    assert queue.stats(now=5.0) == (2, 5.0, 4.5)
+
+    waits["slow.com"] = 0.0
+    assert queue.pop(now=15.0)[0] == ("https://slow.com/1",)
+    assert queue.pop(now=15.0)[0] == ("https://slow.com/2",)
+    assert len(queue) == 0
+
+
+def test_queue_blocked_domain_needs_notify():
+    waits = {"a.com": float("inf")}
+    queue = _TaskQueue(fairness_timeout=60, ready_in=lambda domain: waits[domain])
+    queue.push(("https://a.com/1",), 0, 0.0)
+
+    assert queue.pop(now=1.0) is None
+    assert queue.next_ready_time() is None
+    waits["a.com"] = 0.0
+    assert queue.pop(now=2.0) is None  # still blocked until notified
+    queue.notify_domain("a.com")
+    assert queue.pop(now=2.0)[0] == ("https://a.com/1",)
+
+
+@pytest.mark.asyncio
+async def test_throttled_domain_does_not_hold_slots():
+    crawler = FakeCrawler(delay=0.01)
+    dispatcher = MemoryAdaptiveDispatcher(
+        max_session_permit=4,
+        rate_limiter=RateLimiter(base_delay=(0.1, 0.1), max_concurrent_per_domain=1),
+    )
+    slow = [f"https://slow.com/{i}" for i in range(4)]
+    others = [f"https://site{i}.com/" for i in range(8)]
+
+    start = time.perf_counter()
+    results = await dispatcher.run_urls(slow + others, crawler, CrawlerRunConfig())
+    elapsed = time.perf_counter() - start
+
+    assert sorted(r.url for r in results) == sorted(slow + others)
+    assert crawler.max_active["slow.com"] == 1
+    # Every other site is done before the throttled domain's second request
+    assert set(crawler.finished[: len(others) + 1]) >= set(others)
+    gaps = [b - a for a, b in zip(crawler.starts["slow.com"], crawler.starts["slow.com"][1:])]
+    assert all(gap >= 0.09 for gap in gaps)
+    assert elapsed < 1.0
+
+
+@pytest.mark.asyncio
+async def test_robots_crawl_delay_is_respected():
+    robots = FakeRobotsParser({"polite.com": 0.15})
+    crawler = FakeCrawler(robots_parser=robots)
+    dispatcher = MemoryAdaptiveDispatcher(
+        rate_limiter=RateLimiter(base_delay=(0.0, 0.0), respect_crawl_delay=True),
+    )
+    urls = [f"https://polite.com/{i}" for i in range(3)] + ["https://other.com/"]
+
+    results = await dispatcher.run_urls(urls, crawler, CrawlerRunConfig())
+    assert len(results) == 4
+    assert len(robots.lookups) == 2  # once per domain
+    starts = crawler.starts["polite.com"]
+    assert all(b - a >= 0.14 for a, b in zip(starts, starts[1:]))
+
+
+@pytest.mark.asyncio
+async def test_semaphore_dispatcher_respects_domain_cap():
+    crawler = FakeCrawler(delay=0.02)
+    dispatcher = SemaphoreDispatcher(
+        semaphore_count=5,
+        rate_limiter=RateLimiter(base_delay=(0.0, 0.0), max_concurrent_per_domain=2),
+    )
+    urls = [f"https://a.com/{i}" for i in range(6)]
+    results = await dispatcher.run_urls(crawler=crawler, urls=urls, config=CrawlerRunConfig())
+    assert [r.url for r in results] == urls
+    assert crawler.max_active["a.com"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+import crawl4ai.utils as utils
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.async_webcrawler import process_html_content
+from crawl4ai.utils import preprocess_html_for_schema
+
+
+PAGES = [
+    # Blank text after and inside elements that do or don't allow character data
+    """<!DOCTYPE html>
+<html>
+  <head>
+    <title>Source tree</title>
+    <script>var x = 1;</script>
+  </head>
+  <body>
+    <!-- navigation -->
+    <ul class="menu">
+      <li class="item">One</li>
+      <li class="item">Two</li>
+    </ul>
+    <div class="card"> <span>Price</span> <b>12</b>
+      <p>Some text<!-- inline -->   more text</p>
+      <table><tr> <td> cell </td> </tr></table>
+    </div>
+    <pre>
+  keep   this
+    </pre>
+  </body>
+</html>
+""",
+    # Strict doctype drops blank text directly in body
+    """<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.01//EN">
+<html><body>
+  <p class="a">x</p>
+  <div class="b"> <i>y</i> </div>
+</body></html>""",
+    # No closing tags: whitespace at the end of the input is dropped
+    """<html><head><title>t</title></head>
+<body>
+<p>First
+<p>Second\xa0
+</p>
+""",
+]
+
+
+def _process(html, config=None):
+    result, _ = process_html_content(
+        "https://example.com/page", html, "", config or CrawlerRunConfig(), None, None
+    )
+    return result
+
+
+@pytest.mark.parametrize("html", PAGES)
+def test_fit_html_matches_a_fresh_parse(html):
+    expected = preprocess_html_for_schema(html_content=html, text_threshold=500, max_size=300_000)
+    assert _process(html).fit_html == expected
+    # The scraper's own removals must not leak into the copy
+    config = CrawlerRunConfig(excluded_tags=["ul", "div"], exclude_all_images=True)
+    assert _process(html, config).fit_html == expected
+
+
+def test_fit_html_reuses_the_scraper_parse(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("fit_html parsed the page again")
+
+    monkeypatch.setattr(utils.lhtml, "fromstring", fail)
+    assert "Price" in _process(PAGES[0]).fit_html
+
+
+def test_fragments_are_parsed_on_their_own():
+    html = "<div class='a'>\n  <p>One</p>\n</div>\n<p>Two</p>"
+    assert _process(html).fit_html == preprocess_html_for_schema(
+        html_content=html, text_threshold=500, max_size=300_000
+    )
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,185 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import (
+    AsyncWebCrawler,
+    BestFirstCrawlingStrategy,
+    BFSDeepCrawlStrategy,
+    CrawlerRunConfig,
+    DFSDeepCrawlStrategy,
+    FrontierEntry,
+    SemaphoreDispatcher,
+    SQLiteFrontierStore,
+)
+from crawl4ai.frontier import DONE, FAILED, IN_FLIGHT, PENDING
+from crawl4ai.models import CrawlResult
+
+SITE = {
+    "https://example.com/": ["/a", "/b", "/c"],
+    "https://example.com/a": ["/a1", "/a2", "/b"],
+    "https://example.com/b": ["/b1"],
+    "https://example.com/c": [],
+    "https://example.com/a1": [],
+    "https://example.com/a2": [],
+    "https://example.com/b1": [],
+}
+
+
+class FakeCrawler:
+    """Stands in for AsyncWebCrawler, serving SITE and recording every crawl."""
+
+    def __init__(self):
+        self.crawled = []
+
+    async def arun(self, url, config=None, session_id=None):
+        self.crawled.append(url)
+        links = [{"href": "https://example.com" + path} for path in SITE.get(url, [])]
+        return CrawlResult(url=url, html="", success=True, links={"internal": links})
+
+    async def arun_many(self, urls, config=None):
+        async def stream():
+            for url in urls:
+                yield await self.arun(url, config)
+
+        if config.stream:
+            return stream()
+        return [result async for result in stream()]
+
+
+@pytest.mark.asyncio
+async def test_store_round_trip(tmp_path):
+    path = str(tmp_path / "frontier.db")
+    async with SQLiteFrontierStore(path) as store:
+        added = await store.add([FrontierEntry("https://a.com/"), FrontierEntry("https://b.com/", depth=1)])
+        assert len(added) == 2
+        assert await store.add([FrontierEntry("https://a.com/")]) == []
+        await store.mark_in_flight(["https://a.com/", "https://b.com/"])
+        await store.mark_done("https://a.com/")
+        assert await store.count(IN_FLIGHT) == 1
+
+    async with SQLiteFrontierStore(path) as store:
+        # The crawl that was in flight starts over
+        assert await store.count(IN_FLIGHT) == 0
+        assert await store.count(DONE) == 1
+        assert [e.url for e in await store.unfinished()] == ["https://b.com/"]
+        assert store.is_known("https://a.com/")
+        await store.mark_done("https://b.com/", success=False)
+        assert await store.count(FAILED) == 1
+        assert await store.count() == 2
+
+
+@pytest.mark.asyncio
+async def test_writes_are_batched(tmp_path):
+    path = str(tmp_path / "frontier.db")
+    store = SQLiteFrontierStore(path, batch_size=3, flush_interval=60)
+    await store.open()
+    await store.add([FrontierEntry("https://a.com/1"), FrontierEntry("https://a.com/2")])
+
+    async with SQLiteFrontierStore(path) as reader:
+        assert await reader.count() == 0
+
+    await store.mark_in_flight(["https://a.com/1"])  # third change triggers a flush
+    async with SQLiteFrontierStore(path) as reader:
+        assert await reader.count(PENDING) == 2  # in-flight is reset on open
+    await store.close()
+
+
+@pytest.mark.asyncio
+async def test_arun_many_resume_skips_finished_urls(tmp_path):
+    path = str(tmp_path / "frontier.db")
+    urls = [f"https://example.com/{i}" for i in range(20)]
+    dispatcher = SemaphoreDispatcher(semaphore_count=1, prefetch_limit=1)
+
+    first = FakeCrawler()
+    stream = await AsyncWebCrawler.arun_many(
+        first, urls, config=CrawlerRunConfig(stream=True), dispatcher=dispatcher, resume_from=path
+    )
+    async for result in stream:
+        if len(first.crawled) == 8:
+            break
+    await stream.aclose()
+
+    second = FakeCrawler()
+    results = await AsyncWebCrawler.arun_many(
+        second, urls, config=CrawlerRunConfig(), dispatcher=dispatcher, resume_from=path
+    )
+    assert set(first.crawled) | set(second.crawled) == set(urls)
+    # Only the crawl that was running when the first run stopped is repeated
+    assert len(set(first.crawled) & set(second.crawled)) <= 1
+    assert len(results) == len(second.crawled)
+
+    async with SQLiteFrontierStore(path) as store:
+        assert await store.count(DONE) == 20
+
+
+@pytest.mark.parametrize(
+    "make_strategy",
+    [
+        lambda path: BFSDeepCrawlStrategy(max_depth=2, resume_from=path),
+        lambda path: BestFirstCrawlingStrategy(max_depth=2, resume_from=path),
+    ],
+)
+@pytest.mark.asyncio
+async def test_deep_crawl_resume(tmp_path, make_strategy):
+    path = str(tmp_path / "frontier.db")
+    config = CrawlerRunConfig(stream=True)
+
+    first = FakeCrawler()
+    results = await make_strategy(path).arun("https://example.com/", first, config)
+    async for result in results:
+        if len(first.crawled) == 3:
+            break
+    await results.aclose()
+
+    second = FakeCrawler()
+    results = await make_strategy(path).arun("https://example.com/", second, config)
+    depths = {result.url: result.metadata["depth"] async for result in results}
+
+    assert set(first.crawled) | set(second.crawled) == set(SITE)
+    assert len(set(first.crawled) & set(second.crawled)) <= 1
+    assert depths["https://example.com/a1"] == 2
+
+    # A finished crawl has nothing left to resume
+    third = FakeCrawler()
+    results = await make_strategy(path).arun("https://example.com/", third, config)
+    assert [result async for result in results] == []
+    assert third.crawled == []
+
+
+@pytest.mark.asyncio
+async def test_resumed_visited_reads_the_store(tmp_path):
+    path = str(tmp_path / "frontier.db")
+    async with SQLiteFrontierStore(path) as store:
+        await store.add([FrontierEntry("https://example.com/"), FrontierEntry("https://example.com/a", 1)])
+        await store.mark_done("https://example.com/")
+
+    strategy = BestFirstCrawlingStrategy(max_depth=2, resume_from=path)
+    queue = asyncio.PriorityQueue()
+    store, visited, _ = await strategy._restore_frontier("https://example.com/", queue)
+    try:
+        # Known URLs are looked up in the store, not copied
+        assert len(visited._visited) == 0
+        assert "https://example.com/" in visited
+        # The unfinished URL is crawled when dequeued, and seen from then on
+        assert "https://example.com/a" not in visited
+        visited.add("https://example.com/a")
+        assert "https://example.com/a" in visited
+        assert "https://example.com/b" not in visited
+    finally:
+        await store.close()
+
+
+@pytest.mark.parametrize("kwargs", [{"resume_from": "frontier.db"}, {"pipelined": True}])
+def test_dfs_rejects_bfs_only_options(kwargs):
+    with pytest.raises(ValueError):
+        DFSDeepCrawlStrategy(max_depth=2, **kwargs)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,128 @@
+import codecs
+import os
+import sys
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+import crawl4ai.utils as utils
+from crawl4ai import HTTPCrawlerConfig
+from crawl4ai.async_crawler_strategy import (
+    AsyncHTTPCrawlerStrategy,
+    ResponseTooLargeError,
+    UnsupportedContentTypeError,
+)
+from crawl4ai.utils import sniff_encoding
+
+RUSSIAN = "Съешь же ещё этих мягких французских булок, да выпей чаю. " * 20
+LATIN = "<html><body><p>Café crème brûlée, naïve façade.</p></body></html>"
+
+
+async def handle_big(request):
+    return web.Response(body=b"<p>x</p>" * 100_000, content_type="text/html")
+
+
+async def handle_chunked(request):
+    response = web.StreamResponse(headers={"Content-Type": "text/html"})
+    response.enable_chunked_encoding()
+    await response.prepare(request)
+    for _ in range(100):
+        await response.write(b"<p>" + b"x" * 10_000 + b"</p>")
+    await response.write_eof()
+    return response
+
+
+async def handle_meta(request):
+    # No charset in the header; the page declares it
+    body = LATIN.replace("<html>", '<html><head><meta charset="windows-1252"></head>').encode("cp1252")
+    return web.Response(body=body, headers={"Content-Type": "text/html"})
+
+
+async def handle_pdf(request):
+    return web.Response(body=b"%PDF-1.4" + b"0" * 1000, content_type="application/pdf")
+
+
+@pytest_asyncio.fixture
+async def base_url():
+    app = web.Application()
+    app.router.add_get("/big", handle_big)
+    app.router.add_get("/chunked", handle_chunked)
+    app.router.add_get("/meta", handle_meta)
+    app.router.add_get("/pdf", handle_pdf)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    yield f"http://127.0.0.1:{runner.addresses[0][1]}"
+    await runner.cleanup()
+
+
+def test_sniff_encoding_order():
+    body = '<meta charset="windows-1252"><p>Café</p>'.encode("cp1252")
+    # The header wins over the document
+    assert sniff_encoding(body, "iso-8859-2") == "iso8859-2"
+    # An unknown header charset is ignored
+    assert sniff_encoding(body, "no-such-charset") == "cp1252"
+    assert sniff_encoding(codecs.BOM_UTF8 + "<p>Café</p>".encode()) == "utf-8-sig"
+    assert sniff_encoding(codecs.BOM_UTF16_LE + "<p>hi</p>".encode("utf-16-le")) == "utf-16"
+    assert sniff_encoding(b'<meta http-equiv="Content-Type" content="text/html; charset=Shift_JIS">') == "shift_jis"
+    assert sniff_encoding(RUSSIAN.encode("cp1251")) == "cp1251"
+    assert sniff_encoding(b"") == "utf-8"
+
+
+def test_detector_sees_a_bounded_sample(monkeypatch):
+    sizes = []
+    detect = utils.chardet.detect
+
+    def recording(data):
+        sizes.append(len(data))
+        return detect(data)
+
+    monkeypatch.setattr(utils.chardet, "detect", recording)
+    body = RUSSIAN.encode("cp1251") * 2000  # about 4 MB
+    assert sniff_encoding(body) == "cp1251"
+    assert sizes == [64 * 1024]
+
+
+@pytest.mark.asyncio
+async def test_meta_charset_is_used(base_url):
+    async with AsyncHTTPCrawlerStrategy() as strategy:
+        response = await strategy.crawl(f"{base_url}/meta")
+    assert "Café crème brûlée" in response.html
+
+
+@pytest.mark.parametrize("path", ["/big", "/chunked"])
+@pytest.mark.asyncio
+async def test_max_body_bytes(base_url, path):
+    config = HTTPCrawlerConfig(max_body_bytes=100_000)
+    async with AsyncHTTPCrawlerStrategy(browser_config=config) as strategy:
+        with pytest.raises(ResponseTooLargeError):
+            await strategy.crawl(f"{base_url}{path}")
+
+    async with AsyncHTTPCrawlerStrategy(browser_config=config.clone(max_body_bytes=2_000_000)) as strategy:
+        response = await strategy.crawl(f"{base_url}{path}")
+        assert len(response.html) > 100_000
+
+
+@pytest.mark.asyncio
+async def test_allowed_content_types(base_url):
+    config = HTTPCrawlerConfig(allowed_content_types=["text/", "application/xhtml+xml"])
+    async with AsyncHTTPCrawlerStrategy(browser_config=config) as strategy:
+        with pytest.raises(UnsupportedContentTypeError):
+            await strategy.crawl(f"{base_url}/pdf")
+        assert (await strategy.crawl(f"{base_url}/meta")).status_code == 200
+
+
+def test_config_round_trip():
+    config = HTTPCrawlerConfig(max_body_bytes=1024, allowed_content_types=["text/html"])
+    restored = HTTPCrawlerConfig.from_kwargs(config.to_dict())
+    assert restored.max_body_bytes == 1024
+    assert restored.allowed_content_types == ["text/html"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
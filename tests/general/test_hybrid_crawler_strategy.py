@@ -0,0 +1,148 @@
+import os
+import sys
+
+import pytest
+from aiohttp import web
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import (
+    AsyncCrawlerStrategy,
+    AsyncHybridCrawlerStrategy,
+    HTTPStatusError,
+)
+from crawl4ai.models import AsyncCrawlResponse
+
+ARTICLE = "<html><body><article>" + "<p>Plenty of server rendered text here.</p>" * 20 + "</article></body></html>"
+SPA = '<html><head><script src="/app.js"></script></head><body><div id="root"></div></body></html>'
+SHORT = "<html><body><p>Hi</p></body></html>"
+NOSCRIPT = (
+    "<html><body><noscript>Please enable JavaScript to use this site.</noscript>"
+    + "<p>Some teaser text for the page.</p>" * 10
+    + "</body></html>"
+)
+COMMENTS = ARTICLE.replace("</article>", "</article><noscript>Enable JavaScript to see the comments.</noscript>") * 10
+
+
+class RecordingStrategy(AsyncCrawlerStrategy):
+    """Serves pages from a dict and records what it was asked for."""
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.crawled = []
+        self.started = False
+
+    async def __aenter__(self):
+        self.started = True
+        return self
+
+    async def __aexit__(self, *args):
+        self.started = False
+
+    async def crawl(self, url, config=None, **kwargs):
+        self.crawled.append(url)
+        page = self.pages.get(url, ARTICLE)
+        if isinstance(page, int):
+            raise HTTPStatusError(page, f"Unexpected status code for {url}")
+        return AsyncCrawlResponse(html=page, response_headers={}, status_code=200)
+
+
+def make_strategy(pages, **kwargs):
+    http = RecordingStrategy(pages)
+    browser = RecordingStrategy({})
+    return AsyncHybridCrawlerStrategy(http_strategy=http, browser_strategy=browser, **kwargs), http, browser
+
+
+@pytest.mark.parametrize(
+    "page, reason",
+    [(ARTICLE, None), (COMMENTS, None), (SPA, "spa root"), (SHORT, "little text"), (NOSCRIPT, "noscript"), (403, "status 403")],
+)
+@pytest.mark.asyncio
+async def test_escalation_heuristics(page, reason):
+    strategy, http, browser = make_strategy({"https://a.com/x": page})
+    async with strategy:
+        await strategy.crawl("https://a.com/x", CrawlerRunConfig())
+    assert http.crawled == ["https://a.com/x"]
+    assert browser.crawled == ([] if reason is None else ["https://a.com/x"])
+    stats = strategy.escalation_stats()["a.com"]
+    assert stats["reasons"] == ({} if reason is None else {reason: 1})
+
+
+@pytest.mark.asyncio
+async def test_http_errors_are_not_escalated():
+    strategy, http, browser = make_strategy({"https://a.com/missing": 404})
+    async with strategy:
+        with pytest.raises(HTTPStatusError):
+            await strategy.crawl("https://a.com/missing", CrawlerRunConfig())
+    assert browser.crawled == []
+
+
+@pytest.mark.asyncio
+async def test_browser_only_options_skip_http():
+    strategy, http, browser = make_strategy({})
+    async with strategy:
+        await strategy.crawl("https://a.com/", CrawlerRunConfig(js_code="window.scrollTo(0, 1000)"))
+        await strategy.crawl("https://a.com/", CrawlerRunConfig(screenshot=True))
+        await strategy.crawl("raw:<p>hello</p>", CrawlerRunConfig())
+    assert http.crawled == ["raw:<p>hello</p>"]
+    assert browser.crawled == ["https://a.com/", "https://a.com/"]
+
+
+@pytest.mark.asyncio
+async def test_browser_starts_only_when_needed():
+    strategy, http, browser = make_strategy({"https://a.com/spa": SPA})
+    async with strategy:
+        await strategy.crawl("https://a.com/article", CrawlerRunConfig())
+        assert not browser.started
+        await strategy.crawl("https://a.com/spa", CrawlerRunConfig())
+        assert browser.started
+    assert not browser.started
+
+
+@pytest.mark.asyncio
+async def test_domain_preference_is_learned_and_reprobed():
+    pages = {f"https://spa.com/{i}": SPA for i in range(40)}
+    strategy, http, browser = make_strategy(pages, learn_after=5, reprobe_interval=10)
+    async with strategy:
+        for i in range(40):
+            await strategy.crawl(f"https://spa.com/{i}", CrawlerRunConfig())
+        await strategy.crawl("https://news.com/story", CrawlerRunConfig())
+
+    # Five pages to learn, then only every tenth page is tried over HTTP
+    assert http.crawled[:5] == [f"https://spa.com/{i}" for i in range(5)]
+    assert len([url for url in http.crawled if url.startswith("https://spa.com")]) == 5 + 3
+    assert len(browser.crawled) == 40
+    stats = strategy.escalation_stats()
+    assert stats["spa.com"]["prefers_browser"] and stats["spa.com"]["escalation_rate"] == 1.0
+    assert stats["spa.com"]["browser"] == 32
+    assert stats["news.com"] == {
+        "http": 1, "escalated": 0, "browser": 0, "escalation_rate": 0.0, "prefers_browser": False, "reasons": {}
+    }
+
+
+@pytest.mark.asyncio
+async def test_crawler_serves_static_pages_without_a_browser(tmp_path):
+    async def handle(request):
+        return web.Response(text=ARTICLE, content_type="text/html")
+
+    app = web.Application()
+    app.router.add_get("/", handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    url = f"http://127.0.0.1:{runner.addresses[0][1]}/"
+    try:
+        strategy = AsyncHybridCrawlerStrategy()
+        async with AsyncWebCrawler(crawler_strategy=strategy, base_directory=str(tmp_path)) as crawler:
+            result = await crawler.arun(url, config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS))
+        assert result.success and "server rendered text" in result.markdown
+        assert not strategy._browser_started
+    finally:
+        await runner.cleanup()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,181 @@
+import asyncio
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+import crawl4ai.async_dispatcher as async_dispatcher
+from crawl4ai import CrawlerRunConfig, MemoryAdaptiveDispatcher
+from crawl4ai.async_crawler_strategy import AsyncPlaywrightCrawlerStrategy
+from crawl4ai.models import CrawlResult, PageResourceUsage
+
+MB = 1024 * 1024
+
+
+class FakeCDPSession:
+    def __init__(self, snapshots):
+        self.snapshots = iter(snapshots)
+        self.sent = []
+        self.detached = False
+
+    async def send(self, method, params=None):
+        self.sent.append(method)
+        if method == "Performance.getMetrics":
+            return {"metrics": [{"name": k, "value": v} for k, v in next(self.snapshots).items()]}
+        return {}
+
+    async def detach(self):
+        self.detached = True
+
+
+class FakeContext:
+    def __init__(self, session):
+        self.session = session
+
+    async def new_cdp_session(self, page):
+        if self.session is None:
+            raise RuntimeError("CDP session is only available in Chromium")
+        return self.session
+
+
+class FakePage:
+    def __init__(self, session):
+        self.context = FakeContext(session)
+
+
+@pytest.mark.asyncio
+async def test_page_metrics_from_cdp():
+    strategy = AsyncPlaywrightCrawlerStrategy()
+    session = FakeCDPSession(
+        [
+            {"TaskDuration": 0.25, "JSHeapUsedSize": 1 * MB, "JSHeapTotalSize": 2 * MB},
+            {"TaskDuration": 1.75, "JSHeapUsedSize": 48 * MB, "JSHeapTotalSize": 64 * MB, "Nodes": 1200},
+        ]
+    )
+
+    started, baseline = await strategy._start_resource_usage(FakePage(session))
+    assert started is session
+    assert session.sent == ["Performance.enable", "Performance.getMetrics"]
+
+    usage = await strategy._collect_resource_usage(session, baseline)
+    assert usage == PageResourceUsage(
+        js_heap_used_mb=48.0, js_heap_total_mb=64.0, js_heap_peak_mb=48.0, cpu_time=1.5, dom_nodes=1200
+    )
+    assert session.detached
+
+
+@pytest.mark.asyncio
+async def test_heap_peak_is_sampled_while_the_page_is_open(monkeypatch):
+    monkeypatch.setattr(AsyncPlaywrightCrawlerStrategy, "RESOURCE_SAMPLE_INTERVAL", 0.01)
+    strategy = AsyncPlaywrightCrawlerStrategy()
+    # The heap grows to 300 MB while the page runs and is collected before the end
+    session = FakeCDPSession(
+        [{"TaskDuration": 0.0, "JSHeapUsedSize": 1 * MB}]
+        + [{"JSHeapUsedSize": heap * MB} for heap in (50, 300, 120)]
+        + [{"TaskDuration": 0.5, "JSHeapUsedSize": 40 * MB, "JSHeapTotalSize": 80 * MB}]
+    )
+    started, baseline = await strategy._start_resource_usage(FakePage(session))
+    sampler = asyncio.create_task(strategy._sample_heap_peak(started, baseline))
+    while session.sent.count("Performance.getMetrics") < 4:
+        await asyncio.sleep(0.01)
+    sampler.cancel()
+
+    usage = await strategy._collect_resource_usage(session, baseline)
+    assert usage.js_heap_used_mb == 40.0
+    assert usage.js_heap_peak_mb == 300.0
+
+
+@pytest.mark.asyncio
+async def test_page_metrics_unavailable_without_cdp():
+    strategy = AsyncPlaywrightCrawlerStrategy()
+    assert await strategy._start_resource_usage(FakePage(None)) == (None, {})
+
+
+def test_config_flag_round_trip():
+    config = CrawlerRunConfig(capture_resource_usage=True)
+    assert CrawlerRunConfig.from_kwargs(config.to_dict()).capture_resource_usage
+
+
+class HeavySiteCrawler:
+    """Pages on heavy.com report a large JS heap; records the memory reading at each start."""
+
+    def __init__(self, readings):
+        self.readings = readings
+        self.started = []
+
+    async def arun(self, url, config=None, session_id=None):
+        self.started.append((url, self.readings["memory"]))
+        await asyncio.sleep(0.01)
+        heap = 900.0 if "heavy.com" in url else 20.0
+        return CrawlResult(
+            url=url,
+            html="",
+            success=True,
+            resource_usage=PageResourceUsage(
+                js_heap_used_mb=heap * 0.8, js_heap_total_mb=heap * 1.2, js_heap_peak_mb=heap, cpu_time=0.5
+            ),
+        )
+
+
+@pytest.mark.asyncio
+async def test_dispatch_results_use_page_metrics_and_gate_heavy_domains(monkeypatch):
+    readings = {"memory": 87.0}
+    monkeypatch.setattr(async_dispatcher, "get_true_memory_usage_percent", lambda: readings["memory"])
+    crawler = HeavySiteCrawler(readings)
+    dispatcher = MemoryAdaptiveDispatcher(
+        max_session_permit=1,
+        check_interval=0.05,
+        recovery_threshold_percent=85.0,
+        page_memory_limit_mb=500,
+    )
+
+    async def lower_memory():
+        await asyncio.sleep(0.3)
+        readings["memory"] = 60.0
+
+    urls = ["https://heavy.com/1", "https://heavy.com/2", "https://light.com/1", "https://light.com/2"]
+    lowering = asyncio.create_task(lower_memory())
+    results = {r.url: r async for r in dispatcher.run_urls_stream(urls, crawler, CrawlerRunConfig())}
+    await lowering
+
+    assert results["https://heavy.com/1"].peak_memory == 900.0
+    assert results["https://heavy.com/1"].memory_usage == 720.0
+    assert results["https://light.com/1"].cpu_time == 0.5
+    assert dispatcher.memory_hungry_domains == {"heavy.com": 900.0}
+
+    # heavy.com/2 waited for memory to drop below the recovery threshold,
+    # while light.com kept crawling
+    started = dict(crawler.started)
+    assert started["https://heavy.com/2"] < 85.0
+    assert started["https://light.com/2"] == 87.0
+
+
+@pytest.mark.asyncio
+async def test_heavy_domains_wait_at_most_memory_wait_timeout(monkeypatch):
+    readings = {"memory": 87.0}
+    monkeypatch.setattr(async_dispatcher, "get_true_memory_usage_percent", lambda: readings["memory"])
+    crawler = HeavySiteCrawler(readings)
+    dispatcher = MemoryAdaptiveDispatcher(
+        max_session_permit=1,
+        check_interval=0.05,
+        recovery_threshold_percent=85.0,
+        memory_wait_timeout=0.3,
+        page_memory_limit_mb=500,
+    )
+
+    urls = ["https://heavy.com/1", "https://heavy.com/2", "https://light.com/1"]
+    start = asyncio.get_running_loop().time()
+    results = [r async for r in dispatcher.run_urls_stream(urls, crawler, CrawlerRunConfig())]
+    elapsed = asyncio.get_running_loop().time() - start
+
+    # Memory never recovered, yet heavy.com/2 ran once the hold timed out
+    assert all(r.result.success for r in results)
+    assert dict(crawler.started)["https://heavy.com/2"] == 87.0
+    assert 0.3 <= elapsed < 2.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,90 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import BFSDeepCrawlStrategy, CrawlerRunConfig, MemoryAdaptiveDispatcher
+from crawl4ai.models import CrawlResult
+
+# Ten sections of ten pages each; one section page is slow to load
+SITE = {"https://example.com/": [f"https://example.com/s{i}" for i in range(10)]}
+for i in range(10):
+    SITE[f"https://example.com/s{i}"] = [f"https://example.com/s{i}/p{j}" for j in range(10)]
+SLOW = "https://example.com/s0"
+
+
+class FakeCrawler:
+    """Serves SITE through a real dispatcher and records when each page starts and ends."""
+
+    def __init__(self, slow_delay: float = 0.5):
+        self.slow_delay = slow_delay
+        self.started = {}
+        self.finished = {}
+
+    async def arun(self, url, config=None, session_id=None):
+        self.started[url] = time.perf_counter()
+        await asyncio.sleep(self.slow_delay if url == SLOW else 0.01)
+        self.finished[url] = time.perf_counter()
+        links = [{"href": href} for href in SITE.get(url, [])]
+        return CrawlResult(url=url, html="", success=True, links={"internal": links})
+
+    async def arun_many(self, urls, config=None):
+        dispatcher = MemoryAdaptiveDispatcher(max_session_permit=5, check_interval=0.05)
+
+        async def stream():
+            async for task_result in dispatcher.run_urls_stream(urls, self, config):
+                yield task_result.result
+
+        if config.stream:
+            return stream()
+        return [result async for result in stream()]
+
+
+@pytest.mark.asyncio
+async def test_next_level_starts_before_slow_page_finishes():
+    crawler = FakeCrawler()
+    strategy = BFSDeepCrawlStrategy(max_depth=2, pipelined=True)
+    results = await strategy.arun("https://example.com/", crawler, CrawlerRunConfig())
+
+    assert len(results) == 111  # root, 10 sections, 100 pages
+    assert len({r.url for r in results}) == len(results)
+    depths = {r.url: r.metadata["depth"] for r in results}
+    assert depths["https://example.com/s3/p4"] == 2
+    assert {r.metadata["parent_url"] for r in results if r.url.startswith("https://example.com/s3/")} == {
+        "https://example.com/s3"
+    }
+    # Pages of other sections were crawled while the slow section page was loading
+    before_slow_done = [url for url, start in crawler.started.items() if start < crawler.finished[SLOW]]
+    assert sum("/p" in url for url in before_slow_done) >= 50
+
+
+@pytest.mark.asyncio
+async def test_depth_order_and_max_depth():
+    crawler = FakeCrawler(slow_delay=0.01)
+    strategy = BFSDeepCrawlStrategy(max_depth=1, pipelined=True)
+    results = [
+        r async for r in await strategy.arun("https://example.com/", crawler, CrawlerRunConfig(stream=True))
+    ]
+    assert {r.metadata["depth"] for r in results} == {0, 1}
+    assert len(results) == 11
+
+
+@pytest.mark.asyncio
+async def test_max_pages_is_not_exceeded():
+    crawler = FakeCrawler(slow_delay=0.01)
+    strategy = BFSDeepCrawlStrategy(max_depth=2, max_pages=25, pipelined=True)
+    results = await strategy.arun("https://example.com/", crawler, CrawlerRunConfig())
+
+    assert len(results) == 25
+    assert len(crawler.started) == 25
+    # Breadth-first: every section page comes before any deeper page is needed
+    assert sum(r.metadata["depth"] == 1 for r in results) == 10
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,135 @@
+import os
+import sys
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
+
+
+HTML = """
+<html>
+    <head><title>Executor test</title></head>
+    <body>
+        <article>
+            <h1>Post processing</h1>
+            <p class="item">First paragraph with enough words to be kept by the scraper.</p>
+            <p class="item">Second paragraph with enough words to be kept by the scraper.</p>
+            <a href="/next">Next page</a>
+        </article>
+    </body>
+</html>
+"""
+
+
+async def _process(crawler, config):
+    return await crawler.aprocess_html(
+        url="https://example.com/page",
+        html=HTML,
+        extracted_content=None,
+        config=config,
+        screenshot_data=None,
+        pdf_data=None,
+        verbose=False,
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["inline", "thread", "process"])
+async def test_executor_modes_produce_same_result(tmp_path, mode):
+    schema = {
+        "name": "items",
+        "baseSelector": "p.item",
+        "fields": [{"name": "text", "type": "text"}],
+    }
+    crawler = AsyncWebCrawler(
+        config=BrowserConfig(verbose=False), base_directory=str(tmp_path)
+    )
+    try:
+        baseline = await _process(
+            crawler,
+            CrawlerRunConfig(extraction_strategy=JsonCssExtractionStrategy(schema)),
+        )
+        result = await _process(
+            crawler,
+            CrawlerRunConfig(
+                extraction_strategy=JsonCssExtractionStrategy(schema),
+                post_processing_executor=mode,
+            ),
+        )
+    finally:
+        await crawler.close()
+
+    assert result.success
+    assert result.cleaned_html == baseline.cleaned_html
+    assert result.markdown.raw_markdown == baseline.markdown.raw_markdown
+    assert result.extracted_content == baseline.extracted_content
+    assert "First paragraph" in result.markdown.raw_markdown
+
+
+@pytest.mark.asyncio
+async def test_browser_config_executor_is_reused_and_shut_down(tmp_path):
+    crawler = AsyncWebCrawler(
+        config=BrowserConfig(
+            verbose=False,
+            post_processing_executor="thread",
+            post_processing_workers=2,
+        ),
+        base_directory=str(tmp_path),
+    )
+    await _process(crawler, CrawlerRunConfig())
+    executor = crawler._post_processing_executors["thread"]
+    await _process(crawler, CrawlerRunConfig())
+    assert crawler._post_processing_executors["thread"] is executor
+
+    await crawler.close()
+    assert not crawler._post_processing_executors
+
+
+@pytest.mark.asyncio
+async def test_unpicklable_config_falls_back_to_thread(tmp_path):
+    crawler = AsyncWebCrawler(
+        config=BrowserConfig(verbose=False), base_directory=str(tmp_path)
+    )
+    config = CrawlerRunConfig(
+        post_processing_executor="process",
+        url_matcher=lambda url: True,
+    )
+    try:
+        result = await _process(crawler, config)
+    finally:
+        await crawler.close()
+    assert result.success
+    assert "process" not in crawler._post_processing_executors
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["inline", "process"])
+async def test_fit_markdown_fallback_is_logged(tmp_path, mode):
+    schema = {
+        "name": "items",
+        "baseSelector": "p.item",
+        "fields": [{"name": "text", "type": "text"}],
+    }
+    crawler = AsyncWebCrawler(
+        config=BrowserConfig(verbose=False), base_directory=str(tmp_path)
+    )
+    tags = []
+    crawler.logger.url_status = lambda **kwargs: tags.append(kwargs["tag"])
+    strategy = JsonCssExtractionStrategy(schema)
+    strategy.input_format = "fit_markdown"
+    config = CrawlerRunConfig(extraction_strategy=strategy, post_processing_executor=mode)
+    try:
+        result = await _process(crawler, config)
+    finally:
+        await crawler.close()
+    assert result.success
+    # No content filter, so there is no fit_markdown and extraction uses markdown
+    assert tags == ["SCRAPE", "EXTRACT", "EXTRACT"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,134 @@
+import asyncio
+import os
+import sys
+from collections import Counter
+
+import pytest
+import pytest_asyncio
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+# The frontier's Lua scripts run on fakeredis through lupa
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+from crawl4ai import CrawlerRunConfig, DistributedDispatcher, RedisLeaseFrontier
+from crawl4ai.models import CrawlResult
+
+
+@pytest_asyncio.fixture
+async def redis():
+    client = fakeredis.FakeAsyncRedis()
+    yield client
+    await client.flushall()
+    await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_add_and_claim_take_turns_between_domains(redis):
+    frontier = RedisLeaseFrontier(redis, prefix="test")
+    assert await frontier.add(["https://a.com/1", "https://a.com/2", "https://b.com/1"]) == 3
+    assert await frontier.add(["https://a.com/1"]) == 0
+
+    claimed = await frontier.claim("w1", 2, lease_seconds=10)
+    assert sorted(claimed) == ["https://a.com/1", "https://b.com/1"]
+    assert await frontier.claim("w1", 5, lease_seconds=10) == ["https://a.com/2"]
+    assert await frontier.claim("w1", 5, lease_seconds=10) == []
+    assert await frontier.stats() == {"pending": 0, "leased": 3, "done": 0, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_only_renews_own_leases(redis):
+    frontier = RedisLeaseFrontier(redis, prefix="test")
+    await frontier.add(["https://a.com/1", "https://b.com/1"])
+    claimed = await frontier.claim("w1", 2, lease_seconds=0.1)
+
+    assert await frontier.heartbeat("w2", claimed, 10) == 0
+    assert await frontier.heartbeat("w1", claimed[:1], 10) == 1
+    await asyncio.sleep(0.15)
+
+    # Only the lease that was not renewed expires
+    assert await frontier.requeue_expired() == 1
+    assert await frontier.stats() == {"pending": 1, "leased": 1, "done": 0, "failed": 0}
+    assert await frontier.claim("w2", 5, lease_seconds=10) == claimed[1:]
+
+
+@pytest.mark.asyncio
+async def test_politeness_delay_per_domain(redis):
+    frontier = RedisLeaseFrontier(redis, prefix="test", politeness_delay=0.2)
+    await frontier.add(["https://a.com/1", "https://a.com/2", "https://b.com/1"])
+
+    assert sorted(await frontier.claim("w1", 5, lease_seconds=10)) == ["https://a.com/1", "https://b.com/1"]
+    assert await frontier.claim("w1", 5, lease_seconds=10) == []
+    ready_at = await frontier.next_ready_time()
+    assert ready_at is not None
+
+    await asyncio.sleep(0.25)
+    assert await frontier.claim("w1", 5, lease_seconds=10) == ["https://a.com/2"]
+    assert await frontier.next_ready_time() is None
+
+
+@pytest.mark.asyncio
+async def test_complete_pending_and_leased_urls(redis):
+    frontier = RedisLeaseFrontier(redis, prefix="test")
+    await frontier.add(["https://a.com/1", "https://a.com/2"])
+    url = (await frontier.claim("w1", 1, lease_seconds=10))[0]
+
+    assert await frontier.complete(url)
+    assert not await frontier.complete(url)
+    # A URL can be completed without being claimed, e.g. by a resumed run
+    assert await frontier.complete("https://a.com/2", success=False)
+    assert await frontier.stats() == {"pending": 0, "leased": 0, "done": 1, "failed": 1}
+    assert await frontier.claim("w1", 5, lease_seconds=10) == []
+
+
+@pytest.mark.asyncio
+async def test_is_finished_waits_for_seeders(redis):
+    frontier = RedisLeaseFrontier(redis, prefix="test")
+    assert not await frontier.is_finished()  # nobody has seeded yet
+
+    async with frontier.seeding():
+        await frontier.add(["https://a.com/1"])
+        assert not await frontier.is_finished()
+    url = (await frontier.claim("w1", 1, lease_seconds=10))[0]
+    assert not await frontier.is_finished()
+    await frontier.complete(url)
+    assert await frontier.is_finished()
+
+    # Prefixes keep crawls apart
+    assert not await RedisLeaseFrontier(redis, prefix="other").is_finished()
+
+
+class FakeCrawler:
+    def __init__(self):
+        self.crawled = []
+
+    async def arun(self, url, config=None, session_id=None):
+        self.crawled.append(url)
+        await asyncio.sleep(0.005)
+        return CrawlResult(url=url, html="", success=True)
+
+
+@pytest.mark.asyncio
+async def test_workers_share_a_redis_frontier(redis):
+    urls = [f"https://site{i % 10}.com/{i}" for i in range(60)]
+    crawlers = [FakeCrawler() for _ in range(3)]
+    dispatchers = [
+        DistributedDispatcher(RedisLeaseFrontier(redis, prefix="crawl"), worker_id=f"node-{i}", poll_interval=0.02)
+        for i in range(3)
+    ]
+    await asyncio.gather(
+        *(
+            dispatcher.run_urls(crawler=crawler, urls=urls if i == 0 else [], config=CrawlerRunConfig())
+            for i, (dispatcher, crawler) in enumerate(zip(dispatchers, crawlers))
+        )
+    )
+
+    crawled = Counter(url for crawler in crawlers for url in crawler.crawled)
+    assert set(crawled) == set(urls)
+    assert max(crawled.values()) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,156 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai.utils import RobotsParser, RobotsRules
+
+ROBOTS = """
+User-agent: *
+Disallow: /private
+Allow: /private/open
+Disallow: /*.pdf$
+Disallow: /search?q=
+Crawl-delay: 0.5
+Sitemap: https://example.com/sitemap.xml
+
+User-agent: MyBot
+User-agent: OtherBot
+Disallow: /
+Allow: /public
+Crawl-delay: 2
+"""
+
+
+class RobotsSite:
+    """Serves robots.txt with a configurable status and counts the fetches."""
+
+    def __init__(self):
+        self.status = 200
+        self.fetches = 0
+
+    async def handle(self, request):
+        self.fetches += 1
+        await asyncio.sleep(0.05)
+        if self.status != 200:
+            return web.Response(status=self.status)
+        return web.Response(text=ROBOTS)
+
+
+@pytest_asyncio.fixture
+async def site():
+    site = RobotsSite()
+    app = web.Application()
+    app.router.add_get("/robots.txt", site.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    server = web.TCPSite(runner, "127.0.0.1", 0)
+    await server.start()
+    site.url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+    yield site
+    await runner.cleanup()
+
+
+@pytest.mark.parametrize(
+    "path, allowed",
+    [
+        ("/", True),
+        ("/private/a", False),
+        ("/private/open/b", True),  # the longer Allow wins
+        ("/docs/file.pdf", False),
+        ("/docs/file.pdf?download=1", True),  # $ anchors the end
+        ("/search?q=crawler", False),
+        ("/search", True),
+        ("/priv%61te/a", False),  # percent-encoding is normalized
+        ("/robots.txt", True),
+    ],
+)
+def test_rule_matching(path, allowed):
+    rules = RobotsRules(ROBOTS)
+    assert rules.can_fetch(f"https://example.com{path}", "Mozilla/5.0") is allowed
+
+
+def test_user_agent_groups():
+    rules = RobotsRules(ROBOTS)
+    assert not rules.can_fetch("https://example.com/", "MyBot/1.0")
+    assert rules.can_fetch("https://example.com/public/page", "otherbot")
+    assert rules.crawl_delay("MyBot/1.0") == 2.0
+    assert rules.crawl_delay("Mozilla/5.0") == 0.5
+    assert rules.sitemaps == ["https://example.com/sitemap.xml"]
+    # Equal lengths: Allow wins
+    assert RobotsRules("User-agent: *\nDisallow: /page\nAllow: /page\n").can_fetch("/page")
+    assert RobotsRules("User-agent: *\nCrawl-delay: soon\n").crawl_delay() is None
+    assert RobotsRules("").can_fetch("/anything")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_checks_share_one_fetch(site, tmp_path):
+    parser = RobotsParser(cache_dir=str(tmp_path))
+    results = await asyncio.gather(
+        *(parser.can_fetch(f"{site.url}/private/{i}") for i in range(50)),
+        parser.can_fetch(f"{site.url}/public"),
+    )
+    assert results == [False] * 50 + [True]
+    assert site.fetches == 1
+    assert await parser.crawl_delay(f"{site.url}/", "MyBot") == 2.0
+
+
+@pytest.mark.asyncio
+async def test_rules_persist_off_the_event_loop(site, tmp_path, monkeypatch):
+    parser = RobotsParser(cache_dir=str(tmp_path))
+    assert not await parser.can_fetch(f"{site.url}/private")
+
+    threads = []
+    read = RobotsParser._get_cached_rules
+
+    def recording(self, domain):
+        threads.append(threading.current_thread())
+        return read(self, domain)
+
+    monkeypatch.setattr(RobotsParser, "_get_cached_rules", recording)
+    # A new parser has an empty memory cache and loads the rules from disk
+    fresh = RobotsParser(cache_dir=str(tmp_path))
+    assert not await fresh.can_fetch(f"{site.url}/private")
+    assert site.fetches == 1
+    assert threads and threading.main_thread() not in threads
+
+
+@pytest.mark.asyncio
+async def test_memory_cache_is_bounded(site, tmp_path):
+    parser = RobotsParser(cache_dir=str(tmp_path), max_cached_sites=1)
+    other = site.url.replace("127.0.0.1", "localhost")
+    await parser.can_fetch(f"{site.url}/")
+    await parser.can_fetch(f"{other}/")
+    assert list(parser._rules) == [other.split("//")[1]]
+    assert site.fetches == 2
+    # The evicted site comes back from disk, not the network
+    assert not await parser.can_fetch(f"{site.url}/private")
+    assert site.fetches == 2
+
+
+@pytest.mark.asyncio
+async def test_missing_and_failing_robots(site, tmp_path, monkeypatch):
+    site.status = 404
+    parser = RobotsParser(cache_dir=str(tmp_path))
+    assert await parser.can_fetch(f"{site.url}/private")
+    assert await parser.can_fetch(f"{site.url}/private")
+    assert site.fetches == 1  # a missing robots.txt is cached too
+
+    site.status = 503
+    monkeypatch.setattr(RobotsParser, "ERROR_CACHE_TTL", 0)
+    failing = RobotsParser(cache_dir=str(tmp_path / "other"))
+    assert await failing.can_fetch(f"{site.url}/private")
+    site.status = 200
+    assert not await failing.can_fetch(f"{site.url}/private")
+    assert site.fetches == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,152 @@
+import asyncio
+import os
+import pickle
+import sys
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from aiohttp import web
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig, LinkPreview, SharedHTTPClient
+from crawl4ai.async_crawler_strategy import AsyncHTTPCrawlerStrategy, AsyncHybridCrawlerStrategy
+from crawl4ai.processors.pdf import PDFContentScrapingStrategy
+from crawl4ai.utils import RobotsParser
+
+PAGE = "<html><body><article>" + "<p>Some server rendered text.</p>" * 20 + "</article></body></html>"
+
+
+class Site:
+    """Records the client port of every request and how many run at once."""
+
+    def __init__(self):
+        self.ports = []
+        self.active = 0
+        self.peak = 0
+
+    async def handle(self, request):
+        self.ports.append(request.transport.get_extra_info("peername")[1])
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if request.path == "/slow":
+                await asyncio.sleep(0.05)
+            if request.path == "/robots.txt":
+                return web.Response(text="User-agent: *\nDisallow: /private\n")
+            if request.path == "/doc.pdf":
+                return web.Response(body=b"%PDF-1.4" + b"0" * 200_000, content_type="application/pdf")
+            return web.Response(text=PAGE, content_type="text/html")
+        finally:
+            self.active -= 1
+
+
+@pytest_asyncio.fixture
+async def site():
+    site = Site()
+    app = web.Application()
+    app.router.add_get("/{path:.*}", site.handle)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    server = web.TCPSite(runner, "127.0.0.1", 0)
+    await server.start()
+    site.url = f"http://127.0.0.1:{runner.addresses[0][1]}"
+    yield site
+    await runner.cleanup()
+
+
+@pytest.mark.asyncio
+async def test_crawler_shares_one_pool(site, tmp_path):
+    strategy = AsyncHTTPCrawlerStrategy()
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, check_robots_txt=True)
+    async with AsyncWebCrawler(crawler_strategy=strategy, base_directory=str(tmp_path)) as crawler:
+        crawler.robots_parser = RobotsParser(cache_dir=str(tmp_path / "robots"), http_client=crawler.http_client)
+        assert strategy.http_client is crawler.http_client
+        for path in ("/a", "/b", "/private"):
+            result = await crawler.arun(f"{site.url}{path}", config=config)
+        assert result.status_code == 403  # disallowed by robots.txt
+        assert crawler.http_client._session is not None
+    # robots.txt and both pages went over one keep-alive connection
+    assert len(site.ports) == 3 and len(set(site.ports)) == 1
+    assert strategy.http_client is None
+    assert crawler.http_client._session is None
+
+
+@pytest.mark.asyncio
+async def test_hybrid_strategy_forwards_the_pool(tmp_path):
+    strategy = AsyncHybridCrawlerStrategy()
+    pool = SharedHTTPClient()
+    async with AsyncWebCrawler(crawler_strategy=strategy, base_directory=str(tmp_path), http_client=pool) as crawler:
+        assert strategy.http_strategy.http_client is pool
+    # A pool passed in is left open for its owner
+    assert strategy.http_client is None and pool.loop is not None
+    await pool.close()
+
+
+@pytest.mark.parametrize("client", ["session", "httpx"])
+@pytest.mark.asyncio
+async def test_per_host_limit(site, client):
+    async with SharedHTTPClient(max_connections_per_host=2) as pool:
+        async def fetch():
+            if client == "session":
+                async with pool.session.get(f"{site.url}/slow") as response:
+                    return await response.text()
+            response = await pool.httpx_client.get(f"{site.url}/slow")
+            return response.text
+
+        pages = await asyncio.gather(*(fetch() for _ in range(6)))
+    assert all("server rendered" in page for page in pages)
+    assert site.peak == 2
+
+
+@pytest.mark.asyncio
+async def test_run_from_a_worker_thread_uses_the_pool(site):
+    async with SharedHTTPClient() as pool:
+        async with pool.session.get(f"{site.url}/a") as response:
+            await response.read()
+
+        async def fetch(http_client):
+            assert http_client is pool
+            async with http_client.session.get(f"{site.url}/b") as response:
+                return response.status
+
+        assert await asyncio.to_thread(pool.run, fetch) == 200
+    assert len(set(site.ports)) == 1
+
+
+def test_pool_pickles_without_connections():
+    pool = SharedHTTPClient(max_connections_per_host=3, headers={"User-Agent": "test"})
+    copy = pickle.loads(pickle.dumps(pool))
+    assert copy.max_connections_per_host == 3 and copy.headers == {"User-Agent": "test"}
+    assert copy.loop is None and copy._session is None
+
+
+@pytest.mark.asyncio
+async def test_pdf_download_goes_through_the_pool(site):
+    pytest.importorskip("PyPDF2")
+    strategy = PDFContentScrapingStrategy()
+    async with SharedHTTPClient() as pool:
+        async with pool.session.get(f"{site.url}/a") as response:
+            await response.read()
+        path = await asyncio.to_thread(strategy._get_pdf_path, f"{site.url}/doc.pdf", pool)
+    try:
+        assert Path(path).read_bytes().startswith(b"%PDF-1.4")
+        assert Path(path).stat().st_size == 200_008
+        assert len(set(site.ports)) == 1
+    finally:
+        Path(path).unlink()
+
+
+@pytest.mark.asyncio
+async def test_link_preview_seeder_borrows_the_pool():
+    async with SharedHTTPClient() as pool:
+        async with LinkPreview(http_client=pool) as preview:
+            assert preview.seeder.client is pool.httpx_client
+        # Closing the preview leaves the pool's client open
+        assert not pool.httpx_client.is_closed
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
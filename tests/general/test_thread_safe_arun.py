@@ -0,0 +1,111 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
+from crawl4ai.async_crawler_strategy import AsyncCrawlerStrategy
+from crawl4ai.models import AsyncCrawlResponse
+from crawl4ai.proxy_strategy import RoundRobinProxyStrategy
+from crawl4ai.async_configs import ProxyConfig
+
+
+PAGE_TIME = 0.5
+
+
+class SlowStrategy(AsyncCrawlerStrategy):
+    """Crawler strategy that takes PAGE_TIME seconds per page and records what it saw."""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.seen = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+    async def crawl(self, url, config=None, **kwargs):
+        config.url = url
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(PAGE_TIME)
+        finally:
+            self.active -= 1
+        proxy = config.proxy_config.server if config.proxy_config else None
+        self.seen.append((config.url, proxy))
+        return AsyncCrawlResponse(
+            html=f"<html><body><p>Content of {url}</p></body></html>",
+            response_headers={},
+            status_code=200,
+        )
+
+
+@pytest.mark.asyncio
+async def test_thread_safe_crawler_runs_pages_concurrently(tmp_path):
+    strategy = SlowStrategy()
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+    urls = [f"https://example.com/page{i}" for i in range(8)]
+
+    async with AsyncWebCrawler(
+        crawler_strategy=strategy, thread_safe=True, base_directory=str(tmp_path)
+    ) as crawler:
+        start = time.perf_counter()
+        results = await asyncio.gather(*(crawler.arun(url, config=config) for url in urls))
+        elapsed = time.perf_counter() - start
+
+    assert all(result.success for result in results)
+    assert strategy.max_active == len(urls)
+    assert elapsed < 2 * PAGE_TIME, f"{len(urls)} pages took {elapsed:.2f}s"
+    # The shared config is not modified, and each crawl saw its own URL
+    assert sorted(url for url, _ in strategy.seen) == urls
+    assert config.url is None
+
+
+@pytest.mark.asyncio
+async def test_thread_safe_crawler_serializes_shared_session(tmp_path):
+    strategy = SlowStrategy()
+    config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS, session_id="shared")
+
+    async with AsyncWebCrawler(
+        crawler_strategy=strategy, thread_safe=True, base_directory=str(tmp_path)
+    ) as crawler:
+        await asyncio.gather(
+            crawler.arun("https://example.com/a", config=config),
+            crawler.arun("https://example.com/b", config=config),
+            crawler.arun("https://example.com/c", config=config.clone(session_id="other")),
+        )
+        assert crawler._session_locks == {}
+
+    assert strategy.max_active == 2
+
+
+@pytest.mark.asyncio
+async def test_proxy_rotation_does_not_leak_between_concurrent_crawls(tmp_path):
+    strategy = SlowStrategy()
+    proxies = [ProxyConfig(server=f"http://127.0.0.1:{8000 + i}") for i in range(4)]
+    config = CrawlerRunConfig(
+        cache_mode=CacheMode.BYPASS,
+        proxy_rotation_strategy=RoundRobinProxyStrategy(proxies),
+    )
+    urls = [f"https://example.com/page{i}" for i in range(4)]
+
+    async with AsyncWebCrawler(
+        crawler_strategy=strategy, thread_safe=True, base_directory=str(tmp_path)
+    ) as crawler:
+        await asyncio.gather(*(crawler.arun(url, config=config) for url in urls))
+
+    assert sorted(proxy for _, proxy in strategy.seen) == [p.server for p in proxies]
+    assert config.proxy_config is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,151 @@
+import gc
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import (
+    BestFirstCrawlingStrategy,
+    BFSDeepCrawlStrategy,
+    BloomVisitedSet,
+    CrawlerRunConfig,
+    DFSDeepCrawlStrategy,
+    HashedVisitedSet,
+)
+from crawl4ai.models import CrawlResult
+
+SITE = {"https://example.com/": [f"https://example.com/s{i}" for i in range(5)]}
+for i in range(5):
+    # Every section also links back to the root and to its neighbour
+    SITE[f"https://example.com/s{i}"] = [
+        "https://example.com/",
+        f"https://example.com/s{(i + 1) % 5}",
+        *(f"https://example.com/s{i}/p{j}" for j in range(3)),
+    ]
+
+
+def url(i: int) -> str:
+    return f"https://example.com/category/{i % 97}/product-{i}?ref=listing"
+
+
+class FakeCrawler:
+    def __init__(self):
+        self.crawled = []
+
+    async def arun(self, url, config=None):
+        self.crawled.append(url)
+        links = [{"href": href} for href in SITE.get(url, [])]
+        return CrawlResult(url=url, html="", success=True, links={"internal": links})
+
+    async def arun_many(self, urls, config=None):
+        results = [await self.arun(url) for url in urls]
+        if not config.stream:
+            return results
+
+        async def stream():
+            for result in results:
+                yield result
+
+        return stream()
+
+
+def bytes_per_url(factory, count: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    visited = factory()
+    for i in range(count):
+        visited.add(url(i))
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / count
+
+
+@pytest.mark.parametrize("visited", [HashedVisitedSet(initial_capacity=4), BloomVisitedSet(capacity=20_000)])
+def test_no_false_negatives(visited):
+    visited.update(url(i) for i in range(20_000))
+    visited.add(url(0))
+    assert all(url(i) in visited for i in range(20_000))
+    # A Bloom filter counts a URL it mistakes for a seen one only once
+    assert 19_950 <= len(visited) <= 20_000
+
+
+def test_hashed_set_has_no_false_positives():
+    visited = HashedVisitedSet()
+    visited.update(url(i) for i in range(20_000))
+    assert not any(url(i) in visited for i in range(20_000, 40_000))
+
+
+def test_bloom_false_positive_rate():
+    visited = BloomVisitedSet(capacity=20_000, error_rate=0.01)
+    visited.update(url(i) for i in range(20_000))
+    false_positives = sum(url(i) in visited for i in range(20_000, 40_000))
+    assert false_positives < 20_000 * 0.02
+
+
+def test_bloom_exact_fallback(tmp_path):
+    # A filter far too small for its contents answers "maybe" for almost everything
+    visited = BloomVisitedSet(capacity=100, error_rate=0.1, exact_path=str(tmp_path / "seen.db"), write_batch_size=50)
+    visited.update(url(i) for i in range(2_000))
+    assert all(url(i) in visited for i in range(2_000))
+    assert not any(url(i) in visited for i in range(2_000, 4_000))
+    assert len(visited) == 2_000
+
+    fresh = visited.empty_copy()
+    assert url(0) not in fresh
+    assert len(fresh) == 0
+    # The copy has its own file and leaves the original usable
+    fresh.update(url(i) for i in range(100))
+    assert fresh._db_path != visited._db_path
+    assert url(1_999) in visited and url(1_999) not in fresh
+
+
+def test_bloom_scratch_files(tmp_path):
+    template = BloomVisitedSet(capacity=100, exact_path=str(tmp_path / "seen.db"), write_batch_size=10)
+    copies = [template.empty_copy() for _ in range(3)]
+    assert list(tmp_path.iterdir()) == []  # nothing is opened before the first write
+
+    for copy in copies:
+        copy.update(url(i) for i in range(20))
+    paths = {copy._db_path for copy in copies}
+    assert len(paths) == 3
+    assert all(os.path.dirname(path) == str(tmp_path) for path in paths)
+    assert all(os.path.basename(path).startswith("seen-") for path in paths)
+
+    closed, collected, kept = copies
+    closed.close()
+    assert url(0) not in closed
+    del copies, collected
+    gc.collect()
+    assert list(tmp_path.iterdir()) == [Path(kept._db_path)]
+
+
+def test_memory_per_url():
+    assert bytes_per_url(HashedVisitedSet, 100_000) < 32
+    assert bytes_per_url(lambda: BloomVisitedSet(capacity=100_000), 100_000) < 4
+    assert bytes_per_url(set, 100_000) > 100  # the plain set keeps every string
+
+
+@pytest.mark.parametrize("strategy_class", [BFSDeepCrawlStrategy, BestFirstCrawlingStrategy, DFSDeepCrawlStrategy])
+@pytest.mark.parametrize("visited_set", [HashedVisitedSet(), BloomVisitedSet(capacity=1_000)])
+@pytest.mark.asyncio
+async def test_strategies_use_visited_set(strategy_class, visited_set):
+    expected = FakeCrawler()
+    await strategy_class(max_depth=2).arun("https://example.com/", expected, CrawlerRunConfig())
+
+    strategy = strategy_class(max_depth=2, visited_set=visited_set)
+    for _ in range(2):  # every crawl starts from an empty copy
+        crawler = FakeCrawler()
+        results = await strategy.arun("https://example.com/", crawler, CrawlerRunConfig())
+        assert crawler.crawled == expected.crawled
+        assert len(crawler.crawled) == len(set(crawler.crawled))
+        assert len(results) > 15  # root, sections and their pages
+    assert len(visited_set) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark cache hits that load every field against hits that only load
+the markdown, as aget_cached_url(fields=...) does.
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import sys
+import tempfile
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai.async_database import AsyncDatabaseManager  # noqa: E402
+from crawl4ai.models import CrawlResult, MarkdownGenerationResult  # noqa: E402
+from crawl4ai.utils import ensure_content_dirs  # noqa: E402
+
+console = Console()
+URL = "https://example.com/article"
+
+
+async def make_manager(directory: str, paragraphs: int, screenshot_bytes: int) -> AsyncDatabaseManager:
+    manager = AsyncDatabaseManager()
+    manager.db_path = os.path.join(directory, "crawl4ai.db")
+    manager.content_paths = ensure_content_dirs(directory)
+    await manager.ainit_db()
+    manager._initialized = True
+    await manager.acache_url(
+        CrawlResult(
+            url=URL,
+            html="<html><body>" + "<p>Some article text.</p>" * paragraphs + "</body></html>",
+            success=True,
+            cleaned_html="<p>Some article text.</p>",
+            markdown=MarkdownGenerationResult(
+                raw_markdown="Some article text.",
+                markdown_with_citations="Some article text.",
+                references_markdown="",
+            ),
+            extracted_content='[{"title": "Article"}]',
+            screenshot=base64.b64encode(os.urandom(screenshot_bytes)).decode("ascii"),
+        )
+    )
+    await manager.aflush_writes()
+    return manager
+
+
+async def hit_latency(manager: AsyncDatabaseManager, runs: int, fields=None) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        await manager.aget_cached_url(URL, fields=fields)
+    return (time.perf_counter() - start) / runs
+
+
+async def run(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = await make_manager(tmp, args.paragraphs, args.screenshot_kb * 1024)
+        try:
+            full = await hit_latency(manager, args.runs)
+            markdown_only = await hit_latency(manager, args.runs, fields=["markdown"])
+        finally:
+            await manager.cleanup()
+
+    table = Table(title=f"Cache hit latency, {args.runs} runs")
+    table.add_column("Fields")
+    table.add_column("ms/hit", justify="right")
+    table.add_row("all", f"{full * 1000:.2f}")
+    table.add_row("markdown", f"{markdown_only * 1000:.2f}")
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Full vs projected cache hits")
+    parser.add_argument("--runs", type=int, default=200, help="Cache hits per variant")
+    parser.add_argument("--paragraphs", type=int, default=5000, help="Paragraphs in the cached HTML")
+    parser.add_argument("--screenshot-kb", type=int, default=200, help="Size of the cached screenshot")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
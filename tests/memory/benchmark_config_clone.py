@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark building a CrawlerRunConfig from scratch against cloning one.
+
+Deep crawls and dispatchers derive a config per URL, so both paths run once
+for every page crawled.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import CacheMode, CrawlerRunConfig  # noqa: E402
+
+console = Console()
+
+
+def rate(func, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return runs / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CrawlerRunConfig construction vs clone()")
+    parser.add_argument("--runs", type=int, default=20_000, help="Configs to build per method")
+    args = parser.parse_args()
+
+    config = CrawlerRunConfig()
+    construct_rate = rate(lambda: CrawlerRunConfig(stream=True, cache_mode=CacheMode.BYPASS), args.runs)
+    clone_rate = rate(lambda: config.clone(deep_crawl_strategy=None, stream=False), args.runs)
+
+    table = Table(title=f"CrawlerRunConfig, {args.runs:,} runs")
+    table.add_column("Method")
+    table.add_column("Configs/s", justify="right")
+    table.add_row("CrawlerRunConfig(...)", f"{construct_rate:,.0f}")
+    table.add_row("config.clone(...)", f"{clone_rate:,.0f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
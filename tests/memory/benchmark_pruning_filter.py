@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Benchmark PruningContentFilter's single lxml pass against the BeautifulSoup
+implementation on a large, deeply nested page.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from rich.console import Console
+from rich.table import Table
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai.content_filter_strategy import PruningContentFilter  # noqa: E402
+
+console = Console()
+
+
+def make_page(depth: int, copies: int) -> str:
+    section = "<div class='section'>" + "".join(
+        f"<div><p>Paragraph {i} has enough words to be kept by the filter. "
+        f"<a href='/page/{i}'>Related link {i}</a></p></div>"
+        for i in range(20)
+    ) + "</div>"
+    nested = section
+    for level in range(depth):
+        nested = f"<div id='level-{level}'>{nested}{section}</div>"
+    return f"<html><body><article>{nested * copies}</article></body></html>"
+
+
+def timed(func, html: str):
+    start = time.perf_counter()
+    blocks = func(html)
+    return blocks, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PruningContentFilter lxml pass vs BeautifulSoup")
+    parser.add_argument("--depth", type=int, default=20, help="Nesting depth of the generated page")
+    parser.add_argument("--copies", type=int, default=5, help="Copies of the nested block in the page")
+    args = parser.parse_args()
+
+    html = make_page(args.depth, args.copies)
+    content_filter = PruningContentFilter()
+    fast, fast_duration = timed(content_filter.filter_content, html)
+    soup, soup_duration = timed(content_filter._filter_content_soup, html)
+
+    table = Table(title=f"{len(html) / 1e6:.2f} MB page, nesting depth {args.depth}")
+    table.add_column("Implementation")
+    table.add_column("Time (s)", justify="right")
+    table.add_row("lxml pass", f"{fast_duration:.3f}")
+    table.add_row("BeautifulSoup", f"{soup_duration:.3f}")
+    console.print(table)
+    console.print(f"Speedup: {soup_duration / fast_duration:.1f}x, identical output: {fast == soup}")
+
+
+if __name__ == "__main__":
+    main()
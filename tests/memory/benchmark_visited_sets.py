@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Benchmark the memory and speed of the visited sets used by deep crawls.
+
+Adds N generated URLs to a plain set and to each VisitedSet, measuring the
+memory the set holds on to (tracemalloc) and the time taken per URL.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from rich.console import Console
+from rich.table import Table
+
+parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(parent_dir)
+
+from crawl4ai import BloomVisitedSet, HashedVisitedSet  # noqa: E402
+
+console = Console()
+
+
+def make_url(i: int) -> str:
+    return f"https://shop.example.com/category/{i % 1000}/product-{i}?utm_source=listing&page={i % 50}"
+
+
+def measure(factory, count: int):
+    """Returns (bytes per URL, microseconds per add, microseconds per lookup)."""
+    # Memory is traced from construction, so preallocated tables count too
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    visited = factory()
+    for i in range(count):
+        visited.add(make_url(i))
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    close(visited)
+
+    # Timed separately, since tracing slows down every allocation
+    visited = factory()
+    start = time.perf_counter()
+    for i in range(count):
+        visited.add(make_url(i))
+    add_time = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(0, 2 * count, 2):
+        make_url(i) in visited
+    lookup_time = time.perf_counter() - start
+    close(visited)
+    return held / count, add_time / count * 1e6, lookup_time / count * 1e6
+
+
+def close(visited):
+    if isinstance(visited, BloomVisitedSet):
+        visited.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory per URL of deep crawl visited sets")
+    parser.add_argument("--urls", type=int, default=1_000_000, help="Number of URLs to add")
+    parser.add_argument("--error-rate", type=float, default=0.001, help="Bloom filter false positive rate")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        candidates = {
+            "set (baseline)": set,
+            "HashedVisitedSet": HashedVisitedSet,
+            "BloomVisitedSet": lambda: BloomVisitedSet(capacity=args.urls, error_rate=args.error_rate),
+            "BloomVisitedSet + exact_path": lambda: BloomVisitedSet(
+                capacity=args.urls, error_rate=args.error_rate, exact_path=os.path.join(tmp, "seen.db")
+            ),
+        }
+        table = Table(title=f"Visited sets, {args.urls:,} URLs")
+        table.add_column("Structure")
+        table.add_column("Bytes/URL (RAM)", justify="right")
+        table.add_column("Add (µs)", justify="right")
+        table.add_column("Lookup (µs)", justify="right")
+        for name, factory in candidates.items():
+            console.print(f"Measuring {name}...")
+            per_url, add_us, lookup_us = measure(factory, args.urls)
+            table.add_row(name, f"{per_url:.1f}", f"{add_us:.2f}", f"{lookup_us:.2f}")
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()